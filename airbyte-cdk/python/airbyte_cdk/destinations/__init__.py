@@ -3,5 +3,7 @@
 #
 
 from .destination import Destination
+from .message_reader import AirbyteMessageReader, RecordBatch, batch_messages
+from .record_buffer import BufferedRecordWriter, RecordSink, StreamFlushStats
 
-__all__ = ["Destination"]
+__all__ = ["AirbyteMessageReader", "BufferedRecordWriter", "Destination", "RecordBatch", "RecordSink", "StreamFlushStats", "batch_messages"]
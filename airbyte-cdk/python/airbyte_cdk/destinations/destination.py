@@ -10,21 +10,32 @@ from abc import ABC, abstractmethod
 from typing import Any, Iterable, List, Mapping
 
 from airbyte_cdk.connector import Connector
+from airbyte_cdk.destinations.message_reader import DEFAULT_CHUNK_SIZE, AirbyteMessageReader
 from airbyte_cdk.models import AirbyteMessage, ConfiguredAirbyteCatalog, Type
 from airbyte_cdk.sources.utils.schema_helpers import check_config_against_spec_or_exit
-from pydantic import ValidationError
+from airbyte_cdk.utils.message_deserializer import AirbyteMessageDeserializer
 
 logger = logging.getLogger("airbyte")
 
 
 class Destination(Connector, ABC):
     VALID_CMDS = {"spec", "check", "write"}
+    # Approximate number of characters of input read and decoded at once
+    input_chunk_size: int = DEFAULT_CHUNK_SIZE
+    # Number of threads decoding the chunks of input, 1 decodes them in the thread running write
+    input_decoding_workers: int = 1
+    # Decode the input with orjson, which must be installed (see AirbyteMessageDeserializer)
+    input_use_orjson: bool = False
 
     @abstractmethod
     def write(
         self, config: Mapping[str, Any], configured_catalog: ConfiguredAirbyteCatalog, input_messages: Iterable[AirbyteMessage]
     ) -> Iterable[AirbyteMessage]:
-        """Implement to define how the connector writes data to the destination"""
+        """
+        Implement to define how the connector writes data to the destination.
+        Use airbyte_cdk.destinations.message_reader.batch_messages to consume the records of input_messages in batches grouped by stream,
+        or airbyte_cdk.destinations.record_buffer.BufferedRecordWriter to flush them to a RecordSink on background threads.
+        """
 
     def _run_check(self, config: Mapping[str, Any]) -> AirbyteMessage:
         check_result = self.check(logger, config)
@@ -32,11 +43,12 @@ class Destination(Connector, ABC):
 
     def _parse_input_stream(self, input_stream: io.TextIOWrapper) -> Iterable[AirbyteMessage]:
         """Reads from stdin, converting to Airbyte messages"""
-        for line in input_stream:
-            try:
-                yield AirbyteMessage.parse_raw(line)
-            except ValidationError:
-                logger.info(f"ignoring input which can't be deserialized as Airbyte Message: {line}")
+        reader = AirbyteMessageReader(
+            chunk_size=self.input_chunk_size,
+            max_workers=self.input_decoding_workers,
+            deserializer=AirbyteMessageDeserializer(use_orjson=self.input_use_orjson),
+        )
+        yield from reader.read_messages(input_stream)
 
     def _run_write(
         self, config: Mapping[str, Any], configured_catalog_path: str, input_stream: io.TextIOWrapper
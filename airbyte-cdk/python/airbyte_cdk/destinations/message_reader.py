@@ -0,0 +1,122 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import io
+import logging
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from airbyte_cdk.models import AirbyteMessage, AirbyteRecordMessage, Type
+from airbyte_cdk.sources.utils.concurrency import map_in_order
+from airbyte_cdk.utils.message_deserializer import AirbyteMessageDeserializer
+
+logger = logging.getLogger("airbyte")
+
+# Approximate number of characters of input read and decoded at once
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+# Maximum number of records of a stream grouped in a RecordBatch
+DEFAULT_MAX_BATCH_SIZE = 1000
+
+
+class RecordBatch(NamedTuple):
+    """
+    Consecutive records of a stream, in the order they were read.
+    """
+
+    stream: str
+    namespace: Optional[str]
+    records: List[AirbyteRecordMessage]
+
+
+class AirbyteMessageReader:
+    """
+    Reads AirbyteMessages from the input of a destination.
+
+    The input is read in chunks of lines which are decoded with AirbyteMessageDeserializer. With max_workers > 1 the chunks are decoded
+    by a pool of threads while the next chunks are read, at most max_workers chunks ahead of the consumer. Messages are always yielded
+    in the order of the input. Lines which can't be deserialized as AirbyteMessages are logged and ignored.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_workers: int = 1,
+        deserializer: AirbyteMessageDeserializer = None,
+    ):
+        """
+        :param chunk_size: approximate number of characters of input decoded together
+        :param max_workers: number of threads decoding the chunks, 1 decodes them in the consuming thread
+        :param deserializer: deserializer used to decode the lines, defaults to AirbyteMessageDeserializer()
+        """
+        self._chunk_size = chunk_size
+        self._max_workers = max_workers
+        self._deserializer = deserializer or AirbyteMessageDeserializer()
+
+    def read_messages(self, input_stream: io.TextIOBase) -> Iterator[AirbyteMessage]:
+        chunks = self._read_chunks(input_stream)
+        if self._max_workers > 1:
+            decoded_chunks = map_in_order(self._decode_chunk, chunks, self._max_workers)
+        else:
+            decoded_chunks = map(self._decode_chunk, chunks)
+        for messages in decoded_chunks:
+            yield from messages
+
+    def read_batches(
+        self, input_stream: io.TextIOBase, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE
+    ) -> Iterator[Union[RecordBatch, AirbyteMessage]]:
+        """
+        Same as batch_messages(self.read_messages(input_stream), max_batch_size)
+        """
+        return batch_messages(self.read_messages(input_stream), max_batch_size)
+
+    def _read_chunks(self, input_stream: io.TextIOBase) -> Iterator[List[str]]:
+        while True:
+            # readlines stops at the end of the line which exceeds the hint, so lines are never split between chunks
+            lines = input_stream.readlines(self._chunk_size)
+            if not lines:
+                return
+            yield lines
+
+    def _decode_chunk(self, lines: List[str]) -> List[AirbyteMessage]:
+        messages = []
+        for line in lines:
+            try:
+                messages.append(self._deserializer.deserialize(line))
+            except ValueError:
+                logger.info(f"ignoring input which can't be deserialized as Airbyte Message: {line}")
+        return messages
+
+
+def batch_messages(
+    messages: Iterable[AirbyteMessage], max_batch_size: int = DEFAULT_MAX_BATCH_SIZE
+) -> Iterator[Union[RecordBatch, AirbyteMessage]]:
+    """
+    Group the records of every stream into RecordBatches of at most max_batch_size records.
+
+    Every other message (e.g. STATE) is yielded as is, once the batches of all the records read before it were yielded, so a destination
+    can emit a state message as soon as it has persisted the batches it received before. Records of a stream are yielded in input order.
+
+    :param messages: messages to group, usually the input_messages of Destination.write
+    :param max_batch_size: maximum number of records in a batch
+    :return: iterator over RecordBatches and non-record messages
+    """
+    pending: Dict[Tuple[Optional[str], str], List[AirbyteRecordMessage]] = {}
+    for message in messages:
+        if message.type == Type.RECORD:
+            record = message.record
+            key = (record.namespace, record.stream)
+            records = pending.setdefault(key, [])
+            records.append(record)
+            if len(records) >= max_batch_size:
+                del pending[key]
+                yield RecordBatch(stream=record.stream, namespace=record.namespace, records=records)
+        else:
+            yield from _flush(pending)
+            yield message
+    yield from _flush(pending)
+
+
+def _flush(pending: Dict[Tuple[Optional[str], str], List[AirbyteRecordMessage]]) -> Iterator[RecordBatch]:
+    batches = [RecordBatch(stream=stream, namespace=namespace, records=records) for (namespace, stream), records in pending.items()]
+    pending.clear()
+    yield from batches
@@ -0,0 +1,254 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import collections
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from airbyte_cdk.destinations.message_reader import RecordBatch
+from airbyte_cdk.models import AirbyteMessage, AirbyteRecordMessage, Type
+
+logger = logging.getLogger("airbyte")
+
+# Default limits of the buffer of a stream, it is flushed as soon as one of them is reached
+DEFAULT_MAX_BUFFER_RECORDS = 10000
+DEFAULT_MAX_BUFFER_BYTES = 8 * 1024 * 1024
+DEFAULT_MAX_BUFFER_AGE_SECONDS = 60.0
+# Default cap of the size of all the records held in memory, buffered or being flushed
+DEFAULT_MAX_MEMORY_BYTES = 256 * 1024 * 1024
+
+StreamKey = Tuple[Optional[str], str]
+
+
+class RecordSink(ABC):
+    """
+    Destination of the records flushed by a BufferedRecordWriter.
+    """
+
+    @abstractmethod
+    def flush(self, batch: RecordBatch):
+        """
+        Durably write the records of the batch, a STATE message received after them is emitted once this method returns.
+        Called from the flush threads of the writer, concurrently for different batches when it has more than one flush worker.
+        """
+
+    def close(self):
+        """
+        Called once every record was flushed, e.g. to merge the flushed data into the final tables. The STATE messages received after
+        the last flushed records are only emitted once it returns, the STATE messages emitted before still rely on flush alone.
+        """
+
+
+@dataclass
+class StreamFlushStats:
+    """
+    Flushes of the records of a stream, updated by the flush threads.
+    """
+
+    flushes: int = 0
+    records: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def add(self, records: int, size: int, seconds: float):
+        self.flushes += 1
+        self.records += records
+        self.bytes += size
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def __str__(self):
+        throughput = self.records / self.seconds if self.seconds else 0.0
+        mean_seconds = self.seconds / self.flushes if self.flushes else 0.0
+        return (
+            f"{self.records} records ({self.bytes / 1024 / 1024:.1f} MiB) in {self.flushes} flushes,"
+            f" {mean_seconds:.2f}s mean and {self.max_seconds:.2f}s max latency, {throughput:.0f} records/s"
+        )
+
+
+@dataclass
+class _StreamBuffer:
+    records: List[AirbyteRecordMessage] = field(default_factory=list)
+    size: int = 0
+    created_at: float = 0.0
+    # number of the first message barrier (e.g. STATE) received after the first record of the buffer
+    first_barrier: int = 0
+
+
+@dataclass
+class _Flush:
+    future: Future
+    size: int
+    first_barrier: int
+
+
+def estimate_record_size(record: AirbyteRecordMessage) -> int:
+    """
+    :return: number of characters of the data of the record serialized to JSON
+    """
+    return len(json.dumps(record.data, default=str))
+
+
+class BufferedRecordWriter:
+    """
+    Buffers the records of every stream and flushes them to a RecordSink on background threads.
+
+    The buffer of a stream is flushed when it reaches max_buffer_records records, max_buffer_bytes bytes or when its first record is
+    older than max_buffer_age_seconds (checked as messages are received). When all the records held in memory, buffered or being
+    flushed, reach max_memory_bytes, the largest buffer is flushed and the reader waits for the flushes to complete. At most
+    max_pending_flushes flushes are waiting or running at once, so the input is not read faster than the sink can write it.
+
+    Every other message (e.g. STATE) is emitted in the order it was received, once all the records received before it were flushed, so
+    the state of a sync never covers records which were not durably written. Buffers are not flushed when a STATE message is received,
+    a state is emitted later when the buffers holding the records received before it are flushed.
+    """
+
+    def __init__(
+        self,
+        sink: RecordSink,
+        max_buffer_records: int = DEFAULT_MAX_BUFFER_RECORDS,
+        max_buffer_bytes: int = DEFAULT_MAX_BUFFER_BYTES,
+        max_buffer_age_seconds: float = DEFAULT_MAX_BUFFER_AGE_SECONDS,
+        max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+        flush_workers: int = 1,
+        max_pending_flushes: int = None,
+        record_size: Callable[[AirbyteRecordMessage], int] = estimate_record_size,
+    ):
+        """
+        :param sink: sink the buffers are flushed to
+        :param max_buffer_records: number of records of a stream buffer which triggers its flush
+        :param max_buffer_bytes: size of a stream buffer which triggers its flush, as measured by record_size
+        :param max_buffer_age_seconds: age of a stream buffer which triggers its flush
+        :param max_memory_bytes: size of all the records buffered or being flushed, the writer waits for the flushes above it
+        :param flush_workers: number of threads flushing the buffers
+        :param max_pending_flushes: number of flushes waiting or running, defaults to twice flush_workers
+        :param record_size: estimates the number of bytes of a record, defaults to the length of its data serialized to JSON
+        """
+        self._sink = sink
+        self._max_buffer_records = max_buffer_records
+        self._max_buffer_bytes = max_buffer_bytes
+        self._max_buffer_age_seconds = max_buffer_age_seconds
+        self._max_memory_bytes = max_memory_bytes
+        self._flush_workers = flush_workers
+        self._max_pending_flushes = max_pending_flushes or 2 * flush_workers
+        self._record_size = record_size
+
+        self._buffers: Dict[StreamKey, _StreamBuffer] = {}
+        self._buffered_bytes = 0
+        self._flushes: List[_Flush] = []
+        self._flushing_bytes = 0
+        # messages waiting for the flushes of the records received before them, with their barrier number
+        self._barriers: Deque[Tuple[int, AirbyteMessage]] = collections.deque()
+        self._next_barrier = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stats_lock = threading.Lock()
+        self.stats: Dict[StreamKey, StreamFlushStats] = collections.defaultdict(StreamFlushStats)
+
+    def write(self, messages: Iterable[AirbyteMessage]) -> Iterator[AirbyteMessage]:
+        """
+        Flush the records of the messages to the sink and close it once every record was flushed.
+
+        :param messages: messages to write, usually the input_messages of Destination.write
+        :return: the non-record messages, in order, once the records received before them were flushed
+        :raise: the first exception raised by the sink, the buffered records are not flushed anymore
+        """
+        self._executor = ThreadPoolExecutor(max_workers=self._flush_workers, thread_name_prefix="destination_flush")
+        try:
+            for message in messages:
+                if message.type == Type.RECORD:
+                    self._buffer(message.record)
+                else:
+                    self._barriers.append((self._next_barrier, message))
+                    self._next_barrier += 1
+                self._flush_expired_buffers()
+                yield from self._completed_barriers(wait_for_flushes=False)
+            for key in list(self._buffers):
+                self._flush(key)
+            while self._flushes:
+                self._wait_for_flushes()
+        except BaseException:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        self._executor.shutdown()
+        # the trailing messages are emitted once the sink is closed, which may write the flushed data to its final place
+        self._sink.close()
+        yield from self._completed_barriers(wait_for_flushes=False)
+        self.log_stats()
+
+    def log_stats(self):
+        with self._stats_lock:
+            for (namespace, stream), stats in self.stats.items():
+                name = f"{namespace}.{stream}" if namespace else stream
+                logger.info(f"Flushed stream {name}: {stats}")
+
+    def _buffer(self, record: AirbyteRecordMessage):
+        key = (record.namespace, record.stream)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = _StreamBuffer(created_at=time.monotonic(), first_barrier=self._next_barrier)
+        size = self._record_size(record)
+        buffer.records.append(record)
+        buffer.size += size
+        self._buffered_bytes += size
+        if len(buffer.records) >= self._max_buffer_records or buffer.size >= self._max_buffer_bytes:
+            self._flush(key)
+        if self._buffered_bytes + self._flushing_bytes >= self._max_memory_bytes:
+            if self._buffers:
+                self._flush(max(self._buffers, key=lambda k: self._buffers[k].size))
+            while self._flushes and self._buffered_bytes + self._flushing_bytes >= self._max_memory_bytes:
+                self._wait_for_flushes()
+
+    def _flush_expired_buffers(self):
+        expired_before = time.monotonic() - self._max_buffer_age_seconds
+        for key in [key for key, buffer in self._buffers.items() if buffer.created_at <= expired_before]:
+            self._flush(key)
+
+    def _flush(self, key: StreamKey):
+        while len(self._flushes) >= self._max_pending_flushes:
+            self._wait_for_flushes()
+        buffer = self._buffers.pop(key)
+        self._buffered_bytes -= buffer.size
+        self._flushing_bytes += buffer.size
+        namespace, stream = key
+        batch = RecordBatch(stream=stream, namespace=namespace, records=buffer.records)
+        future = self._executor.submit(self._flush_batch, key, batch, buffer.size)
+        self._flushes.append(_Flush(future=future, size=buffer.size, first_barrier=buffer.first_barrier))
+
+    def _flush_batch(self, key: StreamKey, batch: RecordBatch, size: int):
+        started_at = time.monotonic()
+        self._sink.flush(batch)
+        seconds = time.monotonic() - started_at
+        with self._stats_lock:
+            self.stats[key].add(len(batch.records), size, seconds)
+
+    def _wait_for_flushes(self):
+        wait([flush.future for flush in self._flushes], return_when=FIRST_COMPLETED)
+        self._reap_flushes()
+
+    def _reap_flushes(self):
+        """Forget the completed flushes, raise the exception of a failed flush"""
+        for flush in [flush for flush in self._flushes if flush.future.done()]:
+            # raises the exception of the sink
+            flush.future.result()
+            self._flushes.remove(flush)
+            self._flushing_bytes -= flush.size
+
+    def _completed_barriers(self, wait_for_flushes: bool) -> Iterator[AirbyteMessage]:
+        while self._barriers:
+            self._reap_flushes()
+            pending = [flush.first_barrier for flush in self._flushes] + [buffer.first_barrier for buffer in self._buffers.values()]
+            # the records received before the barrier are in the buffers and the flushes created before it
+            first_pending = min(pending, default=self._next_barrier)
+            while self._barriers and self._barriers[0][0] < first_pending:
+                yield self._barriers.popleft()[1]
+            if not self._barriers or not wait_for_flushes:
+                return
+            self._wait_for_flushes()
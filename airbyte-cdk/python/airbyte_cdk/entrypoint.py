@@ -18,14 +18,17 @@ from airbyte_cdk.models.airbyte_protocol import ConnectorSpecification
 from airbyte_cdk.sources import Source
 from airbyte_cdk.sources.utils.schema_helpers import check_config_against_spec_or_exit, split_config
 from airbyte_cdk.utils.airbyte_secrets_utils import get_secrets, update_secrets
+from airbyte_cdk.utils.message_serializer import AirbyteMessageSerializer
+from airbyte_cdk.utils.message_writer import BufferedMessageWriter
 
 logger = init_logger("airbyte")
 init_uncaught_exception_handler(logger)
 
 
 class AirbyteEntrypoint(object):
-    def __init__(self, source: Source):
+    def __init__(self, source: Source, serializer: AirbyteMessageSerializer = None):
         self.source = source
+        self.serializer = serializer or AirbyteMessageSerializer()
         self.logger = logging.getLogger(f"airbyte.{getattr(source, 'name', '')}")
 
     @staticmethod
@@ -63,6 +66,13 @@ class AirbyteEntrypoint(object):
         return main_parser.parse_args(args)
 
     def run(self, parsed_args: argparse.Namespace) -> Iterable[str]:
+        for message in self.messages(parsed_args):
+            yield self.serializer.serialize(message)
+
+    def messages(self, parsed_args: argparse.Namespace) -> Iterable[AirbyteMessage]:
+        """
+        Run the command and yield the messages it outputs, before they are serialized.
+        """
         cmd = parsed_args.command
         if not cmd:
             raise Exception("No command passed")
@@ -71,8 +81,7 @@ class AirbyteEntrypoint(object):
         source_spec: ConnectorSpecification = self.source.spec(self.logger)
         with tempfile.TemporaryDirectory() as temp_dir:
             if cmd == "spec":
-                message = AirbyteMessage(type=Type.SPEC, spec=source_spec)
-                yield message.json(exclude_unset=True)
+                yield AirbyteMessage(type=Type.SPEC, spec=source_spec)
             else:
                 raw_config = self.source.read_config(parsed_args.config)
                 config = self.source.configure(raw_config, temp_dir)
@@ -95,26 +104,27 @@ class AirbyteEntrypoint(object):
                     else:
                         self.logger.error("Check failed")
 
-                    output_message = AirbyteMessage(type=Type.CONNECTION_STATUS, connectionStatus=check_result).json(exclude_unset=True)
-                    yield output_message
+                    yield AirbyteMessage(type=Type.CONNECTION_STATUS, connectionStatus=check_result)
                 elif cmd == "discover":
                     catalog = self.source.discover(self.logger, config)
-                    yield AirbyteMessage(type=Type.CATALOG, catalog=catalog).json(exclude_unset=True)
+                    yield AirbyteMessage(type=Type.CATALOG, catalog=catalog)
                 elif cmd == "read":
                     config_catalog = self.source.read_catalog(parsed_args.catalog)
                     state = self.source.read_state(parsed_args.state)
-                    generator = self.source.read(self.logger, config, config_catalog, state)
-                    for message in generator:
-                        yield message.json(exclude_unset=True)
+                    yield from self.source.read(self.logger, config, config_catalog, state)
                 else:
                     raise Exception("Unexpected command " + cmd)
 
 
-def launch(source: Source, args: List[str]):
-    source_entrypoint = AirbyteEntrypoint(source)
+def launch(source: Source, args: List[str], serializer: AirbyteMessageSerializer = None, writer: BufferedMessageWriter = None):
+    source_entrypoint = AirbyteEntrypoint(source, serializer=serializer)
     parsed_args = source_entrypoint.parse_args(args)
-    for message in source_entrypoint.run(parsed_args):
-        print(message)
+    with writer or BufferedMessageWriter() as message_writer:
+        for message in source_entrypoint.messages(parsed_args):
+            message_writer.write(source_entrypoint.serializer.serialize(message))
+            if message.type == Type.STATE:
+                # the state is not held in the buffer until the next message, which may only come once the next slice is read
+                message_writer.flush()
 
 
 def main():
@@ -5,10 +5,11 @@
 
 import copy
 import logging
+import threading
 from abc import ABC, abstractmethod
 from datetime import datetime
-from functools import lru_cache
-from typing import Any, Dict, Iterator, List, Mapping, MutableMapping, Optional, Tuple
+from functools import lru_cache, partial
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Tuple
 
 from airbyte_cdk.models import (
     AirbyteCatalog,
@@ -25,9 +26,10 @@ from airbyte_cdk.models import Type as MessageType
 from airbyte_cdk.sources.source import Source
 from airbyte_cdk.sources.streams import Stream
 from airbyte_cdk.sources.streams.http.http import HttpStream
+from airbyte_cdk.sources.utils.concurrency import map_in_order, merge_concurrently
 from airbyte_cdk.sources.utils.schema_helpers import InternalConfig, split_config
 from airbyte_cdk.sources.utils.transform import TypeTransformer
-from airbyte_cdk.utils.event_timing import create_timer
+from airbyte_cdk.utils.event_timing import EventTimer, create_timer
 from airbyte_cdk.utils.traced_exception import AirbyteTracedException
 
 
@@ -60,12 +62,26 @@ class AbstractSource(Source, ABC):
 
     # Stream name to instance map for applying output object transformation
     _stream_to_instance_map: Dict[str, Stream] = {}
+    # Bounds the number of slices read at the same time by all the streams when they are read concurrently
+    _read_slots: Optional[threading.BoundedSemaphore] = None
 
     @property
     def name(self) -> str:
         """Source name"""
         return self.__class__.__name__
 
+    @property
+    def concurrency_limit(self) -> Optional[int]:
+        """
+        Override to read several streams at the same time. When this returns a value greater than 1, up to that many streams are read
+        concurrently and their messages are merged into a single output. Streams are read one after another by default.
+
+        Streams read concurrently must not share mutable state. Slices of a single stream can be read concurrently as well,
+        see Stream.concurrency_limit. The limit applies to the slices being read by all the streams together, so reading the slices of
+        a stream concurrently does not increase the number of concurrent reads.
+        """
+        return None
+
     def discover(self, logger: logging.Logger, config: Mapping[str, Any]) -> AirbyteCatalog:
         """Implements the Discover operation from the Airbyte Specification.
         See https://docs.airbyte.io/architecture/airbyte-protocol.
@@ -102,38 +118,119 @@ class AbstractSource(Source, ABC):
         stream_instances = {s.name: s for s in self.streams(config)}
         self._stream_to_instance_map = stream_instances
         with create_timer(self.name) as timer:
-            for configured_stream in catalog.streams:
-                stream_instance = stream_instances.get(configured_stream.stream.name)
-                if not stream_instance:
-                    raise KeyError(
-                        f"The requested stream {configured_stream.stream.name} was not found in the source."
-                        f" Available streams: {stream_instances.keys()}"
+            concurrent = bool(self.concurrency_limit and self.concurrency_limit > 1)
+            self._read_slots = threading.BoundedSemaphore(self.concurrency_limit) if concurrent else None
+            for stream_instance in stream_instances.values():
+                if isinstance(stream_instance, HttpStream):
+                    # every read slot of the source, or every slice read concurrently by the stream, keeps a connection busy
+                    stream_instance.transport.reserve_connections(
+                        self.concurrency_limit if concurrent else stream_instance.concurrency_limit or 1
                     )
-
-                try:
-                    timer.start_event(f"Syncing stream {configured_stream.stream.name}")
-                    yield from self._read_stream(
+            if concurrent:
+                yield from self._read_streams_concurrently(
+                    logger=logger,
+                    stream_instances=stream_instances,
+                    catalog=catalog,
+                    connector_state=connector_state,
+                    internal_config=internal_config,
+                    timer=timer,
+                )
+            else:
+                for configured_stream in catalog.streams:
+                    yield from self._read_configured_stream(
                         logger=logger,
-                        stream_instance=stream_instance,
+                        stream_instances=stream_instances,
                         configured_stream=configured_stream,
                         connector_state=connector_state,
                         internal_config=internal_config,
+                        timer=timer,
                     )
-                except AirbyteTracedException as e:
-                    raise e
-                except Exception as e:
-                    logger.exception(f"Encountered an exception while reading stream {configured_stream.stream.name}")
-                    display_message = stream_instance.get_error_display_message(e)
-                    if display_message:
-                        raise AirbyteTracedException.from_exception(e, message=display_message) from e
-                    raise e
-                finally:
-                    timer.finish_event()
-                    logger.info(f"Finished syncing {configured_stream.stream.name}")
-                    logger.info(timer.report())
 
+        transports = {id(s.transport): s.transport for s in stream_instances.values() if isinstance(s, HttpStream)}
+        for transport in transports.values():
+            logger.info(f"HTTP transport: {transport.stats}")
         logger.info(f"Finished syncing {self.name}")
 
+    def _read_configured_stream(
+        self,
+        logger: logging.Logger,
+        stream_instances: Mapping[str, Stream],
+        configured_stream: ConfiguredAirbyteStream,
+        connector_state: MutableMapping[str, Any],
+        internal_config: InternalConfig,
+        timer: EventTimer,
+    ) -> Iterator[AirbyteMessage]:
+        stream_instance = stream_instances.get(configured_stream.stream.name)
+        if not stream_instance:
+            raise KeyError(
+                f"The requested stream {configured_stream.stream.name} was not found in the source."
+                f" Available streams: {stream_instances.keys()}"
+            )
+
+        event_name = f"Syncing stream {configured_stream.stream.name}"
+        try:
+            timer.start_event(event_name)
+            yield from self._read_stream(
+                logger=logger,
+                stream_instance=stream_instance,
+                configured_stream=configured_stream,
+                connector_state=connector_state,
+                internal_config=internal_config,
+            )
+        except AirbyteTracedException as e:
+            raise e
+        except Exception as e:
+            logger.exception(f"Encountered an exception while reading stream {configured_stream.stream.name}")
+            display_message = stream_instance.get_error_display_message(e)
+            if display_message:
+                raise AirbyteTracedException.from_exception(e, message=display_message) from e
+            raise e
+        finally:
+            timer.finish_event(event_name)
+            logger.info(f"Finished syncing {configured_stream.stream.name}")
+            logger.info(timer.report())
+
+    def _read_streams_concurrently(
+        self,
+        logger: logging.Logger,
+        stream_instances: Mapping[str, Stream],
+        catalog: ConfiguredAirbyteCatalog,
+        connector_state: MutableMapping[str, Any],
+        internal_config: InternalConfig,
+        timer: EventTimer,
+    ) -> Iterator[AirbyteMessage]:
+        """
+        Read up to `concurrency_limit` streams at the same time and merge their messages into a single output.
+
+        Each stream is read in its own thread against a private copy of the connector state. When a stream checkpoints, its state
+        is copied into the shared connector state under a lock and a snapshot of the shared state is emitted. Messages of a stream
+        are emitted in the order they were produced, so a STATE message is always emitted after all the records preceding it.
+        """
+        logger.info(f"Reading up to {self.concurrency_limit} streams concurrently")
+        state_lock = threading.Lock()
+
+        def read_configured_stream(configured_stream: ConfiguredAirbyteStream) -> Iterator[AirbyteMessage]:
+            stream_name = configured_stream.stream.name
+            with state_lock:
+                stream_connector_state = copy.deepcopy(connector_state)
+            messages = self._read_configured_stream(
+                logger=logger,
+                stream_instances=stream_instances,
+                configured_stream=configured_stream,
+                connector_state=stream_connector_state,
+                internal_config=internal_config,
+                timer=timer,
+            )
+            for message in messages:
+                if message.type == MessageType.STATE:
+                    with state_lock:
+                        connector_state[stream_name] = copy.deepcopy(stream_connector_state.get(stream_name))
+                        message = AirbyteMessage(type=MessageType.STATE, state=AirbyteStateMessage(data=dict(connector_state)))
+                yield message
+
+        producers = [partial(read_configured_stream, configured_stream) for configured_stream in catalog.streams]
+        yield from merge_concurrently(producers, max_workers=self.concurrency_limit)
+
     def _read_stream(
         self,
         logger: logging.Logger,
@@ -211,13 +308,19 @@ class AbstractSource(Source, ABC):
             stream_state=stream_state,
         )
         total_records_counter = 0
-        for _slice in slices:
-            records = stream_instance.read_records(
+
+        def read_slice(_slice: Optional[Mapping[str, Any]]) -> Iterable[Mapping[str, Any]]:
+            return stream_instance.read_records(
                 sync_mode=SyncMode.incremental,
                 stream_slice=_slice,
                 stream_state=stream_state,
                 cursor_field=configured_stream.cursor_field or None,
             )
+
+        # Streams managing their own state (IncrementalMixin) update it while their records are read, a slice read ahead of the records
+        # being emitted would then advance the checkpointed state past records which were not emitted yet
+        allow_concurrency = "state" not in dir(stream_instance)
+        for records in self._read_slices(stream_instance, slices, read_slice, allow_concurrency=allow_concurrency):
             for record_counter, record_data in enumerate(records, start=1):
                 yield self._as_airbyte_record(stream_name, record_data)
                 stream_state = stream_instance.get_updated_state(stream_state, record_data)
@@ -245,18 +348,58 @@ class AbstractSource(Source, ABC):
     ) -> Iterator[AirbyteMessage]:
         slices = stream_instance.stream_slices(sync_mode=SyncMode.full_refresh, cursor_field=configured_stream.cursor_field)
         total_records_counter = 0
-        for slice in slices:
-            records = stream_instance.read_records(
-                stream_slice=slice,
+
+        def read_slice(_slice: Optional[Mapping[str, Any]]) -> Iterable[Mapping[str, Any]]:
+            return stream_instance.read_records(
+                stream_slice=_slice,
                 sync_mode=SyncMode.full_refresh,
                 cursor_field=configured_stream.cursor_field,
             )
+
+        for records in self._read_slices(stream_instance, slices, read_slice):
             for record in records:
                 yield self._as_airbyte_record(configured_stream.stream.name, record)
                 total_records_counter += 1
                 if self._limit_reached(internal_config, total_records_counter):
                     return
 
+    def _read_slices(
+        self,
+        stream_instance: Stream,
+        slices: Iterable[Optional[Mapping[str, Any]]],
+        read_slice: Callable[[Optional[Mapping[str, Any]]], Iterable[Mapping[str, Any]]],
+        allow_concurrency: bool = True,
+    ) -> Iterator[Iterable[Mapping[str, Any]]]:
+        """
+        Read the records of every slice, in slice order.
+
+        If the stream allows it, up to stream_instance.concurrency_limit slices are read at the same time. In that case the records
+        of a slice are fetched entirely before being returned, and each slice is read with the stream state available when the
+        read was started rather than the state updated by the preceding slices. When streams are read concurrently, every slice
+        read takes one of the concurrency_limit read slots of the source.
+        """
+        concurrency_limit = stream_instance.concurrency_limit
+        if allow_concurrency and concurrency_limit and concurrency_limit > 1:
+            stream_instance.logger.info(f"Reading up to {concurrency_limit} slices of {stream_instance.name} stream concurrently")
+            yield from map_in_order(lambda _slice: self._fetch_slice(read_slice, _slice), slices, max_workers=concurrency_limit)
+        else:
+            for _slice in slices:
+                yield self._read_slice_in_slot(read_slice, _slice) if self._read_slots else read_slice(_slice)
+
+    def _fetch_slice(
+        self, read_slice: Callable[[Optional[Mapping[str, Any]]], Iterable[Mapping[str, Any]]], _slice: Optional[Mapping[str, Any]]
+    ) -> List[Mapping[str, Any]]:
+        if self._read_slots:
+            with self._read_slots:
+                return list(read_slice(_slice))
+        return list(read_slice(_slice))
+
+    def _read_slice_in_slot(
+        self, read_slice: Callable[[Optional[Mapping[str, Any]]], Iterable[Mapping[str, Any]]], _slice: Optional[Mapping[str, Any]]
+    ) -> Iterator[Mapping[str, Any]]:
+        with self._read_slots:
+            yield from read_slice(_slice)
+
     def _checkpoint_state(self, stream, stream_state, connector_state):
         try:
             connector_state[stream.name] = stream.state
@@ -285,5 +428,7 @@ class AbstractSource(Source, ABC):
         # taken unless configured. See
         # docs/connector-development/cdk-python/schemas.md for details.
         transformer.transform(data, schema)  # type: ignore
-        message = AirbyteRecordMessage(stream=stream_name, data=data, emitted_at=now_millis)
-        return AirbyteMessage(type=MessageType.RECORD, record=message)
+        # Records are the bulk of the output so the messages are built without pydantic validation, the copy of data mirrors
+        # what validation would do and protects the message from later changes to the record by the stream.
+        message = AirbyteRecordMessage.construct(stream=stream_name, data=dict(data), emitted_at=now_millis)
+        return AirbyteMessage.construct(type=MessageType.RECORD, record=message)
@@ -3,55 +3,162 @@
 #
 
 import ast
+import copy
 import datetime
 import numbers
+import threading
+import time
+from dataclasses import dataclass, fields
+from functools import lru_cache
 
 from airbyte_cdk.sources.declarative.interpolation.interpolation import Interpolation
 from dateutil import parser
-from jinja2 import Environment
+from jinja2 import Environment, Template
 from jinja2.exceptions import UndefinedError
 
+# Maximum number of compiled templates and static values kept in the shared caches
+TEMPLATE_CACHE_SIZE = 1024
+
+# A string without any of these markers is not a template and renders to itself
+_TEMPLATE_MARKERS = ("{{", "{%", "{#")
+
+_IMMUTABLE_TYPES = (str, int, float, bool, type(None))
+
+
+def _create_environment() -> Environment:
+    environment = Environment()
+    # Defines some utility methods that can be called from template strings
+    # eg "{{ today_utc() }}
+    environment.globals["now_local"] = datetime.datetime.now
+    environment.globals["now_utc"] = lambda: datetime.datetime.now(datetime.timezone.utc)
+    environment.globals["today_utc"] = lambda: datetime.datetime.now(datetime.timezone.utc).date()
+    environment.globals["timestamp"] = (
+        lambda dt: int(dt) if isinstance(dt, numbers.Number) else int(parser.parse(dt).replace(tzinfo=datetime.timezone.utc).timestamp())
+    )
+    environment.globals["max"] = lambda a, b: max(a, b)
+    return environment
+
+
+# The environment is shared by all interpolations so templates compiled once can be reused by all of them
+_environment = _create_environment()
+
+
+@dataclass
+class InterpolationStats:
+    """
+    Counters of the interpolations evaluated by a thread.
+    """
+
+    # number of calls to JinjaInterpolation.eval
+    evaluations: int = 0
+    # number of strings rendered with jinja
+    renders: int = 0
+    # number of strings which were not templates and skipped jinja
+    static_values: int = 0
+    # number of templates compiled, the other renders used a cached template
+    compilations: int = 0
+    # time spent evaluating, in nanoseconds
+    duration_ns: int = 0
+
+    def __sub__(self, other: "InterpolationStats") -> "InterpolationStats":
+        return InterpolationStats(**{f.name: getattr(self, f.name) - getattr(other, f.name) for f in fields(self)})
+
+    def __str__(self):
+        return (
+            f"{self.evaluations} interpolations ({self.renders} rendered, {self.compilations} compiled, {self.static_values} static)"
+            f" in {datetime.timedelta(microseconds=self.duration_ns // 1000)}"
+        )
+
+
+_thread_stats = threading.local()
+
+
+def get_interpolation_stats() -> InterpolationStats:
+    """
+    :return: the interpolation counters of the current thread. The returned object is updated by the following interpolations,
+    copy it to keep a snapshot.
+    """
+    stats = getattr(_thread_stats, "stats", None)
+    if stats is None:
+        stats = _thread_stats.stats = InterpolationStats()
+    return stats
+
+
+def _is_static(s: str) -> bool:
+    """
+    :return: True if the string renders to itself. Strings with line breaks are rendered by jinja which normalizes them.
+    """
+    return not any(marker in s for marker in _TEMPLATE_MARKERS) and "\n" not in s and "\r" not in s
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _compile_template(s: str) -> Template:
+    get_interpolation_stats().compilations += 1
+    return _environment.from_string(s)
+
+
+def _literal_eval(result):
+    try:
+        return ast.literal_eval(result)
+    except (ValueError, SyntaxError):
+        return result
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def _static_value(s: str):
+    return _literal_eval(s)
+
 
 class JinjaInterpolation(Interpolation):
     def __init__(self):
-        self._environment = Environment()
-        # Defines some utility methods that can be called from template strings
-        # eg "{{ today_utc() }}
-        self._environment.globals["now_local"] = datetime.datetime.now
-        self._environment.globals["now_utc"] = lambda: datetime.datetime.now(datetime.timezone.utc)
-        self._environment.globals["today_utc"] = lambda: datetime.datetime.now(datetime.timezone.utc).date()
-        self._environment.globals["timestamp"] = (
-            lambda dt: int(dt)
-            if isinstance(dt, numbers.Number)
-            else int(parser.parse(dt).replace(tzinfo=datetime.timezone.utc).timestamp())
-        )
-        self._environment.globals["max"] = lambda a, b: max(a, b)
+        self._environment = _environment
 
     def eval(self, input_str: str, config, default=None, **kwargs):
+        stats = get_interpolation_stats()
+        stats.evaluations += 1
+        start = time.perf_counter_ns()
+        try:
+            return self._eval_with_default(input_str, config, default, **kwargs)
+        finally:
+            stats.duration_ns += time.perf_counter_ns() - start
+
+    def _eval_with_default(self, input_str: str, config, default=None, **kwargs):
         context = {"config": config, **kwargs}
         try:
             if isinstance(input_str, str):
-                result = self._eval(input_str, context)
-                if result:
-                    return self._literal_eval(result)
+                if _is_static(input_str):
+                    if input_str:
+                        return self._static_value(input_str)
+                else:
+                    result = self._eval(input_str, context)
+                    if result:
+                        return self._literal_eval(result)
             else:
                 # If input is not a string, return it as is
                 raise Exception(f"Expected a string. got {input_str}")
         except UndefinedError:
             pass
         # If result is empty or resulted in an undefined error, evaluate and return the default string
+        if isinstance(default, str) and _is_static(default):
+            return self._static_value(default)
         return self._literal_eval(self._eval(default, context))
 
+    @staticmethod
+    def _static_value(s: str):
+        get_interpolation_stats().static_values += 1
+        value = _static_value(s)
+        # the cached value is shared, return a copy of mutable values (e.g. lists) so callers can't alter it
+        return value if isinstance(value, _IMMUTABLE_TYPES) else copy.deepcopy(value)
+
     def _literal_eval(self, result):
-        try:
-            return ast.literal_eval(result)
-        except (ValueError, SyntaxError):
-            return result
+        return _literal_eval(result)
 
     def _eval(self, s: str, context):
-        try:
-            return self._environment.from_string(s).render(context)
-        except TypeError:
+        if not isinstance(s, str):
             # The string is a static value, not a jinja template
             # It can be returned as is
             return s
+        if _is_static(s):
+            return s
+        get_interpolation_stats().renders += 1
+        return _compile_template(s).render(context)
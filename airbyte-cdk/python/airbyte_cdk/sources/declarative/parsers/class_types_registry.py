@@ -7,6 +7,7 @@ from typing import Mapping, Type
 from airbyte_cdk.sources.declarative.requesters.paginators.interpolated_paginator import InterpolatedPaginator
 from airbyte_cdk.sources.declarative.requesters.paginators.next_page_url_paginator import NextPageUrlPaginator
 from airbyte_cdk.sources.declarative.requesters.paginators.offset_paginator import OffsetPaginator
+from airbyte_cdk.sources.declarative.requesters.paginators.page_number_paginator import PageNumberPaginator
 from airbyte_cdk.sources.declarative.stream_slicers.datetime_stream_slicer import DatetimeStreamSlicer
 from airbyte_cdk.sources.streams.http.requests_native_auth.token import TokenAuthenticator
 
@@ -14,6 +15,7 @@ CLASS_TYPES_REGISTRY: Mapping[str, Type] = {
     "NextPageUrlPaginator": NextPageUrlPaginator,
     "InterpolatedPaginator": InterpolatedPaginator,
     "OffsetPaginator": OffsetPaginator,
+    "PageNumberPaginator": PageNumberPaginator,
     "TokenAuthenticator": TokenAuthenticator,
     "DatetimeStreamSlicer": DatetimeStreamSlicer,
 }
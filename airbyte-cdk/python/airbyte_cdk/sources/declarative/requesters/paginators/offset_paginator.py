@@ -24,6 +24,15 @@ class OffsetPaginator(Paginator):
         self._update_state_with_offset(offset)
         return token_map
 
+    @property
+    def page_size(self) -> Optional[int]:
+        return self._limit
+
+    def page_token(self, page_index: int) -> Optional[Mapping[str, Any]]:
+        if page_index == 0:
+            return None
+        return {self._offsetKey: page_index * self._limit}
+
     def _update_state_with_offset(self, offset):
         self._state.update_state(**{self._offsetKey: offset})
 
@@ -0,0 +1,44 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+from typing import Any, List, Mapping, Optional
+
+import requests
+from airbyte_cdk.sources.declarative.requesters.paginators.paginator import Paginator
+from airbyte_cdk.sources.declarative.states.dict_state import DictState
+
+
+class PageNumberPaginator(Paginator):
+    """
+    A paginator that increments a page number and stops when a page has fewer than page_size records.
+    """
+
+    def __init__(self, page_size: int, state: Optional[DictState] = None, page_key: str = "page", start_from_page: int = 1):
+        self._page_size = page_size
+        self._state = state or DictState()
+        self._page_key = page_key
+        self._start_from_page = start_from_page
+        self._update_state_with_page(start_from_page)
+
+    def next_page_token(self, response: requests.Response, last_records: List[Mapping[str, Any]]) -> Optional[Mapping[str, Any]]:
+        if len(last_records) < self._page_size:
+            return None
+        page = self._get_page() + 1
+        self._update_state_with_page(page)
+        return {self._page_key: page}
+
+    @property
+    def page_size(self) -> Optional[int]:
+        return self._page_size
+
+    def page_token(self, page_index: int) -> Optional[Mapping[str, Any]]:
+        if page_index == 0:
+            return None
+        return {self._page_key: self._start_from_page + page_index}
+
+    def _update_state_with_page(self, page):
+        self._state.update_state(**{self._page_key: page})
+
+    def _get_page(self):
+        return self._state.get_state(self._page_key)
@@ -12,3 +12,23 @@ class Paginator(ABC):
     @abstractmethod
     def next_page_token(self, response: requests.Response, last_records: List[Mapping[str, Any]]) -> Optional[Mapping[str, Any]]:
         pass
+
+    @property
+    def page_size(self) -> Optional[int]:
+        """
+        Paginators whose tokens do not depend on the previous responses (e.g. offset or page number pagination) return the number of
+        records per page, which allows the retriever to request several pages concurrently. A page with fewer records is the last one.
+
+        :return: the number of records per page, or None if the pages must be read one after the other
+        """
+        return None
+
+    def page_token(self, page_index: int) -> Optional[Mapping[str, Any]]:
+        """
+        Only called if page_size is not None, paginators returning a page size must override it. The pages of the other paginators are
+        read one after the other with next_page_token.
+
+        :param page_index: index of the page, starting at 0 for the first page
+        :return: the token to request the page with. The first page is requested without token.
+        """
+        return None
@@ -2,11 +2,14 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import copy
+import itertools
 from typing import Any, Iterable, List, Mapping, MutableMapping, Optional, Union
 
 import requests
 from airbyte_cdk.models import SyncMode
 from airbyte_cdk.sources.declarative.extractors.http_selector import HttpSelector
+from airbyte_cdk.sources.declarative.interpolation.jinja import get_interpolation_stats
 from airbyte_cdk.sources.declarative.requesters.paginators.paginator import Paginator
 from airbyte_cdk.sources.declarative.requesters.requester import Requester
 from airbyte_cdk.sources.declarative.retrievers.retriever import Retriever
@@ -15,6 +18,7 @@ from airbyte_cdk.sources.declarative.states.state import State
 from airbyte_cdk.sources.declarative.stream_slicers.single_slice import SingleSlice
 from airbyte_cdk.sources.declarative.stream_slicers.stream_slicer import StreamSlicer
 from airbyte_cdk.sources.streams.http import HttpStream
+from airbyte_cdk.sources.utils.concurrency import map_in_order
 
 
 class SimpleRetriever(Retriever, HttpStream):
@@ -27,7 +31,12 @@ class SimpleRetriever(Retriever, HttpStream):
         paginator: Paginator = None,
         stream_slicer: Optional[StreamSlicer] = SingleSlice(),
         state: Optional[State] = None,
+        max_concurrent_pages: int = 1,
     ):
+        """
+        :param max_concurrent_pages: maximum number of page requests in flight at the same time. Pages are only requested concurrently
+        if the paginator supports it (see Paginator.page_size), the records are always emitted in page order.
+        """
         self._name = name
         self._primary_key = primary_key
         self._paginator = paginator
@@ -38,6 +47,8 @@ class SimpleRetriever(Retriever, HttpStream):
         self._state: State = (state or DictState()).deep_copy()
         self._last_response = None
         self._last_records = None
+        self._max_concurrent_pages = max_concurrent_pages
+        self.transport.reserve_connections(max_concurrent_pages)
 
     @property
     def name(self) -> str:
@@ -226,13 +237,47 @@ class SimpleRetriever(Retriever, HttpStream):
         stream_state: Mapping[str, Any] = None,
     ) -> Iterable[Mapping[str, Any]]:
         # Warning: use self.state instead of the stream_state passed as argument!
-        records_generator = HttpStream.read_records(self, sync_mode, cursor_field, stream_slice, self.state)
+        interpolation_stats = copy.copy(get_interpolation_stats())
+        if self._can_read_pages_concurrently():
+            records_generator = self._read_pages_concurrently(stream_slice)
+        else:
+            records_generator = HttpStream.read_records(self, sync_mode, cursor_field, stream_slice, self.state)
         for r in records_generator:
             self._state.update_state(stream_slice=stream_slice, stream_state=self.state, last_response=self._last_response, last_record=r)
             yield r
         else:
             self._state.update_state(stream_slice=stream_slice, stream_state=self.state, last_reponse=self._last_response)
             yield from []
+        self.logger.debug(f"Read slice {stream_slice} of {self.name} with {get_interpolation_stats() - interpolation_stats}")
+
+    def _can_read_pages_concurrently(self) -> bool:
+        # the vcr cassette used by the cache is not thread-safe
+        return self._max_concurrent_pages > 1 and self._paginator is not None and self._paginator.page_size and not self.use_cache
+
+    def _read_pages_concurrently(self, stream_slice: Mapping[str, Any] = None) -> Iterable[Mapping[str, Any]]:
+        """
+        Keep up to max_concurrent_pages page requests in flight and parse the responses in page order.
+        The first page with fewer records than the page size is the last one, the requests sent for the following pages are discarded.
+        """
+        page_size = self._paginator.page_size
+        stream_state = self.state
+
+        def fetch_page(page_index: int) -> requests.Response:
+            next_page_token = self._paginator.page_token(page_index)
+            return self._fetch_page(stream_state=stream_state, stream_slice=stream_slice, next_page_token=next_page_token)
+
+        responses = map_in_order(fetch_page, itertools.count(), self._max_concurrent_pages)
+        try:
+            for page_index, response in enumerate(responses):
+                next_page_token = self._paginator.page_token(page_index)
+                records = self.parse_response(
+                    response, stream_state=stream_state, stream_slice=stream_slice, next_page_token=next_page_token
+                )
+                yield from records
+                if len(records) < page_size:
+                    break
+        finally:
+            responses.close()
 
     def stream_slices(
         self, *, sync_mode: SyncMode, cursor_field: List[str] = None, stream_state: Mapping[str, Any] = None
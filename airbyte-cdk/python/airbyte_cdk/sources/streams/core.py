@@ -183,6 +183,22 @@ class Stream(ABC):
         """
         return None
 
+    @property
+    def concurrency_limit(self) -> Optional[int]:
+        """
+        Override to read several slices of this stream at the same time. When this returns a value greater than 1, up to that many slices
+        are read concurrently and their records are emitted in slice order, so read_records must be thread-safe.
+
+        Each concurrently read slice is fully fetched before its records are emitted, and receives the stream state available when its read
+        was started, so only enable this for streams whose slices do not depend on each other.
+
+        Incremental streams managing their own state (see IncrementalMixin) are always read one slice after another, since the state they
+        update while reading a slice ahead would be checkpointed before the records of the preceding slices are emitted.
+
+        return None to read slices one after another.
+        """
+        return None
+
     @deprecated(version="0.1.49", reason="You should use explicit state property instead, see IncrementalMixin docs.")
     def get_updated_state(self, current_stream_state: MutableMapping[str, Any], latest_record: Mapping[str, Any]):
         """Override to extract state from the latest record. Needed to implement incremental sync.
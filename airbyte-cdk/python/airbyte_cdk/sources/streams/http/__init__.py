@@ -5,5 +5,6 @@
 # Initialize Streams Package
 from .exceptions import UserDefinedBackoffException
 from .http import HttpStream, HttpSubStream
+from .transport import HttpTransport, HttpTransportConfig
 
-__all__ = ["HttpStream", "HttpSubStream", "UserDefinedBackoffException"]
+__all__ = ["HttpStream", "HttpSubStream", "HttpTransport", "HttpTransportConfig", "UserDefinedBackoffException"]
@@ -0,0 +1,368 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import io
+import os
+import socket
+import ssl
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import DEFAULT_CA_BUNDLE_PATH, get_encoding_from_headers, select_proxy
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+# Headers which only apply to a single HTTP/1.1 connection and are forbidden in HTTP/2
+_HOP_BY_HOP_HEADERS = frozenset(("connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade"))
+
+
+@dataclass(frozen=True)
+class HttpTransportConfig:
+    """
+    Connection settings shared by all the streams using an HttpTransport.
+    """
+
+    # number of hosts whose connections are kept open
+    pool_connections: int = 10
+    # minimum number of idle connections kept open per host, the pools grow to the number of requests sent concurrently by the source
+    # (see HttpTransport.reserve_connections)
+    pool_maxsize: int = 10
+    # maximum number of connections opened to a host at the same time, requests wait for a free connection once it is reached.
+    # Not applied by the HTTP/2 backend, which multiplexes the requests to a host over a single connection.
+    max_connections_per_host: Optional[int] = None
+    # send TCP keep-alive probes on idle connections so they are not silently dropped by load balancers and NATs
+    keep_alive: bool = True
+    # seconds a connection stays idle before the first keep-alive probe is sent
+    keep_alive_idle: int = 60
+    # request compressed responses (Accept-Encoding), otherwise ask for the identity encoding
+    compression: bool = True
+    # send the requests with httpx over HTTP/2 when the server supports it, httpx must be installed with its http2 extra
+    http2: bool = False
+
+
+class HttpTransportStats:
+    """
+    Thread-safe counters of the requests sent by an HttpTransport and of the connections it opened.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+        self.tls_handshakes = 0
+
+    def add_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def add_connection(self):
+        with self._lock:
+            self.connections += 1
+
+    def add_tls_handshake(self):
+        with self._lock:
+            self.tls_handshakes += 1
+
+    @property
+    def reused_connections(self) -> int:
+        """
+        :return: number of requests sent over a connection opened by a previous request
+        """
+        return max(0, self.requests - self.connections)
+
+    def __str__(self):
+        return (
+            f"{self.requests} HTTP requests over {self.connections} connections"
+            f" ({self.reused_connections} reused connections, {self.tls_handshakes} TLS handshakes)"
+        )
+
+
+def _counting_pool_class(pool_class, stats: HttpTransportStats):
+    class CountingConnectionPool(pool_class):
+        def _make_request(self, conn, *args, **kwargs):
+            # a connection without socket is connected by the request: either a new connection or a reconnection after the server
+            # closed it. The connections are not patched as vcrpy replaces the connection classes of urllib3 to record the requests.
+            if getattr(conn, "sock", None) is None:
+                stats.add_connection()
+                if self.scheme == "https":
+                    stats.add_tls_handshake()
+            return super()._make_request(conn, *args, **kwargs)
+
+    return CountingConnectionPool
+
+
+def _socket_options(config: HttpTransportConfig):
+    options = list(HTTPConnection.default_socket_options)
+    if config.keep_alive:
+        options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        # the TCP keep-alive timings can only be tuned on some platforms (e.g. Linux)
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, config.keep_alive_idle))
+        if hasattr(socket, "TCP_KEEPINTVL"):
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, max(1, config.keep_alive_idle // 6)))
+    return options
+
+
+def _ssl_context(verify: Union[bool, str], cert: Union[None, str, Tuple[str, str]]) -> ssl.SSLContext:
+    """
+    :return: SSL context verifying the certificates as requests does for the verify and cert arguments of a request
+    """
+    if verify is False:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    else:
+        ca_bundle = DEFAULT_CA_BUNDLE_PATH if verify is True else verify
+        if os.path.isdir(ca_bundle):
+            context = ssl.create_default_context(capath=ca_bundle)
+        else:
+            context = ssl.create_default_context(cafile=ca_bundle)
+    if isinstance(cert, tuple):
+        context.load_cert_chain(*cert)
+    elif cert:
+        context.load_cert_chain(cert)
+    return context
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    requests HTTPAdapter applying an HttpTransportConfig to its connection pools and counting the connections they open.
+    """
+
+    def __init__(self, config: HttpTransportConfig, stats: HttpTransportStats):
+        self._config = config
+        self._stats = stats
+        maxsize = config.max_connections_per_host or config.pool_maxsize
+        super().__init__(
+            pool_connections=config.pool_connections, pool_maxsize=maxsize, pool_block=config.max_connections_per_host is not None
+        )
+
+    def resize(self, maxsize: int):
+        """
+        Keep up to maxsize idle connections open per host. The pools are replaced, the connections of the previous pools are closed once
+        they are released by the requests using them.
+        """
+        self.init_poolmanager(self._pool_connections, maxsize, block=self._pool_block)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        super().init_poolmanager(connections, maxsize, block=block, socket_options=_socket_options(self._config), **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _counting_pool_class(HTTPConnectionPool, self._stats),
+            "https": _counting_pool_class(HTTPSConnectionPool, self._stats),
+        }
+
+    def send(self, request: requests.PreparedRequest, *args, **kwargs) -> requests.Response:
+        self._stats.add_request()
+        return super().send(request, *args, **kwargs)
+
+    def close(self):
+        """
+        Called by requests.Session.close. The pools are shared with the other sessions of the transport, they are closed by
+        HttpTransport.close.
+        """
+
+    def close_pools(self):
+        super().close()
+
+
+class _HttpxRawStream(io.RawIOBase):
+    """
+    File-like body of a streamed httpx response, read by requests.Response.iter_content and exposed as the raw stream.
+    """
+
+    def __init__(self, httpx_response):
+        super().__init__()
+        self._httpx_response = httpx_response
+        self._chunks = httpx_response.iter_bytes()
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._buffer:
+            try:
+                self._buffer = next(self._chunks)
+            except StopIteration:
+                return 0
+            except httpx.TransportError as e:
+                raise requests.exceptions.ChunkedEncodingError(e)
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def close(self):
+        self._httpx_response.close()
+        super().close()
+
+
+class Http2Adapter(BaseAdapter):
+    """
+    requests transport adapter sending the requests with an httpx client which negotiates HTTP/2 with the servers supporting it.
+
+    The responses are converted to requests.Response and the httpx errors to the equivalent requests exceptions, so HttpStream's error
+    handling and backoff work the same as with the default adapter. Redirects are followed by httpx. As httpx applies the certificate
+    verification, client certificate and proxy to a whole client, one client is kept per combination of the verify, cert and proxies
+    arguments of the requests.
+    """
+
+    def __init__(self, config: HttpTransportConfig, stats: HttpTransportStats):
+        if httpx is None:
+            raise ImportError("httpx must be installed with its http2 extra to use the HTTP/2 transport")
+        super().__init__()
+        self._config = config
+        self._stats = stats
+        self._clients: Dict[Tuple[Any, Any, Optional[str]], "httpx.Client"] = {}
+        self._clients_lock = threading.Lock()
+
+    def _client(self, url: str, verify, cert, proxies) -> "httpx.Client":
+        proxy = select_proxy(url, proxies) if proxies else None
+        key = (verify, cert, proxy)
+        with self._clients_lock:
+            if key not in self._clients:
+                limits = httpx.Limits(
+                    max_connections=None, max_keepalive_connections=self._config.pool_connections * self._config.pool_maxsize
+                )
+                transport = httpx.HTTPTransport(
+                    http2=True,
+                    limits=limits,
+                    socket_options=_socket_options(self._config),
+                    verify=_ssl_context(verify, cert),
+                    proxy=httpx.Proxy(proxy) if proxy else None,
+                )
+                # the proxies of the environment are already merged into the proxies argument by requests
+                self._clients[key] = httpx.Client(transport=transport, follow_redirects=True, trust_env=False)
+            return self._clients[key]
+
+    def _trace(self, event_name: str, info: Mapping[str, Any]):
+        if event_name == "connection.connect_tcp.complete":
+            self._stats.add_connection()
+        elif event_name == "connection.start_tls.complete":
+            self._stats.add_tls_handshake()
+
+    @staticmethod
+    def _timeout(timeout: Union[None, float, Tuple[Optional[float], Optional[float]]]):
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return httpx.Timeout(read, connect=connect)
+        return httpx.Timeout(timeout)
+
+    def send(self, request: requests.PreparedRequest, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        self._stats.add_request()
+        headers = [(name, value) for name, value in request.headers.items() if name.lower() not in _HOP_BY_HOP_HEADERS]
+        try:
+            client = self._client(request.url, verify, cert, proxies)
+            httpx_request = client.build_request(
+                request.method,
+                request.url,
+                headers=headers,
+                content=request.body,
+                timeout=self._timeout(timeout),
+                extensions={"trace": self._trace},
+            )
+            httpx_response = client.send(httpx_request, stream=stream)
+        except httpx.ConnectTimeout as e:
+            raise requests.exceptions.ConnectTimeout(e, request=request)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.ReadTimeout(e, request=request)
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e, request=request)
+
+        response = requests.Response()
+        response.status_code = httpx_response.status_code
+        response.reason = httpx_response.reason_phrase
+        response.headers = CaseInsensitiveDict(httpx_response.headers.items())
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = str(httpx_response.url)
+        response.request = request
+        response.connection = self
+        # httpx decodes the body, it is exposed as the content and as the raw stream
+        if stream:
+            response.raw = _HttpxRawStream(httpx_response)
+        else:
+            response._content = httpx_response.content
+            response._content_consumed = True
+            response.raw = io.BytesIO(response._content)
+        return response
+
+    def close(self):
+        """
+        Called by requests.Session.close. The clients are shared with the other sessions of the transport, they are closed by
+        HttpTransport.close.
+        """
+
+    def close_pools(self):
+        with self._clients_lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+
+
+class HttpTransport:
+    """
+    Connection pools shared by HTTP streams.
+
+    Every stream keeps its own requests.Session (authentication, cookies) but mounts the adapters of its transport, so the streams
+    of a source reuse each other's connections instead of opening new connections (and TLS handshakes) for every stream instance.
+    Streams use the process-wide HttpTransport.default() unless they are given a transport. Closing a session does not close the
+    connections of its transport, which are closed by HttpTransport.close.
+    """
+
+    _default: Optional["HttpTransport"] = None
+    _default_lock = threading.Lock()
+
+    def __init__(self, config: HttpTransportConfig = None):
+        self.config = config or HttpTransportConfig()
+        self.stats = HttpTransportStats()
+        self._http1_adapter = PooledHTTPAdapter(self.config, self.stats)
+        self._http2_adapter = Http2Adapter(self.config, self.stats) if self.config.http2 else None
+        self._pool_lock = threading.Lock()
+
+    @classmethod
+    def default(cls) -> "HttpTransport":
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = HttpTransport()
+            return cls._default
+
+    def mount(self, session: requests.Session, allow_http2: bool = True):
+        """
+        Send the requests of the session with this transport.
+
+        :param session: session to configure
+        :param allow_http2: set to False to always use HTTP/1.1 (e.g. when the responses are recorded by vcrpy, which patches urllib3)
+        """
+        adapter = self._http2_adapter if self._http2_adapter and allow_http2 else self._http1_adapter
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not self.config.compression:
+            session.headers["Accept-Encoding"] = "identity"
+
+    def reserve_connections(self, count: int):
+        """
+        Grow the HTTP/1.1 connection pools to keep at least `count` idle connections per host, so the connections of `count` requests
+        sent concurrently can all be reused. The pools never shrink and do not grow beyond max_connections_per_host. HTTP/2 requests are
+        multiplexed over a single connection per host and are not affected.
+        """
+        with self._pool_lock:
+            if self.config.max_connections_per_host is None and count > self._http1_adapter._pool_maxsize:
+                self._http1_adapter.resize(count)
+
+    def close(self):
+        """
+        Close the connections of the transport. They are reopened by the next requests.
+        """
+        self._http1_adapter.close_pools()
+        if self._http2_adapter:
+            self._http2_adapter.close_pools()
@@ -0,0 +1,106 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Iterable, Iterator, List, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Maximum number of messages produced by the worker threads that can wait to be consumed.
+# Once the queue is full the workers block, which keeps memory usage bounded when the consumer (stdout) is the bottleneck.
+DEFAULT_QUEUE_SIZE = 1000
+
+# How often (in seconds) a blocked worker checks whether the consumer has gone away.
+_POLL_INTERVAL = 0.1
+
+
+class _WorkerFinished:
+    """Sentinel put on the output queue when a worker is exhausted"""
+
+
+class _WorkerFailed:
+    """Wraps an exception raised in a worker so it can be re-raised in the consuming thread"""
+
+    def __init__(self, exception: BaseException):
+        self.exception = exception
+
+
+def map_in_order(func: Callable[[T], R], items: Iterable[T], max_workers: int) -> Iterator[R]:
+    """
+    Apply func to every item using a pool of max_workers threads and yield the results in the order of the items.
+    At most max_workers items are processed at the same time, so results are buffered for at most that many items.
+    Remaining work is cancelled if the returned generator is closed before being exhausted.
+
+    :param func: function to apply, it must be thread-safe
+    :param items: input items, consumed lazily from the calling thread
+    :param max_workers: maximum number of items processed in parallel
+    :return: iterator over func(item) for every item, in input order
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="airbyte_map")
+    pending: Deque[Future] = deque()
+    try:
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def merge_concurrently(producers: List[Callable[[], Iterable[T]]], max_workers: int, queue_size: int = DEFAULT_QUEUE_SIZE) -> Iterator[T]:
+    """
+    Run every producer in a pool of max_workers threads and yield the items they produce from the calling thread.
+
+    Items of a given producer are yielded in the order that producer generated them; items of different producers are interleaved
+    in the order they were produced. The first exception raised by a producer stops the remaining producers and is re-raised here.
+
+    :param producers: zero-argument callables returning the iterables to consume
+    :param max_workers: maximum number of producers consumed at the same time
+    :param queue_size: maximum number of produced items waiting to be yielded
+    :return: iterator over the items of all producers
+    """
+    output: queue.Queue = queue.Queue(maxsize=queue_size)
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                output.put(item, timeout=_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def work(producer: Callable[[], Iterable[T]]):
+        try:
+            for item in producer():
+                if not put(item):
+                    return
+        except BaseException as e:
+            put(_WorkerFailed(e))
+        else:
+            put(_WorkerFinished())
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="airbyte_merge")
+    try:
+        for producer in producers:
+            executor.submit(work, producer)
+        remaining = len(producers)
+        while remaining:
+            item = output.get()
+            if isinstance(item, _WorkerFinished):
+                remaining -= 1
+            elif isinstance(item, _WorkerFailed):
+                raise item.exception
+            else:
+                yield item
+    finally:
+        stopped.set()
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -2,15 +2,23 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import functools
 import logging
+import numbers
+import threading
 from distutils.util import strtobool
 from enum import Flag, auto
-from typing import Any, Callable, Dict, Mapping, Optional
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
-from jsonschema import Draft7Validator, validators
+from jsonschema import Draft7Validator, RefResolver
 
 logger = logging.getLogger("airbyte")
 
+_DRAFT7_TYPE_CHECKER = Draft7Validator.TYPE_CHECKER
+
+# Maximum number of compiled schemas kept by a TypeTransformer
+MAX_COMPILED_SCHEMAS = 64
+
 
 class TransformConfig(Flag):
     """
@@ -31,9 +39,80 @@ class TransformConfig(Flag):
     CustomSchemaNormalization = auto()
 
 
+class _SchemaNode:
+    """
+    Compiled form of a (sub)schema: the conversion applied to a value described by this schema and the normalization steps applied
+    to its content. Nodes are compiled the first time a value reaches them, so definitions are only resolved when they are used,
+    and nodes referencing a definition share its compiled node so recursive schemas compile to a finite graph.
+    """
+
+    __slots__ = ("schema", "scope", "compiled", "converter", "ref", "steps", "is_leaf")
+
+    def __init__(self, schema: Any, scope: str):
+        self.schema = schema
+        # resolution scope of the schema, used to resolve its relative $refs
+        self.scope = scope
+        self.compiled = False
+        self.converter: Optional[Callable[[Any], Any]] = None
+        self.ref: Optional["_SchemaNode"] = None
+        self.steps: List[Tuple[str, Any]] = []
+        # True if the node only checks the type of the value, so it can be applied without descending into the value
+        self.is_leaf = False
+
+
+# Step kinds of a compiled schema node, mirroring the jsonschema keywords used to traverse the record
+_TYPE = "type"
+_PROPERTIES = "properties"
+_ITEMS = "items"
+_TUPLE_ITEMS = "tuple_items"
+_FALSE_SCHEMA = "false_schema"
+
+
+def _is_integer(instance: Any) -> bool:
+    if isinstance(instance, bool):
+        return False
+    return isinstance(instance, int) or isinstance(instance, float) and instance.is_integer()
+
+
+def _is_number(instance: Any) -> bool:
+    if isinstance(instance, bool):
+        return False
+    return isinstance(instance, numbers.Number)
+
+
+# Types checked with a plain isinstance, the other ones need to exclude booleans which are ints in python
+_PYTHON_TYPES = {"array": list, "boolean": bool, "null": type(None), "object": dict, "string": str}
+_NUMERIC_TYPE_CHECKS = {"integer": _is_integer, "number": _is_number}
+
+
+def _compile_type_check(types: List[str]) -> Callable[[Any], bool]:
+    """
+    :return function checking if an instance is of one of the given jsonschema types, same as the Draft7 jsonschema type checker.
+    """
+    python_types = tuple(_PYTHON_TYPES[t] for t in types if t in _PYTHON_TYPES)
+    other_checks = [
+        _NUMERIC_TYPE_CHECKS.get(t) or functools.partial(_DRAFT7_TYPE_CHECKER.is_type, type=t) for t in types if t not in _PYTHON_TYPES
+    ]
+    if not other_checks:
+        return lambda instance: isinstance(instance, python_types)
+    return lambda instance: isinstance(instance, python_types) or any(check(instance) for check in other_checks)
+
+
+def _to_boolean(original_item: Any) -> bool:
+    if isinstance(original_item, str):
+        return strtobool(original_item) == 1
+    return bool(original_item)
+
+
+_DEFAULT_CASTS: Dict[str, Callable[[Any], Any]] = {"string": str, "number": float, "integer": int, "boolean": _to_boolean}
+
+
 class TypeTransformer:
     """
     Class for transforming object before output.
+
+    The first time a schema is used, it is compiled into a graph of normalization steps which is cached and reused for every
+    following record described by the same schema object, so the schema is only traversed and its $refs resolved once.
     """
 
     _custom_normalizer: Optional[Callable[[Any, Dict[str, Any]], Any]] = None
@@ -46,13 +125,9 @@ class TypeTransformer:
         if TransformConfig.NoTransform in config and config != TransformConfig.NoTransform:
             raise Exception("NoTransform option cannot be combined with other flags.")
         self._config = config
-        all_validators = {
-            key: self.__get_normalizer(key, orig_validator)
-            for key, orig_validator in Draft7Validator.VALIDATORS.items()
-            # Do not validate field we do not transform for maximum performance.
-            if key in ["type", "array", "$ref", "properties", "items"]
-        }
-        self._normalizer = validators.create(meta_schema=Draft7Validator.META_SCHEMA, validators=all_validators)
+        # id of the schema -> (schema, (root node, resolver, nodes of the schema by id)). The schema is kept to make sure its id is not reused.
+        self._compiled_schemas: Dict[int, Tuple[Mapping[str, Any], Tuple[_SchemaNode, RefResolver, Dict[int, _SchemaNode]]]] = {}
+        self._compile_lock = threading.RLock()
 
     def registerCustomTransform(self, normalization_callback: Callable[[Any, Dict[str, Any]], Any]) -> Callable:
         """
@@ -66,22 +141,10 @@ class TypeTransformer:
         if TransformConfig.CustomSchemaNormalization not in self._config:
             raise Exception("Please set TransformConfig.CustomSchemaNormalization config before registering custom normalizer")
         self._custom_normalizer = normalization_callback
+        # compiled schemas hold the previous normalizer
+        self._compiled_schemas = {}
         return normalization_callback
 
-    def __normalize(self, original_item: Any, subschema: Dict[str, Any]) -> Any:
-        """
-        Applies different transform function to object's field according to config.
-        :param original_item original value of field.
-        :param subschema part of the jsonschema containing field type/format data.
-        :return Final field value.
-        """
-        if TransformConfig.DefaultSchemaNormalization in self._config:
-            original_item = self.default_convert(original_item, subschema)
-
-        if self._custom_normalizer:
-            original_item = self._custom_normalizer(original_item, subschema)
-        return original_item
-
     @staticmethod
     def default_convert(original_item: Any, subschema: Dict[str, Any]) -> Any:
         """
@@ -118,47 +181,181 @@ class TypeTransformer:
             return original_item
         return original_item
 
-    def __get_normalizer(self, schema_key: str, original_validator: Callable):
-        """
-        Traverse through object fields using native jsonschema validator and apply normalization function.
-        :param schema_key related json schema key that currently being validated/normalized.
-        :original_validator: native jsonschema validator callback.
-        """
-
-        def normalizator(validator_instance: Callable, property_value: Any, instance: Any, schema: Dict[str, Any]):
-            """
-            Jsonschema validator callable it uses for validating instance. We
-            override default Draft7Validator to perform value transformation
-            before validation take place. We do not take any action except
-            logging warn if object does not conform to json schema, just using
-            jsonschema algorithm to traverse through object fields.
-            Look
-            https://python-jsonschema.readthedocs.io/en/stable/creating/?highlight=validators.create#jsonschema.validators.create
-            validators parameter for detailed description.
-            :
-            """
-
-            def resolve(subschema):
-                if "$ref" in subschema:
-                    _, resolved = validator_instance.resolver.resolve(subschema["$ref"])
-                    return resolved
-                return subschema
-
-            # Transform object and array values before running json schema type checking for each element.
-            if schema_key == "properties":
-                for k, subschema in property_value.items():
-                    if k in (instance or {}):
-                        subschema = resolve(subschema)
-                        instance[k] = self.__normalize(instance[k], subschema)
-            elif schema_key == "items":
-                subschema = resolve(property_value)
-                for index, item in enumerate((instance or [])):
-                    instance[index] = self.__normalize(item, subschema)
-
-            # Running native jsonschema traverse algorithm after field normalization is done.
-            yield from original_validator(validator_instance, property_value, instance, schema)
-
-        return normalizator
+    def _compile_default_converter(self, subschema: Dict[str, Any]) -> Optional[Callable[[Any], Any]]:
+        """
+        Precompute default_convert for a subschema: the target type is resolved once instead of for every value.
+        :return conversion function, or None if values described by this subschema are never converted.
+        """
+        if type(self).default_convert is not TypeTransformer.default_convert:
+            # default_convert is overridden, the result cannot be precomputed
+            return lambda original_item: self.default_convert(original_item, subschema)
+
+        target_type = subschema.get("type", [])
+        nullable = "null" in target_type
+        if isinstance(target_type, list):
+            target_type = [t for t in target_type if t != "null"]
+            if len(target_type) != 1:
+                return None
+            target_type = target_type[0]
+        cast = _DEFAULT_CASTS.get(target_type) if isinstance(target_type, str) else None
+        if not cast:
+            return None
+
+        def convert(original_item: Any) -> Any:
+            if original_item is None and nullable:
+                return None
+            try:
+                return cast(original_item)
+            except (ValueError, TypeError):
+                return original_item
+
+        return convert
+
+    def _compile_converter(self, subschema: Any) -> Optional[Callable[[Any], Any]]:
+        """
+        Build the function applying the configured transforms to a value described by subschema.
+        :return conversion function, or None if no transform applies.
+        """
+        if not isinstance(subschema, dict):
+            return None
+        default_converter = None
+        if TransformConfig.DefaultSchemaNormalization in self._config:
+            default_converter = self._compile_default_converter(subschema)
+        custom_normalizer = self._custom_normalizer
+        if not custom_normalizer:
+            return default_converter
+        if not default_converter:
+            return lambda original_item: custom_normalizer(original_item, subschema)
+        return lambda original_item: custom_normalizer(default_converter(original_item), subschema)
+
+    def _get_node(self, schema: Any, scope: str, nodes: Dict[int, _SchemaNode]) -> _SchemaNode:
+        node = nodes.get(id(schema))
+        if node is None:
+            node = nodes[id(schema)] = _SchemaNode(schema, scope)
+        return node
+
+    def _compile(self, node: _SchemaNode, resolver: RefResolver, nodes: Dict[int, _SchemaNode]):
+        """
+        Compile a schema node following the same traversal as the jsonschema Draft7 validator restricted to the
+        type, $ref, properties and items keywords.
+        """
+        with self._compile_lock:
+            if node.compiled:
+                return
+            schema = node.schema
+            scopes = [node.scope]
+            if isinstance(schema, dict) and schema.get("$id"):
+                scopes.append(schema["$id"])
+            for scope in scopes:
+                resolver.push_scope(scope)
+            try:
+                scope = resolver.resolution_scope
+                converter, ref, steps = None, None, []
+                if isinstance(schema, dict) and "$ref" in schema:
+                    url, resolved = resolver.resolve(schema["$ref"])
+                    converter = self._compile_converter(resolved)
+                    ref = self._get_node(resolved, url, nodes)
+                elif isinstance(schema, dict):
+                    converter = self._compile_converter(schema)
+                    for keyword, value in schema.items():
+                        if keyword == "type":
+                            types = [value] if isinstance(value, str) else value
+                            steps.append((_TYPE, (_compile_type_check(types), ", ".join(repr(t) for t in types))))
+                        elif keyword == "properties" and isinstance(value, dict):
+                            steps.append(
+                                (_PROPERTIES, [(name, self._get_node(subschema, scope, nodes)) for name, subschema in value.items()])
+                            )
+                        elif keyword == "items" and isinstance(value, list):
+                            steps.append((_TUPLE_ITEMS, [self._get_node(subschema, scope, nodes) for subschema in value]))
+                        elif keyword == "items":
+                            steps.append((_ITEMS, self._get_node(value, scope, nodes)))
+                elif schema is False:
+                    steps.append((_FALSE_SCHEMA, None))
+            finally:
+                for _ in scopes:
+                    resolver.pop_scope()
+            node.converter, node.ref, node.steps = converter, ref, steps
+            node.is_leaf = ref is None and all(kind == _TYPE for kind, _ in steps)
+            node.compiled = True
+
+    def _get_compiled_schema(self, schema: Mapping[str, Any]) -> Tuple[_SchemaNode, RefResolver, Dict[int, _SchemaNode]]:
+        compiled = self._compiled_schemas.get(id(schema))
+        if compiled is None or compiled[0] is not schema:
+            resolver = RefResolver.from_schema(schema)
+            nodes: Dict[int, _SchemaNode] = {}
+            compiled = (schema, (self._get_node(schema, resolver.resolution_scope, nodes), resolver, nodes))
+            if len(self._compiled_schemas) >= MAX_COMPILED_SCHEMAS:
+                # schemas are usually loaded once per stream, evict the oldest one if a caller builds a new schema for every record
+                self._compiled_schemas.pop(next(iter(self._compiled_schemas)), None)
+            self._compiled_schemas[id(schema)] = compiled
+        return compiled[1]
+
+    def _normalize(self, node: _SchemaNode, instance: Any, errors: List[str], resolver: RefResolver, nodes: Dict[int, _SchemaNode]):
+        """
+        Apply the compiled normalization steps to instance, modifying it in place.
+        Values that still do not conform to the schema after normalization are reported in errors.
+        """
+        if not node.compiled:
+            self._compile(node, resolver, nodes)
+        while node.ref is not None:
+            node = node.ref
+            if not node.compiled:
+                self._compile(node, resolver, nodes)
+        for kind, step in node.steps:
+            if kind == _PROPERTIES:
+                if isinstance(instance, dict):
+                    self._normalize_properties(step, instance, errors, resolver, nodes)
+            elif kind == _ITEMS:
+                if isinstance(instance, list):
+                    self._normalize_items(step, instance, errors, resolver, nodes)
+            elif kind == _TYPE:
+                self._check_type(step, instance, errors)
+            elif kind == _TUPLE_ITEMS:
+                if isinstance(instance, list):
+                    for item, child in zip(instance, step):
+                        self._normalize(child, item, errors, resolver, nodes)
+            elif kind == _FALSE_SCHEMA:
+                errors.append(f"False schema does not allow {instance!r}")
+
+    @staticmethod
+    def _check_type(step: Tuple[Callable[[Any], bool], str], instance: Any, errors: List[str]):
+        check, message = step
+        if not check(instance):
+            errors.append(f"{instance!r} is not of type {message}")
+
+    def _normalize_properties(
+        self,
+        properties: List[Tuple[str, _SchemaNode]],
+        instance: Dict[str, Any],
+        errors: List[str],
+        resolver: RefResolver,
+        nodes: Dict[int, _SchemaNode],
+    ):
+        # Transform object values before running json schema type checking for each element.
+        for name, child in properties:
+            if name in instance:
+                if not child.compiled:
+                    self._compile(child, resolver, nodes)
+                if child.converter:
+                    instance[name] = child.converter(instance[name])
+        for name, child in properties:
+            if name in instance:
+                if child.is_leaf:
+                    for _, step in child.steps:
+                        self._check_type(step, instance[name], errors)
+                else:
+                    self._normalize(child, instance[name], errors, resolver, nodes)
+
+    def _normalize_items(
+        self, items: _SchemaNode, instance: List[Any], errors: List[str], resolver: RefResolver, nodes: Dict[int, _SchemaNode]
+    ):
+        if not items.compiled:
+            self._compile(items, resolver, nodes)
+        if items.converter:
+            for index, item in enumerate(instance):
+                instance[index] = items.converter(item)
+        for item in instance:
+            self._normalize(items, item, errors, resolver, nodes)
 
     def transform(self, record: Dict[str, Any], schema: Mapping[str, Any]):
         """
@@ -168,10 +365,9 @@ class TypeTransformer:
         """
         if TransformConfig.NoTransform in self._config:
             return
-        normalizer = self._normalizer(schema)
-        for e in normalizer.iter_errors(record):
-            """
-            just calling normalizer.validate() would throw an exception on
-            first validation occurences and stop processing rest of schema.
-            """
-            logger.warning(e.message)
+        errors: List[str] = []
+        root, resolver, nodes = self._get_compiled_schema(schema)
+        self._normalize(root, record, errors, resolver, nodes)
+        for error in errors:
+            # values not conforming to the schema are not an error, they are just left as is
+            logger.warning(error)
@@ -32,12 +32,17 @@ class EventTimer:
         self.count += 1
         self.stack.insert(0, self.events[name])
 
-    def finish_event(self):
+    def finish_event(self, name: Optional[str] = None):
         """
         Finish the current event and pop it from the stack.
+        If a name is given, finish that event instead of the current one, which is needed when events are timed from several threads.
         """
 
-        if self.stack:
+        if name is not None and name in self.events and self.events[name] in self.stack:
+            event = self.events[name]
+            self.stack.remove(event)
+            event.finish()
+        elif self.stack:
             event = self.stack.pop(0)
             event.finish()
         else:
@@ -70,6 +75,8 @@ class Event:
         return float("+inf")
 
     def __str__(self):
+        if not self.end:
+            return f"{self.name} in progress"
         return f"{self.name} {datetime.timedelta(seconds=self.duration)}"
 
     def finish(self):
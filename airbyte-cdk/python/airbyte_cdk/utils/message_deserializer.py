@@ -0,0 +1,74 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import json
+from typing import Any, Callable
+
+from airbyte_cdk.models import AirbyteMessage, AirbyteRecordMessage, AirbyteStateMessage
+from airbyte_cdk.models import Type as MessageType
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_RECORD_FIELDS = frozenset(("namespace", "stream", "data", "emitted_at"))
+_RECORD_MESSAGE_FIELDS = frozenset(("type", "record"))
+_STATE_MESSAGE_FIELDS = frozenset(("type", "state"))
+
+
+class AirbyteMessageDeserializer:
+    """
+    Deserializes JSON lines to AirbyteMessages.
+
+    RECORD and legacy STATE messages are the bulk of a destination's input, so when their envelope has the expected shape they are built
+    with the pydantic construct method, which skips the model validation. The envelope is checked field by field beforehand so the
+    resulting messages are equal to the ones returned by AirbyteMessage.parse_raw. Every other message goes through the pydantic
+    validation. The orjson backend is faster, it falls back to the json module for the inputs orjson rejects (e.g. NaN) but decodes
+    integers larger than 64 bits to floats.
+    """
+
+    def __init__(self, use_orjson: bool = False):
+        """
+        :param use_orjson: decode lines with orjson, which must be installed
+        """
+        if use_orjson and orjson is None:
+            raise ImportError("orjson must be installed to use the orjson deserializer backend")
+        self._loads: Callable[[str], Any] = self._orjson_loads if use_orjson else json.loads
+
+    @staticmethod
+    def _orjson_loads(line: str) -> Any:
+        try:
+            return orjson.loads(line)
+        except orjson.JSONDecodeError:
+            return json.loads(line)
+
+    def deserialize(self, line: str) -> AirbyteMessage:
+        """
+        :raises ValueError: if the line is not a valid AirbyteMessage (pydantic's ValidationError is a ValueError)
+        """
+        obj = self._loads(line)
+        if isinstance(obj, dict):
+            message_fields = obj.keys()
+            if message_fields == _RECORD_MESSAGE_FIELDS and obj["type"] == MessageType.RECORD.value:
+                record = obj["record"]
+                if isinstance(record, dict) and self._is_valid_record(record):
+                    return AirbyteMessage.construct(type=MessageType.RECORD, record=AirbyteRecordMessage.construct(**record))
+            elif message_fields == _STATE_MESSAGE_FIELDS and obj["type"] == MessageType.STATE.value:
+                state = obj["state"]
+                if isinstance(state, dict) and state.keys() == {"data"} and isinstance(state["data"], dict):
+                    return AirbyteMessage.construct(type=MessageType.STATE, state=AirbyteStateMessage.construct(data=state["data"]))
+        return AirbyteMessage.parse_obj(obj)
+
+    @staticmethod
+    def _is_valid_record(record: dict) -> bool:
+        emitted_at = record.get("emitted_at")
+        namespace = record.get("namespace")
+        return (
+            record.keys() <= _RECORD_FIELDS
+            and isinstance(record.get("stream"), str)
+            and isinstance(record.get("data"), dict)
+            and type(emitted_at) is int
+            and (namespace is None or isinstance(namespace, str))
+        )
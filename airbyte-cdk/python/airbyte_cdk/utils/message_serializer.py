@@ -0,0 +1,56 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import json
+from typing import Any, Callable, Dict
+
+from airbyte_cdk.models import AirbyteMessage
+from airbyte_cdk.models import Type as MessageType
+from pydantic.json import pydantic_encoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_RECORD_FIELDS = ("namespace", "stream", "data", "emitted_at")
+
+
+class AirbyteMessageSerializer:
+    """
+    Serializes AirbyteMessages to JSON strings.
+
+    RECORD and legacy STATE messages are the bulk of a sync's output, so they are serialized by building the protocol envelope directly
+    instead of going through the pydantic model export. With the default json backend the output is byte-for-byte identical to
+    AirbyteMessage.json(exclude_unset=True). The orjson backend is faster and produces equivalent compact JSON (no whitespace and
+    non-ASCII characters are not escaped). Every other message type falls back to the pydantic export.
+    """
+
+    def __init__(self, use_orjson: bool = False):
+        """
+        :param use_orjson: serialize RECORD and STATE messages with orjson, which must be installed
+        """
+        if use_orjson and orjson is None:
+            raise ImportError("orjson must be installed to use the orjson serializer backend")
+        self._dumps: Callable[[Any], str] = self._orjson_dumps if use_orjson else self._json_dumps
+
+    @staticmethod
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, default=pydantic_encoder)
+
+    @staticmethod
+    def _orjson_dumps(obj: Any) -> str:
+        return orjson.dumps(obj, default=pydantic_encoder, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def serialize(self, message: AirbyteMessage) -> str:
+        if message.__fields_set__ == {"type", "record"} and message.type == MessageType.RECORD:
+            record = message.record
+            fields_set = record.__fields_set__
+            if fields_set.issubset(_RECORD_FIELDS):
+                record_envelope: Dict[str, Any] = {field: getattr(record, field) for field in _RECORD_FIELDS if field in fields_set}
+                return self._dumps({"type": MessageType.RECORD.value, "record": record_envelope})
+        elif message.__fields_set__ == {"type", "state"} and message.type == MessageType.STATE:
+            if message.state.__fields_set__ == {"data"}:
+                return self._dumps({"type": MessageType.STATE.value, "state": {"data": message.state.data}})
+        return message.json(exclude_unset=True)
@@ -0,0 +1,62 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import sys
+import time
+from typing import List, TextIO
+
+# Flush once this many characters are buffered
+DEFAULT_MAX_BUFFER_SIZE = 64 * 1024
+# Flush buffered messages older than this many seconds when the next message is written
+DEFAULT_MAX_BUFFER_AGE = 1.0
+
+
+class BufferedMessageWriter:
+    """
+    Writes serialized messages to an output stream (stdout by default), one per line.
+
+    Messages are buffered and written with a single write call once the buffer reaches max_buffer_size characters or when the oldest
+    buffered message is older than max_buffer_age seconds, which saves the overhead of writing every message separately.
+    The age is only checked when a message is written, so flush() must be called once the last message was written, and after the
+    messages which must not wait for the next one (e.g. STATE messages).
+
+    Use max_buffer_size=0 to write and flush every message as soon as it is received.
+    """
+
+    def __init__(
+        self, output: TextIO = None, max_buffer_size: int = DEFAULT_MAX_BUFFER_SIZE, max_buffer_age: float = DEFAULT_MAX_BUFFER_AGE
+    ):
+        self._output = output
+        self._max_buffer_size = max_buffer_size
+        self._max_buffer_age = max_buffer_age
+        self._buffer: List[str] = []
+        self._buffer_size = 0
+        self._buffer_started_at = 0.0
+
+    @property
+    def output(self) -> TextIO:
+        # resolved lazily so that stdout can be replaced (e.g. captured in tests) after the writer is created
+        return self._output or sys.stdout
+
+    def write(self, message: str):
+        if not self._buffer:
+            self._buffer_started_at = time.monotonic()
+        self._buffer.append(message)
+        self._buffer_size += len(message) + 1
+        if self._buffer_size >= self._max_buffer_size or time.monotonic() - self._buffer_started_at >= self._max_buffer_age:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._buffer.append("")
+            self.output.write("\n".join(self._buffer))
+            self._buffer = []
+            self._buffer_size = 0
+        self.output.flush()
+
+    def __enter__(self) -> "BufferedMessageWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.flush()
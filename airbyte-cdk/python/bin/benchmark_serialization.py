@@ -0,0 +1,72 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+"""
+Compares the time spent building and serializing RECORD messages with the pydantic models and with AirbyteMessageSerializer.
+
+Usage: python bin/benchmark_serialization.py [--records 100000] [--fields 20]
+"""
+
+import argparse
+import io
+import time
+from datetime import datetime
+
+from airbyte_cdk.models import AirbyteMessage, AirbyteRecordMessage, Type
+from airbyte_cdk.utils import message_serializer
+from airbyte_cdk.utils.message_serializer import AirbyteMessageSerializer
+from airbyte_cdk.utils.message_writer import BufferedMessageWriter
+
+
+def make_record(i: int, fields: int) -> dict:
+    record = {"id": i, "name": f"name {i}", "updated_at": "2022-01-01T00:00:00Z", "active": i % 2 == 0, "amount": i * 1.5}
+    record.update({f"field_{n}": f"value {n}" for n in range(fields - len(record))})
+    return record
+
+
+def current_path(records, output):
+    for record in records:
+        message = AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream="stream", data=record, emitted_at=1))
+        print(message.json(exclude_unset=True), file=output)
+
+
+def fast_path(records, output, serializer):
+    with BufferedMessageWriter(output) as writer:
+        for record in records:
+            message = AirbyteMessage.construct(
+                type=Type.RECORD, record=AirbyteRecordMessage.construct(stream="stream", data=dict(record), emitted_at=1)
+            )
+            writer.write(serializer.serialize(message))
+
+
+def timed(name, func, *args):
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<30} {elapsed:8.3f}s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--fields", type=int, default=20)
+    args = parser.parse_args()
+
+    records = [make_record(i, args.fields) for i in range(args.records)]
+    print(f"{datetime.now().isoformat()} serializing {args.records} records with {args.fields} fields")
+
+    outputs = {}
+    baseline = timed("pydantic + print", current_path, records, outputs.setdefault("current", io.StringIO()))
+    elapsed = timed("serializer (json)", fast_path, records, outputs.setdefault("json", io.StringIO()), AirbyteMessageSerializer())
+    print(f"{'speedup':<30} {baseline / elapsed:8.2f}x")
+    assert outputs["current"].getvalue() == outputs["json"].getvalue(), "json serializer output differs from the pydantic output"
+
+    if message_serializer.orjson is not None:
+        elapsed = timed("serializer (orjson)", fast_path, records, io.StringIO(), AirbyteMessageSerializer(use_orjson=True))
+        print(f"{'speedup':<30} {baseline / elapsed:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+"""
+Compares TypeTransformer, which compiles each schema once, with the previous implementation which traversed the schema with
+jsonschema validator callbacks for every record, on a wide flat schema and on a nested schema using $refs.
+
+Usage: python bin/benchmark_transform.py [--records 10000] [--fields 500]
+"""
+
+import argparse
+import copy
+import logging
+import time
+
+from airbyte_cdk.sources.utils.transform import TransformConfig, TypeTransformer
+from jsonschema import Draft7Validator, validators
+
+logging.getLogger("airbyte").setLevel(logging.ERROR)
+
+
+class LegacyTypeTransformer(TypeTransformer):
+    """TypeTransformer.transform as implemented before schemas were compiled"""
+
+    def __init__(self, config: TransformConfig):
+        super().__init__(config)
+
+        def get_normalizer(schema_key, original_validator):
+            def normalizator(validator_instance, property_value, instance, schema):
+                def resolve(subschema):
+                    if "$ref" in subschema:
+                        _, resolved = validator_instance.resolver.resolve(subschema["$ref"])
+                        return resolved
+                    return subschema
+
+                if schema_key == "properties":
+                    for k, subschema in property_value.items():
+                        if k in (instance or {}):
+                            instance[k] = self.default_convert(instance[k], resolve(subschema))
+                elif schema_key == "items":
+                    subschema = resolve(property_value)
+                    for index, item in enumerate((instance or [])):
+                        instance[index] = self.default_convert(item, subschema)
+                yield from original_validator(validator_instance, property_value, instance, schema)
+
+            return normalizator
+
+        all_validators = {
+            key: get_normalizer(key, orig_validator)
+            for key, orig_validator in Draft7Validator.VALIDATORS.items()
+            if key in ["type", "array", "$ref", "properties", "items"]
+        }
+        self._legacy_normalizer = validators.create(meta_schema=Draft7Validator.META_SCHEMA, validators=all_validators)
+
+    def transform(self, record, schema):
+        for e in self._legacy_normalizer(schema).iter_errors(record):
+            logging.getLogger("airbyte").warning(e.message)
+
+
+TYPES = [["null", "string"], ["null", "integer"], ["null", "number"], ["null", "boolean"], "string"]
+VALUES = ["12", 7, "3.5", "true", None]
+
+
+def wide_schema_and_record(fields: int):
+    schema = {"type": "object", "properties": {f"field_{i}": {"type": TYPES[i % len(TYPES)]} for i in range(fields)}}
+    record = {f"field_{i}": VALUES[(i * 3) % len(VALUES)] for i in range(fields)}
+    return schema, record
+
+
+def nested_schema_and_record(fields: int):
+    item = {"type": "object", "properties": {f"field_{i}": {"type": TYPES[i % len(TYPES)]} for i in range(fields // 10)}}
+    schema = {
+        "type": "object",
+        "definitions": {"item": item},
+        "properties": {
+            "id": {"type": "integer"},
+            "items": {"type": "array", "items": {"$ref": "#/definitions/item"}},
+            "parent": {"type": ["null", "object"], "properties": {"child": {"$ref": "#/definitions/item"}}},
+        },
+    }
+    item_record = {f"field_{i}": VALUES[(i * 3) % len(VALUES)] for i in range(fields // 10)}
+    record = {"id": "1", "items": [dict(item_record) for _ in range(10)], "parent": {"child": dict(item_record)}}
+    return schema, record
+
+
+def timed(name, transformer, schema, records):
+    start = time.perf_counter()
+    for record in records:
+        transformer.transform(record, schema)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<20} {elapsed:8.3f}s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=10_000)
+    parser.add_argument("--fields", type=int, default=500)
+    args = parser.parse_args()
+
+    for name, make_schema_and_record in (("wide", wide_schema_and_record), ("nested", nested_schema_and_record)):
+        schema, record = make_schema_and_record(args.fields)
+        print(f"{name} schema, {args.records} records")
+        legacy_records = [copy.deepcopy(record) for _ in range(args.records)]
+        compiled_records = [copy.deepcopy(record) for _ in range(args.records)]
+        baseline = timed("legacy", LegacyTypeTransformer(TransformConfig.DefaultSchemaNormalization), schema, legacy_records)
+        elapsed = timed("compiled", TypeTransformer(TransformConfig.DefaultSchemaNormalization), schema, compiled_records)
+        print(f"{'speedup':<20} {baseline / elapsed:8.2f}x")
+        assert legacy_records == compiled_records, "compiled transform output differs from the legacy output"
+
+
+if __name__ == "__main__":
+    main()
@@ -15,7 +15,7 @@ README = (HERE / "README.md").read_text()
 
 setup(
     name="airbyte-cdk",
-    version="0.1.62",
+    version="0.1.71",
     description="A framework for writing Airbyte Connectors.",
     long_description=README,
     long_description_content_type="text/markdown",
@@ -66,6 +66,12 @@ setup(
             "requests-mock",
             "pytest-httpserver",
         ],
+        "orjson": [
+            "orjson~=3.7",
+        ],
+        "http2": [
+            "httpx[http2]>=0.25",
+        ],
         "sphinx-docs": [
             "Sphinx~=4.2",
             "sphinx-rtd-theme~=1.0",
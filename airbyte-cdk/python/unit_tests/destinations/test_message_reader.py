@@ -0,0 +1,76 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import io
+
+import pytest
+from airbyte_cdk.destinations import AirbyteMessageReader, RecordBatch, batch_messages
+from airbyte_cdk.models import AirbyteMessage, AirbyteRecordMessage, AirbyteStateMessage, Type
+
+
+def _record(stream: str, i: int, namespace: str = None) -> AirbyteMessage:
+    return AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream=stream, namespace=namespace, data={"id": i}, emitted_at=0))
+
+
+def _state(i: int) -> AirbyteMessage:
+    return AirbyteMessage(type=Type.STATE, state=AirbyteStateMessage(data={"id": i}))
+
+
+def _input_stream(lines):
+    return io.TextIOWrapper(io.BytesIO("\n".join(lines).encode("utf-8")), encoding="utf-8")
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+@pytest.mark.parametrize("chunk_size", [1, 100, 1024 * 1024])
+def test_read_messages(chunk_size, max_workers):
+    messages = [_record("users", i) if i % 10 else _state(i) for i in range(1000)]
+    lines = [message.json(exclude_unset=True) for message in messages]
+    lines.insert(500, "ignore this line which is not an airbyte message")
+
+    reader = AirbyteMessageReader(chunk_size=chunk_size, max_workers=max_workers)
+
+    assert list(reader.read_messages(_input_stream(lines))) == messages
+
+
+def test_read_batches():
+    messages = [_record("users", 1), _record("orders", 1), _state(1)]
+    reader = AirbyteMessageReader()
+
+    batches = list(reader.read_batches(_input_stream([message.json(exclude_unset=True) for message in messages])))
+
+    assert batches == [
+        RecordBatch(stream="users", namespace=None, records=[messages[0].record]),
+        RecordBatch(stream="orders", namespace=None, records=[messages[1].record]),
+        messages[2],
+    ]
+
+
+def test_batch_messages():
+    messages = [
+        _record("users", 1),
+        _record("orders", 1),
+        _record("users", 2),
+        _record("users", 2, namespace="other"),
+        _record("users", 3),
+        _state(1),
+        _record("orders", 2),
+        _state(2),
+        _state(3),
+        _record("users", 4),
+    ]
+
+    batches = list(batch_messages(messages, max_batch_size=2))
+
+    assert batches == [
+        RecordBatch(stream="users", namespace=None, records=[messages[0].record, messages[2].record]),
+        # the pending batches are yielded before the state message
+        RecordBatch(stream="orders", namespace=None, records=[messages[1].record]),
+        RecordBatch(stream="users", namespace="other", records=[messages[3].record]),
+        RecordBatch(stream="users", namespace=None, records=[messages[4].record]),
+        messages[5],
+        RecordBatch(stream="orders", namespace=None, records=[messages[6].record]),
+        messages[7],
+        messages[8],
+        RecordBatch(stream="users", namespace=None, records=[messages[9].record]),
+    ]
@@ -0,0 +1,151 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import threading
+import time
+
+import pytest
+from airbyte_cdk.destinations import BufferedRecordWriter, RecordBatch, RecordSink
+from airbyte_cdk.models import AirbyteMessage, AirbyteRecordMessage, AirbyteStateMessage, Type
+
+
+def _record(stream: str, i: int, namespace: str = None) -> AirbyteMessage:
+    return AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream=stream, namespace=namespace, data={"id": i}, emitted_at=0))
+
+
+def _state(i: int) -> AirbyteMessage:
+    return AirbyteMessage(type=Type.STATE, state=AirbyteStateMessage(data={"id": i}))
+
+
+class ListSink(RecordSink):
+    def __init__(self, delay: float = 0.0):
+        self.batches = []
+        self.closed = False
+        self._delay = delay
+        self._lock = threading.Lock()
+
+    def flush(self, batch: RecordBatch):
+        time.sleep(self._delay)
+        with self._lock:
+            self.batches.append(batch)
+
+    def close(self):
+        self.closed = True
+
+    def records(self, stream: str):
+        return sorted(record.data["id"] for batch in self.batches if batch.stream == stream for record in batch.records)
+
+
+def test_flush_on_record_count():
+    sink = ListSink()
+    writer = BufferedRecordWriter(sink, max_buffer_records=3)
+
+    assert list(writer.write([_record("users", i) for i in range(7)])) == []
+
+    assert [len(batch.records) for batch in sink.batches] == [3, 3, 1]
+    assert sink.records("users") == list(range(7))
+    assert sink.closed
+    assert writer.stats[(None, "users")].records == 7
+    assert writer.stats[(None, "users")].flushes == 3
+
+
+def test_flush_on_size():
+    sink = ListSink()
+    writer = BufferedRecordWriter(sink, max_buffer_bytes=25, record_size=lambda record: 10)
+
+    list(writer.write([_record("users", i) for i in range(6)]))
+
+    assert [len(batch.records) for batch in sink.batches] == [3, 3]
+
+
+def test_flush_on_age(mocker):
+    now = mocker.patch("airbyte_cdk.destinations.record_buffer.time.monotonic", return_value=0.0)
+    sink = ListSink()
+    writer = BufferedRecordWriter(sink, max_buffer_age_seconds=10)
+
+    def messages():
+        yield _record("users", 1)
+        now.return_value = 10.0
+        yield _record("orders", 1)
+        yield _record("users", 2)
+
+    list(writer.write(messages()))
+
+    assert [(batch.stream, len(batch.records)) for batch in sink.batches] == [("users", 1), ("orders", 1), ("users", 1)]
+
+
+def test_memory_cap_flushes_largest_buffer():
+    sink = ListSink()
+    writer = BufferedRecordWriter(sink, max_memory_bytes=5, record_size=lambda record: 1)
+    messages = [_record("users", 1), _record("orders", 1), _record("users", 2), _record("users", 3), _record("orders", 2)]
+
+    list(writer.write(messages))
+
+    assert [(batch.stream, len(batch.records)) for batch in sink.batches] == [("users", 3), ("orders", 2)]
+
+
+@pytest.mark.parametrize("flush_workers", [1, 4])
+def test_states_are_emitted_after_previous_records_are_flushed(flush_workers):
+    emitted = []
+
+    class CheckingSink(ListSink):
+        def flush(self, batch: RecordBatch):
+            super().flush(batch)
+            # no state covering the records of the batch was emitted before they were flushed
+            assert all(state.state.data["id"] < min(record.data["id"] for record in batch.records) for state in emitted)
+
+    sink = CheckingSink(delay=0.001)
+    writer = BufferedRecordWriter(sink, max_buffer_records=7, flush_workers=flush_workers)
+    messages = [_record(f"stream_{i % 3}", i) if i % 10 else _state(i) for i in range(1, 300)]
+
+    for message in writer.write(messages):
+        emitted.append(message)
+
+    assert emitted == [message for message in messages if message.type == Type.STATE]
+    assert sorted(record for stream in ("stream_0", "stream_1", "stream_2") for record in sink.records(stream)) == [
+        i for i in range(1, 300) if i % 10
+    ]
+
+
+def test_state_waits_for_buffered_records():
+    sink = ListSink()
+    writer = BufferedRecordWriter(sink, max_buffer_records=2)
+    output = writer.write([_record("users", 1), _state(1), _record("orders", 1), _record("users", 2), _state(2), _record("orders", 2)])
+
+    # the first state is emitted when the users buffer is full, the second one when the orders buffer is full
+    assert next(output) == _state(1)
+    assert sink.batches[0].stream == "users"
+    assert next(output) == _state(2)
+    assert [batch.stream for batch in sink.batches] == ["users", "orders"]
+    assert list(output) == []
+
+
+def test_flush_error_is_raised():
+    class FailingSink(ListSink):
+        def flush(self, batch: RecordBatch):
+            raise RuntimeError("write failed")
+
+    sink = FailingSink()
+    writer = BufferedRecordWriter(sink, max_buffer_records=1)
+
+    with pytest.raises(RuntimeError, match="write failed"):
+        list(writer.write([_record("users", 1), _state(1), _record("users", 2)]))
+    assert not sink.closed
+
+
+def test_trailing_states_are_emitted_after_close():
+    class FailingCloseSink(ListSink):
+        def close(self):
+            raise RuntimeError("close failed")
+
+    sink = FailingCloseSink()
+    writer = BufferedRecordWriter(sink, max_buffer_records=10)
+    emitted = []
+
+    with pytest.raises(RuntimeError, match="close failed"):
+        for message in writer.write([_record("users", 1), _state(1), _record("users", 2), _state(2)]):
+            emitted.append(message)
+    # the records were flushed, but the states waiting for the end of the input are not emitted without a closed sink
+    assert sink.records("users") == [1, 2]
+    assert emitted == []
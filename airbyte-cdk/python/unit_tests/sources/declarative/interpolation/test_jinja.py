@@ -2,8 +2,10 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import copy
+
 import pytest
-from airbyte_cdk.sources.declarative.interpolation.jinja import JinjaInterpolation
+from airbyte_cdk.sources.declarative.interpolation.jinja import JinjaInterpolation, get_interpolation_stats
 
 interpolation = JinjaInterpolation()
 
@@ -43,3 +45,41 @@ def test_get_value_from_a_list_of_mappings():
 def test_literals(test_name, s, value):
     val = interpolation.eval(s, None)
     assert val == value
+
+
+def test_templates_are_compiled_once():
+    s = "{{ config['cached_template_key'] }}"
+    before = copy.copy(get_interpolation_stats())
+    assert interpolation.eval(s, {"cached_template_key": "a"}) == "a"
+    assert JinjaInterpolation().eval(s, {"cached_template_key": "b"}) == "b"
+    stats = get_interpolation_stats() - before
+    assert stats.evaluations == 2
+    assert stats.renders == 2
+    assert stats.compilations == 1
+
+
+@pytest.mark.parametrize(
+    "test_name, s, expected_value",
+    [
+        ("test_string", "a static string", "a static string"),
+        ("test_number", "4", 4),
+        ("test_list", "[1, 2]", [1, 2]),
+        ("test_dict", "{'a': 1}", {"a": 1}),
+    ],
+)
+def test_static_strings_are_not_rendered(test_name, s, expected_value):
+    before = copy.copy(get_interpolation_stats())
+    assert interpolation.eval(s, {}) == expected_value
+    stats = get_interpolation_stats() - before
+    assert stats.renders == 0
+    assert stats.static_values == 1
+
+
+def test_static_values_are_not_shared():
+    value = interpolation.eval("[1, 2]", {})
+    value.append(3)
+    assert interpolation.eval("[1, 2]", {}) == [1, 2]
+
+
+def test_strings_with_line_breaks_are_rendered():
+    assert interpolation.eval("first line\n", {}) == "first line"
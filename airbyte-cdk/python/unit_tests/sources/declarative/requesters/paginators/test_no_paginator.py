@@ -10,3 +10,9 @@ def test():
     paginator = NoPagination()
     next_page_token = paginator.next_page_token(requests.Response(), [])
     assert next_page_token is None
+
+
+def test_pages_are_not_requested_concurrently():
+    paginator = NoPagination()
+    assert paginator.page_size is None
+    assert paginator.page_token(1) is None
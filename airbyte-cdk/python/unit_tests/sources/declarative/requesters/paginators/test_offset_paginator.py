@@ -45,3 +45,10 @@ def test_return_next_offset_limit_2():
 
     next_page_token = paginator.next_page_token(response, [{"id": 2}])
     assert next_page_token is None
+
+
+def test_page_tokens():
+    paginator = OffsetPaginator(2, DictState(), tag)
+
+    assert paginator.page_size == 2
+    assert [paginator.page_token(i) for i in range(3)] == [None, {tag: 2}, {tag: 4}]
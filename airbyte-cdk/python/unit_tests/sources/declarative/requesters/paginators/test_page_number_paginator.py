@@ -0,0 +1,32 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import requests
+from airbyte_cdk.sources.declarative.requesters.paginators.page_number_paginator import PageNumberPaginator
+from airbyte_cdk.sources.declarative.states.dict_state import DictState
+
+response = requests.Response()
+
+last_responses = [{"id": 0}, {"id": 1}]
+
+
+def test_return_none_if_fewer_records_than_page_size():
+    paginator = PageNumberPaginator(5, DictState())
+
+    assert paginator.next_page_token(response, last_responses) is None
+
+
+def test_return_next_page():
+    paginator = PageNumberPaginator(2, DictState(), "page_number")
+
+    assert paginator.next_page_token(response, last_responses) == {"page_number": 2}
+    assert paginator.next_page_token(response, last_responses) == {"page_number": 3}
+    assert paginator.next_page_token(response, [{"id": 2}]) is None
+
+
+def test_page_tokens():
+    paginator = PageNumberPaginator(2, DictState(), start_from_page=0)
+
+    assert paginator.page_size == 2
+    assert [paginator.page_token(i) for i in range(3)] == [None, {"page": 1}, {"page": 2}]
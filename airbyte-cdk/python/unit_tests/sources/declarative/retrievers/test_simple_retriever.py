@@ -4,8 +4,10 @@
 
 from unittest.mock import MagicMock
 
+import pytest
 import requests
 from airbyte_cdk.models import SyncMode
+from airbyte_cdk.sources.declarative.requesters.paginators.offset_paginator import OffsetPaginator
 from airbyte_cdk.sources.declarative.requesters.requester import HttpMethod
 from airbyte_cdk.sources.declarative.retrievers.simple_retriever import SimpleRetriever
 
@@ -100,3 +102,43 @@ def test_simple_retriever():
     assert retriever.request_kwargs(None, None, None) == request_kwargs
     assert retriever.cache_filename == cache_filename
     assert retriever.use_cache == use_cache
+
+
+@pytest.mark.parametrize(
+    "test_name, max_concurrent_pages, number_of_records",
+    [
+        ("test_sequential", 1, 5),
+        ("test_concurrent", 3, 5),
+        ("test_concurrent_last_page_is_empty", 3, 6),
+        ("test_concurrent_more_pages_than_workers", 2, 11),
+    ],
+)
+def test_read_pages_concurrently(test_name, max_concurrent_pages, number_of_records):
+    page_size = 2
+    all_records = [{"id": i} for i in range(number_of_records)]
+
+    requester = MagicMock()
+    requester.use_cache = False
+    record_selector = MagicMock()
+    record_selector.select_records.side_effect = lambda response, **kwargs: all_records[response.offset : response.offset + page_size]
+
+    retriever = SimpleRetriever(
+        "stream_name",
+        primary_key,
+        requester=requester,
+        paginator=OffsetPaginator(page_size),
+        record_selector=record_selector,
+        max_concurrent_pages=max_concurrent_pages,
+    )
+    requested_offsets = []
+
+    def fetch_page(stream_state, stream_slice, next_page_token):
+        offset = (next_page_token or {}).get("offset", 0)
+        requested_offsets.append(offset)
+        return MagicMock(offset=offset)
+
+    retriever._fetch_page = MagicMock(side_effect=fetch_page)
+
+    assert list(retriever.read_records(SyncMode.full_refresh)) == all_records
+    assert set(range(0, number_of_records + 1, page_size)).issubset(requested_offsets)
+    assert len(requested_offsets) < number_of_records // page_size + 1 + max_concurrent_pages
@@ -0,0 +1,227 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import json
+import socket
+import ssl
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterable, Mapping, Optional
+
+import pytest
+import requests
+from airbyte_cdk.sources.streams.http import HttpStream, HttpTransport, HttpTransportConfig
+from airbyte_cdk.sources.streams.http import transport as transport_module
+from airbyte_cdk.sources.streams.http.transport import Http2Adapter, PooledHTTPAdapter
+
+requires_httpx = pytest.mark.skipif(transport_module.httpx is None, reason="httpx is not installed")
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    # answers with HTTP/1.1 and keeps the connections alive unless the /close path is requested
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length)) if length else None
+        content = json.dumps({"method": self.command, "path": self.path, "body": body}).encode()
+        self.send_response(HTTPStatus.CREATED if body else HTTPStatus.OK)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header("X-Test", "value")
+        if self.path == "/close":
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_GET = do_POST = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(name="server_url")
+def server_url_fixture():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+class StubStream(HttpStream):
+    url_base = "https://test_base_url.com"
+    primary_key = ""
+
+    def path(self, **kwargs) -> str:
+        return ""
+
+    def next_page_token(self, response: requests.Response) -> Optional[Mapping[str, Any]]:
+        return None
+
+    def parse_response(self, response: requests.Response, **kwargs) -> Iterable[Mapping]:
+        yield from []
+
+
+def test_streams_share_the_default_transport():
+    first_stream, second_stream = StubStream(), StubStream()
+
+    assert first_stream.transport is second_stream.transport is HttpTransport.default()
+    assert first_stream._session is not second_stream._session
+    assert first_stream._session.get_adapter("https://test_base_url.com") is second_stream._session.get_adapter("https://test_base_url.com")
+
+
+def test_stream_with_transport():
+    transport = HttpTransport(HttpTransportConfig(compression=False))
+    stream = StubStream(transport=transport)
+
+    assert stream.transport is transport
+    assert stream._session.headers["Accept-Encoding"] == "identity"
+
+
+def test_pool_configuration():
+    adapter = HttpTransport(HttpTransportConfig(pool_connections=3, pool_maxsize=5))._http1_adapter
+    assert (adapter._pool_connections, adapter._pool_maxsize, adapter._pool_block) == (3, 5, False)
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in adapter.poolmanager.connection_pool_kw["socket_options"]
+
+    adapter = HttpTransport(HttpTransportConfig(max_connections_per_host=2, keep_alive=False))._http1_adapter
+    assert (adapter._pool_maxsize, adapter._pool_block) == (2, True)
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) not in adapter.poolmanager.connection_pool_kw["socket_options"]
+
+
+def test_connections_are_reused_by_the_sessions_of_a_transport(server_url):
+    transport = HttpTransport()
+    sessions = [requests.Session(), requests.Session()]
+    for session in sessions:
+        transport.mount(session)
+
+    for session in sessions * 2:
+        assert session.get(f"{server_url}/records").json() == {"method": "GET", "path": "/records", "body": None}
+
+    assert (transport.stats.requests, transport.stats.connections, transport.stats.reused_connections) == (4, 1, 3)
+    assert transport.stats.tls_handshakes == 0
+    assert str(transport.stats) == "4 HTTP requests over 1 connections (3 reused connections, 0 TLS handshakes)"
+
+
+def test_reconnections_are_counted(server_url):
+    transport = HttpTransport()
+    session = requests.Session()
+    transport.mount(session)
+
+    for _ in range(3):
+        session.get(f"{server_url}/close")
+
+    assert (transport.stats.requests, transport.stats.connections, transport.stats.reused_connections) == (3, 3, 0)
+
+
+def test_http2_requires_httpx(mocker):
+    mocker.patch.object(transport_module, "httpx", None)
+    with pytest.raises(ImportError):
+        HttpTransport(HttpTransportConfig(http2=True))
+
+
+@requires_httpx
+def test_http2_transport_is_not_used_with_cache():
+    transport = HttpTransport(HttpTransportConfig(http2=True))
+    session = requests.Session()
+
+    transport.mount(session)
+    assert isinstance(session.get_adapter("https://test_base_url.com"), Http2Adapter)
+
+    transport.mount(session, allow_http2=False)
+    assert isinstance(session.get_adapter("https://test_base_url.com"), PooledHTTPAdapter)
+
+
+@requires_httpx
+def test_http2_adapter_response(server_url):
+    transport = HttpTransport(HttpTransportConfig(http2=True))
+    session = requests.Session()
+    transport.mount(session)
+
+    response = session.post(f"{server_url}/records", json={"page": 2})
+
+    assert response.status_code == 201
+    assert response.json() == {"method": "POST", "path": "/records", "body": {"page": 2}}
+    assert response.headers["x-test"] == "value"
+    assert response.url == f"{server_url}/records"
+    assert b"".join(response.iter_content(chunk_size=4)) == response.content
+    session.get(f"{server_url}/records")
+    assert (transport.stats.requests, transport.stats.connections) == (2, 1)
+
+
+@requires_httpx
+def test_http2_adapter_raises_requests_exceptions():
+    transport = HttpTransport(HttpTransportConfig(http2=True))
+    session = requests.Session()
+    transport.mount(session)
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        # nothing listens on port 1
+        session.get("http://127.0.0.1:1/")
+
+
+def test_closing_a_session_keeps_the_connections_of_the_transport(server_url):
+    transport = HttpTransport()
+    sessions = [requests.Session(), requests.Session()]
+    for session in sessions:
+        transport.mount(session)
+
+    sessions[0].get(f"{server_url}/records")
+    sessions[0].close()
+    sessions[1].get(f"{server_url}/records")
+    assert (transport.stats.requests, transport.stats.connections) == (2, 1)
+
+    transport.close()
+    sessions[1].get(f"{server_url}/records")
+    assert (transport.stats.requests, transport.stats.connections) == (3, 2)
+
+
+def test_reserve_connections():
+    transport = HttpTransport(HttpTransportConfig(pool_maxsize=5))
+
+    transport.reserve_connections(3)
+    assert transport._http1_adapter._pool_maxsize == 5
+    transport.reserve_connections(20)
+    assert transport._http1_adapter._pool_maxsize == 20
+    assert transport._http1_adapter.poolmanager.connection_pool_kw["maxsize"] == 20
+    transport.reserve_connections(8)
+    assert transport._http1_adapter._pool_maxsize == 20
+
+    transport = HttpTransport(HttpTransportConfig(max_connections_per_host=2))
+    transport.reserve_connections(20)
+    assert transport._http1_adapter._pool_maxsize == 2
+
+
+@requires_httpx
+def test_http2_adapter_streamed_response(server_url):
+    transport = HttpTransport(HttpTransportConfig(http2=True))
+    session = requests.Session()
+    transport.mount(session)
+
+    response = session.get(f"{server_url}/records", stream=True)
+
+    assert not response._content_consumed
+    assert b"".join(response.iter_content(chunk_size=4)) == b'{"method": "GET", "path": "/records", "body": null}'
+    response.close()
+
+
+@requires_httpx
+def test_http2_adapter_clients(mocker):
+    transport = HttpTransport(HttpTransportConfig(http2=True))
+    adapter = transport._http2_adapter
+    http_transport = mocker.spy(transport_module.httpx, "HTTPTransport")
+
+    default_client = adapter._client("https://test_base_url.com", True, None, {})
+    assert http_transport.call_args.kwargs["verify"].verify_mode == ssl.CERT_REQUIRED
+    assert adapter._client("https://other_url.com", True, None, {"http": "http://proxy:3128"}) is default_client
+    proxy_client = adapter._client("https://test_base_url.com", False, None, {"https": "http://proxy:3128"})
+
+    assert proxy_client is not default_client
+    kwargs = http_transport.call_args.kwargs
+    assert (kwargs["verify"].verify_mode, kwargs["proxy"].url) == (ssl.CERT_NONE, "http://proxy:3128")
+
+    transport.close()
+    assert default_client.is_closed and proxy_client.is_closed
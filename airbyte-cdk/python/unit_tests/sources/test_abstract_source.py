@@ -3,6 +3,8 @@
 #
 
 import logging
+import threading
+import time
 from collections import defaultdict
 from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 from unittest.mock import call
@@ -539,3 +541,188 @@ class TestIncrementalRead:
         messages = _fix_emitted_at(list(src.read(logger, {}, catalog, state=defaultdict(dict))))
 
         assert expected == messages
+
+
+class MockConcurrentSource(MockSource):
+    concurrency_limit = 2
+
+
+class TestConcurrentRead:
+    def test_full_refresh_streams_are_read_concurrently(self, mocker):
+        """Tests that all records of every stream are emitted, in stream order within each stream"""
+        s1_output = [{"id": i} for i in range(100)]
+        s2_output = [{"id": -i} for i in range(100)]
+        s1 = MockStream([({"sync_mode": SyncMode.full_refresh}, s1_output)], name="s1")
+        s2 = MockStream([({"sync_mode": SyncMode.full_refresh}, s2_output)], name="s2")
+        mocker.patch.object(MockStream, "get_json_schema", return_value={})
+
+        src = MockConcurrentSource(streams=[s1, s2])
+        catalog = ConfiguredAirbyteCatalog(
+            streams=[
+                _configured_stream(s1, SyncMode.full_refresh),
+                _configured_stream(s2, SyncMode.full_refresh),
+            ]
+        )
+
+        messages = _fix_emitted_at(list(src.read(logger, {}, catalog)))
+
+        assert [message for message in messages if message.record.stream == "s1"] == _as_records("s1", s1_output)
+        assert [message for message in messages if message.record.stream == "s2"] == _as_records("s2", s2_output)
+
+    def test_state_is_emitted_after_stream_records(self, mocker):
+        """Tests that the STATE messages of a stream follow its records and accumulate the state of the other streams"""
+        slices = [{"1": "1"}, {"2": "2"}]
+        stream_output = [{"k1": "v1"}, {"k2": "v2"}]
+        s1 = MockStream(
+            [({"sync_mode": SyncMode.incremental, "stream_slice": s, "stream_state": mocker.ANY}, stream_output) for s in slices],
+            name="s1",
+        )
+        s2 = MockStream(
+            [({"sync_mode": SyncMode.incremental, "stream_slice": s, "stream_state": mocker.ANY}, stream_output) for s in slices],
+            name="s2",
+        )
+        state = {"cursor": "value"}
+        mocker.patch.object(MockStream, "get_updated_state", return_value=state)
+        mocker.patch.object(MockStream, "supports_incremental", return_value=True)
+        mocker.patch.object(MockStream, "get_json_schema", return_value={})
+        mocker.patch.object(MockStream, "stream_slices", return_value=slices)
+
+        src = MockConcurrentSource(streams=[s1, s2])
+        catalog = ConfiguredAirbyteCatalog(
+            streams=[
+                _configured_stream(s1, SyncMode.incremental),
+                _configured_stream(s2, SyncMode.incremental),
+            ]
+        )
+
+        messages = _fix_emitted_at(list(src.read(logger, {}, catalog, state={"s3": {"cursor": "old"}})))
+
+        for stream_name in ("s1", "s2"):
+            stream_messages = [
+                message
+                for message in messages
+                if (message.type == Type.RECORD and message.record.stream == stream_name)
+                or (message.type == Type.STATE and message.state.data.get(stream_name))
+            ]
+            assert stream_messages[:2] == _as_records(stream_name, stream_output)
+            assert stream_messages[2].type == Type.STATE
+            assert stream_messages[2].state.data[stream_name] == state
+            assert stream_messages[2].state.data["s3"] == {"cursor": "old"}
+        assert messages[-1].type == Type.STATE
+        assert messages[-1].state.data == {"s1": state, "s2": state, "s3": {"cursor": "old"}}
+
+    def test_exception_is_raised_from_reading_thread(self, mocker):
+        stream = MockStream(name="my_stream")
+        mocker.patch.object(MockStream, "get_json_schema", return_value={})
+        mocker.patch.object(MockStream, "read_records", side_effect=RuntimeError("oh no!"))
+        mocker.patch.object(MockStream, "get_error_display_message", return_value="my message")
+
+        source = MockConcurrentSource(streams=[stream])
+        catalog = ConfiguredAirbyteCatalog(streams=[_configured_stream(stream, SyncMode.full_refresh)])
+
+        with pytest.raises(AirbyteTracedException, match="oh no!") as exc:
+            list(source.read(logger, {}, catalog))
+        assert exc.value.message == "my message"
+
+    def test_slices_are_read_concurrently_in_order(self, mocker):
+        """Tests that the records of concurrently read slices are emitted in slice order"""
+        slices = [{"slice": i} for i in range(20)]
+        s1 = MockStream([({"sync_mode": SyncMode.full_refresh, "stream_slice": s}, [s]) for s in slices], name="s1")
+        mocker.patch.object(MockStream, "get_json_schema", return_value={})
+        mocker.patch.object(MockStream, "stream_slices", return_value=slices)
+        mocker.patch.object(MockStream, "concurrency_limit", new_callable=mocker.PropertyMock, return_value=4)
+
+        src = MockSource(streams=[s1])
+        catalog = ConfiguredAirbyteCatalog(streams=[_configured_stream(s1, SyncMode.full_refresh)])
+
+        messages = _fix_emitted_at(list(src.read(logger, {}, catalog)))
+
+        assert messages == _as_records("s1", slices)
+
+
+class SlowStream(MockStream):
+    """Stream reading every slice slowly and keeping track of the number of slices read at the same time"""
+
+    lock = threading.Lock()
+    reading = 0
+    max_reading = 0
+
+    def __init__(self, name: str, concurrency_limit: int = None):
+        super().__init__(name=name)
+        self._concurrency_limit = concurrency_limit
+
+    @property
+    def concurrency_limit(self) -> Optional[int]:
+        return self._concurrency_limit
+
+    def stream_slices(self, **kwargs):
+        return [{"slice": i} for i in range(8)]
+
+    def read_records(self, stream_slice: Mapping[str, Any] = None, **kwargs) -> Iterable[Mapping[str, Any]]:
+        with SlowStream.lock:
+            SlowStream.reading += 1
+            SlowStream.max_reading = max(SlowStream.max_reading, SlowStream.reading)
+        time.sleep(0.01)
+        records = self._read_slice(stream_slice)
+        with SlowStream.lock:
+            SlowStream.reading -= 1
+        return records
+
+    def _read_slice(self, stream_slice: Mapping[str, Any]) -> List[Mapping[str, Any]]:
+        return [stream_slice]
+
+
+class SlowStreamWithState(SlowStream):
+    cursor_field = "slice"
+
+    def __init__(self, name: str, concurrency_limit: int = None):
+        super().__init__(name, concurrency_limit)
+        self._state = {}
+
+    @property
+    def state(self):
+        return self._state
+
+    @state.setter
+    def state(self, value):
+        self._state = value
+
+    def _read_slice(self, stream_slice: Mapping[str, Any]) -> List[Mapping[str, Any]]:
+        self._state = {"slice": stream_slice["slice"]}
+        return [stream_slice]
+
+
+@pytest.fixture(name="slow_streams")
+def slow_streams_fixture(mocker):
+    mocker.patch.object(MockStream, "get_json_schema", return_value={})
+    SlowStream.reading = SlowStream.max_reading = 0
+
+
+def test_source_concurrency_limit_applies_to_slices_of_all_streams(slow_streams):
+    streams = [SlowStream(name=f"s{i}", concurrency_limit=4) for i in range(3)]
+    src = MockConcurrentSource(streams=streams)
+    catalog = ConfiguredAirbyteCatalog(streams=[_configured_stream(stream, SyncMode.full_refresh) for stream in streams])
+
+    messages = list(src.read(logger, {}, catalog))
+
+    assert len(messages) == 3 * 8
+    assert SlowStream.max_reading == MockConcurrentSource.concurrency_limit
+
+
+def test_slices_of_streams_managing_their_state_are_not_read_concurrently(slow_streams, mocker):
+    mocker.patch.object(SlowStreamWithState, "supports_incremental", return_value=True)
+    stream = SlowStreamWithState(name="s1", concurrency_limit=4)
+    src = MockSource(streams=[stream])
+    catalog = ConfiguredAirbyteCatalog(streams=[_configured_stream(stream, SyncMode.incremental)])
+
+    messages = list(src.read(logger, {}, catalog, state={}))
+
+    # every checkpoint covers the records emitted before it and no more
+    emitted = []
+    for message in messages:
+        if message.type == Type.RECORD:
+            emitted.append(message.record.data["slice"])
+        else:
+            assert message.state.data["s1"] == {"slice": emitted[-1]}
+    assert emitted == list(range(8))
+    assert SlowStream.max_reading == 1
@@ -0,0 +1,53 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import random
+import time
+
+import pytest
+from airbyte_cdk.sources.utils.concurrency import map_in_order, merge_concurrently
+
+
+def _slow_identity(value):
+    time.sleep(random.random() / 100)
+    return value
+
+
+def test_map_in_order_keeps_input_order():
+    assert list(map_in_order(_slow_identity, range(50), max_workers=8)) == list(range(50))
+
+
+def test_map_in_order_raises_worker_exception():
+    def fail_on_three(value):
+        if value == 3:
+            raise ValueError("three")
+        return value
+
+    results = map_in_order(fail_on_three, range(10), max_workers=2)
+    assert [next(results) for _ in range(3)] == [0, 1, 2]
+    with pytest.raises(ValueError, match="three"):
+        next(results)
+
+
+def test_merge_concurrently_keeps_order_of_each_producer():
+    producers = [lambda name=name: ((name, _slow_identity(i)) for i in range(20)) for name in "abc"]
+
+    items = list(merge_concurrently(producers, max_workers=3, queue_size=5))
+
+    assert len(items) == 60
+    for name in "abc":
+        assert [i for producer_name, i in items if producer_name == name] == list(range(20))
+
+
+def test_merge_concurrently_raises_producer_exception():
+    def failing_producer():
+        yield 1
+        raise ValueError("oh no!")
+
+    def infinite_producer():
+        while True:
+            yield 2
+
+    with pytest.raises(ValueError, match="oh no!"):
+        list(merge_concurrently([failing_producer, infinite_producer], max_workers=2, queue_size=1))
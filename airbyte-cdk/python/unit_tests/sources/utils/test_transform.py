@@ -210,3 +210,45 @@ def test_custom_transform_with_default_normalization():
     obj = {"value": 12}
     s.transformer.transform(obj, SIMPLE_SCHEMA)
     assert obj == {"value": "transformed"}
+
+
+def test_schema_is_compiled_once(mocker):
+    t = TypeTransformer(TransformConfig.DefaultSchemaNormalization)
+    compile_spy = mocker.spy(t, "_compile")
+
+    for _ in range(3):
+        t.transform({"value": 1, "nested": {"a": 1}, "array": [1]}, COMPLEX_SCHEMA)
+    compile_count = compile_spy.call_count
+    t.transform({"value": 1, "nested": {"a": 1}, "array": [1]}, COMPLEX_SCHEMA)
+
+    assert compile_count > 0
+    assert compile_spy.call_count == compile_count
+
+
+def test_recursive_schema():
+    schema = {
+        "type": "object",
+        "definitions": {
+            "node": {
+                "type": "object",
+                "properties": {"value": {"type": "string"}, "children": {"type": "array", "items": {"$ref": "#/definitions/node"}}},
+            }
+        },
+        "properties": {"root": {"$ref": "#/definitions/node"}},
+    }
+    record = {"root": {"value": 1, "children": [{"value": 2, "children": [{"value": 3}]}]}}
+
+    TypeTransformer(TransformConfig.DefaultSchemaNormalization).transform(record, schema)
+
+    assert record == {"root": {"value": "1", "children": [{"value": "2", "children": [{"value": "3"}]}]}}
+
+
+def test_custom_transform_registered_after_first_transform():
+    transformer = TypeTransformer(TransformConfig.CustomSchemaNormalization)
+    obj = {"value": 12}
+    transformer.transform(obj, SIMPLE_SCHEMA)
+    assert obj == {"value": 12}
+
+    transformer.registerCustomTransform(lambda instance, schema: "transformed")
+    transformer.transform(obj, SIMPLE_SCHEMA)
+    assert obj == {"value": "transformed"}
@@ -2,7 +2,7 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
-
+import io
 from argparse import Namespace
 from copy import deepcopy
 from typing import Any, List, Mapping, MutableMapping, Union
@@ -10,17 +10,20 @@ from unittest.mock import MagicMock
 
 import pytest
 from airbyte_cdk import AirbyteEntrypoint
+from airbyte_cdk.entrypoint import launch
 from airbyte_cdk.models import (
     AirbyteCatalog,
     AirbyteConnectionStatus,
     AirbyteMessage,
     AirbyteRecordMessage,
+    AirbyteStateMessage,
     AirbyteStream,
     ConnectorSpecification,
     Status,
     Type,
 )
 from airbyte_cdk.sources import Source
+from airbyte_cdk.utils.message_writer import BufferedMessageWriter
 
 
 class MockSource(Source):
@@ -175,3 +178,24 @@ def test_run_read(entrypoint: AirbyteEntrypoint, mocker, spec_mock, config_mock)
 def test_invalid_command(entrypoint: AirbyteEntrypoint, mocker, config_mock):
     with pytest.raises(Exception):
         list(entrypoint.run(Namespace(command="invalid", config="conf")))
+
+
+def test_launch_flushes_state(mocker, spec_mock, config_mock):
+    output = io.StringIO()
+    record = AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream="stream", data={"data": "stuff"}, emitted_at=1))
+    state = AirbyteMessage(type=Type.STATE, state=AirbyteStateMessage(data={"cursor": 1}))
+
+    def read(*args):
+        yield record
+        yield state
+        # the state is written without waiting for the next message
+        assert output.getvalue() == f"{record.json(exclude_unset=True)}\n{state.json(exclude_unset=True)}\n"
+        yield record
+
+    mocker.patch.object(MockSource, "read_state", return_value={})
+    mocker.patch.object(MockSource, "read_catalog", return_value={})
+    mocker.patch.object(MockSource, "read", side_effect=read)
+    writer = BufferedMessageWriter(output, max_buffer_size=1000, max_buffer_age=60)
+    launch(MockSource(), ["read", "--config", "config_path", "--catalog", "catalog_path"], writer=writer)
+
+    assert output.getvalue().count("\n") == 3
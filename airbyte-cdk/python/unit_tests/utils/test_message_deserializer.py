@@ -0,0 +1,61 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import pytest
+from airbyte_cdk.models import AirbyteMessage
+from airbyte_cdk.utils import message_deserializer
+from airbyte_cdk.utils.message_deserializer import AirbyteMessageDeserializer
+
+LINES = [
+    '{"type": "RECORD", "record": {"stream": "users", "data": {"id": 1, "name": "Zo\\u00eb", "nested": {"list": [1, null]}}, "emitted_at": 1}}',
+    '{"type": "RECORD", "record": {"stream": "users", "namespace": "public", "data": {}, "emitted_at": 1}}',
+    '{"type": "RECORD", "record": {"stream": "users", "namespace": null, "data": {"price": 1.5}, "emitted_at": 1}}',
+    '{"type": "RECORD", "record": {"stream": "users", "data": {"nan": NaN}, "emitted_at": 1}}',
+    # the envelopes below are converted by the pydantic validation
+    '{"type": "RECORD", "record": {"stream": "users", "data": {}, "emitted_at": 1.0}}',
+    '{"type": "RECORD", "record": {"stream": 1, "data": {}, "emitted_at": "1"}}',
+    '{"type": "RECORD", "record": {"stream": "users", "data": {}, "emitted_at": 1, "extra": true}}',
+    '{"type": "RECORD", "record": {"stream": "users", "data": [], "emitted_at": 1}}',
+    '{"type": "RECORD", "record": null}',
+    '{"type": "STATE", "state": {"data": {"users": {"updated_at": "2022-01-01"}}}}',
+    '{"type": "STATE", "state": {"type": "STREAM", "stream": {"stream_descriptor": {"name": "users"}, "stream_state": {"cursor": 1}}}}',
+    '{"type": "LOG", "log": {"level": "INFO", "message": "hello"}}',
+]
+
+INVALID_LINES = [
+    "not json",
+    "[1, 2]",
+    '{"type": "RECORD", "record": {"data": {}, "emitted_at": 1}}',
+    '{"type": "RECORD", "record": {"stream": "users", "data": 1, "emitted_at": 1}}',
+    '{"type": "UNKNOWN"}',
+]
+
+BACKENDS = [False, pytest.param(True, marks=pytest.mark.skipif(message_deserializer.orjson is None, reason="orjson is not installed"))]
+
+
+@pytest.mark.parametrize("use_orjson", BACKENDS)
+@pytest.mark.parametrize("line", LINES)
+def test_deserialize_is_equal_to_pydantic(line, use_orjson):
+    message = AirbyteMessageDeserializer(use_orjson=use_orjson).deserialize(line)
+    expected_message = AirbyteMessage.parse_raw(line)
+    assert message == expected_message
+    assert message.json(exclude_unset=True) == expected_message.json(exclude_unset=True)
+
+
+@pytest.mark.parametrize("use_orjson", BACKENDS)
+@pytest.mark.parametrize("line", INVALID_LINES)
+def test_deserialize_invalid_line(line, use_orjson):
+    with pytest.raises(ValueError):
+        AirbyteMessageDeserializer(use_orjson=use_orjson).deserialize(line)
+
+
+def test_json_backend_keeps_big_integers():
+    line = '{"type": "RECORD", "record": {"stream": "users", "data": {"big": 123456789012345678901234567890}, "emitted_at": 1}}'
+    assert AirbyteMessageDeserializer().deserialize(line).record.data == {"big": 123456789012345678901234567890}
+
+
+def test_orjson_backend_requires_orjson(mocker):
+    mocker.patch.object(message_deserializer, "orjson", None)
+    with pytest.raises(ImportError):
+        AirbyteMessageDeserializer(use_orjson=True)
@@ -0,0 +1,63 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import datetime
+import json
+from decimal import Decimal
+
+import pytest
+from airbyte_cdk.models import (
+    AirbyteLogMessage,
+    AirbyteMessage,
+    AirbyteRecordMessage,
+    AirbyteStateMessage,
+    AirbyteStateType,
+    AirbyteStreamState,
+    Level,
+    StreamDescriptor,
+    Type,
+)
+from airbyte_cdk.utils import message_serializer
+from airbyte_cdk.utils.message_serializer import AirbyteMessageSerializer
+
+RECORD_DATA = {
+    "id": 1,
+    "name": "Zoë",
+    "price": Decimal("1.5"),
+    "created_at": datetime.datetime(2022, 1, 1, 12, 30),
+    "tags": ("a", "b"),
+    "nested": {"list": [1, None, True], "empty": {}},
+}
+
+MESSAGES = [
+    AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream="users", data=RECORD_DATA, emitted_at=1)),
+    AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream="users", namespace="public", data={}, emitted_at=1)),
+    AirbyteMessage.construct(type=Type.RECORD, record=AirbyteRecordMessage.construct(stream="users", data=RECORD_DATA, emitted_at=1)),
+    AirbyteMessage(type=Type.STATE, state=AirbyteStateMessage(data={"users": {"updated_at": "2022-01-01"}})),
+    AirbyteMessage(
+        type=Type.STATE,
+        state=AirbyteStateMessage(
+            type=AirbyteStateType.STREAM,
+            stream=AirbyteStreamState(stream_descriptor=StreamDescriptor(name="users"), stream_state={"updated_at": "2022-01-01"}),
+        ),
+    ),
+    AirbyteMessage(type=Type.LOG, log=AirbyteLogMessage(level=Level.INFO, message="hello")),
+]
+
+
+@pytest.mark.parametrize("message", MESSAGES)
+def test_json_backend_is_byte_compatible(message):
+    assert AirbyteMessageSerializer().serialize(message) == message.json(exclude_unset=True)
+
+
+@pytest.mark.skipif(message_serializer.orjson is None, reason="orjson is not installed")
+@pytest.mark.parametrize("message", MESSAGES)
+def test_orjson_backend_is_json_compatible(message):
+    assert json.loads(AirbyteMessageSerializer(use_orjson=True).serialize(message)) == json.loads(message.json(exclude_unset=True))
+
+
+def test_orjson_backend_requires_orjson(mocker):
+    mocker.patch.object(message_serializer, "orjson", None)
+    with pytest.raises(ImportError):
+        AirbyteMessageSerializer(use_orjson=True)
@@ -0,0 +1,44 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import io
+
+from airbyte_cdk.utils.message_writer import BufferedMessageWriter
+
+
+def test_messages_are_buffered_until_max_size():
+    output = io.StringIO()
+    writer = BufferedMessageWriter(output, max_buffer_size=10, max_buffer_age=60)
+
+    writer.write("abcd")
+    assert output.getvalue() == ""
+    writer.write("efgh")
+    assert output.getvalue() == "abcd\nefgh\n"
+
+
+def test_messages_are_flushed_after_max_age(mocker):
+    monotonic = mocker.patch("airbyte_cdk.utils.message_writer.time.monotonic", return_value=100.0)
+    output = io.StringIO()
+    writer = BufferedMessageWriter(output, max_buffer_size=1000, max_buffer_age=1)
+
+    writer.write("first")
+    assert output.getvalue() == ""
+    monotonic.return_value = 101.5
+    writer.write("second")
+    assert output.getvalue() == "first\nsecond\n"
+
+
+def test_flush_on_exit():
+    output = io.StringIO()
+    with BufferedMessageWriter(output, max_buffer_size=1000, max_buffer_age=60) as writer:
+        writer.write("message")
+        assert output.getvalue() == ""
+    assert output.getvalue() == "message\n"
+
+
+def test_no_buffering():
+    output = io.StringIO()
+    writer = BufferedMessageWriter(output, max_buffer_size=0)
+    writer.write("message")
+    assert output.getvalue() == "message\n"
@@ -0,0 +1,94 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import logging
+import time
+from typing import Any, Callable, Iterator, List, Mapping
+
+from airbyte_cdk.destinations import RecordBatch, RecordSink
+from airbyte_cdk.models import AirbyteRecordMessage
+
+logger = logging.getLogger("airbyte")
+
+# Limits of a SendMessageBatch call
+# https://docs.aws.amazon.com/AWSSimpleQueueService/latest/APIReference/API_SendMessageBatch.html
+MAX_BATCH_ENTRIES = 10
+MAX_BATCH_BYTES = 256 * 1024
+# Number of times the entries which failed for a reason other than the request itself are sent again
+MAX_RETRIES = 5
+
+
+def message_size(message: Mapping[str, Any]) -> int:
+    """
+    :return: the size of the message as counted by SQS: its body and the names, types and values of its attributes
+    """
+    size = len(str(message["MessageBody"]).encode())
+    for name, attribute in message.get("MessageAttributes", {}).items():
+        size += len(name.encode()) + len(attribute["DataType"].encode()) + len(attribute.get("StringValue", "").encode())
+    return size
+
+
+class SqsBatchSender(RecordSink):
+    """
+    Sends the records flushed by a BufferedRecordWriter with SendMessageBatch calls of up to MAX_BATCH_ENTRIES messages and
+    MAX_BATCH_BYTES bytes. The calls of a flushed batch are sent in order, several batches are sent at once when the writer has
+    more than one flush worker. Entries rejected because of a sender fault (e.g. an invalid message) fail the write, the other
+    failed entries are sent again up to MAX_RETRIES times.
+    """
+
+    def __init__(self, client, queue_url: str, build_message: Callable[[AirbyteRecordMessage], dict], max_retries: int = MAX_RETRIES):
+        """
+        :param client: SQS client, shared by the flush threads
+        :param queue_url: URL of the queue the messages are sent to
+        :param build_message: builds the SendMessage parameters of a record
+        :param max_retries: number of times the failed entries are sent again
+        """
+        self._client = client
+        self._queue_url = queue_url
+        self._build_message = build_message
+        self._max_retries = max_retries
+
+    def flush(self, batch: RecordBatch):
+        self.send(batch.records)
+
+    def send(self, records: List[AirbyteRecordMessage]):
+        """
+        Send the messages of the records, in order.
+        """
+        messages = [self._build_message(record) for record in records]
+        for messages_batch in self._split(messages):
+            self._send(messages_batch)
+
+    @staticmethod
+    def _split(messages: List[dict]) -> Iterator[List[dict]]:
+        current, current_size = [], 0
+        for message in messages:
+            size = message_size(message)
+            if current and (len(current) == MAX_BATCH_ENTRIES or current_size + size > MAX_BATCH_BYTES):
+                yield current
+                current, current_size = [], 0
+            current.append(message)
+            current_size += size
+        if current:
+            yield current
+
+    def _send(self, messages: List[dict]):
+        entries = {str(i): {"Id": str(i), **message} for i, message in enumerate(messages)}
+        for attempt in range(self._max_retries + 1):
+            response = self._client.send_message_batch(QueueUrl=self._queue_url, Entries=list(entries.values()))
+            failed = response.get("Failed", [])
+            if not failed:
+                return
+            sender_faults = [entry for entry in failed if entry.get("SenderFault")]
+            if sender_faults:
+                raise Exception(f"Amazon SQS rejected {len(sender_faults)} messages: {self._errors(sender_faults)}")
+            entries = {entry["Id"]: entries[entry["Id"]] for entry in failed}
+            if attempt < self._max_retries:
+                logger.info(f"Sending {len(entries)} failed messages again: {self._errors(failed)}")
+                time.sleep(min(2**attempt, 30))
+        raise Exception(f"Amazon SQS failed to receive {len(entries)} messages after {self._max_retries} retries: {self._errors(failed)}")
+
+    @staticmethod
+    def _errors(failed: List[Mapping[str, Any]]) -> str:
+        return ", ".join(sorted({f"{entry.get('Code')}: {entry.get('Message')}" for entry in failed}))
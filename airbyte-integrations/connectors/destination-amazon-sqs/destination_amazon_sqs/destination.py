@@ -9,21 +9,25 @@ from uuid import uuid4
 
 import boto3
 from airbyte_cdk import AirbyteLogger
-from airbyte_cdk.destinations import Destination
+from airbyte_cdk.destinations import BufferedRecordWriter, Destination
 from airbyte_cdk.models import AirbyteConnectionStatus, AirbyteMessage, ConfiguredAirbyteCatalog, Status, Type
 from botocore.exceptions import ClientError
 
+from .batch_sender import SqsBatchSender
+
 
 class DestinationAmazonSqs(Destination):
+    # Number of records flushed at once, they are sent by SendMessageBatch calls of up to 10 messages
+    max_buffer_records = 100
+    # Number of flushed batches sent at the same time to standard queues
+    send_workers = 8
+
     def queue_is_fifo(self, url: str) -> bool:
         return url.endswith(".fifo")
 
     def parse_queue_name(self, url: str) -> str:
         return url.rsplit("/", 1)[-1]
 
-    def send_single_message(self, queue, message) -> dict:
-        return queue.send_message(**message)
-
     def build_sqs_message(self, record, message_body_key=None):
         data = None
         if message_body_key:
@@ -62,20 +66,6 @@ class DestinationAmazonSqs(Destination):
         #     message['MessageDeduplicationId'] = message_dedupe_id
         return message
 
-    # TODO: Support batch send
-    # def send_batch_messages(messages, queue):
-    #     entry = {
-    #         'Id': "1",
-    #         'MessageBody': str(record.data),
-    #     }
-    #     response = queue.send_messages(Entries=messages)
-    #     if 'Successful' in response:
-    #         for status in response['Successful']:
-    #             print("Message sent: " + status['MessageId'])
-    #     if 'Failed' in response:
-    #         for status in response['Failed']:
-    #             print("Message sent: " + status['MessageId'])
-
     # https://docs.aws.amazon.com/AWSSimpleQueueService/latest/APIReference/API_SendMessage.html
     def write(
         self, config: Mapping[str, Any], configured_catalog: ConfiguredAirbyteCatalog, input_messages: Iterable[AirbyteMessage]
@@ -85,10 +75,7 @@ class DestinationAmazonSqs(Destination):
         queue_url = config["queue_url"]
         queue_region = config["region"]
 
-        # TODO: Implement optional params for batch
         # Optional Properties
-        # max_batch_size = config.get("max_batch_size", 10)
-        # send_as_batch = config.get("send_as_batch", False)
         message_delay = config.get("message_delay")
         message_body_key = config.get("message_body_key")
 
@@ -107,23 +94,52 @@ class DestinationAmazonSqs(Destination):
         # TODO: Support adding/setting attributes in the UI
         # TODO: Support extract a specific path as message attributes
 
-        for message in input_messages:
-            if message.type == Type.RECORD:
-                sqs_message = self.build_sqs_message(message.record, message_body_key)
+        # The attributes of the queue are read once, not for every record
+        fifo = self.queue_is_fifo(queue_url)
+        if fifo:
+            use_content_dedupe = False if queue.attributes.get("ContentBasedDeduplication") == "false" else "true"
 
-                if message_delay:
-                    sqs_message = self.set_message_delay(sqs_message, message_delay)
+        def build_message(record) -> dict:
+            sqs_message = self.build_sqs_message(record, message_body_key)
 
-                sqs_message = self.add_attributes_to_message(message.record, sqs_message)
+            if message_delay:
+                sqs_message = self.set_message_delay(sqs_message, message_delay)
 
-                if self.queue_is_fifo(queue_url):
-                    use_content_dedupe = False if queue.attributes.get("ContentBasedDeduplication") == "false" else "true"
-                    self.set_message_fifo_properties(sqs_message, message_group_id, use_content_dedupe)
+            sqs_message = self.add_attributes_to_message(record, sqs_message)
+
+            if fifo:
+                self.set_message_fifo_properties(sqs_message, message_group_id, use_content_dedupe)
+            return sqs_message
 
-                self.send_single_message(queue, sqs_message)
+        sender = SqsBatchSender(queue.meta.client, queue_url, build_message)
+        if fifo:
+            # All the messages share the same group, so they are sent one batch at a time in the order of the input
+            yield from self.write_in_order(sender, input_messages)
+            return
+        writer = BufferedRecordWriter(sender, max_buffer_records=self.max_buffer_records, flush_workers=self.send_workers)
+        # State messages are emitted once every message received before them was acknowledged by SQS
+        for message in writer.write(input_messages):
             if message.type == Type.STATE:
                 yield message
 
+    def write_in_order(self, sender: SqsBatchSender, input_messages: Iterable[AirbyteMessage]) -> Iterable[AirbyteMessage]:
+        """
+        Send the records of all the streams in a single buffer, in the order they are received.
+        The buffer is sent before a state message is emitted.
+        """
+        records = []
+        for message in input_messages:
+            if message.type == Type.RECORD:
+                records.append(message.record)
+                if len(records) == self.max_buffer_records:
+                    sender.send(records)
+                    records = []
+            elif message.type == Type.STATE:
+                sender.send(records)
+                records = []
+                yield message
+        sender.send(records)
+
     def check(self, logger: AirbyteLogger, config: Mapping[str, Any]) -> AirbyteConnectionStatus:
         try:
             # Required propeties
@@ -5,7 +5,7 @@
 
 from setuptools import find_packages, setup
 
-MAIN_REQUIREMENTS = ["airbyte-cdk", "boto3"]
+MAIN_REQUIREMENTS = ["airbyte-cdk>=0.1.70", "boto3"]
 
 TEST_REQUIREMENTS = ["pytest~=6.1", "moto"]
 
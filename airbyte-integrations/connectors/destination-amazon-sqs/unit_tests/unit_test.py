@@ -5,11 +5,15 @@
 import json
 import time
 from typing import Any, Mapping
+from unittest.mock import MagicMock
 
 import boto3
+import pytest
+from airbyte_cdk.destinations import RecordBatch
 from airbyte_cdk.logger import AirbyteLogger
-from airbyte_cdk.models import AirbyteMessage, ConfiguredAirbyteCatalog, Status
+from airbyte_cdk.models import AirbyteMessage, AirbyteRecordMessage, AirbyteStateMessage, ConfiguredAirbyteCatalog, Status, Type
 from destination_amazon_sqs import DestinationAmazonSqs
+from destination_amazon_sqs.batch_sender import SqsBatchSender
 
 # from airbyte_cdk.sources.source import Source
 from moto import mock_iam, mock_sqs
@@ -224,3 +228,94 @@ def test_write():
         if time.time() > timeout:
             print("Timed out waiting for message after 20 seconds.")
             assert False
+
+
+@set_initial_no_auth_action_count(4)
+@mock_sqs
+@mock_iam
+def test_write_batches():
+    user = create_user_with_all_permissions()
+    queue_region = "eu-west-1"
+    client = boto3.client(
+        "sqs", aws_access_key_id=user["AccessKeyId"], aws_secret_access_key=user["SecretAccessKey"], region_name=queue_region
+    )
+    queue_url = client.create_queue(QueueName="amazon-sqs-mock-queue")["QueueUrl"]
+    config = create_config(queue_url, queue_region, user["AccessKeyId"], user["SecretAccessKey"], None)
+    catalog = ConfiguredAirbyteCatalog(streams=get_catalog()["streams"])
+    records = [
+        AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream="ab-airbyte-testing", data={"id": i}, emitted_at=0))
+        for i in range(25)
+    ]
+    state = AirbyteMessage(type=Type.STATE, state=AirbyteStateMessage(data={"id": 25}))
+
+    assert list(DestinationAmazonSqs().write(config, catalog, records + [state])) == [state]
+
+    received = []
+    while True:
+        messages = client.receive_message(QueueUrl=queue_url, MaxNumberOfMessages=10).get("Messages", [])
+        if not messages:
+            break
+        received += [json.loads(message["Body"])["id"] for message in messages]
+    assert sorted(received) == list(range(25))
+
+
+def test_batch_sender_retries_failed_entries(mocker):
+    mocker.patch("destination_amazon_sqs.batch_sender.time.sleep")
+    client = MagicMock()
+    client.send_message_batch.side_effect = [
+        {"Successful": [{"Id": str(i)} for i in range(1, 10)], "Failed": [{"Id": "0", "SenderFault": False, "Code": "InternalError"}]},
+        {"Successful": [{"Id": str(i)} for i in range(2)]},
+        {"Successful": [{"Id": "0"}]},
+    ]
+    sender = SqsBatchSender(client, "queue_url", lambda record: {"MessageBody": json.dumps(record.data)})
+    records = [AirbyteRecordMessage(stream="stream", data={"id": i}, emitted_at=0) for i in range(11)]
+
+    sender.flush(RecordBatch(stream="stream", namespace=None, records=records))
+
+    calls = [call.kwargs["Entries"] for call in client.send_message_batch.mock_calls]
+    assert [len(entries) for entries in calls] == [10, 1, 1]
+    assert calls[1] == [{"Id": "0", "MessageBody": '{"id": 0}'}]
+    assert calls[2] == [{"Id": "0", "MessageBody": '{"id": 10}'}]
+
+
+def test_batch_sender_splits_by_size():
+    client = MagicMock()
+    client.send_message_batch.return_value = {}
+    sender = SqsBatchSender(client, "queue_url", lambda record: {"MessageBody": "x" * 100 * 1024})
+    records = [AirbyteRecordMessage(stream="stream", data={}, emitted_at=0) for i in range(5)]
+
+    sender.flush(RecordBatch(stream="stream", namespace=None, records=records))
+
+    assert [len(call.kwargs["Entries"]) for call in client.send_message_batch.mock_calls] == [2, 2, 1]
+
+
+def test_batch_sender_raises_sender_faults():
+    client = MagicMock()
+    client.send_message_batch.return_value = {"Failed": [{"Id": "0", "SenderFault": True, "Code": "InvalidMessageContents"}]}
+    sender = SqsBatchSender(client, "queue_url", lambda record: {"MessageBody": ""})
+
+    with pytest.raises(Exception, match="InvalidMessageContents"):
+        sender.flush(RecordBatch(stream="stream", namespace=None, records=[AirbyteRecordMessage(stream="stream", data={}, emitted_at=0)]))
+    client.send_message_batch.assert_called_once()
+
+
+def test_fifo_messages_are_sent_in_input_order():
+    sent = []
+    sender = MagicMock()
+    sender.send.side_effect = lambda records: sent.append([(record.stream, record.data["id"]) for record in records])
+    destination = DestinationAmazonSqs()
+    destination.max_buffer_records = 3
+
+    def record(stream: str, i: int) -> AirbyteMessage:
+        return AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream=stream, data={"id": i}, emitted_at=0))
+
+    state = AirbyteMessage(type=Type.STATE, state=AirbyteStateMessage(data={"id": 1}))
+    messages = [record("users", 1), record("orders", 2), record("users", 3), record("orders", 4), state, record("users", 5)]
+
+    output = destination.write_in_order(sender, messages)
+
+    assert next(output) == state
+    # every record received before the state was sent
+    assert sent == [[("users", 1), ("orders", 2), ("users", 3)], [("orders", 4)]]
+    assert list(output) == []
+    assert sent[-1] == [("users", 5)]
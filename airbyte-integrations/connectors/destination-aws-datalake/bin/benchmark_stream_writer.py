@@ -0,0 +1,117 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+"""
+Compares StreamWriter, which uploads rolling gzip-compressed objects with multipart uploads while the messages are written, with the
+previous implementation which kept every message of the stream in memory and wrote a single uncompressed object at the end of the sync,
+on a synthetic stream. S3 is replaced by a client counting the uploaded bytes, with a fixed latency per request. Each design is run in
+its own process so that their peak memory usage can be compared.
+
+Usage: python bin/benchmark_stream_writer.py [--records 10000000] [--latency 0.05]
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import MagicMock
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from airbyte_cdk.models import DestinationSyncMode  # noqa: E402
+from destination_aws_datalake import stream_writer  # noqa: E402
+
+
+class CountingS3Client:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.uploaded_bytes = 0
+        self.objects = 0
+
+    def put_object(self, Bucket, Key, Body):
+        time.sleep(self.latency)
+        self.uploaded_bytes += len(Body.encode())
+        self.objects += 1
+
+    def create_multipart_upload(self, **kwargs):
+        time.sleep(self.latency)
+        return {"UploadId": "upload"}
+
+    def upload_part(self, Body, PartNumber, **kwargs):
+        time.sleep(self.latency)
+        self.uploaded_bytes += len(Body)
+        return {"ETag": f"etag{PartNumber}"}
+
+    def complete_multipart_upload(self, **kwargs):
+        time.sleep(self.latency)
+        self.objects += 1
+        return {"ETag": "etag"}
+
+
+class LegacyStreamWriter:
+    """StreamWriter as implemented before the objects were uploaded while the messages are written, without the Lake Formation calls"""
+
+    def __init__(self, s3_client: CountingS3Client):
+        self._s3_client = s3_client
+        self._messages = []
+
+    def append_message(self, message: str):
+        self._messages.append(message)
+
+    def add_to_datalake(self):
+        self._s3_client.put_object(Bucket="bucket", Key="prefix/table/object.json", Body="\n".join(self._messages))
+        self._messages = []
+
+
+def messages(records: int):
+    for i in range(records):
+        record = {"id": i, "name": f"user {i}", "email": f"user{i}@example.com", "score": i * 0.5, "active": i % 2 == 0}
+        yield json.dumps(record, default=str)
+
+
+def run(design: str, records: int, latency: float):
+    s3_client = CountingS3Client(latency)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        if design == "legacy":
+            writer = LegacyStreamWriter(s3_client)
+        else:
+            aws_handler = MagicMock(s3_client=s3_client)
+            config = MagicMock(lakeformation_database_name="db", bucket_name="bucket", bucket_prefix="prefix")
+            writer = stream_writer.StreamWriter("table", aws_handler, config, {}, DestinationSyncMode.append, executor=executor)
+            # only the upload of the objects is measured
+            writer._register_objects = lambda: None
+        for message in messages(records):
+            writer.append_message(message)
+        writer.add_to_datalake()
+    elapsed = time.perf_counter() - start
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"{design:<10} {elapsed:8.1f}s {records / elapsed:10.0f} records/s {s3_client.uploaded_bytes / 1e6:8.0f} MB uploaded"
+        f" in {s3_client.objects} objects, max RSS {max_rss:.0f} MiB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=10_000_000)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per S3 request")
+    parser.add_argument("--design", choices=["legacy", "streaming"], help="run a single design in this process")
+    args = parser.parse_args()
+
+    if args.design:
+        run(args.design, args.records, args.latency)
+        return
+    print(f"{args.records} records")
+    for design in ("legacy", "streaming"):
+        command = [sys.executable, __file__, "--design", design, "--records", str(args.records), "--latency", str(args.latency)]
+        subprocess.run(command, check=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -62,10 +62,6 @@ class AwsHandler:
     def head_object(self, object_key):
         return self.s3_client.head_object(Bucket=self._bucket_name, Key=object_key)
 
-    @retry(stop_max_attempt_number=10, wait_random_min=2000, wait_random_max=3000)
-    def put_object(self, object_key, body):
-        self.s3_client.put_object(Bucket=self._bucket_name, Key=object_key, Body="\n".join(body))
-
     @staticmethod
     def batch_iterate(iterable, n=1):
         size = len(iterable)
@@ -214,7 +210,12 @@ class AwsHandler:
         else:
             self.logger.debug("Table was empty, nothing to purge.")
 
-    def update_governed_table(self, txid, database, table, bucket, object_key, etag, size):
+    def update_governed_table(self, txid, database, table, bucket, objects):
+        """
+        Add the objects to the governed table, by batches of 99 objects.
+
+        :param objects: key, ETag and size of the objects
+        """
         self.logger.debug(f"Updating governed table {database}:{table}")
         write_ops = [
             {
@@ -224,14 +225,16 @@ class AwsHandler:
                     "Size": size,
                 }
             }
+            for object_key, etag, size in objects
         ]
 
-        self.lf_client.update_table_objects(
-            TransactionId=txid,
-            DatabaseName=database,
-            TableName=table,
-            WriteOperations=write_ops,
-        )
+        for batch in self.batch_iterate(write_ops, 99):
+            self.lf_client.update_table_objects(
+                TransactionId=txid,
+                DatabaseName=database,
+                TableName=table,
+                WriteOperations=batch,
+            )
 
 
 class LakeformationTransaction:
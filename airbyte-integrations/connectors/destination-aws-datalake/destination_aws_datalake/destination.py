@@ -4,6 +4,7 @@
 
 
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Iterable, Mapping
 
 from airbyte_cdk import AirbyteLogger
@@ -17,6 +18,9 @@ from .stream_writer import StreamWriter
 
 
 class DestinationAwsDatalake(Destination):
+    # Number of parts of the objects uploaded at the same time
+    upload_workers = 8
+
     def write(
         self, config: Mapping[str, Any], configured_catalog: ConfiguredAirbyteCatalog, input_messages: Iterable[AirbyteMessage]
     ) -> Iterable[AirbyteMessage]:
@@ -45,6 +49,8 @@ class DestinationAwsDatalake(Destination):
             raise
         self.logger.debug("AWS session creation OK")
 
+        upload_executor = ThreadPoolExecutor(max_workers=self.upload_workers, thread_name_prefix="datalake_upload")
+
         # creating stream writers
         streams = {
             s.stream.name: StreamWriter(
@@ -53,20 +59,32 @@ class DestinationAwsDatalake(Destination):
                 connector_config=connector_config,
                 schema=s.stream.json_schema["properties"],
                 sync_mode=s.destination_sync_mode,
+                executor=upload_executor,
             )
             for s in configured_catalog.streams
         }
 
-        for message in input_messages:
-            if message.type == Type.STATE:
-                yield message
-            else:
-                data = message.record.data
-                stream = message.record.stream
-                streams[stream].append_message(json.dumps(data, default=str))
-
-        for stream_name, stream in streams.items():
-            stream.add_to_datalake()
+        try:
+            for message in input_messages:
+                if message.type == Type.STATE:
+                    # the objects written before the state are added to the tables before it is emitted
+                    for stream in streams.values():
+                        if stream.has_pending_messages:
+                            stream.add_to_datalake()
+                    yield message
+                else:
+                    data = message.record.data
+                    stream = message.record.stream
+                    streams[stream].append_message(json.dumps(data, default=str))
+
+            for stream_name, stream in streams.items():
+                stream.add_to_datalake()
+        except BaseException:
+            for stream in streams.values():
+                stream.abort()
+            raise
+        finally:
+            upload_executor.shutdown(wait=False, cancel_futures=True)
 
     def check(self, logger: AirbyteLogger, config: Mapping[str, Any]) -> AirbyteConnectionStatus:
         """
@@ -0,0 +1,106 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import zlib
+from collections import deque
+from concurrent.futures import Executor, Future
+from typing import Deque, List, Mapping, Tuple
+
+from retrying import retry
+
+# Size of the compressed parts uploaded in the background, S3 requires at least 5 MiB for every part except the last one
+PART_SIZE = 8 * 1024 * 1024
+# Number of parts of an object uploaded or waiting to be uploaded, the writer waits for the oldest part above it
+MAX_PENDING_PARTS = 4
+# gzip compression level, the fastest levels compress JSON lines nearly as well as the default one
+COMPRESSION_LEVEL = 1
+# Number of characters of lines compressed at once, compressing every line separately is much slower
+COMPRESSION_CHUNK_SIZE = 1024 * 1024
+
+
+class GzipMultipartUpload:
+    """
+    S3 object made of gzip-compressed lines, uploaded with a multipart upload while it is written.
+
+    The lines are compressed by chunks of COMPRESSION_CHUNK_SIZE characters as they are written. Every PART_SIZE bytes of compressed data are uploaded as a part by the executor,
+    at most MAX_PENDING_PARTS parts are held in memory, so the memory used does not depend on the size of the object.
+    """
+
+    def __init__(self, s3_client, bucket: str, key: str, executor: Executor, part_size: int = PART_SIZE):
+        self._s3_client = s3_client
+        self._bucket = bucket
+        self.key = key
+        self._executor = executor
+        self._part_size = part_size
+        self._compressor = zlib.compressobj(COMPRESSION_LEVEL, wbits=16 + zlib.MAX_WBITS)
+        self._lines: List[str] = []
+        self._lines_size = 0
+        self._buffer = bytearray()
+        self._parts: Deque[Future] = deque()
+        self._uploaded_parts: List[Mapping[str, str]] = []
+        self.size = 0
+        self.lines = 0
+        self._raw_size = 0
+        self._upload_id = self._s3_client.create_multipart_upload(Bucket=bucket, Key=key)["UploadId"]
+
+    def write(self, line: str):
+        """
+        :param line: line to add to the object, without its line separator
+        """
+        self._lines.append(line)
+        self._lines_size += len(line) + 1
+        self.lines += 1
+        if self._lines_size >= COMPRESSION_CHUNK_SIZE:
+            self._compress_lines()
+            if len(self._buffer) >= self._part_size:
+                self._upload_part()
+
+    @property
+    def raw_size(self) -> int:
+        """Number of characters of the lines written to the object"""
+        return self._raw_size + self._lines_size
+
+    def _compress_lines(self):
+        self._lines.append("")
+        self._buffer += self._compressor.compress("\n".join(self._lines).encode())
+        self._raw_size += self._lines_size
+        self._lines = []
+        self._lines_size = 0
+
+    def _upload_part(self):
+        while len(self._parts) >= MAX_PENDING_PARTS:
+            self._uploaded_parts.append(self._parts.popleft().result())
+        part_number = len(self._uploaded_parts) + len(self._parts) + 1
+        body = bytes(self._buffer)
+        self._buffer = bytearray()
+        self.size += len(body)
+        self._parts.append(self._executor.submit(self._send_part, part_number, body))
+
+    @retry(stop_max_attempt_number=5, wait_random_min=1000, wait_random_max=2000)
+    def _send_part(self, part_number: int, body: bytes) -> Mapping[str, str]:
+        response = self._s3_client.upload_part(
+            Bucket=self._bucket, Key=self.key, UploadId=self._upload_id, PartNumber=part_number, Body=body
+        )
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+    def complete(self) -> Tuple[str, int]:
+        """
+        Upload the last part and complete the upload.
+
+        :return: the ETag and the size of the object
+        """
+        self._compress_lines()
+        self._buffer += self._compressor.flush()
+        self._upload_part()
+        while self._parts:
+            self._uploaded_parts.append(self._parts.popleft().result())
+        response = self._s3_client.complete_multipart_upload(
+            Bucket=self._bucket, Key=self.key, UploadId=self._upload_id, MultipartUpload={"Parts": self._uploaded_parts}
+        )
+        return response["ETag"], self.size
+
+    def abort(self):
+        for part in self._parts:
+            part.cancel()
+        self._s3_client.abort_multipart_upload(Bucket=self._bucket, Key=self.key, UploadId=self._upload_id)
@@ -2,6 +2,7 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+from concurrent.futures import Executor
 from datetime import datetime
 
 import nanoid
@@ -9,10 +10,22 @@ from airbyte_cdk.models import DestinationSyncMode
 from retrying import retry
 
 from .aws import AwsHandler, LakeformationTransaction
+from .multipart_upload import GzipMultipartUpload
+
+# Size of the uncompressed JSON lines of an S3 object, the next messages are written to a new object
+MAX_OBJECT_SIZE = 512 * 1024 * 1024
+# Number of keys of a DeleteObjects request
+DELETE_BATCH_SIZE = 1000
 
 
 class StreamWriter:
-    def __init__(self, name, aws_handler: AwsHandler, connector_config, schema, sync_mode):
+    """
+    Writes the messages of a stream to rolling gzip-compressed JSON lines objects of at most MAX_OBJECT_SIZE uncompressed bytes,
+    uploaded in the background while the messages are written. The objects written since the last call are added to the governed
+    table in a single Lake Formation transaction by add_to_datalake, the first transaction also purges the table in overwrite mode.
+    """
+
+    def __init__(self, name, aws_handler: AwsHandler, connector_config, schema, sync_mode, executor: Executor = None):
         self._db = connector_config.lakeformation_database_name
         self._bucket = connector_config.bucket_name
         self._prefix = connector_config.bucket_prefix
@@ -20,52 +33,87 @@ class StreamWriter:
         self._aws_handler = aws_handler
         self._schema = schema
         self._sync_mode = sync_mode
-        self._messages = []
+        self._executor = executor
+        self._upload = None
+        # key, ETag and size of the completed objects which were not added to the table yet
+        self._objects = []
+        self._purge = sync_mode == DestinationSyncMode.overwrite
         self._logger = aws_handler.logger
 
         self._logger.debug(f"Creating StreamWriter for {self._db}:{self._table}")
-        if sync_mode == DestinationSyncMode.overwrite:
-            self._logger.debug(f"StreamWriter mode is OVERWRITE, need to purge {self._db}:{self._table}")
-            with LakeformationTransaction(self._aws_handler) as tx:
-                self._aws_handler.purge_table(tx.txid, self._db, self._table)
 
     def append_message(self, message):
-        self._logger.debug(f"Appending message to table {self._table}")
-        self._messages.append(message)
+        if self._upload is None:
+            object_key = self.generate_object_key(f"{self._prefix}/{self._table}")
+            self._upload = GzipMultipartUpload(self._aws_handler.s3_client, self._bucket, object_key, self._executor)
+        self._upload.write(message)
+        if self._upload.raw_size >= MAX_OBJECT_SIZE:
+            self._complete_object()
+
+    def _complete_object(self):
+        upload, self._upload = self._upload, None
+        etag, size = upload.complete()
+        self._logger.debug(f"Object {upload.key} of table {self._table} was uploaded: {upload.lines} messages, {size} bytes")
+        self._objects.append((upload.key, etag, size))
 
     def generate_object_key(self, prefix=None):
         salt = nanoid.generate(size=10)
         base = datetime.now().strftime("%Y%m%d%H%M%S")
-        path = f"{base}.{salt}.json"
+        path = f"{base}.{salt}.json.gz"
         if prefix:
-            path = f"{prefix}/{base}.{salt}.json"
+            path = f"{prefix}/{base}.{salt}.json.gz"
 
         return path
 
-    @retry(stop_max_attempt_number=10, wait_random_min=2000, wait_random_max=3000)
+    @property
+    def has_pending_messages(self) -> bool:
+        """Whether messages were written since the last call to add_to_datalake"""
+        return self._upload is not None or len(self._objects) > 0
+
+    def abort(self):
+        """Abort the upload of the object being written and delete the objects which were not added to the table"""
+        if self._upload is not None:
+            upload, self._upload = self._upload, None
+            try:
+                upload.abort()
+            except Exception as e:
+                self._logger.error(f"Could not abort the upload of {upload.key}:\n{repr(e)}")
+        objects, self._objects = self._objects, []
+        for start in range(0, len(objects), DELETE_BATCH_SIZE):
+            keys = [{"Key": key} for key, _, _ in objects[start : start + DELETE_BATCH_SIZE]]
+            try:
+                self._aws_handler.s3_client.delete_objects(Bucket=self._bucket, Delete={"Objects": keys, "Quiet": True})
+            except Exception as e:
+                self._logger.error(f"Could not delete the objects of table {self._table} which were not added to it:\n{repr(e)}")
+
     def add_to_datalake(self):
+        """Complete the object being written and add the objects written since the last call to the table"""
+        if self._upload is not None:
+            self._complete_object()
+        self._register_objects()
+
+    @retry(stop_max_attempt_number=10, wait_random_min=2000, wait_random_max=3000)
+    def _register_objects(self):
         with LakeformationTransaction(self._aws_handler) as tx:
             self._logger.debug(f"Flushing messages to table {self._table}")
-            object_prefix = f"{self._prefix}/{self._table}"
             table_location = "s3://" + self._bucket + "/" + self._prefix + "/" + self._table + "/"
 
             table = self._aws_handler.get_table(tx.txid, self._db, self._table, table_location)
             self._aws_handler.update_table_schema(tx.txid, self._db, table, self._schema)
 
-            if len(self._messages) > 0:
+            if self._purge:
+                self._logger.debug(f"StreamWriter mode is OVERWRITE, need to purge {self._db}:{self._table}")
+                self._aws_handler.purge_table(tx.txid, self._db, self._table)
+
+            if len(self._objects) > 0:
                 try:
-                    self._logger.debug(f"There are {len(self._messages)} messages to flush for {self._table}")
-                    self._logger.debug(f"10 first messages >>> {repr(self._messages[0:10])} <<<")
-                    object_key = self.generate_object_key(object_prefix)
-                    self._aws_handler.put_object(object_key, self._messages)
-                    res = self._aws_handler.head_object(object_key)
-                    self._aws_handler.update_governed_table(
-                        tx.txid, self._db, self._table, self._bucket, object_key, res["ETag"], res["ContentLength"]
-                    )
+                    self._logger.debug(f"There are {len(self._objects)} objects to add to {self._table}")
+                    self._aws_handler.update_governed_table(tx.txid, self._db, self._table, self._bucket, self._objects)
                     self._logger.debug(f"Table {self._table} was updated")
                 except Exception as e:
                     self._logger.error(f"An exception was raised:\n{repr(e)}")
                     raise (e)
             else:
                 self._logger.debug(f"There was no message to flush for {self._table}")
-        self._messages = []
+        self._objects = []
+        self._purge = False
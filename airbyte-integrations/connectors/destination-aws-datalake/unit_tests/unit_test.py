@@ -2,6 +2,142 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import gzip
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import ANY, MagicMock, PropertyMock
+
+from airbyte_cdk.models import (
+    AirbyteMessage,
+    AirbyteRecordMessage,
+    AirbyteStateMessage,
+    AirbyteStream,
+    ConfiguredAirbyteCatalog,
+    ConfiguredAirbyteStream,
+    DestinationSyncMode,
+    SyncMode,
+    Type,
+)
+from destination_aws_datalake import DestinationAwsDatalake
+from destination_aws_datalake.multipart_upload import GzipMultipartUpload
+from destination_aws_datalake.stream_writer import StreamWriter
+
 
 def test_example_method():
     assert True
+
+
+def test_gzip_multipart_upload():
+    s3_client = MagicMock()
+    s3_client.create_multipart_upload.return_value = {"UploadId": "upload"}
+    s3_client.upload_part.side_effect = lambda PartNumber, **kwargs: {"ETag": f"etag{PartNumber}"}
+    s3_client.complete_multipart_upload.return_value = {"ETag": "object-etag"}
+    lines = [json.dumps({"id": i, "value": os.urandom(8).hex()}) for i in range(20000)]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        upload = GzipMultipartUpload(s3_client, "bucket", "key.json.gz", executor, part_size=64 * 1024)
+        for line in lines:
+            upload.write(line)
+        etag, size = upload.complete()
+
+    parts = sorted(s3_client.upload_part.mock_calls, key=lambda c: c.kwargs["PartNumber"])
+    body = b"".join(part.kwargs["Body"] for part in parts)
+    assert gzip.decompress(body).decode().splitlines() == lines
+    assert (etag, size) == ("object-etag", len(body))
+    s3_client.complete_multipart_upload.assert_called_once_with(
+        Bucket="bucket",
+        Key="key.json.gz",
+        UploadId="upload",
+        MultipartUpload={"Parts": [{"PartNumber": i + 1, "ETag": f"etag{i + 1}"} for i in range(len(parts))]},
+    )
+
+
+def test_stream_writer_rolls_objects(mocker):
+    mocker.patch("destination_aws_datalake.stream_writer.MAX_OBJECT_SIZE", 100)
+    upload = mocker.patch("destination_aws_datalake.stream_writer.GzipMultipartUpload")
+    upload.return_value.complete.return_value = ("etag", 10)
+    raw_sizes = iter([50, 100, 20])
+    type(upload.return_value).raw_size = PropertyMock(side_effect=lambda: next(raw_sizes))
+    mocker.patch("destination_aws_datalake.stream_writer.LakeformationTransaction")
+    aws_handler = MagicMock()
+    config = MagicMock(lakeformation_database_name="db", bucket_name="bucket", bucket_prefix="prefix")
+
+    writer = StreamWriter("table", aws_handler, config, {}, DestinationSyncMode.overwrite)
+    for message in ["a", "b", "c"]:
+        writer.append_message(message)
+    writer.add_to_datalake()
+
+    assert upload.call_count == 2
+    aws_handler.purge_table.assert_called_once()
+    aws_handler.update_governed_table.assert_called_once_with(ANY, "db", "table", "bucket", [(ANY, "etag", 10), (ANY, "etag", 10)])
+
+
+def test_stream_writer_purges_once(mocker):
+    upload = mocker.patch("destination_aws_datalake.stream_writer.GzipMultipartUpload")
+    upload.return_value.complete.return_value = ("etag", 10)
+    upload.return_value.raw_size = 1
+    mocker.patch("destination_aws_datalake.stream_writer.LakeformationTransaction")
+    aws_handler = MagicMock()
+    config = MagicMock(lakeformation_database_name="db", bucket_name="bucket", bucket_prefix="prefix")
+
+    writer = StreamWriter("table", aws_handler, config, {}, DestinationSyncMode.overwrite)
+    writer.append_message("a")
+    assert writer.has_pending_messages
+    writer.add_to_datalake()
+    assert not writer.has_pending_messages
+    writer.append_message("b")
+    writer.add_to_datalake()
+
+    aws_handler.purge_table.assert_called_once()
+    assert aws_handler.update_governed_table.call_count == 2
+
+
+def test_stream_writer_abort_deletes_completed_objects(mocker):
+    mocker.patch("destination_aws_datalake.stream_writer.MAX_OBJECT_SIZE", 100)
+    upload = mocker.patch("destination_aws_datalake.stream_writer.GzipMultipartUpload")
+    upload.return_value.complete.return_value = ("etag", 10)
+    upload.return_value.key = "prefix/table/object.json.gz"
+    raw_sizes = iter([100, 20])
+    type(upload.return_value).raw_size = PropertyMock(side_effect=lambda: next(raw_sizes))
+    aws_handler = MagicMock()
+    config = MagicMock(lakeformation_database_name="db", bucket_name="bucket", bucket_prefix="prefix")
+
+    writer = StreamWriter("table", aws_handler, config, {}, DestinationSyncMode.append)
+    writer.append_message("a")
+    writer.append_message("b")
+    writer.abort()
+
+    # the object being written is aborted, the completed one is deleted
+    upload.return_value.abort.assert_called_once()
+    aws_handler.s3_client.delete_objects.assert_called_once_with(
+        Bucket="bucket", Delete={"Objects": [{"Key": "prefix/table/object.json.gz"}], "Quiet": True}
+    )
+    assert not writer.has_pending_messages
+
+
+def test_state_is_emitted_once_the_previous_messages_are_added(mocker):
+    mocker.patch("destination_aws_datalake.destination.AwsHandler")
+    stream_writer = mocker.patch("destination_aws_datalake.destination.StreamWriter")
+    writer = stream_writer.return_value
+    writer.has_pending_messages = True
+    config = {"credentials": {"credentials_title": "IAM User"}, "bucket_name": "bucket", "lakeformation_database_name": "db"}
+    catalog = ConfiguredAirbyteCatalog(
+        streams=[
+            ConfiguredAirbyteStream(
+                stream=AirbyteStream(name="users", json_schema={"properties": {}}),
+                sync_mode=SyncMode.full_refresh,
+                destination_sync_mode=DestinationSyncMode.append,
+            )
+        ]
+    )
+    record = AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream="users", data={"id": 1}, emitted_at=0))
+    state = AirbyteMessage(type=Type.STATE, state=AirbyteStateMessage(data={"id": 1}))
+
+    output = DestinationAwsDatalake().write(config, catalog, [record, state, record])
+
+    assert next(output) == state
+    writer.add_to_datalake.assert_called_once()
+    assert list(output) == []
+    assert writer.add_to_datalake.call_count == 2
+    writer.abort.assert_not_called()
@@ -3,10 +3,8 @@
 #
 
 import json
-from datetime import datetime
 from logging import getLogger
 from typing import Any, Dict, Iterable, Mapping, Optional
-from uuid import uuid4
 
 from airbyte_cdk import AirbyteLogger
 from airbyte_cdk.destinations import Destination
@@ -86,22 +84,20 @@ class DestinationFirebolt(Destination):
                 if configured_stream.destination_sync_mode == DestinationSyncMode.overwrite:
                     writer.delete_table(configured_stream.stream.name)
                     logger.info(f"Stream {configured_stream.stream.name} is wiped.")
-                writer.create_raw_table(configured_stream.stream.name)
+                writer.create_raw_table(configured_stream.stream.name, configured_stream.stream.json_schema)
 
-            for message in input_messages:
-                if message.type == Type.STATE:
-                    yield message
-                elif message.type == Type.RECORD:
-                    data = message.record.data
-                    stream = message.record.stream
+            def selected_messages() -> Iterable[AirbyteMessage]:
+                for message in input_messages:
                     # Skip unselected streams
-                    if stream not in streams:
-                        logger.debug(f"Stream {stream} was not present in configured streams, skipping")
+                    if message.type == Type.RECORD and message.record.stream not in streams:
+                        logger.debug(f"Stream {message.record.stream} was not present in configured streams, skipping")
                         continue
-                    writer.queue_write_data(stream, str(uuid4()), datetime.now(), json.dumps(data))
+                    yield message
 
-            # Flush any leftover messages
-            writer.flush()
+            # State messages are emitted once the records received before them are written, leftover records are flushed at the end
+            for message in writer.buffered_writer().write(selected_messages()):
+                if message.type == Type.STATE:
+                    yield message
 
     def check(self, logger: AirbyteLogger, config: Mapping[str, Any]) -> AirbyteConnectionStatus:
         """
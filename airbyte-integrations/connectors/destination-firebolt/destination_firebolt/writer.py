@@ -3,33 +3,122 @@
 #
 
 import json
-from collections import defaultdict
+import threading
 from datetime import datetime
 from time import time
+from typing import Any, Dict, List, Mapping, NamedTuple, Optional
 from uuid import uuid4
 
 import pyarrow as pa
 import pyarrow.parquet as pq
 from airbyte_cdk import AirbyteLogger
+from airbyte_cdk.destinations import BufferedRecordWriter, RecordBatch, RecordSink
 from firebolt.db import Connection
 from pyarrow import fs
 
+# Column types of the top-level properties of the stream schemas written to typed columns: JSON type, Firebolt type and parquet type
+TYPED_COLUMN_TYPES = {
+    "string": ("TEXT", pa.string()),
+    "integer": ("BIGINT", pa.int64()),
+    "number": ("DOUBLE", pa.float64()),
+    "boolean": ("BOOLEAN", pa.bool_()),
+}
+RAW_COLUMNS = ("_airbyte_ab_id", "_airbyte_emitted_at", "_airbyte_data")
+# Synonyms of the typed column types which can be reported for the columns of an existing table
+FIREBOLT_TYPE_SYNONYMS = {
+    "STRING": "TEXT",
+    "VARCHAR": "TEXT",
+    "LONG": "BIGINT",
+    "INT8": "BIGINT",
+    "FLOAT8": "DOUBLE",
+    "DOUBLE PRECISION": "DOUBLE",
+    "BOOL": "BOOLEAN",
+}
+
+
+class TypedColumn(NamedTuple):
+    name: str
+    json_type: str
+    firebolt_type: str
+    arrow_type: pa.DataType
+
+    @property
+    def quoted_name(self) -> str:
+        escaped_name = self.name.replace('"', '""')
+        return f'"{escaped_name}"'
+
+    @property
+    def definition(self) -> str:
+        return f"{self.quoted_name} {self.firebolt_type} NULL"
+
+    def value(self, data: Mapping[str, Any]) -> Any:
+        """
+        :return: the value of the column in the record data, None if it does not match the type of the column
+        """
+        value = data.get(self.name)
+        if self.json_type == "string":
+            return value if isinstance(value, str) else None
+        if self.json_type == "boolean":
+            return value if isinstance(value, bool) else None
+        if isinstance(value, bool):
+            return None
+        if self.json_type == "integer":
+            return value if isinstance(value, int) and -(2**63) <= value < 2**63 else None
+        return float(value) if isinstance(value, (int, float)) else None
+
+
+def typed_columns(json_schema: Mapping[str, Any]) -> List[TypedColumn]:
+    """
+    Columns of the top-level properties of a stream schema with a single scalar type (nullable or not).
+    Values of the other properties are only written to _airbyte_data.
 
-class FireboltWriter:
+    :param json_schema: JSON schema of the stream.
+    """
+    columns = []
+    for name, schema in (json_schema.get("properties") or {}).items():
+        json_types = schema.get("type") if isinstance(schema, Mapping) else None
+        json_types = [json_types] if isinstance(json_types, str) else json_types or []
+        json_types = [json_type for json_type in json_types if json_type != "null"]
+        if len(json_types) == 1 and json_types[0] in TYPED_COLUMN_TYPES and name.lower() not in RAW_COLUMNS:
+            firebolt_type, arrow_type = TYPED_COLUMN_TYPES[json_types[0]]
+            columns.append(TypedColumn(name, json_types[0], firebolt_type, arrow_type))
+    return columns
+
+
+def firebolt_type(data_type: str) -> str:
+    """
+    :return: the type of a column as reported by information_schema, without nullability and with the names used by TYPED_COLUMN_TYPES
+    """
+    data_type = data_type.upper().replace(" NOT NULL", "").replace(" NULL", "").strip()
+    return FIREBOLT_TYPE_SYNONYMS.get(data_type, data_type)
+
+
+class FireboltWriter(RecordSink):
     """
     Base class for shared writer logic.
+    Records are buffered by a BufferedRecordWriter, see buffered_writer, which flushes them to the writer.
     """
 
-    flush_interval = 1000
+    # Size of the records flushed at once and number of batches flushed concurrently
+    max_buffer_bytes = 1024 * 1024
+    flush_workers = 1
 
-    def __init__(self, connection: Connection) -> None:
+    def __init__(self, connection: Connection, write_typed_columns: bool = False) -> None:
         """
         :param connection: Firebolt SDK connection class with established connection
             to the databse.
+        :param write_typed_columns: write the scalar top-level properties of the records to typed columns
+            in addition to _airbyte_data.
         """
         self.connection = connection
-        self._buffer = defaultdict(list)
-        self._values = 0
+        self.write_typed_columns = write_typed_columns
+        self._columns: Dict[str, List[TypedColumn]] = {}
+
+    def buffered_writer(self) -> BufferedRecordWriter:
+        """
+        :return: BufferedRecordWriter flushing the records to this writer
+        """
+        return BufferedRecordWriter(self, max_buffer_bytes=self.max_buffer_bytes, flush_workers=self.flush_workers)
 
     def delete_table(self, name: str) -> None:
         """
@@ -41,63 +130,95 @@ class FireboltWriter:
         cursor = self.connection.cursor()
         cursor.execute(f"DROP TABLE IF EXISTS _airbyte_raw_{name}")
 
-    def create_raw_table(self, name: str):
+    def columns_definition(self, name: str) -> str:
+        """
+        :param name: table name.
+        :return: the definition of the columns of the raw table of the stream
+        """
+        definitions = ["_airbyte_ab_id TEXT", "_airbyte_emitted_at TIMESTAMP", "_airbyte_data TEXT"]
+        definitions += [column.definition for column in self._columns.get(name, [])]
+        return ",\n            ".join(definitions)
+
+    def column_names(self, name: str) -> str:
+        """
+        :param name: table name.
+        :return: the list of the columns written to the raw table of the stream
+        """
+        return ", ".join(list(RAW_COLUMNS) + [column.quoted_name for column in self._columns.get(name, [])])
+
+    def existing_columns(self, name: str) -> Dict[str, str]:
+        """
+        :param name: table name.
+        :return: the types of the columns of the raw table of the stream by name, empty when the table does not exist
+        """
+        cursor = self.connection.cursor()
+        cursor.execute(
+            "SELECT column_name, data_type FROM information_schema.columns WHERE table_name = ?", parameters=(f"_airbyte_raw_{name}",)
+        )
+        return {column_name: firebolt_type(data_type) for column_name, data_type in cursor.fetchall()}
+
+    def create_raw_table(self, name: str, json_schema: Optional[Mapping[str, Any]] = None):
         """
         Create the resulting _airbyte_raw table.
 
         :param name: table name to create.
-        """
+        :param json_schema: JSON schema of the stream, its typed columns are created when write_typed_columns is set.
+            When the table already exists, only the typed columns it has with the type of the property are written.
+        """
+        if self.write_typed_columns and json_schema:
+            columns = typed_columns(json_schema)
+            existing_columns = self.existing_columns(name)
+            if existing_columns:
+                columns = [column for column in columns if existing_columns.get(column.name) == column.firebolt_type]
+            self._columns[name] = columns
         query = f"""
         CREATE FACT TABLE IF NOT EXISTS _airbyte_raw_{name} (
-            _airbyte_ab_id TEXT,
-            _airbyte_emitted_at TIMESTAMP,
-            _airbyte_data TEXT
+            {self.columns_definition(name)}
         )
         PRIMARY INDEX _airbyte_ab_id
         """
         cursor = self.connection.cursor()
         cursor.execute(query)
 
-    def queue_write_data(self, stream_name: str, id: str, time: datetime, record: str) -> None:
+    def rows(self, batch: RecordBatch) -> List[tuple]:
         """
-        Queue up data in a buffer in memory before writing to the database.
-        When flush_interval is reached data is persisted.
-
-        :param stream_name: name of the stream for which the data corresponds.
-        :param id: unique identifier of this data row.
-        :param time: time of writing.
-        :param record: string representation of the json data payload.
+        :return: the rows of the raw table of the records: id, time of writing, string representation of the json data payload
+            and the values of the typed columns.
         """
-        self._buffer[stream_name].append((id, time, record))
-        self._values += 1
-        if self._values == self.flush_interval:
-            self._flush()
+        written_at = datetime.now()
+        columns = self._columns.get(batch.stream, [])
+        return [
+            (str(uuid4()), written_at, json.dumps(record.data), *[column.value(record.data) for column in columns])
+            for record in batch.records
+        ]
 
-    def _flush(self):
+    def flush(self, batch: RecordBatch) -> None:
         """
-        Stub for the intermediate data flush that's triggered during the
-        buffering operation.
+        Stub for the data flush of a batch of records, called from the flush threads of the BufferedRecordWriter.
         """
         raise NotImplementedError()
 
-    def flush(self):
+    def close(self) -> None:
         """
-        Stub for the data flush at the end of writing operation.
+        Stub for the end of the writing operation, once every batch was flushed.
         """
-        raise NotImplementedError()
 
 
 class FireboltS3Writer(FireboltWriter):
     """
     Data writer using the S3 strategy. Data is buffered in memory
-    before being flushed to S3 in .parquet format. At the end of
-    the operation data is written to Firebolt databse from S3, allowing
-    greater ingestion speed.
+    before being flushed to S3 in .parquet format, the parts are uploaded
+    in parallel while the input keeps being read. Every part is written to
+    the Firebolt database from S3 before its flush returns, so the STATE
+    messages following its records are only emitted once they are persisted.
     """
 
-    flush_interval = 100000
+    max_buffer_bytes = 32 * 1024 * 1024
+    flush_workers = 4
 
-    def __init__(self, connection: Connection, s3_bucket: str, access_key: str, secret_key: str, s3_region: str) -> None:
+    def __init__(
+        self, connection: Connection, s3_bucket: str, access_key: str, secret_key: str, s3_region: str, write_typed_columns: bool = False
+    ) -> None:
         """
         :param connection: Firebolt SDK connection class with established connection
             to the databse.
@@ -106,53 +227,49 @@ class FireboltS3Writer(FireboltWriter):
         :param access_key: AWS Access Key ID that has read/write/delete permissions on the files in the bucket.
         :param secret_key: Corresponding AWS Secret Key.
         :param s3_region: S3 region. Best to keep this the same as Firebolt database region. Default us-east-1.
+        :param write_typed_columns: write the scalar top-level properties of the records to typed columns
+            in addition to _airbyte_data.
         """
-        super().__init__(connection)
+        super().__init__(connection, write_typed_columns)
         self.key_id = access_key
         self.secret_key = secret_key
         self.s3_bucket = s3_bucket
-        self._updated_tables = set()
+        self._ingest_lock = threading.Lock()
         self.unique_dir = f"{int(time())}_{uuid4()}"
         self.fs = fs.S3FileSystem(access_key=access_key, secret_key=secret_key, region=s3_region)
 
-    def _flush(self) -> None:
+    def flush(self, batch: RecordBatch) -> None:
         """
-        Intermediate data flush that's triggered during the
-        buffering operation. Uploads data stored in memory to the S3.
+        Uploads a batch of records to S3 as a parquet file and ingests it into the raw table, called from the flush threads of the
+        BufferedRecordWriter. The uploads run in parallel, the statements of the ingestion are sent one at a time on the connection.
         """
-        for table, data in self._buffer.items():
-            key_list, ts_list, payload = zip(*data)
-            upload_data = [pa.array(key_list), pa.array(ts_list), pa.array(payload)]
-            pa_table = pa.table(upload_data, names=["_airbyte_ab_id", "_airbyte_emitted_at", "_airbyte_data"])
-            pq.write_to_dataset(table=pa_table, root_path=f"{self.s3_bucket}/airbyte_output/{self.unique_dir}/{table}", filesystem=self.fs)
-        # Update tables
-        self._updated_tables.update(self._buffer.keys())
-        self._buffer.clear()
-        self._values = 0
-
-    def flush(self) -> None:
-        """
-        Flush any leftover data after ingestion and write from S3 to Firebolt.
-        Intermediate data on S3 and External Table will be deleted after write is complete.
-        """
-        self._flush()
-        for table in self._updated_tables:
-            self.create_raw_table(table)
-            self.create_external_table(table)
-            self.ingest_data(table)
-            self.cleanup(table)
+        table = batch.stream
+        part = str(uuid4()).replace("-", "")
+        columns = self._columns.get(table, [])
+        names = list(RAW_COLUMNS) + [column.name for column in columns]
+        types = [pa.string(), pa.timestamp("us"), pa.string()] + [column.arrow_type for column in columns]
+        upload_data = [pa.array(values, type=type_) for values, type_ in zip(zip(*self.rows(batch)), types)]
+        pa_table = pa.table(upload_data, names=names)
+        pq.write_to_dataset(
+            table=pa_table, root_path=f"{self.s3_bucket}/airbyte_output/{self.unique_dir}/{table}/{part}", filesystem=self.fs
+        )
+        with self._ingest_lock:
+            try:
+                self.create_external_table(table, part)
+                self.ingest_data(table, part)
+            finally:
+                self.cleanup(table, part)
 
-    def create_external_table(self, name: str) -> None:
+    def create_external_table(self, name: str, part: str) -> None:
         """
-        Create Firebolt External Table to interface with the files on S3.
+        Create Firebolt External Table to interface with the files of a part on S3.
 
         :param name: Stream name from which the table name is derived.
+        :param part: Part of the stream uploaded by a flush.
         """
         query = f"""
-        CREATE EXTERNAL TABLE IF NOT EXISTS ex_airbyte_raw_{name} (
-            _airbyte_ab_id TEXT,
-            _airbyte_emitted_at TIMESTAMP,
-            _airbyte_data TEXT
+        CREATE EXTERNAL TABLE IF NOT EXISTS ex_airbyte_raw_{name}_{part} (
+            {self.columns_definition(name)}
         )
         URL = ?
         CREDENTIALS = ( AWS_KEY_ID = ? AWS_SECRET_KEY = ? )
@@ -160,63 +277,59 @@ class FireboltS3Writer(FireboltWriter):
         TYPE = (PARQUET);
         """
         cursor = self.connection.cursor()
-        cursor.execute(query, parameters=(f"s3://{self.s3_bucket}/airbyte_output/{self.unique_dir}/{name}", self.key_id, self.secret_key))
+        url = f"s3://{self.s3_bucket}/airbyte_output/{self.unique_dir}/{name}/{part}"
+        cursor.execute(query, parameters=(url, self.key_id, self.secret_key))
 
-    def ingest_data(self, name: str) -> None:
+    def ingest_data(self, name: str, part: str) -> None:
         """
         Write data from External Table to the _airbyte_raw table effectively
-        persisting data in Firebolt.
+        persisting data in Firebolt. The typed columns are copied as is, without parsing _airbyte_data.
 
         :param name: Stream name from which the table name is derived.
+        :param part: Part of the stream uploaded by a flush.
         """
-        query = f"INSERT INTO _airbyte_raw_{name} SELECT * FROM ex_airbyte_raw_{name}"
+        columns = self.column_names(name)
+        query = f"INSERT INTO _airbyte_raw_{name} ({columns}) SELECT {columns} FROM ex_airbyte_raw_{name}_{part}"
         cursor = self.connection.cursor()
         cursor.execute(query)
 
-    def cleanup(self, name: str) -> None:
+    def cleanup(self, name: str, part: str) -> None:
         """
-        Clean intermediary External tables and wipe the S3 folder.
+        Clean the intermediary External table and wipe the S3 folder of a part.
 
         :param name: Stream name from which the table name is derived.
+        :param part: Part of the stream uploaded by a flush.
         """
         cursor = self.connection.cursor()
-        cursor.execute(f"DROP TABLE IF EXISTS ex_airbyte_raw_{name}")
-        self.fs.delete_dir_contents(f"{self.s3_bucket}/airbyte_output/{self.unique_dir}/{name}")
+        cursor.execute(f"DROP TABLE IF EXISTS ex_airbyte_raw_{name}_{part}")
+        self.fs.delete_dir(f"{self.s3_bucket}/airbyte_output/{self.unique_dir}/{name}/{part}")
 
 
 class FireboltSQLWriter(FireboltWriter):
     """
     Data writer using the SQL writing strategy. Data is buffered in memory
-    and flushed using INSERT INTO SQL statement. This is less effective strategy
+    and flushed using multi-row INSERT INTO SQL statements. This is less effective strategy
     better suited for testing and small data sets.
     """
 
-    flush_interval = 1000
+    # Number of rows inserted by a single INSERT statement
+    insert_batch_size = 500
 
-    def __init__(self, connection: Connection) -> None:
+    def flush(self, batch: RecordBatch) -> None:
         """
-        :param connection: Firebolt SDK connection class with established connection
-            to the databse.
-        """
-        super().__init__(connection)
-
-    def _flush(self) -> None:
-        """
-        Intermediate data flush that's triggered during the
-        buffering operation. Writes data stored in memory via SQL commands.
+        Writes a batch of records via SQL commands, called from the flush thread of the BufferedRecordWriter.
         """
         cursor = self.connection.cursor()
-        # id, written_at, data
-        for table, data in self._buffer.items():
-            cursor.executemany(f"INSERT INTO _airbyte_raw_{table} VALUES (?, ?, ?)", parameters_seq=data)
-        self._buffer.clear()
-        self._values = 0
-
-    def flush(self) -> None:
-        """
-        Final data flush after all data has been written to memory.
-        """
-        self._flush()
+        rows = self.rows(batch)
+        # id, written_at, data and the typed columns
+        placeholders = "(" + ", ".join(["?"] * (len(RAW_COLUMNS) + len(self._columns.get(batch.stream, [])))) + ")"
+        for start in range(0, len(rows), self.insert_batch_size):
+            chunk = rows[start : start + self.insert_batch_size]
+            values = ", ".join([placeholders] * len(chunk))
+            cursor.execute(
+                f"INSERT INTO _airbyte_raw_{batch.stream} ({self.column_names(batch.stream)}) VALUES {values}",
+                parameters=[value for row in chunk for value in row],
+            )
 
 
 def create_firebolt_wirter(connection: Connection, config: json, logger: AirbyteLogger) -> FireboltWriter:
@@ -228,8 +341,9 @@ def create_firebolt_wirter(connection: Connection, config: json, logger: Airbyte
             config["loading_method"]["aws_key_id"],
             config["loading_method"]["aws_key_secret"],
             config["loading_method"]["s3_region"],
+            write_typed_columns=config.get("write_typed_columns", False),
         )
     else:
         logger.info("Using the SQL writing strategy")
-        writer = FireboltSQLWriter(connection)
+        writer = FireboltSQLWriter(connection, write_typed_columns=config.get("write_typed_columns", False))
     return writer
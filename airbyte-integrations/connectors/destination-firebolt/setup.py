@@ -5,7 +5,7 @@
 
 from setuptools import find_packages, setup
 
-MAIN_REQUIREMENTS = ["airbyte-cdk", "firebolt-sdk>=0.8.0", "pyarrow"]
+MAIN_REQUIREMENTS = ["airbyte-cdk>=0.1.70", "firebolt-sdk>=0.8.0", "pyarrow"]
 
 TEST_REQUIREMENTS = ["pytest~=6.1"]
 
@@ -6,6 +6,7 @@ from datetime import datetime
 from typing import Any, Dict
 from unittest.mock import MagicMock, call, patch
 
+from airbyte_cdk.destinations import BufferedRecordWriter
 from airbyte_cdk.models import (
     AirbyteMessage,
     AirbyteRecordMessage,
@@ -63,6 +64,10 @@ def config_no_engine() -> Dict[str, str]:
     return args
 
 
+def buffer_writes(mock_writer: MagicMock) -> None:
+    mock_writer.return_value.buffered_writer.side_effect = lambda: BufferedRecordWriter(mock_writer.return_value)
+
+
 @fixture
 def logger() -> MagicMock:
     return MagicMock()
@@ -179,15 +184,22 @@ def test_sql_write_append(
     airbyte_state_message: AirbyteMessage,
 ) -> None:
     catalog = ConfiguredAirbyteCatalog(streams=[configured_stream1, configured_stream2])
+    buffer_writes(mock_writer)
 
     destination = DestinationFirebolt()
     result = destination.write(config, catalog, [airbyte_message1, airbyte_state_message, airbyte_message2])
 
     assert list(result) == [airbyte_state_message]
     mock_writer.return_value.delete_table.assert_not_called()
-    mock_writer.return_value.create_raw_table.mock_calls = [call(mock_connection, "table1"), call(mock_connection, "table2")]
-    assert len(mock_writer.return_value.queue_write_data.mock_calls) == 2
-    mock_writer.return_value.flush.assert_called_once()
+    mock_writer.return_value.create_raw_table.assert_has_calls(
+        [call("table1", configured_stream1.stream.json_schema), call("table2", configured_stream2.stream.json_schema)]
+    )
+    batches = [flush.args[0] for flush in mock_writer.return_value.flush.mock_calls]
+    assert [(batch.stream, [record.data for record in batch.records]) for batch in batches] == [
+        ("table1", [airbyte_message1.record.data]),
+        ("table2", [airbyte_message2.record.data]),
+    ]
+    mock_writer.return_value.close.assert_called_once()
 
 
 @patch("destination_firebolt.writer.FireboltS3Writer")
@@ -207,6 +219,7 @@ def test_sql_write_overwrite(
     # Overwrite triggers a delete
     configured_stream1.destination_sync_mode = DestinationSyncMode.overwrite
     catalog = ConfiguredAirbyteCatalog(streams=[configured_stream1, configured_stream2])
+    buffer_writes(mock_writer)
 
     destination = DestinationFirebolt()
     result = destination.write(config, catalog, [airbyte_message1, airbyte_state_message, airbyte_message2])
@@ -214,7 +227,9 @@ def test_sql_write_overwrite(
     mock_s3_writer.assert_not_called()
     assert list(result) == [airbyte_state_message]
     mock_writer.return_value.delete_table.assert_called_once_with("table1")
-    mock_writer.return_value.create_raw_table.mock_calls = [call(mock_connection, "table1"), call(mock_connection, "table2")]
+    mock_writer.return_value.create_raw_table.assert_has_calls(
+        [call("table1", configured_stream1.stream.json_schema), call("table2", configured_stream2.stream.json_schema)]
+    )
 
 
 @patch("destination_firebolt.writer.FireboltS3Writer")
@@ -231,6 +246,7 @@ def test_s3_write(
     airbyte_state_message: AirbyteMessage,
 ):
     catalog = ConfiguredAirbyteCatalog(streams=[configured_stream1, configured_stream2])
+    buffer_writes(mock_s3_writer)
 
     destination = DestinationFirebolt()
     result = destination.write(config_external_table, catalog, [airbyte_message1, airbyte_state_message, airbyte_message2])
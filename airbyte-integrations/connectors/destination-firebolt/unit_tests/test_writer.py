@@ -5,8 +5,27 @@
 from typing import Any, Union
 from unittest.mock import ANY, MagicMock, call, patch
 
-from destination_firebolt.writer import FireboltS3Writer, FireboltSQLWriter
-from pytest import fixture, mark
+import pyarrow as pa
+from airbyte_cdk.destinations import RecordBatch
+from airbyte_cdk.models import AirbyteMessage, AirbyteRecordMessage, AirbyteStateMessage, Type
+from destination_firebolt.writer import FireboltS3Writer, FireboltSQLWriter, typed_columns
+from pytest import fixture, mark, raises
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": ["null", "string"]},
+        "count": {"type": "integer"},
+        "price": {"type": "number"},
+        "active": {"type": "boolean"},
+        "tags": {"type": "array", "items": {"type": "string"}},
+        "either": {"type": ["string", "integer"]},
+    },
+}
+
+
+def batch(stream: str, *data: dict) -> RecordBatch:
+    return RecordBatch(stream=stream, namespace=None, records=[AirbyteRecordMessage(stream=stream, data=d, emitted_at=0) for d in data])
 
 
 @fixture
@@ -28,11 +47,6 @@ def s3_writer(connection: MagicMock) -> FireboltS3Writer:
         return FireboltS3Writer(connection, "dummy_bucket", "access_key", "secret_key", "us-east-1")
 
 
-def test_sql_default(sql_writer: FireboltSQLWriter) -> None:
-    assert len(sql_writer._buffer) == 0
-    assert sql_writer.flush_interval == 1000
-
-
 @mark.parametrize("writer", ["sql_writer", "s3_writer"])
 def test_sql_create(connection: MagicMock, writer: Union[FireboltSQLWriter, FireboltS3Writer], request: Any) -> None:
     writer = request.getfixturevalue(writer)
@@ -48,109 +62,151 @@ def test_sql_create(connection: MagicMock, writer: Union[FireboltSQLWriter, Fire
     connection.cursor.return_value.execute.assert_called_once_with(expected_query)
 
 
-def test_data_buffering(sql_writer: FireboltSQLWriter) -> None:
-    sql_writer.queue_write_data("dummy", "id1", 20200101, '{"key": "value"}')
-    sql_writer._buffer["dummy"][0] == ("id1", 20200101, '{"key": "value"}')
-    assert len(sql_writer._buffer["dummy"]) == 1
-    assert len(sql_writer._buffer.keys()) == 1
-    sql_writer.queue_write_data("dummy", "id2", 20200102, '{"key2": "value2"}')
-    sql_writer._buffer["dummy"][0] == ("id2", 20200102, '{"key2": "value2"}')
-    assert len(sql_writer._buffer["dummy"]) == 2
-    assert len(sql_writer._buffer.keys()) == 1
-    sql_writer.queue_write_data("dummy2", "id3", 20200103, '{"key3": "value3"}')
-    sql_writer._buffer["dummy"][0] == ("id3", 20200103, '{"key3": "value3"}')
-    assert len(sql_writer._buffer["dummy"]) == 2
-    assert len(sql_writer._buffer["dummy2"]) == 1
-    assert len(sql_writer._buffer.keys()) == 2
-
-
-def test_data_auto_flush_one_table(connection: MagicMock, sql_writer: FireboltSQLWriter) -> None:
-    sql_writer.flush_interval = 2
-    sql_writer.queue_write_data("dummy", "id1", 20200101, '{"key": "value"}')
-    connection.cursor.return_value.executemany.assert_not_called()
-    assert sql_writer._values == 1
-    sql_writer.queue_write_data("dummy", "id1", 20200101, '{"key": "value"}')
-    connection.cursor.return_value.executemany.assert_called_once()
-    assert len(sql_writer._buffer.keys()) == 0
-    assert sql_writer._values == 0
-    sql_writer.queue_write_data("dummy", "id1", 20200101, '{"key": "value"}')
-    assert len(sql_writer._buffer.keys()) == 1
-
-
-def test_data_auto_flush_multi_tables(connection: MagicMock, sql_writer: FireboltSQLWriter) -> None:
-    sql_writer.flush_interval = 2
-    sql_writer.queue_write_data("dummy", "id1", 20200101, '{"key": "value"}')
-    connection.cursor.return_value.executemany.assert_not_called()
-    assert sql_writer._values == 1
-    sql_writer.queue_write_data("dummy2", "id1", 20200101, '{"key": "value"}')
-    assert len(connection.cursor.return_value.executemany.mock_calls) == 2
-    assert len(sql_writer._buffer.keys()) == 0
-    assert sql_writer._values == 0
-
-
-def test_s3_default(s3_writer: FireboltS3Writer) -> None:
-    assert s3_writer.flush_interval == 100000
-    assert s3_writer._values == 0
-    assert len(s3_writer._buffer.keys()) == 0
-
-
 def test_s3_delete_tables(connection: MagicMock, s3_writer: FireboltS3Writer) -> None:
     expected_sql = "DROP TABLE IF EXISTS _airbyte_raw_dummy"
     s3_writer.delete_table("dummy")
     connection.cursor.return_value.execute.assert_called_once_with(expected_sql)
 
 
-@patch("pyarrow.parquet.write_to_dataset")
-def test_s3_data_auto_flush_one_table(mock_write: MagicMock, s3_writer: FireboltS3Writer) -> None:
-    s3_writer.flush_interval = 2
-    s3_writer.queue_write_data("dummy", "id1", 20200101, '{"key": "value"}')
-    mock_write.assert_not_called()
-    assert s3_writer._values == 1
-    s3_writer.queue_write_data("dummy", "id1", 20200101, '{"key": "value"}')
-    mock_write.assert_called_once_with(table=ANY, root_path="dummy_bucket/airbyte_output/111_dummy-uuid/dummy", filesystem=s3_writer.fs)
-    assert len(s3_writer._buffer.keys()) == 0
-    assert s3_writer._values == 0
-    assert s3_writer._updated_tables == set(["dummy"])
-    mock_write.reset_mock()
-    s3_writer.queue_write_data("dummy", "id1", 20200101, '{"key": "value"}')
-    mock_write.assert_not_called()
-    assert len(s3_writer._buffer.keys()) == 1
-    assert s3_writer._updated_tables == set(["dummy"])
+def test_s3_cleanup(connection: MagicMock, s3_writer: FireboltS3Writer) -> None:
+    expected_sql = "DROP TABLE IF EXISTS ex_airbyte_raw_my_table_part"
+    bucket_path = "dummy_bucket/airbyte_output/111_dummy-uuid/my_table/part"
+    s3_writer.cleanup("my_table", "part")
+    connection.cursor.return_value.execute.assert_called_once_with(expected_sql)
+    s3_writer.fs.delete_dir.assert_called_once_with(bucket_path)
 
 
+def test_typed_columns() -> None:
+    columns = typed_columns(SCHEMA)
+    assert [(column.name, column.firebolt_type) for column in columns] == [
+        ("name", "TEXT"),
+        ("count", "BIGINT"),
+        ("price", "DOUBLE"),
+        ("active", "BOOLEAN"),
+    ]
+    data = {"name": 1, "count": True, "price": 3, "active": "yes"}
+    assert [column.value(data) for column in columns] == [None, None, 3.0, None]
+
+
+def test_create_typed_table(connection: MagicMock) -> None:
+    writer = FireboltSQLWriter(connection, write_typed_columns=True)
+    writer.create_raw_table("dummy", {"properties": {"count": {"type": "integer"}, 'a"b': {"type": "string"}}})
+    query = connection.cursor.return_value.execute.call_args[0][0]
+    assert '_airbyte_data TEXT,\n            "count" BIGINT NULL,\n            "a""b" TEXT NULL\n' in query
+
+
+def test_create_typed_table_existing_table(connection: MagicMock) -> None:
+    """Only the typed columns the table created by an earlier sync has with the same type are written"""
+    connection.cursor.return_value.fetchall.return_value = [
+        ("_airbyte_ab_id", "TEXT"),
+        ("_airbyte_emitted_at", "TIMESTAMP"),
+        ("_airbyte_data", "TEXT"),
+        ("name", "text NULL"),
+        ("count", "TEXT NULL"),
+        ("price", "double precision"),
+        ("removed", "BOOLEAN NULL"),
+    ]
+    writer = FireboltSQLWriter(connection, write_typed_columns=True)
+    writer.create_raw_table("dummy", SCHEMA)
+    assert writer.column_names("dummy") == '_airbyte_ab_id, _airbyte_emitted_at, _airbyte_data, "name", "price"'
+    connection.cursor.return_value.execute.assert_any_call(
+        "SELECT column_name, data_type FROM information_schema.columns WHERE table_name = ?", parameters=("_airbyte_raw_dummy",)
+    )
+
+    connection.reset_mock()
+    writer.flush(batch("dummy", {"name": "a", "count": 1, "price": 2}))
+    query, parameters = (
+        connection.cursor.return_value.execute.call_args[0][0],
+        connection.cursor.return_value.execute.call_args[1]["parameters"],
+    )
+    assert (
+        query
+        == 'INSERT INTO _airbyte_raw_dummy (_airbyte_ab_id, _airbyte_emitted_at, _airbyte_data, "name", "price") VALUES (?, ?, ?, ?, ?)'
+    )
+    assert parameters[3:] == ["a", 2.0]
+
+
+@mark.parametrize(
+    "write_typed_columns, expected_parameters, expected_columns",
+    [
+        (False, 3, "_airbyte_ab_id, _airbyte_emitted_at, _airbyte_data"),
+        (True, 7, '_airbyte_ab_id, _airbyte_emitted_at, _airbyte_data, "name", "count", "price", "active"'),
+    ],
+)
+def test_sql_flush(connection: MagicMock, write_typed_columns: bool, expected_parameters: int, expected_columns: str) -> None:
+    writer = FireboltSQLWriter(connection, write_typed_columns=write_typed_columns)
+    writer.insert_batch_size = 2
+    writer.create_raw_table("dummy", SCHEMA)
+    connection.reset_mock()
+    writer.flush(batch("dummy", {"name": "a", "count": 1}, {"name": "b"}, {"name": "c"}))
+    execute = connection.cursor.return_value.execute
+    assert len(execute.mock_calls) == 2
+    placeholders = "(" + ", ".join(["?"] * expected_parameters) + ")"
+    execute.assert_any_call(f"INSERT INTO _airbyte_raw_dummy ({expected_columns}) VALUES {placeholders}, {placeholders}", parameters=ANY)
+    execute.assert_any_call(f"INSERT INTO _airbyte_raw_dummy ({expected_columns}) VALUES {placeholders}", parameters=ANY)
+    parameters = execute.mock_calls[0].kwargs["parameters"]
+    assert len(parameters) == 2 * expected_parameters
+    assert parameters[2] == '{"name": "a", "count": 1}'
+    if write_typed_columns:
+        assert parameters[3:7] == ["a", 1, None, None]
+
+
+@patch("destination_firebolt.writer.uuid4", MagicMock(side_effect=["part-1", "id-1", "part-2", "id-2"]))
 @patch("pyarrow.parquet.write_to_dataset")
-def test_s3_data_auto_flush_multi_tables(mock_write: MagicMock, s3_writer: FireboltS3Writer) -> None:
-    s3_writer.flush_interval = 2
-    s3_writer.queue_write_data("dummy", "id1", 20200101, '{"key": "value"}')
-    mock_write.assert_not_called()
-    assert s3_writer._values == 1
-    s3_writer.queue_write_data("dummy2", "id1", 20200101, '{"key": "value"}')
+def test_s3_flush(mock_write: MagicMock, connection: MagicMock, s3_writer: FireboltS3Writer) -> None:
+    s3_writer.flush(batch("dummy", {"key": "value"}))
+    s3_writer.flush(batch("dummy2", {"key": "value"}))
     assert mock_write.mock_calls == [
-        call(table=ANY, root_path="dummy_bucket/airbyte_output/111_dummy-uuid/dummy", filesystem=s3_writer.fs),
-        call(table=ANY, root_path="dummy_bucket/airbyte_output/111_dummy-uuid/dummy2", filesystem=s3_writer.fs),
+        call(table=ANY, root_path="dummy_bucket/airbyte_output/111_dummy-uuid/dummy/part1", filesystem=s3_writer.fs),
+        call(table=ANY, root_path="dummy_bucket/airbyte_output/111_dummy-uuid/dummy2/part2", filesystem=s3_writer.fs),
+    ]
+    table = mock_write.mock_calls[0].kwargs["table"]
+    assert table.column_names == ["_airbyte_ab_id", "_airbyte_emitted_at", "_airbyte_data"]
+    assert table.column("_airbyte_data").to_pylist() == ['{"key": "value"}']
+
+    # every part is ingested before the flush returns
+    execute = connection.cursor.return_value.execute
+    assert len(execute.mock_calls) == 6
+    expected_url = "s3://dummy_bucket/airbyte_output/111_dummy-uuid/dummy/part1"
+    execute.assert_any_call(ANY, parameters=(expected_url, "access_key", "secret_key"))
+    columns = "_airbyte_ab_id, _airbyte_emitted_at, _airbyte_data"
+    execute.assert_any_call(f"INSERT INTO _airbyte_raw_dummy ({columns}) SELECT {columns} FROM ex_airbyte_raw_dummy_part1")
+    execute.assert_any_call(f"INSERT INTO _airbyte_raw_dummy2 ({columns}) SELECT {columns} FROM ex_airbyte_raw_dummy2_part2")
+    execute.assert_any_call("DROP TABLE IF EXISTS ex_airbyte_raw_dummy2_part2")
+    assert s3_writer.fs.delete_dir.mock_calls == [
+        call("dummy_bucket/airbyte_output/111_dummy-uuid/dummy/part1"),
+        call("dummy_bucket/airbyte_output/111_dummy-uuid/dummy2/part2"),
     ]
-    assert len(s3_writer._buffer.keys()) == 0
-    assert s3_writer._values == 0
-    assert s3_writer._updated_tables == set(["dummy", "dummy2"])
 
 
-def test_s3_final_flush(connection: MagicMock, s3_writer: FireboltS3Writer) -> None:
-    s3_writer._updated_tables = set(["dummy", "dummy2"])
-    s3_writer.flush()
-    assert len(connection.cursor.return_value.execute.mock_calls) == 8
-    expected_url1 = "s3://dummy_bucket/airbyte_output/111_dummy-uuid/dummy"
-    expected_url2 = "s3://dummy_bucket/airbyte_output/111_dummy-uuid/dummy2"
-    connection.cursor.return_value.execute.assert_any_call(ANY, parameters=(expected_url1, "access_key", "secret_key"))
-    connection.cursor.return_value.execute.assert_any_call(ANY, parameters=(expected_url2, "access_key", "secret_key"))
-    expected_query1 = "INSERT INTO _airbyte_raw_dummy SELECT * FROM ex_airbyte_raw_dummy"
-    expected_query2 = "INSERT INTO _airbyte_raw_dummy2 SELECT * FROM ex_airbyte_raw_dummy2"
-    connection.cursor.return_value.execute.assert_any_call(expected_query1)
-    connection.cursor.return_value.execute.assert_any_call(expected_query2)
+@patch("pyarrow.parquet.write_to_dataset")
+def test_s3_no_state_when_ingestion_fails(mock_write: MagicMock, s3_writer: FireboltS3Writer) -> None:
+    messages = [
+        AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream="dummy", data={"key": "value"}, emitted_at=0)),
+        AirbyteMessage(type=Type.STATE, state=AirbyteStateMessage(data={"cursor": 1})),
+    ]
+    emitted = []
+    with patch.object(s3_writer, "ingest_data", MagicMock(side_effect=Exception("ingestion failed"))):
+        with raises(Exception, match="ingestion failed"):
+            for message in s3_writer.buffered_writer().write(iter(messages)):
+                emitted.append(message)
 
+    assert [message for message in emitted if message.type == Type.STATE] == []
+    # the staged part is removed
+    s3_writer.fs.delete_dir.assert_called_once()
 
-def test_s3_cleanup(connection: MagicMock, s3_writer: FireboltS3Writer) -> None:
-    expected_sql = "DROP TABLE IF EXISTS ex_airbyte_raw_my_table"
-    bucket_path = "dummy_bucket/airbyte_output/111_dummy-uuid/my_table"
-    s3_writer.cleanup("my_table")
-    connection.cursor.return_value.execute.assert_called_once_with(expected_sql)
-    s3_writer.fs.delete_dir_contents.assert_called_once_with(bucket_path)
+
+@patch("pyarrow.parquet.write_to_dataset")
+def test_s3_flush_typed_columns(mock_write: MagicMock, connection: MagicMock, s3_writer: FireboltS3Writer) -> None:
+    s3_writer.write_typed_columns = True
+    s3_writer.create_raw_table("dummy", SCHEMA)
+    s3_writer.flush(batch("dummy", {"name": "a", "count": 1, "price": 2.5, "active": True}, {"count": "2"}))
+    table = mock_write.mock_calls[0].kwargs["table"]
+    assert table.column_names == ["_airbyte_ab_id", "_airbyte_emitted_at", "_airbyte_data", "name", "count", "price", "active"]
+    assert table.schema.field("count").type == pa.int64()
+    assert table.column("count").to_pylist() == [1, None]
+    assert table.column("active").to_pylist() == [True, None]
+
+    s3_writer.create_external_table("dummy", "part")
+    query = connection.cursor.return_value.execute.call_args[0][0]
+    assert '"price" DOUBLE NULL' in query
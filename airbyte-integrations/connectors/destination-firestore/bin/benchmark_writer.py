@@ -0,0 +1,168 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+"""
+Compares FirestoreWriter, which commits batches of up to 500 writes or deletes concurrently, with the previous implementation which
+added or deleted one document per request, against a fake in-process Firestore client adding a fixed latency to every request.
+The overwrite purge of a collection and the write of as many records, with a STATE message every 1000 records, are timed.
+
+Usage: python bin/benchmark_writer.py [--records 5000] [--latency 0.01]
+"""
+
+import argparse
+import itertools
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from airbyte_cdk.models import AirbyteMessage, AirbyteRecordMessage, AirbyteStateMessage, Type  # noqa: E402
+from destination_firestore.writer import FirestoreWriter  # noqa: E402
+
+# Number of records written between two STATE messages
+STATE_INTERVAL = 1000
+# Number of documents listed per request
+PAGE_SIZE = 300
+
+
+class FakeFirestore:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.documents = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def new_id(self) -> str:
+        return str(next(self._ids))
+
+    def commit(self, operations):
+        time.sleep(self.latency)
+        with self._lock:
+            for operation, document_id, data in operations:
+                if operation == "set":
+                    self.documents[document_id] = data
+                else:
+                    self.documents.pop(document_id, None)
+
+
+class FakeDocument:
+    def __init__(self, firestore: FakeFirestore, document_id: str):
+        self._firestore = firestore
+        self.id = document_id
+
+    @property
+    def reference(self):
+        return self
+
+    def delete(self):
+        self._firestore.commit([("delete", self.id, None)])
+
+
+class FakeWriteBatch:
+    def __init__(self, firestore: FakeFirestore):
+        self._firestore = firestore
+        self._operations = []
+
+    def set(self, reference: FakeDocument, data):
+        self._operations.append(("set", reference.id, data))
+
+    def delete(self, reference: FakeDocument):
+        self._operations.append(("delete", reference.id, None))
+
+    def commit(self, retry=None):
+        self._firestore.commit(self._operations)
+
+
+class FakeCollection:
+    def __init__(self, firestore: FakeFirestore):
+        self._firestore = firestore
+
+    def document(self) -> FakeDocument:
+        return FakeDocument(self._firestore, self._firestore.new_id())
+
+    def add(self, data):
+        self._firestore.commit([("set", self._firestore.new_id(), data)])
+
+    def list_documents(self, page_size: int = PAGE_SIZE):
+        for i, document_id in enumerate(list(self._firestore.documents)):
+            if i % PAGE_SIZE == 0:
+                time.sleep(self._firestore.latency)
+            yield FakeDocument(self._firestore, document_id)
+
+    def stream(self):
+        return self.list_documents()
+
+
+class FakeClient:
+    def __init__(self, firestore: FakeFirestore):
+        self._firestore = firestore
+
+    def collection(self, name: str) -> FakeCollection:
+        return FakeCollection(self._firestore)
+
+    def batch(self) -> FakeWriteBatch:
+        return FakeWriteBatch(self._firestore)
+
+
+class LegacyFirestoreWriter(FirestoreWriter):
+    """FirestoreWriter as implemented before the writes and deletes were committed by batches"""
+
+    def write(self, stream: str, data):
+        self.client.collection(stream).add(data)
+
+    def purge(self, stream: str) -> None:
+        for doc in self.client.collection(stream).stream():
+            doc.reference.delete()
+
+    def write_messages(self, messages):
+        for message in messages:
+            if message.type == Type.STATE:
+                yield message
+            elif message.type == Type.RECORD:
+                self.write(message.record.stream, message.record.data)
+
+
+def input_messages(records: int):
+    for i in range(1, records + 1):
+        yield AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream="users", data={"id": i}, emitted_at=0))
+        if i % STATE_INTERVAL == 0:
+            yield AirbyteMessage(type=Type.STATE, state=AirbyteStateMessage(data={"id": i}))
+
+
+def run(name: str, records: int, latency: float):
+    firestore = FakeFirestore(latency)
+    firestore.documents = {firestore.new_id(): {"id": i} for i in range(records)}
+    with patch("destination_firestore.writer.firestore.Client", return_value=FakeClient(firestore)):
+        writer = (LegacyFirestoreWriter if name == "legacy" else FirestoreWriter)(project_id="project")
+
+    start = time.perf_counter()
+    writer.purge("users")
+    purge = time.perf_counter() - start
+    left = len(firestore.documents)
+
+    start = time.perf_counter()
+    if name == "legacy":
+        list(writer.write_messages(input_messages(records)))
+    else:
+        list(writer.buffered_writer().write(input_messages(records)))
+    write = time.perf_counter() - start
+    print(f"{name:<8} purge {purge:6.1f}s ({left} documents left)   write {write:6.1f}s ({len(firestore.documents)} documents stored)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.01, help="seconds per request")
+    args = parser.parse_args()
+
+    print(f"{args.records} documents, {args.latency}s per request")
+    run("legacy", args.records, args.latency)
+    run("batched", args.records, args.latency)
+
+
+if __name__ == "__main__":
+    main()
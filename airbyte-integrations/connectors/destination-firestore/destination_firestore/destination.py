@@ -37,15 +37,11 @@ class DestinationFirestore(Destination):
             if configured_stream.destination_sync_mode == DestinationSyncMode.overwrite:
                 writer.purge(configured_stream.stream.name)
 
-        for message in input_messages:
-            if message.type == Type.STATE:
-                yield message
-            elif message.type == Type.RECORD:
-                record = message.record
-                writer.write(record.stream, record.data)
-            else:
-                # ignore other message types for now
-                continue
+        # ignore other message types for now
+        records_and_states = (message for message in input_messages if message.type in (Type.RECORD, Type.STATE))
+
+        # State messages are emitted once the records received before them are written, leftover records are written at the end
+        yield from writer.buffered_writer().write(records_and_states)
 
     def check(self, logger: AirbyteLogger, config: Mapping[str, Any]) -> AirbyteConnectionStatus:
         """
@@ -3,13 +3,41 @@
 #
 
 import json
-from typing import Any, Dict, Optional
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, List, Optional, Set
 
+from airbyte_cdk.destinations import BufferedRecordWriter, RecordBatch, RecordSink
+from google.api_core import exceptions, retry
 from google.cloud import firestore
 from google.oauth2 import service_account
 
+# Maximum number of writes of a commit
+MAX_BATCH_WRITES = 500
+# Retry of the commits failing because of contention, rate limiting or an unavailable service
+COMMIT_RETRY = retry.Retry(
+    predicate=retry.if_exception_type(
+        exceptions.Aborted,
+        exceptions.DeadlineExceeded,
+        exceptions.InternalServerError,
+        exceptions.ResourceExhausted,
+        exceptions.ServiceUnavailable,
+    ),
+    initial=1.0,
+    maximum=30.0,
+    multiplier=2.0,
+    timeout=300.0,
+)
+
+
+class FirestoreWriter(RecordSink):
+    """
+    Writes the records flushed by a BufferedRecordWriter, see buffered_writer, with commits of up to MAX_BATCH_WRITES documents.
+    Deletes the documents of a stream with commits of up to MAX_BATCH_WRITES deletes, at most max_workers commits are sent at once.
+    """
+
+    # Number of commits sent at once
+    max_workers = 8
 
-class FirestoreWriter:
     def __init__(self, project_id: str, credentials_json: Optional[str] = None):
         connection = {}
 
@@ -28,9 +56,49 @@ class FirestoreWriter:
     def check(self) -> bool:
         return bool(list(self.client.collections()))
 
-    def write(self, stream: str, data: Dict[str, Any]) -> None:
-        self.client.collection(stream).add(data)
+    def buffered_writer(self) -> BufferedRecordWriter:
+        """
+        :return: BufferedRecordWriter flushing the records to this writer
+        """
+        return BufferedRecordWriter(self, max_buffer_records=MAX_BATCH_WRITES, flush_workers=self.max_workers)
+
+    def flush(self, batch: RecordBatch):
+        collection = self.client.collection(batch.stream)
+        for start in range(0, len(batch.records), MAX_BATCH_WRITES):
+            write_batch = self.client.batch()
+            for record in batch.records[start : start + MAX_BATCH_WRITES]:
+                # the IDs are generated by the client, so a commit sent again does not create the documents twice
+                write_batch.set(collection.document(), record.data)
+            write_batch.commit(retry=COMMIT_RETRY)
 
     def purge(self, stream: str) -> None:
-        for doc in self.client.collection(stream).stream():
-            doc.reference.delete()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="firestore_purge") as executor:
+            pending: Set[Future] = set()
+            references = []
+            for reference in self.client.collection(stream).list_documents(page_size=MAX_BATCH_WRITES):
+                references.append(reference)
+                if len(references) == MAX_BATCH_WRITES:
+                    pending = self._submit(executor, pending, self._delete, references)
+                    references = []
+            if references:
+                pending = self._submit(executor, pending, self._delete, references)
+            self._wait(pending, ALL_COMPLETED)
+
+    def _delete(self, references: List[firestore.DocumentReference]):
+        write_batch = self.client.batch()
+        for reference in references:
+            write_batch.delete(reference)
+        write_batch.commit(retry=COMMIT_RETRY)
+
+    def _submit(self, executor: ThreadPoolExecutor, pending: Set[Future], function: Callable, *args) -> Set[Future]:
+        while len(pending) >= self.max_workers:
+            pending = self._wait(pending, FIRST_COMPLETED)
+        return pending | {executor.submit(function, *args)}
+
+    @staticmethod
+    def _wait(pending: Set[Future], return_when: str) -> Set[Future]:
+        done, not_done = wait(pending, return_when=return_when)
+        for future in done:
+            # raises the exception of a failed commit
+            future.result()
+        return not_done
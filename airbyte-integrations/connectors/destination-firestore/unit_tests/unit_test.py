@@ -2,6 +2,143 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import itertools
+import threading
+import time
 
-def test_example_method():
-    assert True
+import pytest
+from airbyte_cdk.models import (
+    AirbyteMessage,
+    AirbyteRecordMessage,
+    AirbyteStateMessage,
+    AirbyteStream,
+    ConfiguredAirbyteCatalog,
+    ConfiguredAirbyteStream,
+    DestinationSyncMode,
+    SyncMode,
+    Type,
+)
+from destination_firestore import DestinationFirestore
+from destination_firestore.writer import COMMIT_RETRY, MAX_BATCH_WRITES, FirestoreWriter
+
+
+class FakeDocument:
+    _ids = itertools.count()
+
+    def __init__(self, collection: str, document_id: str = None):
+        self.collection = collection
+        self.id = document_id or str(next(self._ids))
+
+
+class FakeBatch:
+    def __init__(self, client: "FakeClient"):
+        self._client = client
+        self.operations = []
+
+    def set(self, reference, data):
+        self.operations.append(("set", reference, data))
+
+    def delete(self, reference):
+        self.operations.append(("delete", reference, None))
+
+    def commit(self, retry=None):
+        assert retry is COMMIT_RETRY
+        assert len(self.operations) <= MAX_BATCH_WRITES
+        self._client.commit(self.operations)
+
+
+class FakeCollection:
+    def __init__(self, client: "FakeClient", name: str):
+        self._client = client
+        self._name = name
+
+    def document(self):
+        return FakeDocument(self._name)
+
+    def list_documents(self, page_size=None):
+        return [FakeDocument(self._name, document_id) for document_id in list(self._client.documents.get(self._name, {}))]
+
+
+class FakeClient:
+    def __init__(self, delay: float = 0.0):
+        self.documents = {}
+        self.commits = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._delay = delay
+        self._lock = threading.Lock()
+
+    def collection(self, name: str):
+        return FakeCollection(self, name)
+
+    def batch(self):
+        return FakeBatch(self)
+
+    def commit(self, operations):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self._delay)
+        with self._lock:
+            self.in_flight -= 1
+            self.commits.append(len(operations))
+            for operation, reference, data in operations:
+                documents = self.documents.setdefault(reference.collection, {})
+                if operation == "set":
+                    documents[reference.id] = data
+                else:
+                    documents.pop(reference.id, None)
+
+
+@pytest.fixture(name="client")
+def client_fixture(mocker):
+    client = FakeClient(delay=0.005)
+    mocker.patch("destination_firestore.writer.firestore.Client", return_value=client)
+    return client
+
+
+def _record(stream: str, i: int) -> AirbyteMessage:
+    return AirbyteMessage(type=Type.RECORD, record=AirbyteRecordMessage(stream=stream, data={"id": i}, emitted_at=0))
+
+
+def _state(i: int) -> AirbyteMessage:
+    return AirbyteMessage(type=Type.STATE, state=AirbyteStateMessage(data={"id": i}))
+
+
+def _catalog(*streams) -> ConfiguredAirbyteCatalog:
+    return ConfiguredAirbyteCatalog(
+        streams=[
+            ConfiguredAirbyteStream(
+                stream=AirbyteStream(name=name, json_schema={}), sync_mode=SyncMode.full_refresh, destination_sync_mode=sync_mode
+            )
+            for name, sync_mode in streams
+        ]
+    )
+
+
+def test_purge_deletes_by_batches(client):
+    client.documents = {"users": {str(i): {"id": i} for i in range(2 * MAX_BATCH_WRITES + 10)}, "orders": {"1": {"id": 1}}}
+
+    FirestoreWriter(project_id="project").purge("users")
+
+    assert client.documents == {"users": {}, "orders": {"1": {"id": 1}}}
+    assert sorted(client.commits) == [10, MAX_BATCH_WRITES, MAX_BATCH_WRITES]
+    assert 1 < client.max_in_flight <= FirestoreWriter.max_workers
+
+
+def test_write_commits_by_batches_and_emits_states_after_commits(client):
+    client.documents = {"users": {"old": {"id": -1}}, "orders": {"kept": {"id": -1}}}
+    catalog = _catalog(("users", DestinationSyncMode.overwrite), ("orders", DestinationSyncMode.append))
+    messages = [_record("users", i) for i in range(1200)] + [_state(1)] + [_record("orders", i) for i in range(3)] + [_state(2)]
+
+    states = []
+    for message in DestinationFirestore().write({"project_id": "project"}, catalog, messages):
+        # every record received before the state was committed
+        expected = 1200 if message.state.data["id"] == 1 else 1204
+        assert sum(len(documents) for documents in client.documents.values()) >= expected
+        states.append(message)
+
+    assert states == [_state(1), _state(2)]
+    assert sorted(data["id"] for data in client.documents["users"].values()) == list(range(1200))
+    assert sorted(data["id"] for data in client.documents["orders"].values()) == [-1, 0, 1, 2]
+    assert max(client.commits) <= MAX_BATCH_WRITES
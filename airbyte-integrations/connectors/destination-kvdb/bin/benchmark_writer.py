@@ -0,0 +1,155 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+"""
+Compares KvDbWriter, which sends concurrent transactions and lists the keys of a purged stream before deleting them, with the previous
+implementation which sent one transaction at a time and deleted the keys while listing them, against a local fake KvDB server adding a
+fixed latency to every request. The overwrite purge of a stream and the write of as many records, with a STATE message every 10000
+records, are timed.
+
+Usage: python bin/benchmark_writer.py [--records 100000] [--latency 0.05]
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from destination_kvdb.client import KvDbClient  # noqa: E402
+from destination_kvdb.writer import KvDbWriter  # noqa: E402
+
+# Number of records written between two STATE messages
+STATE_INTERVAL = 10000
+
+
+class FakeKvDb:
+    """Keys of the fake server, with their sorted list cached between writes"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.values = {}
+        self._sorted_keys = None
+        self._lock = threading.Lock()
+
+    def list_keys(self, prefix: str, skip: int, limit: int):
+        with self._lock:
+            if self._sorted_keys is None:
+                self._sorted_keys = sorted(self.values)
+            keys = [key for key in self._sorted_keys if key.startswith(prefix)] if prefix else self._sorted_keys
+        return keys[skip : skip + limit]
+
+    def execute(self, transaction):
+        with self._lock:
+            self._sorted_keys = None
+            for operation in transaction:
+                if "set" in operation:
+                    self.values[operation["set"]] = operation["value"]
+                else:
+                    self.values.pop(operation["delete"], None)
+
+
+def serve(kvdb: FakeKvDb) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def reply(self, body):
+            data = json.dumps(body).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            time.sleep(kvdb.latency)
+            query = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+            self.reply(kvdb.list_keys(query.get("prefix", ""), int(query["skip"]), int(query["limit"])))
+
+        def do_POST(self):
+            time.sleep(kvdb.latency)
+            kvdb.execute(json.loads(self.rfile.read(int(self.headers["Content-Length"])))["txn"])
+            self.reply({})
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class LegacyKvDbWriter(KvDbWriter):
+    """KvDbWriter as implemented before the transactions were sent concurrently"""
+
+    def __init__(self, client: KvDbClient):
+        self.client = client
+        self.write_buffer = []
+
+    def delete_stream_entries(self, stream_name: str):
+        keys_to_delete = []
+        for key in self.client.list_keys(prefix=f"{stream_name}__ab__"):
+            keys_to_delete.append(key)
+            if len(keys_to_delete) == self.flush_interval:
+                self.client.delete(keys_to_delete)
+                keys_to_delete.clear()
+        if len(keys_to_delete) > 0:
+            self.client.delete(keys_to_delete)
+
+    def queue_write_operation(self, stream_name: str, record, written_at: int):
+        self.write_buffer.append((f"{stream_name}__ab__{written_at}", record))
+        if len(self.write_buffer) == self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        self.client.batch_write(self.write_buffer)
+        self.write_buffer.clear()
+
+    def close(self):
+        pass
+
+
+def run(name: str, writer_class, records: int, latency: float):
+    kvdb = FakeKvDb(latency)
+    kvdb.values = {f"users__ab__{i:012d}": {"id": i} for i in range(records)}
+    server = serve(kvdb)
+    KvDbClient.base_url = f"http://127.0.0.1:{server.server_port}"
+    writer = writer_class(KvDbClient("bucket"))
+    try:
+        start = time.perf_counter()
+        writer.delete_stream_entries("users")
+        purge = time.perf_counter() - start
+        left = len(kvdb.values)
+
+        start = time.perf_counter()
+        for i in range(records):
+            writer.queue_write_operation("users", {"id": i, "name": f"user {i}"}, time.time_ns() / 1_000_000)
+            if i % STATE_INTERVAL == STATE_INTERVAL - 1:
+                writer.flush()
+        writer.flush()
+        write = time.perf_counter() - start
+    finally:
+        writer.close()
+        server.shutdown()
+    print(f"{name:<10} purge {purge:6.1f}s ({left} keys left)   write {write:6.1f}s ({len(kvdb.values)} keys stored)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per request")
+    args = parser.parse_args()
+
+    print(f"{args.records} keys, {args.latency}s per request")
+    run("legacy", LegacyKvDbWriter, args.records, args.latency)
+    run("concurrent", KvDbWriter, args.records, args.latency)
+
+
+if __name__ == "__main__":
+    main()
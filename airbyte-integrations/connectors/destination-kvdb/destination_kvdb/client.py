@@ -4,16 +4,33 @@
 
 from typing import Any, Iterable, List, Mapping, Tuple, Union
 
+import backoff
 import requests
+from requests.adapters import HTTPAdapter
+
+# Number of times a request failing because of the network, rate limiting or a server error is sent
+MAX_TRIES = 5
+
+
+def _should_give_up(exc: requests.exceptions.RequestException) -> bool:
+    response = exc.response
+    return response is not None and response.status_code != requests.codes.too_many_requests and response.status_code < 500
 
 
 class KvDbClient:
     base_url = "https://kvdb.io"
     PAGE_SIZE = 1000
 
-    def __init__(self, bucket_id: str, secret_key: str = None):
+    def __init__(self, bucket_id: str, secret_key: str = None, max_connections: int = 10):
+        """
+        :param max_connections: number of connections kept open, the client can be shared by that many threads
+        """
         self.secret_key = secret_key
         self.bucket_id = bucket_id
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=max_connections)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
 
     def write(self, key: str, value: Mapping[str, Any]):
         return self.batch_write([(key, value)])
@@ -29,29 +46,33 @@ class KvDbClient:
         """
         https://kvdb.io/docs/api/#list-keys
         """
-        # TODO handle rate limiting
         pagination_complete = False
         offset = 0
 
         while not pagination_complete:
-            response = self._request(
-                "GET",
-                params={
-                    "limit": self.PAGE_SIZE,
-                    "skip": offset,
-                    "format": "json",
-                    "prefix": prefix or "",
-                    "values": "true" if list_values else "false",
-                },
-                endpoint="/",  # the "list" endpoint doesn't work without adding a trailing slash to the URL
-            )
-
-            response_json = response.json()
-            yield from response_json
-
-            pagination_complete = len(response_json) < self.PAGE_SIZE
+            page = self.list_keys_page(offset, list_values=list_values, prefix=prefix)
+            yield from page
+
+            pagination_complete = len(page) < self.PAGE_SIZE
             offset += self.PAGE_SIZE
 
+    def list_keys_page(self, offset: int, list_values: bool = False, prefix: str = None) -> List[Union[str, List]]:
+        """
+        :return: the PAGE_SIZE keys following the first offset keys, there are no more keys when fewer are returned
+        """
+        response = self._request(
+            "GET",
+            params={
+                "limit": self.PAGE_SIZE,
+                "skip": offset,
+                "format": "json",
+                "prefix": prefix or "",
+                "values": "true" if list_values else "false",
+            },
+            endpoint="/",  # the "list" endpoint doesn't work without adding a trailing slash to the URL
+        )
+        return response.json()
+
     def delete(self, key: Union[str, List[str]]):
         """
         https://kvdb.io/docs/api/#execute-transaction
@@ -66,13 +87,14 @@ class KvDbClient:
     def _get_auth_headers(self) -> Mapping[str, Any]:
         return {"Authorization": f"Bearer {self.secret_key}"} if self.secret_key else {}
 
+    @backoff.on_exception(backoff.expo, requests.exceptions.RequestException, max_tries=MAX_TRIES, giveup=_should_give_up)
     def _request(
         self, http_method: str, endpoint: str = None, params: Mapping[str, Any] = None, json: Mapping[str, Any] = None
     ) -> requests.Response:
         url = self._get_base_url() + (endpoint or "")
         headers = {"Accept": "application/json", **self._get_auth_headers()}
 
-        response = requests.request(method=http_method, params=params, url=url, headers=headers, json=json)
+        response = self._session.request(method=http_method, params=params, url=url, headers=headers, json=json)
 
         response.raise_for_status()
         return response
@@ -29,28 +29,30 @@ class DestinationKvdb(Destination):
         then the source is given the last state message output from this method as the starting point of the next sync.
         """
         writer = KvDbWriter(KvDbClient(**config))
+        try:
+            for configured_stream in configured_catalog.streams:
+                if configured_stream.destination_sync_mode == DestinationSyncMode.overwrite:
+                    writer.delete_stream_entries(configured_stream.stream.name)
 
-        for configured_stream in configured_catalog.streams:
-            if configured_stream.destination_sync_mode == DestinationSyncMode.overwrite:
-                writer.delete_stream_entries(configured_stream.stream.name)
-
-        for message in input_messages:
-            if message.type == Type.STATE:
-                # Emitting a state message indicates that all records which came before it have been written to the destination. So we flush
-                # the queue to ensure writes happen, then output the state message to indicate it's safe to checkpoint state
-                writer.flush()
-                yield message
-            elif message.type == Type.RECORD:
-                record = message.record
-                writer.queue_write_operation(
-                    record.stream, record.data, time.time_ns() / 1_000_000
-                )  # convert from nanoseconds to milliseconds
-            else:
-                # ignore other message types for now
-                continue
+            for message in input_messages:
+                if message.type == Type.STATE:
+                    # Emitting a state message indicates that all records which came before it have been written to the destination. So we
+                    # wait for the queued writes to complete, then output the state message to indicate it's safe to checkpoint state
+                    writer.flush()
+                    yield message
+                elif message.type == Type.RECORD:
+                    record = message.record
+                    writer.queue_write_operation(
+                        record.stream, record.data, time.time_ns() / 1_000_000
+                    )  # convert from nanoseconds to milliseconds
+                else:
+                    # ignore other message types for now
+                    continue
 
-        # Make sure to flush any records still in the queue
-        writer.flush()
+            # Make sure to flush any records still in the queue
+            writer.flush()
+        finally:
+            writer.close()
 
     def check(self, logger: AirbyteLogger, config: Mapping[str, Any]) -> AirbyteConnectionStatus:
         """
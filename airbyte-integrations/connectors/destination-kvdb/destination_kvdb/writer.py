@@ -2,7 +2,9 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
-from collections import Mapping
+from collections.abc import Mapping
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, List, Set
 
 from destination_kvdb.client import KvDbClient
 
@@ -16,31 +18,69 @@ class KvDbWriter:
     This is because unless a data source explicitly designates a primary key, we don't know what to key the record on.
     Since KvDB allows reading records with certain prefixes, we treat it more like a message queue, expecting the reader to
     read messages with a particular prefix e.g: name__ab__123, where 123 is the timestamp they last read data from.
+
+    Records are written and keys deleted by transactions of flush_interval keys, sent by max_workers threads. At most max_workers
+    transactions are sent at once, the writer waits for one of them to complete before sending the next one.
     """
 
-    write_buffer = []
     flush_interval = 1000
+    max_workers = 8
 
     def __init__(self, client: KvDbClient):
         self.client = client
+        self.write_buffer = []
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="kvdb_writer")
+        self._pending: Set[Future] = set()
 
     def delete_stream_entries(self, stream_name: str):
         """Deletes all the records belonging to the input stream"""
-        keys_to_delete = []
-        for key in self.client.list_keys(prefix=f"{stream_name}__ab__"):
-            keys_to_delete.append(key)
-            if len(keys_to_delete) == self.flush_interval:
-                self.client.delete(keys_to_delete)
-                keys_to_delete.clear()
-        if len(keys_to_delete) > 0:
-            self.client.delete(keys_to_delete)
+        keys_to_delete = self._list_keys(prefix=f"{stream_name}__ab__")
+        for start in range(0, len(keys_to_delete), self.flush_interval):
+            self._submit(self.client.delete, keys_to_delete[start : start + self.flush_interval])
+        self._wait_for_pending()
+
+    def _list_keys(self, prefix: str) -> List[str]:
+        """
+        Lists the keys by fetching max_workers pages at once. The keys are listed before being deleted, since deleting keys shifts the
+        offsets of the following pages.
+        """
+        keys = []
+        offset = 0
+        while True:
+            offsets = [offset + i * self.client.PAGE_SIZE for i in range(self.max_workers)]
+            pages = list(self._executor.map(lambda page_offset: self.client.list_keys_page(page_offset, prefix=prefix), offsets))
+            for page in pages:
+                keys.extend(page)
+                if len(page) < self.client.PAGE_SIZE:
+                    return keys
+            offset += self.max_workers * self.client.PAGE_SIZE
 
     def queue_write_operation(self, stream_name: str, record: Mapping, written_at: int):
         kv_pair = (f"{stream_name}__ab__{written_at}", record)
         self.write_buffer.append(kv_pair)
         if len(self.write_buffer) == self.flush_interval:
-            self.flush()
+            self._send_write_buffer()
 
     def flush(self):
-        self.client.batch_write(self.write_buffer)
-        self.write_buffer.clear()
+        """Sends the buffered records and waits until every record queued so far is written"""
+        self._send_write_buffer()
+        self._wait_for_pending()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _send_write_buffer(self):
+        if self.write_buffer:
+            self._submit(self.client.batch_write, self.write_buffer)
+            self.write_buffer = []
+
+    def _submit(self, send: Callable[[List], None], items: List):
+        while len(self._pending) >= self.max_workers:
+            self._wait_for_pending(return_when=FIRST_COMPLETED)
+        self._pending.add(self._executor.submit(send, items))
+
+    def _wait_for_pending(self, return_when: str = ALL_COMPLETED):
+        done, self._pending = wait(self._pending, return_when=return_when)
+        for future in done:
+            # raises the exception of a failed request
+            future.result()
@@ -7,7 +7,7 @@ from setuptools import find_packages, setup
 
 MAIN_REQUIREMENTS = ["airbyte-cdk==0.1.6-rc1", "requests"]
 
-TEST_REQUIREMENTS = ["pytest~=6.1"]
+TEST_REQUIREMENTS = ["pytest~=6.1", "pytest-mock", "requests-mock"]
 
 setup(
     name="destination_kvdb",
@@ -2,6 +2,103 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import threading
+import time
 
-def test_example_method():
-    assert True
+import pytest
+import requests
+from destination_kvdb.client import KvDbClient
+from destination_kvdb.writer import KvDbWriter
+
+
+class FakeKvDbClient:
+    PAGE_SIZE = 3
+
+    def __init__(self, keys=(), delay: float = 0.0, fail_writes: bool = False):
+        self.keys = sorted(keys)
+        self.written = []
+        self.transactions = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._delay = delay
+        self._fail_writes = fail_writes
+        self._lock = threading.Lock()
+
+    def list_keys_page(self, offset: int, list_values: bool = False, prefix: str = None):
+        with self._lock:
+            return [key for key in self.keys if key.startswith(prefix or "")][offset : offset + self.PAGE_SIZE]
+
+    def _transaction(self, apply):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self._delay)
+        with self._lock:
+            self.in_flight -= 1
+            apply()
+
+    def batch_write(self, keys_and_values):
+        if self._fail_writes:
+            raise requests.exceptions.HTTPError("400 Client Error")
+
+        def apply():
+            self.written.extend(keys_and_values)
+            self.transactions.append(len(keys_and_values))
+
+        self._transaction(apply)
+
+    def delete(self, keys):
+        def apply():
+            self.keys = [key for key in self.keys if key not in keys]
+            self.transactions.append(len(keys))
+
+        self._transaction(apply)
+
+
+def test_delete_stream_entries_lists_keys_before_deleting(monkeypatch):
+    monkeypatch.setattr(KvDbWriter, "flush_interval", 2)
+    keys = [f"users__ab__{i}" for i in range(20)] + [f"orders__ab__{i}" for i in range(4)]
+    client = FakeKvDbClient(keys, delay=0.01)
+    writer = KvDbWriter(client)
+
+    writer.delete_stream_entries("users")
+    writer.close()
+
+    assert client.keys == sorted(f"orders__ab__{i}" for i in range(4))
+    assert client.transactions == [2] * 10
+    assert 1 < client.max_in_flight <= KvDbWriter.max_workers
+
+
+def test_flush_waits_for_queued_writes(monkeypatch):
+    monkeypatch.setattr(KvDbWriter, "flush_interval", 10)
+    client = FakeKvDbClient(delay=0.01)
+    writer = KvDbWriter(client)
+
+    for i in range(205):
+        writer.queue_write_operation("users", {"id": i}, i)
+    writer.flush()
+    writer.close()
+
+    assert sorted(record["id"] for _, record in client.written) == list(range(205))
+    assert sorted(client.transactions) == [5] + [10] * 20
+    assert client.max_in_flight <= KvDbWriter.max_workers
+
+
+def test_failed_write_is_raised():
+    writer = KvDbWriter(FakeKvDbClient(fail_writes=True))
+    writer.queue_write_operation("users", {"id": 1}, 1)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        writer.flush()
+    writer.close()
+
+
+@pytest.mark.parametrize(("status_code", "expected_calls"), [(503, 5), (429, 5), (400, 1)])
+def test_client_retries_transient_errors(requests_mock, mocker, status_code, expected_calls):
+    mocker.patch("time.sleep")
+    mock = requests_mock.post("https://kvdb.io/bucket", status_code=status_code)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        KvDbClient("bucket").batch_write([("key", {"id": 1})])
+
+    assert mock.call_count == expected_calls
@@ -0,0 +1,155 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, Iterator, Mapping
+
+from .async_job import AsyncJob
+from .common import JobException
+
+logger = logging.getLogger("airbyte")
+
+# How often (in seconds) a blocked thread checks whether the consumer has gone away.
+_POLL_INTERVAL = 0.1
+
+
+class _Finished:
+    """Sentinel put on a queue when its producer is exhausted"""
+
+
+class _Failed:
+    """Wraps an exception raised in a background thread so it can be re-raised in the consuming thread"""
+
+    def __init__(self, exception: BaseException):
+        self.exception = exception
+
+
+def _put(output: queue.Queue, item: Any, stopped: threading.Event) -> bool:
+    """Put the item on the queue unless the consumer has gone away, return False in that case"""
+    while not stopped.is_set():
+        try:
+            output.put(item, timeout=_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(source: queue.Queue, stopped: threading.Event) -> Any:
+    """Get the next item of the queue, raise the exception of its producer or if the producer was stopped"""
+    while True:
+        try:
+            item = source.get(timeout=_POLL_INTERVAL)
+        except queue.Empty:
+            if stopped.is_set():
+                raise JobException("The download of the jobs results was stopped")
+            continue
+        if isinstance(item, _Failed):
+            raise item.exception
+        return item
+
+
+class AsyncJobResult:
+    """Records of a completed job, downloaded by a worker of JobResultsDownloader while they are consumed"""
+
+    def __init__(self, job: AsyncJob, stopped: threading.Event, max_buffered_records: int):
+        self.job = job
+        self._records = queue.Queue(maxsize=max_buffered_records)
+        self._stopped = stopped
+
+    def download(self):
+        """Page through the result of the job, runs in a worker thread"""
+        started_at = time.monotonic()
+        count = 0
+        try:
+            for obj in self.job.get_result():
+                if not _put(self._records, obj.export_all_data(), self._stopped):
+                    return
+                count += 1
+        except BaseException as e:
+            _put(self._records, _Failed(e), self._stopped)
+        else:
+            logger.info(f"{self.job}: downloaded {count} records in {time.monotonic() - started_at:.0f} seconds")
+            _put(self._records, _Finished(), self._stopped)
+
+    def records(self) -> Iterator[Mapping[str, Any]]:
+        """Records of the job, waits for the worker to download them
+
+        :raise: the exception raised while the result was downloaded
+        """
+        while True:
+            record = _get(self._records, self._stopped)
+            if isinstance(record, _Finished):
+                return
+            yield record
+
+
+class JobResultsDownloader:
+    """
+    Downloads the results of the completed jobs while the other jobs are still running.
+
+    The completed jobs are consumed on a background thread, so the status of the running jobs keeps being polled and new jobs keep
+    being started while the results are downloaded. Results are paged through by a pool of MAX_WORKERS workers and are returned in the
+    order the jobs completed. The records of a job are buffered in a bounded queue, up to MAX_BUFFERED_RECORDS per downloaded job,
+    so the workers wait for the consumer when it is the bottleneck.
+    """
+
+    MAX_WORKERS = 4
+    MAX_BUFFERED_RECORDS = 1000
+
+    def __init__(self, jobs: Iterable[AsyncJob], max_workers: int = None, max_buffered_records: int = None):
+        """Init
+
+        :param jobs: completed jobs, iterated on a background thread
+        :param max_workers: number of results downloaded at the same time
+        :param max_buffered_records: number of downloaded records of a job waiting to be consumed
+        """
+        self._jobs = jobs
+        self._max_workers = max_workers or self.MAX_WORKERS
+        self._max_buffered_records = max_buffered_records or self.MAX_BUFFERED_RECORDS
+
+    def results(self) -> Iterator[AsyncJobResult]:
+        """Start the download of every completed job and return them in order of completion.
+        The background threads are stopped when the generator is closed before all the jobs were returned.
+
+        :yield: results of the completed jobs, their records are downloaded in the background
+        :raise: the exception raised while the jobs were polled
+        """
+        stopped = threading.Event()
+        completed: queue.Queue = queue.Queue()
+        executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="insights_download")
+
+        def poll():
+            try:
+                for job in self._jobs:
+                    if stopped.is_set():
+                        return
+                    result = AsyncJobResult(job, stopped=stopped, max_buffered_records=self._max_buffered_records)
+                    # the workers take the results in the order they were submitted, so the result consumed next is always downloading
+                    executor.submit(result.download)
+                    completed.put(result)
+            except BaseException as e:
+                completed.put(_Failed(e))
+            else:
+                completed.put(_Finished())
+
+        # the manager may sleep for minutes between the status updates, the thread is not joined when the consumer goes away
+        threading.Thread(target=poll, name="insights_poll", daemon=True).start()
+        try:
+            while True:
+                result = _get(completed, stopped)
+                if isinstance(result, _Finished):
+                    break
+                yield result
+        except BaseException:
+            # the consumer has gone away or the jobs failed, the pending downloads are cancelled
+            stopped.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        # the results returned last may still be downloading
+        executor.shutdown(wait=False)
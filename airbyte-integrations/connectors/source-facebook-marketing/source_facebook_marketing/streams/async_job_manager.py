@@ -3,8 +3,9 @@
 #
 
 import logging
+import math
 import time
-from typing import TYPE_CHECKING, Iterator, List
+from typing import TYPE_CHECKING, Dict, Iterator, List
 
 from source_facebook_marketing.streams.common import JobException
 
@@ -20,14 +21,20 @@ class InsightAsyncJobManager:
     """
     Class for managing Ads Insights async jobs. Before running next job it
     checks current insight throttle value and if it greater than THROTTLE_LIMIT variable, no new jobs added.
+    The number of running jobs is also limited by a window which shrinks as the throttle value grows. The status of every
+    job is checked after a fraction of its running time, so the quick jobs are detected early and the long ones are polled less often.
     To consume completed jobs use completed_job generator, jobs will be returned in the order they finished.
     """
 
     # When current insights throttle hit this value no new jobs added.
     THROTTLE_LIMIT = 70
     MAX_NUMBER_OF_ATTEMPTS = 20
-    # Time to wait before checking job status update again.
+    # Time to wait before checking the throttle value again.
     JOB_STATUS_UPDATE_SLEEP_SECONDS = 30
+    # The status of a job is checked again after this fraction of its running time, within the following bounds.
+    JOB_STATUS_UPDATE_FACTOR = 0.25
+    MIN_JOB_STATUS_UPDATE_SECONDS = 5
+    MAX_JOB_STATUS_UPDATE_SECONDS = 120
     # Maximum of concurrent jobs that could be scheduled. Since throttling
     # limit is not reliable indicator of async workload capability we still have to use this parameter.
     MAX_JOBS_IN_QUEUE = 100
@@ -41,6 +48,15 @@ class InsightAsyncJobManager:
         self._api = api
         self._jobs = iter(jobs)
         self._running_jobs = []
+        # number of jobs which were split because they failed
+        self._split_count = 0
+
+        # times of the jobs (time.monotonic)
+        self._started_at: Dict[AsyncJob, float] = {}
+        self._next_update_at: Dict[AsyncJob, float] = {}
+        # metrics
+        self._latencies: List[float] = []
+        self._status_updates = 0
 
     def _start_jobs(self):
         """Enqueue new jobs."""
@@ -48,19 +64,50 @@ class InsightAsyncJobManager:
         self._update_api_throttle_limit()
         self._wait_throttle_limit_down()
         prev_jobs_count = len(self._running_jobs)
-        while self._get_current_throttle_value() < self.THROTTLE_LIMIT and len(self._running_jobs) < self.MAX_JOBS_IN_QUEUE:
+        while self._get_current_throttle_value() < self.THROTTLE_LIMIT and len(self._running_jobs) < self._jobs_window():
             job = next(self._jobs, None)
             if not job:
                 self._empty = True
                 break
             job.start()
+            self._job_started(job)
             self._running_jobs.append(job)
 
         logger.info(
             f"Added: {len(self._running_jobs) - prev_jobs_count} jobs. "
             f"Current throttle limit is {self._api.api.ads_insights_throttle}, "
-            f"{len(self._running_jobs)}/{self.MAX_JOBS_IN_QUEUE} job(s) in queue"
+            f"{len(self._running_jobs)}/{self._jobs_window()} job(s) in queue"
+        )
+
+    def _jobs_window(self) -> int:
+        """Maximum number of running jobs, the window shrinks linearly as the throttle value reaches THROTTLE_LIMIT"""
+        headroom = max(0.0, 1 - self._get_current_throttle_value() / self.THROTTLE_LIMIT)
+        return max(1, min(self.MAX_JOBS_IN_QUEUE, math.ceil(self.MAX_JOBS_IN_QUEUE * headroom)))
+
+    def _job_started(self, job: AsyncJob, started_at: float = None):
+        now = time.monotonic()
+        self._started_at[job] = started_at if started_at is not None else now
+        # the first status update is sent with the next batch
+        self._next_update_at[job] = now
+
+    def _job_status_updated(self, job: AsyncJob, now: float):
+        running_time = now - self._started_at.get(job, now)
+        interval = min(
+            self.MAX_JOB_STATUS_UPDATE_SECONDS, max(self.MIN_JOB_STATUS_UPDATE_SECONDS, running_time * self.JOB_STATUS_UPDATE_FACTOR)
         )
+        self._next_update_at[job] = now + interval
+
+    def _job_finished(self, job: AsyncJob):
+        self._next_update_at.pop(job, None)
+        started_at = self._started_at.pop(job, None)
+        if started_at is not None:
+            latency = time.monotonic() - started_at
+            self._latencies.append(latency)
+            logger.info(f"{job}: completed {latency:.0f} seconds after it was started")
+
+    def _seconds_to_next_update(self) -> float:
+        next_update_at = min(self._next_update_at.get(job, 0) for job in self._running_jobs)
+        return max(0.0, next_update_at - time.monotonic())
 
     def completed_jobs(self) -> Iterator[AsyncJob]:
         """Wait until job is ready and return it. If job
@@ -75,14 +122,25 @@ class InsightAsyncJobManager:
         while self._running_jobs:
             completed_jobs = self._check_jobs_status_and_restart()
             while not completed_jobs:
-                logger.info(f"No jobs ready to be consumed, wait for {self.JOB_STATUS_UPDATE_SLEEP_SECONDS} seconds")
-                time.sleep(self.JOB_STATUS_UPDATE_SLEEP_SECONDS)
+                sleep_seconds = self._seconds_to_next_update()
+                logger.info(f"No jobs ready to be consumed, wait for {sleep_seconds:.0f} seconds")
+                time.sleep(sleep_seconds)
                 completed_jobs = self._check_jobs_status_and_restart()
             yield from completed_jobs
             self._start_jobs()
 
+        self._log_metrics()
+
+    def _log_metrics(self):
+        if not self._latencies:
+            return
+        logger.info(
+            f"Insights jobs: {len(self._latencies)} completed after {self._status_updates} status updates, "
+            f"latency avg {sum(self._latencies) / len(self._latencies):.0f}s max {max(self._latencies):.0f}s"
+        )
+
     def _check_jobs_status_and_restart(self) -> List[AsyncJob]:
-        """Checks jobs status in advance and restart if some failed.
+        """Checks the status of the jobs due for an update in advance and restart if some failed.
 
         :return: list of completed jobs
         """
@@ -90,7 +148,13 @@ class InsightAsyncJobManager:
         running_jobs = []
         failed_num = 0
 
-        update_in_batch(api=self._api.api, jobs=self._running_jobs)
+        now = time.monotonic()
+        due_jobs = [job for job in self._running_jobs if self._next_update_at.get(job, now) <= now]
+        if due_jobs:
+            update_in_batch(api=self._api.api, jobs=due_jobs)
+            self._status_updates += len(due_jobs)
+            for job in due_jobs:
+                self._job_status_updated(job, now)
         self._wait_throttle_limit_down()
         for job in self._running_jobs:
             if job.failed:
@@ -102,19 +166,28 @@ class InsightAsyncJobManager:
                             raise JobException(f"{nested_job}: failed more than {self.MAX_NUMBER_OF_ATTEMPTS} times. Terminating...")
                 if job.attempt_number >= self.MAX_NUMBER_OF_ATTEMPTS:
                     raise JobException(f"{job}: failed more than {self.MAX_NUMBER_OF_ATTEMPTS} times. Terminating...")
-                elif job.attempt_number == 2:
-                    logger.info("%s: failed second time, trying to split job into smaller jobs.", job)
+                elif job.attempt_number == 2 or (job.attempt_number == 1 and self._split_count):
+                    if job.attempt_number == 2:
+                        logger.info("%s: failed second time, trying to split job into smaller jobs.", job)
+                    else:
+                        # the failures are usually caused by the amount of data, the restarted job would most likely fail as well
+                        logger.info("%s: failed, splitting it right away as %d similar jobs had to be split.", job, self._split_count)
                     smaller_jobs = job.split_job()
                     grouped_jobs = ParentAsyncJob(api=self._api.api, jobs=smaller_jobs, interval=job.interval)
                     running_jobs.append(grouped_jobs)
                     grouped_jobs.start()
+                    self._job_started(grouped_jobs, started_at=self._started_at.pop(job, None))
+                    self._next_update_at.pop(job, None)
+                    self._split_count += 1
                 else:
                     logger.info("%s: failed, restarting", job)
                     job.restart()
+                    self._next_update_at[job] = now
                     running_jobs.append(job)
                 failed_num += 1
             elif job.completed:
                 completed_jobs.append(job)
+                self._job_finished(job)
             else:
                 running_jobs.append(job)
 
@@ -12,6 +12,7 @@ from airbyte_cdk.sources.streams.core import package_name_from_class
 from airbyte_cdk.sources.utils.schema_helpers import ResourceSchemaLoader
 from cached_property import cached_property
 from source_facebook_marketing.streams.async_job import AsyncJob, InsightAsyncJob
+from source_facebook_marketing.streams.async_job_downloader import JobResultsDownloader
 from source_facebook_marketing.streams.async_job_manager import InsightAsyncJobManager
 
 from .base_streams import FBMarketingIncrementalStream
@@ -110,10 +111,15 @@ class AdsInsights(FBMarketingIncrementalStream):
         stream_slice: Mapping[str, Any] = None,
         stream_state: Mapping[str, Any] = None,
     ) -> Iterable[Mapping[str, Any]]:
-        """Waits for current job to finish (slice) and yield its result"""
+        """Waits for current job to finish (slice) and yield its result,
+        the state is updated once all the records of the job were read"""
         job = stream_slice["insight_job"]
-        for obj in job.get_result():
-            yield obj.export_all_data()
+        job_result = stream_slice.get("job_result")
+        if job_result:
+            yield from job_result.records()
+        else:
+            for obj in job.get_result():
+                yield obj.export_all_data()
 
         self._completed_slices.add(job.interval.start)
         if job.interval.start == self._next_cursor_value:
@@ -198,6 +204,7 @@ class AdsInsights(FBMarketingIncrementalStream):
         1. we should commit state after each successful job
         2. we should run as many job as possible before checking for result
         3. we shouldn't proceed to consumption of the next job before previous succeed
+        4. we should download the results of completed jobs while the other jobs are running
 
         generate slice only if it is not in state,
         when we finished reading slice (in read_records) we check if current slice is the next one and do advance cursor
@@ -209,8 +216,10 @@ class AdsInsights(FBMarketingIncrementalStream):
             self.state = stream_state
 
         manager = InsightAsyncJobManager(api=self._api, jobs=self._generate_async_jobs(params=self.request_params()))
-        for job in manager.completed_jobs():
-            yield {"insight_job": job}
+        # the results of the completed jobs are downloaded in the background while the manager keeps polling the running jobs
+        downloader = JobResultsDownloader(jobs=manager.completed_jobs())
+        for job_result in downloader.results():
+            yield {"insight_job": job_result.job, "job_result": job_result}
 
     def _get_start_date(self) -> pendulum.Date:
         """Get start date to begin sync with. It is not that trivial as it might seem.
@@ -0,0 +1,82 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import threading
+
+import pytest
+from source_facebook_marketing.streams.async_job import InsightAsyncJob
+from source_facebook_marketing.streams.async_job_downloader import JobResultsDownloader
+from source_facebook_marketing.streams.common import JobException
+
+
+def make_job(mocker, records):
+    job = mocker.Mock(spec=InsightAsyncJob)
+    job.get_result.return_value = [mocker.Mock(**{"export_all_data.return_value": record}) for record in records]
+    return job
+
+
+class TestJobResultsDownloader:
+    def test_results_in_order_of_completion(self, mocker):
+        """Downloader should return the results in the order the jobs completed"""
+        jobs = [make_job(mocker, [{"id": i}, {"id": i + 1}]) for i in range(0, 20, 2)]
+        downloader = JobResultsDownloader(jobs=iter(jobs), max_workers=3)
+
+        results = list(downloader.results())
+
+        assert [result.job for result in results] == jobs
+        assert [record for result in results for record in result.records()] == [{"id": i} for i in range(20)]
+
+    def test_results_downloaded_while_jobs_are_polled(self, mocker):
+        """Downloader should download the result of a completed job while it waits for the next one"""
+        downloaded = threading.Event()
+        job = make_job(mocker, [{"id": 1}])
+        job.get_result.side_effect = lambda: downloaded.set() or job.get_result.return_value
+
+        def completed_jobs():
+            yield job
+            assert downloaded.wait(timeout=10)
+
+        results = JobResultsDownloader(jobs=completed_jobs()).results()
+
+        result = next(results)
+        assert list(result.records()) == [{"id": 1}]
+        assert next(results, None) is None
+
+    def test_download_failed(self, mocker):
+        """Downloader should raise the exception of the download when the records are read"""
+        job = mocker.Mock(spec=InsightAsyncJob)
+        job.get_result.side_effect = RuntimeError("download failed")
+        result = next(JobResultsDownloader(jobs=[job]).results())
+
+        with pytest.raises(RuntimeError, match="download failed"):
+            list(result.records())
+
+    def test_jobs_failed(self, mocker):
+        """Downloader should raise the exception of the job manager"""
+
+        def completed_jobs():
+            yield make_job(mocker, [{"id": 1}])
+            raise JobException("job failed")
+
+        results = JobResultsDownloader(jobs=completed_jobs()).results()
+
+        assert list(next(results).records()) == [{"id": 1}]
+        with pytest.raises(JobException, match="job failed"):
+            next(results)
+
+    def test_buffered_records_bounded(self, mocker):
+        """Downloader should stop downloading when the records are not consumed"""
+        exported = []
+        job = mocker.Mock(spec=InsightAsyncJob)
+        job.get_result.return_value = (
+            mocker.Mock(**{"export_all_data.side_effect": lambda i=i: exported.append(i) or i}) for i in range(100)
+        )
+        results = JobResultsDownloader(jobs=[job], max_buffered_records=5).results()
+
+        result = next(results)
+        records = result.records()
+        assert next(records) == 0
+        results.close()
+
+        assert len(exported) <= 7
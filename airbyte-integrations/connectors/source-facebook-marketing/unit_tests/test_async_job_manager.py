@@ -2,6 +2,7 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import pendulum
 import pytest
 from facebook_business.api import FacebookAdsApiBatch
 from source_facebook_marketing.api import MyFacebookAdsApi
@@ -20,7 +21,16 @@ def api_fixture(mocker):
 
 @pytest.fixture(name="time_mock")
 def time_mock_fixture(mocker):
-    return mocker.patch("source_facebook_marketing.streams.async_job_manager.time")
+    """Fake clock, sleeping advances it"""
+    time_mock = mocker.patch("source_facebook_marketing.streams.async_job_manager.time")
+    clock = [1000.0]
+
+    def sleep(seconds):
+        clock[0] += seconds
+
+    time_mock.monotonic.side_effect = lambda: clock[0]
+    time_mock.sleep.side_effect = sleep
+    return time_mock
 
 
 @pytest.fixture(name="update_job_mock")
@@ -69,7 +79,7 @@ class TestInsightAsyncManager:
 
         job = next(manager.completed_jobs(), None)
         assert job == jobs[0]
-        time_mock.sleep.assert_called_with(InsightAsyncJobManager.JOB_STATUS_UPDATE_SLEEP_SECONDS)
+        time_mock.sleep.assert_called_with(InsightAsyncJobManager.MIN_JOB_STATUS_UPDATE_SECONDS)
 
         job = next(manager.completed_jobs(), None)
         assert job is None
@@ -174,3 +184,122 @@ class TestInsightAsyncManager:
 
         with pytest.raises(JobException):
             next(manager.completed_jobs(), None)
+
+    @pytest.mark.parametrize(
+        "throttle,expected_window",
+        [(0, InsightAsyncJobManager.MAX_JOBS_IN_QUEUE), (35, 50), (69, 2), (70, 1), (100, 1)],
+    )
+    def test_jobs_window(self, api, throttle, expected_window):
+        """Manager should run less jobs as the throttle value grows"""
+        api.api.ads_insights_throttle = MyFacebookAdsApi.Throttle(throttle, throttle)
+        manager = InsightAsyncJobManager(api=api, jobs=[])
+
+        assert manager._jobs_window() == expected_window
+
+    def test_jobs_started_within_window(self, api, mocker, time_mock, update_job_mock):
+        """Manager should not start more jobs than the window"""
+        api.api.ads_insights_throttle = MyFacebookAdsApi.Throttle(35, 35)
+        jobs = [mocker.Mock(spec=InsightAsyncJob, attempt_number=1, failed=False, completed=False) for _ in range(60)]
+        manager = InsightAsyncJobManager(api=api, jobs=jobs)
+
+        manager._start_jobs()
+
+        assert len(manager._running_jobs) == 50
+        assert sum(job.start.called for job in jobs) == 50
+
+    def test_jobs_started_in_order(self, api, mocker, time_mock, update_job_mock):
+        """Manager should start the jobs in the order of the stream, taking them from the iterator only when they are started"""
+        start = pendulum.Date(2022, 1, 1)
+        jobs = [
+            mocker.Mock(spec=InsightAsyncJob, attempt_number=1, failed=False, completed=True, interval=pendulum.Period(day, day))
+            for day in (start.add(days=n) for n in range(4))
+        ]
+        jobs_iter = iter(jobs)
+        mocker.patch.object(InsightAsyncJobManager, "MAX_JOBS_IN_QUEUE", 2)
+        manager = InsightAsyncJobManager(api=api, jobs=jobs_iter)
+
+        manager._start_jobs()
+
+        assert manager._running_jobs == jobs[:2]
+        assert next(jobs_iter) is jobs[2]
+
+    def test_jobs_status_update_interval(self, api, mocker, time_mock, update_job_mock):
+        """Manager should check the status of a job less often as it runs longer"""
+
+        def update_job_behaviour(api, jobs):
+            if update_job_mock.call_count == 30:
+                job.completed = True
+
+        update_job_mock.side_effect = update_job_behaviour
+        job = mocker.Mock(spec=InsightAsyncJob, attempt_number=1, failed=False, completed=False)
+        manager = InsightAsyncJobManager(api=api, jobs=[job])
+
+        assert list(manager.completed_jobs()) == [job]
+
+        sleeps = [call.args[0] for call in time_mock.sleep.call_args_list]
+        assert sleeps[0] == InsightAsyncJobManager.MIN_JOB_STATUS_UPDATE_SECONDS
+        assert sleeps == sorted(sleeps)
+        assert sleeps[-1] == InsightAsyncJobManager.MAX_JOB_STATUS_UPDATE_SECONDS
+
+    def test_only_due_jobs_updated(self, api, mocker, time_mock, update_job_mock):
+        """Manager should check the status of the jobs which are due only"""
+        jobs = [
+            mocker.Mock(spec=InsightAsyncJob, attempt_number=1, failed=False, completed=False),
+            mocker.Mock(spec=InsightAsyncJob, attempt_number=1, failed=False, completed=False),
+        ]
+        manager = InsightAsyncJobManager(api=api, jobs=jobs[:1])
+        manager._start_jobs()
+        manager._check_jobs_status_and_restart()
+        time_mock.sleep(60)
+        manager._check_jobs_status_and_restart()
+        # the second job is started while the first one is waiting for its next update
+        manager._jobs, manager._jobs_exhausted = iter(jobs[1:]), False
+        manager._start_jobs()
+        update_job_mock.reset_mock()
+
+        manager._check_jobs_status_and_restart()
+
+        update_job_mock.assert_called_once_with(api=api.api, jobs=[jobs[1]])
+
+    def test_failed_job_split_after_similar_job_split(self, api, mocker, time_mock, update_job_mock):
+        """Manager should split failed jobs right away once a job had to be split"""
+
+        def update_job_behaviour():
+            jobs[0].failed = True
+            jobs[0].attempt_number = 2
+            jobs[1].failed = True
+            yield from range(10)
+
+        update_job_mock.side_effect = update_job_behaviour()
+        jobs = [
+            mocker.Mock(spec=InsightAsyncJob, attempt_number=1, failed=False, completed=False),
+            mocker.Mock(spec=InsightAsyncJob, attempt_number=1, failed=False, completed=False),
+        ]
+        for job in jobs:
+            job.split_job.return_value = [mocker.Mock(spec=InsightAsyncJob, attempt_number=1, failed=False, completed=True)]
+        manager = InsightAsyncJobManager(api=api, jobs=jobs)
+
+        completed_jobs = list(manager.completed_jobs())
+
+        assert len(completed_jobs) == 2
+        assert all(isinstance(job, ParentAsyncJob) for job in completed_jobs)
+        jobs[0].split_job.assert_called_once()
+        jobs[1].split_job.assert_called_once()
+        jobs[1].restart.assert_not_called()
+
+    def test_jobs_metrics_logged(self, api, mocker, time_mock, update_job_mock, caplog):
+        """Manager should log the latency of the jobs once they are all completed"""
+
+        def update_job_behaviour():
+            yield
+            jobs[0].completed = True
+            yield
+
+        update_job_mock.side_effect = update_job_behaviour()
+        jobs = [mocker.Mock(spec=InsightAsyncJob, attempt_number=1, failed=False, completed=False)]
+        manager = InsightAsyncJobManager(api=api, jobs=jobs)
+
+        assert list(manager.completed_jobs()) == jobs
+
+        assert f"{jobs[0]}: completed 5 seconds after it was started" in caplog.text
+        assert "Insights jobs: 1 completed after 2 status updates, latency avg 5s max 5s" in caplog.text
@@ -115,6 +115,23 @@ class TestBaseInsightsStream:
 
         assert len(records) == 3
 
+    def test_read_records_downloaded_result(self, mocker, api):
+        """Records should be read from the downloaded result, the state is updated once all of them were read"""
+        job = mocker.Mock(spec=InsightAsyncJob)
+        job.interval = pendulum.Period(pendulum.date(2010, 1, 1), pendulum.date(2010, 1, 1))
+        job_result = mocker.Mock()
+        job_result.records.return_value = iter([{"id": 1}, {"id": 2}])
+        stream = AdsInsights(api=api, start_date=datetime(2010, 1, 1), end_date=datetime(2011, 1, 1), insights_lookback_window=28)
+
+        records = stream.read_records(sync_mode=SyncMode.incremental, stream_slice={"insight_job": job, "job_result": job_result})
+
+        assert next(records) == {"id": 1}
+        assert next(records) == {"id": 2}
+        assert stream.state == {}
+        assert next(records, None) is None
+        assert stream.state == {"slices": ["2010-01-01"], "time_increment": 1}
+        job.get_result.assert_not_called()
+
     @pytest.mark.parametrize(
         "state",
         [
@@ -159,7 +176,7 @@ class TestBaseInsightsStream:
 
         slices = list(stream.stream_slices(stream_state=None, sync_mode=SyncMode.incremental))
 
-        assert slices == [{"insight_job": 1}, {"insight_job": 2}, {"insight_job": 3}]
+        assert [stream_slice["insight_job"] for stream_slice in slices] == [1, 2, 3]
         async_manager_mock.assert_called_once()
         args, kwargs = async_manager_mock.call_args
         generated_jobs = list(kwargs["jobs"])
@@ -176,7 +193,7 @@ class TestBaseInsightsStream:
 
         slices = list(stream.stream_slices(stream_state=None, sync_mode=SyncMode.incremental))
 
-        assert slices == [{"insight_job": 1}, {"insight_job": 2}, {"insight_job": 3}]
+        assert [stream_slice["insight_job"] for stream_slice in slices] == [1, 2, 3]
         async_manager_mock.assert_called_once()
         args, kwargs = async_manager_mock.call_args
         generated_jobs = list(kwargs["jobs"])
@@ -194,7 +211,7 @@ class TestBaseInsightsStream:
 
         slices = list(stream.stream_slices(stream_state=state, sync_mode=SyncMode.incremental))
 
-        assert slices == [{"insight_job": 1}, {"insight_job": 2}, {"insight_job": 3}]
+        assert [stream_slice["insight_job"] for stream_slice in slices] == [1, 2, 3]
         async_manager_mock.assert_called_once()
         args, kwargs = async_manager_mock.call_args
         generated_jobs = list(kwargs["jobs"])
@@ -213,7 +230,7 @@ class TestBaseInsightsStream:
 
         slices = list(stream.stream_slices(stream_state=state, sync_mode=SyncMode.incremental))
 
-        assert slices == [{"insight_job": 1}, {"insight_job": 2}, {"insight_job": 3}]
+        assert [stream_slice["insight_job"] for stream_slice in slices] == [1, 2, 3]
         async_manager_mock.assert_called_once()
         args, kwargs = async_manager_mock.call_args
         generated_jobs = list(kwargs["jobs"])
@@ -234,7 +251,7 @@ class TestBaseInsightsStream:
 
         slices = list(stream.stream_slices(stream_state=state, sync_mode=SyncMode.incremental))
 
-        assert slices == [{"insight_job": 1}, {"insight_job": 2}, {"insight_job": 3}]
+        assert [stream_slice["insight_job"] for stream_slice in slices] == [1, 2, 3]
         async_manager_mock.assert_called_once()
         args, kwargs = async_manager_mock.call_args
         generated_jobs = list(kwargs["jobs"])
@@ -40,6 +40,32 @@ def test_local_file_read(file_format, extension, expected_columns, expected_rows
     check_read(configs, expected_columns, expected_rows)
 
 
+@pytest.mark.parametrize(
+    "file_format, extension, filename",
+    [
+        ("csv", "csv", "demo"),
+        ("feather", "feather", "demo"),
+        ("orc", "orc", "demo1"),
+        ("parquet", "parquet", "demo1"),
+    ],
+)
+def test_local_file_read_by_batches(file_format, extension, filename):
+    file_path = str(SAMPLE_DIRECTORY.joinpath(file_format, f"{filename}.{extension}"))
+    config = {"dataset_name": "test", "format": file_format, "url": file_path, "provider": {"storage": "local"}}
+    rows = list(Client(**config).read())
+    fields = list(rows[0])[:2]
+
+    client = Client(**config, reader_options='{"chunksize": 2}')
+    assert list(client.read(fields=fields)) == [{field: row[field] for field in fields} for row in rows]
+    with client.reader.open(binary=client.binary_source) as fp:
+        batches = list(client.load_dataframes(fp, fields=set(fields)))
+    assert sum(len(batch) for batch in batches) == len(rows)
+    assert all(len(batch) <= 2 for batch in batches)
+    # only the selected columns of the columnar formats are read
+    if file_format != "csv":
+        assert all(list(batch.columns) == fields for batch in batches)
+
+
 def run_load_dataframes(config, expected_columns=10, expected_rows=42):
     df_list = SourceFile.load_dataframes(config=config, logger=AirbyteLogger(), skip_data=False)
     assert len(df_list) == 1  # Properly load 1 DataFrame
@@ -0,0 +1,107 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+
+import gzip
+import io
+import os
+
+import pytest
+from source_file.ranged_download import DownloadCache, ParallelRangeReader, RangedSource, download, open_ranged
+
+
+class InMemoryRangedSource(RangedSource):
+    def __init__(self, url: str, content: bytes, etag: str = "v1"):
+        super().__init__(url)
+        self.content = content
+        self._etag = etag
+        self.requested_ranges = []
+
+    def probe(self) -> bool:
+        self.size = len(self.content)
+        self.etag = self._etag
+        return True
+
+    def read_range(self, start: int, end: int) -> bytes:
+        self.requested_ranges.append((start, end))
+        return self.content[start:end]
+
+
+@pytest.fixture(name="content")
+def content_fixture():
+    return os.urandom(10 * 1024 + 17)
+
+
+def make_source(url, content, etag="v1"):
+    source = InMemoryRangedSource(url, content, etag=etag)
+    source.probe()
+    return source
+
+
+def test_parallel_range_reader(content):
+    source = make_source("https://example.com/file.bin", content)
+    with io.BufferedReader(ParallelRangeReader(source, chunk_size=1024, max_workers=3)) as reader:
+        assert reader.read() == content
+    assert sorted(source.requested_ranges) == [(start, min(start + 1024, len(content))) for start in range(0, len(content), 1024)]
+
+
+def test_download(tmp_path, content):
+    source = make_source("https://example.com/file.bin", content)
+    path = str(tmp_path / "file.bin")
+    download(source, path, chunk_size=1000, max_workers=4)
+    with open(path, "rb") as f:
+        assert f.read() == content
+    assert os.listdir(tmp_path) == ["file.bin"]
+
+
+def test_download_cache(tmp_path, content):
+    cache = DownloadCache(str(tmp_path))
+    source = make_source("https://example.com/file.bin", content)
+    path = cache.get(source)
+    requested_ranges = len(source.requested_ranges)
+    assert cache.get(source) == path
+    assert len(source.requested_ranges) == requested_ranges
+
+    # a new version of the file replaces the previous one
+    changed = make_source("https://example.com/file.bin", content[::-1], etag="v2")
+    new_path = cache.get(changed)
+    assert new_path != path
+    assert not os.path.exists(path)
+    with open(new_path, "rb") as f:
+        assert f.read() == content[::-1]
+
+
+def test_open_ranged_compressed_text(tmp_path, monkeypatch):
+    monkeypatch.setattr("source_file.ranged_download.DOWNLOAD_CACHE_DIR", str(tmp_path))
+    lines = [f"line {i}\n" for i in range(10000)]
+    source = make_source("https://example.com/file.csv.gz", gzip.compress("".join(lines).encode()))
+    with open_ranged(source, binary=False) as f:
+        assert f.readlines() == lines
+    # text files are streamed, they are not kept in the cache
+    assert os.listdir(tmp_path) == []
+
+
+def test_open_ranged_binary(tmp_path, monkeypatch, content):
+    monkeypatch.setattr("source_file.ranged_download.DOWNLOAD_CACHE_DIR", str(tmp_path))
+    source = make_source("https://example.com/file.parquet", content)
+    with open_ranged(source, binary=True) as f:
+        assert f.read() == content
+    requested_ranges = len(source.requested_ranges)
+
+    # the binary file downloaded by a previous command is read from the cache, as the text files are
+    with open_ranged(source, binary=True) as f:
+        assert f.read() == content
+    with open_ranged(source, binary=False) as f:
+        assert f.buffer.read() == content
+    assert len(source.requested_ranges) == requested_ranges
+
+
+def test_open_ranged_binary_without_cache(tmp_path, monkeypatch, content):
+    monkeypatch.setattr("source_file.ranged_download.DOWNLOAD_CACHE_DIR", None)
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+    source = make_source("https://example.com/file.parquet", content)
+    with open_ranged(source, binary=True) as f:
+        assert f.read() == content
+    # the local copy is deleted once the file is read
+    assert os.listdir(tmp_path) == []
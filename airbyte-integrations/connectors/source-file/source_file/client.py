@@ -5,11 +5,13 @@
 
 import json
 import traceback
-from typing import Iterable
+from typing import Iterable, Iterator, List, Optional, Set
 from urllib.parse import urlparse
 
+import boto3
 import google
 import pandas as pd
+import pyarrow as pa
 import smart_open
 from airbyte_cdk.entrypoint import logger
 from airbyte_cdk.models import AirbyteStream, SyncMode
@@ -19,6 +21,14 @@ from botocore.config import Config
 from genson import SchemaBuilder
 from google.cloud.storage import Client as GCSClient
 from google.oauth2 import service_account
+from pyarrow import ipc, orc, parquet
+
+from .ranged_download import CHUNK_SIZE, AzureRangedSource, GCSRangedSource, HTTPRangedSource, RangedSource, S3RangedSource, open_ranged
+
+# Number of rows read and converted to records at once, can be changed with the `chunksize` reader option
+BATCH_SIZE = 10000
+# Formats which store their schema, it is discovered without reading the data
+SELF_DESCRIBING_FORMATS = {"feather", "orc", "parquet"}
 
 
 class ConfigurationError(Exception):
@@ -85,6 +95,9 @@ class URLFile:
         storage = self.storage_scheme
         url = self.url
 
+        source = self._ranged_source()
+        if source:
+            return open_ranged(source, binary=binary)
         if storage == "gs://":
             return self._open_gcs_url(binary=binary)
         elif storage == "s3://":
@@ -115,6 +128,34 @@ class URLFile:
             return smart_open.open(uri, transport_params=transport_params, mode=mode)
         return smart_open.open(self.full_url, mode=mode)
 
+    def _ranged_source(self) -> Optional[RangedSource]:
+        """
+        :return: the file as a RangedSource if it is stored by a provider supporting ranged downloads and is larger than a range
+        """
+        storage = self.storage_scheme
+        try:
+            if storage == "https://":
+                source = HTTPRangedSource(self.full_url)
+            elif storage == "s3://":
+                bucket, _, key = self.url.partition("/")
+                source = S3RangedSource(self.full_url, self._aws_client(), bucket=bucket, key=key)
+            elif storage == "gs://":
+                bucket, _, blob = self.url.partition("/")
+                source = GCSRangedSource(self.full_url, self._gcs_client(), bucket=bucket, blob=blob)
+            elif storage == "azure://":
+                container, _, blob = self.url.partition("/")
+                source = AzureRangedSource(self.full_url, self._azblob_client(), container=container, blob=blob)
+            else:
+                return None
+            if source.probe() and source.size > CHUNK_SIZE:
+                return source
+        except ConfigurationError:
+            raise
+        except Exception as err:
+            # the file is read sequentially by smart_open, which raises the errors of the provider if the file can't be read at all
+            logger.info(f"Ranged downloads are not available for {self.url}: {repr(err)}")
+        return None
+
     @property
     def url(self) -> str:
         """Convert URL to remove the URL prefix (scheme)
@@ -155,8 +196,7 @@ class URLFile:
         logger.error(f"Unknown Storage provider in: {self.full_url}")
         return ""
 
-    def _open_gcs_url(self, binary) -> object:
-        mode = "rb" if binary else "r"
+    def _gcs_client(self) -> GCSClient:
         service_account_json = self._provider.get("service_account_json")
         credentials = None
         if service_account_json:
@@ -169,13 +209,23 @@ class URLFile:
 
         if credentials:
             credentials = service_account.Credentials.from_service_account_info(credentials)
-            client = GCSClient(credentials=credentials, project=credentials._project_id)
-        else:
-            client = GCSClient.create_anonymous_client()
+            return GCSClient(credentials=credentials, project=credentials._project_id)
+        return GCSClient.create_anonymous_client()
+
+    def _open_gcs_url(self, binary) -> object:
+        mode = "rb" if binary else "r"
+        client = self._gcs_client()
         file_to_close = smart_open.open(self.full_url, transport_params=dict(client=client), mode=mode)
 
         return file_to_close
 
+    def _aws_client(self):
+        aws_access_key_id = self._provider.get("aws_access_key_id")
+        aws_secret_access_key = self._provider.get("aws_secret_access_key")
+        if aws_access_key_id and aws_secret_access_key:
+            return boto3.client("s3", aws_access_key_id=aws_access_key_id, aws_secret_access_key=aws_secret_access_key)
+        return boto3.client("s3", config=Config(signature_version=UNSIGNED))
+
     def _open_aws_url(self, binary):
         mode = "rb" if binary else "r"
         aws_access_key_id = self._provider.get("aws_access_key_id")
@@ -194,8 +244,7 @@ class URLFile:
             result = smart_open.open(self.full_url, transport_params=params, mode=mode)
         return result
 
-    def _open_azblob_url(self, binary):
-        mode = "rb" if binary else "r"
+    def _azblob_client(self) -> BlobServiceClient:
         storage_account = self._provider.get("storage_account")
         storage_acc_url = f"https://{storage_account}.blob.core.windows.net"
         sas_token = self._provider.get("sas_token", None)
@@ -204,11 +253,13 @@ class URLFile:
         credential = shared_key or sas_token
 
         if credential:
-            client = BlobServiceClient(account_url=storage_acc_url, credential=credential)
-        else:
-            # assuming anonymous public read access given no credential
-            client = BlobServiceClient(account_url=storage_acc_url)
+            return BlobServiceClient(account_url=storage_acc_url, credential=credential)
+        # assuming anonymous public read access given no credential
+        return BlobServiceClient(account_url=storage_acc_url)
 
+    def _open_azblob_url(self, binary):
+        mode = "rb" if binary else "r"
+        client = self._azblob_client()
         result = smart_open.open(f"{self.storage_scheme}{self.url}", transport_params=dict(client=client), mode=mode)
         return result
 
@@ -252,24 +303,30 @@ class Client:
             result = result["items"]["properties"]
         return result
 
-    def load_nested_json(self, fp) -> list:
+    def load_nested_json(self, fp) -> Iterable[dict]:
         if self._reader_format == "jsonl":
-            result = []
-            line = fp.readline()
-            while line:
-                result.append(json.loads(line))
-                line = fp.readline()
+            # parsed line by line, so only a line is kept in memory
+            for line in fp:
+                yield json.loads(line)
         else:
             result = json.load(fp)
             if not isinstance(result, list):
                 result = [result]
-        return result
+            yield from result
+
+    @property
+    def batch_size(self) -> int:
+        return int(self._reader_options.get("chunksize") or BATCH_SIZE)
 
-    def load_dataframes(self, fp, skip_data=False) -> Iterable:
+    def load_dataframes(self, fp, skip_data=False, fields: Set[str] = None) -> Iterable:
         """load and return the appropriate pandas dataframe.
 
+        The CSV, JSON lines (`flat_json` with the `lines` reader option), parquet, ORC and feather files are read by batches of
+        `batch_size` rows, the other formats are loaded at once.
+
         :param fp: file-like object to read from
         :param skip_data: limit reading data
+        :param fields: columns to read, all of them by default. The other columns may be read as well.
         :return: a list of dataframe loaded from files described in the configuration
         """
         readers = {
@@ -295,16 +352,68 @@ class Client:
             raise ConfigurationError(error_msg) from err
 
         reader_options = {**self._reader_options}
+        reader_options.pop("chunksize", None)
         if self._reader_format == "csv":
-            reader_options["chunksize"] = 10000
+            reader_options["chunksize"] = self.batch_size
             if skip_data:
                 reader_options["nrows"] = 0
                 reader_options["index_col"] = 0
+            elif fields and "usecols" not in reader_options:
+                reader_options["usecols"] = lambda column: column in fields
 
             yield from reader(fp, **reader_options)
+        elif self._reader_format == "flat_json" and reader_options.get("lines"):
+            yield from reader(fp, chunksize=self.batch_size, **reader_options)
+        elif self._reader_format in SELF_DESCRIBING_FORMATS and set(reader_options) <= {"columns"}:
+            # the other options of the pandas readers are only supported when the file is loaded at once
+            if "columns" in reader_options:
+                fields = set(reader_options["columns"]).intersection(fields) if fields else set(reader_options["columns"])
+            yield from self._read_arrow_batches(fp, skip_data=skip_data, fields=fields)
         else:
             yield reader(fp, **reader_options)
 
+    def _read_arrow_batches(self, fp, skip_data: bool, fields: Optional[Set[str]]) -> Iterator[pd.DataFrame]:
+        """
+        Read the parquet row groups, ORC stripes or feather record batches one at a time, by batches of `batch_size` rows.
+        Only the selected columns are read from the parquet and ORC files.
+        """
+        if self._reader_format == "parquet":
+            parquet_file = parquet.ParquetFile(fp)
+            schema = parquet_file.schema_arrow
+            columns = self._arrow_columns(schema, fields)
+            batches = () if skip_data else parquet_file.iter_batches(batch_size=self.batch_size, columns=columns)
+        elif self._reader_format == "orc":
+            orc_file = orc.ORCFile(fp)
+            schema = orc_file.schema
+            columns = self._arrow_columns(schema, fields)
+            batches = () if skip_data else (orc_file.read_stripe(stripe, columns=columns) for stripe in range(orc_file.nstripes))
+        else:
+            try:
+                feather_file = ipc.open_file(fp)
+            except pa.ArrowInvalid:
+                # feather V1 files are not Arrow IPC files
+                fp.seek(0)
+                yield pd.read_feather(fp)
+                return
+            schema = feather_file.schema
+            columns = self._arrow_columns(schema, fields)
+            batches = () if skip_data else (feather_file.get_batch(index) for index in range(feather_file.num_record_batches))
+
+        if skip_data:
+            yield schema.empty_table().select(columns).to_pandas()
+            return
+        for batch in batches:
+            if batch.schema.names != columns:
+                batch = pa.RecordBatch.from_arrays([batch.column(batch.schema.get_field_index(name)) for name in columns], names=columns)
+            for offset in range(0, batch.num_rows, self.batch_size):
+                yield batch.slice(offset, self.batch_size).to_pandas(integer_object_nulls=True)
+
+    @staticmethod
+    def _arrow_columns(schema: pa.Schema, fields: Optional[Set[str]]) -> List[str]:
+        # the index stored by pandas is not a column of the records
+        index_columns = {column for column in (schema.pandas_metadata or {}).get("index_columns", []) if isinstance(column, str)}
+        return [name for name in schema.names if name not in index_columns and (not fields or name in fields)]
+
     @staticmethod
     def dtype_to_json_type(dtype) -> str:
         """Convert Pandas Dataframe types to Airbyte Types.
@@ -336,17 +445,21 @@ class Client:
                 yield from self.load_nested_json(fp)
             else:
                 fields = set(fields) if fields else None
-                for df in self.load_dataframes(fp):
-                    columns = fields.intersection(set(df.columns)) if fields else df.columns
-                    df = df.where(pd.notnull(df), None)
-                    yield from df[columns].to_dict(orient="records")
+                for df in self.load_dataframes(fp, fields=fields):
+                    if fields:
+                        df = df[[column for column in df.columns if column in fields]]
+                    # the frames of the formats loaded at once are converted to records by batches as well
+                    for offset in range(0, len(df), self.batch_size):
+                        batch = df.iloc[offset : offset + self.batch_size]
+                        batch = batch.where(pd.notnull(batch), None)
+                        yield from batch.to_dict(orient="records")
 
     def _stream_properties(self):
         with self.reader.open(binary=self.binary_source) as fp:
             if self._reader_format == "json" or self._reader_format == "jsonl":
                 return self.load_nested_json_schema(fp)
 
-            df_list = self.load_dataframes(fp, skip_data=False)
+            df_list = self.load_dataframes(fp, skip_data=self._reader_format in SELF_DESCRIBING_FORMATS)
             fields = {}
             for df in df_list:
                 for col in df.columns:
@@ -0,0 +1,277 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+
+import bz2
+import collections
+import gzip
+import hashlib
+import io
+import mmap
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import IO, Deque, Optional
+
+import requests
+import smart_open
+from airbyte_cdk.entrypoint import logger
+
+# Size of the byte ranges downloaded concurrently, files smaller than a chunk are read with a single request
+CHUNK_SIZE = 4 * 1024 * 1024
+# Number of ranges downloaded at the same time
+MAX_WORKERS = 8
+# Number of ranges downloaded ahead of the reader of a streamed file, which bounds the memory it uses
+MAX_BUFFERED_CHUNKS = 2 * MAX_WORKERS
+# Directory of the files downloaded by the previous commands, it must be mounted to outlive the container. Disabled when unset.
+DOWNLOAD_CACHE_DIR = os.environ.get("FILE_DOWNLOAD_CACHE_DIR")
+
+# Compressions detected from the extension of the file, as smart_open does
+_DECOMPRESSORS = {".gz": lambda fileobj: gzip.GzipFile(fileobj=fileobj), ".bz2": bz2.BZ2File}
+
+
+class RangedSource(ABC):
+    """
+    Remote file whose byte ranges can be downloaded independently of each other.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self.size: Optional[int] = None
+        self.etag: Optional[str] = None
+
+    @abstractmethod
+    def probe(self) -> bool:
+        """
+        Fetch the size and the ETag of the file.
+        :return: False if the file can't be downloaded by ranges
+        """
+
+    @abstractmethod
+    def read_range(self, start: int, end: int) -> bytes:
+        """
+        :return: the bytes of the file from `start` (inclusive) to `end` (exclusive)
+        """
+
+
+class HTTPRangedSource(RangedSource):
+    """
+    File served by an HTTP server which accepts Range requests.
+    """
+
+    def __init__(self, url: str):
+        super().__init__(url)
+        self._session = requests.Session()
+        # the ranges must be the ones of the file, not of its encoded content
+        self._session.headers["Accept-Encoding"] = "identity"
+
+    def probe(self) -> bool:
+        response = self._session.head(self.url, allow_redirects=True)
+        response.raise_for_status()
+        if response.headers.get("Accept-Ranges") != "bytes" or "Content-Length" not in response.headers:
+            return False
+        if response.headers.get("Content-Encoding", "identity") != "identity":
+            return False
+        self.url = response.url
+        self.size = int(response.headers["Content-Length"])
+        self.etag = response.headers.get("ETag") or response.headers.get("Last-Modified")
+        return True
+
+    def read_range(self, start: int, end: int) -> bytes:
+        response = self._session.get(self.url, headers={"Range": f"bytes={start}-{end - 1}"})
+        response.raise_for_status()
+        if response.status_code != requests.codes.PARTIAL_CONTENT:
+            raise IOError(f"{self.url} was returned without the range {start}-{end - 1} (status {response.status_code})")
+        return response.content
+
+
+class S3RangedSource(RangedSource):
+    def __init__(self, url: str, client, bucket: str, key: str):
+        super().__init__(url)
+        self._client = client
+        self._bucket = bucket
+        self._key = key
+
+    def probe(self) -> bool:
+        head = self._client.head_object(Bucket=self._bucket, Key=self._key)
+        self.size = head["ContentLength"]
+        self.etag = head.get("ETag")
+        return True
+
+    def read_range(self, start: int, end: int) -> bytes:
+        return self._client.get_object(Bucket=self._bucket, Key=self._key, Range=f"bytes={start}-{end - 1}")["Body"].read()
+
+
+class GCSRangedSource(RangedSource):
+    def __init__(self, url: str, client, bucket: str, blob: str):
+        super().__init__(url)
+        self._bucket = client.bucket(bucket)
+        self._blob_name = blob
+        self._blob = None
+
+    def probe(self) -> bool:
+        self._blob = self._bucket.get_blob(self._blob_name)
+        if self._blob is None:
+            # the error is raised when the file is opened by smart_open
+            return False
+        self.size = self._blob.size
+        self.etag = self._blob.etag
+        return True
+
+    def read_range(self, start: int, end: int) -> bytes:
+        # the end of the GCS ranges is inclusive
+        return self._blob.download_as_bytes(start=start, end=end - 1)
+
+
+class AzureRangedSource(RangedSource):
+    def __init__(self, url: str, client, container: str, blob: str):
+        super().__init__(url)
+        self._blob_client = client.get_blob_client(container=container, blob=blob)
+
+    def probe(self) -> bool:
+        properties = self._blob_client.get_blob_properties()
+        self.size = properties.size
+        self.etag = properties.etag
+        return True
+
+    def read_range(self, start: int, end: int) -> bytes:
+        return self._blob_client.download_blob(offset=start, length=end - start).readall()
+
+
+class ParallelRangeReader(io.RawIOBase):
+    """
+    Reads a RangedSource sequentially while the next CHUNK_SIZE ranges are downloaded concurrently.
+    At most MAX_BUFFERED_CHUNKS ranges are downloaded ahead of the reader, so the memory used does not depend on the size of the file.
+    """
+
+    def __init__(self, source: RangedSource, chunk_size: int = CHUNK_SIZE, max_workers: int = MAX_WORKERS):
+        super().__init__()
+        self._source = source
+        self._chunk_size = chunk_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="file_download")
+        self._pending: Deque[Future] = collections.deque()
+        self._next_start = 0
+        self._buffer = memoryview(b"")
+        for _ in range(MAX_BUFFERED_CHUNKS):
+            self._submit_next()
+
+    def _submit_next(self):
+        if self._next_start < self._source.size:
+            end = min(self._next_start + self._chunk_size, self._source.size)
+            self._pending.append(self._executor.submit(self._source.read_range, self._next_start, end))
+            self._next_start = end
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self._buffer:
+            if not self._pending:
+                return 0
+            self._buffer = memoryview(self._pending.popleft().result())
+            self._submit_next()
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
+
+    def close(self):
+        if not self.closed:
+            for future in self._pending:
+                future.cancel()
+            self._executor.shutdown(wait=False)
+        super().close()
+
+
+def download(source: RangedSource, path: str, chunk_size: int = CHUNK_SIZE, max_workers: int = MAX_WORKERS):
+    """
+    Download the ranges of the file concurrently into a memory-mapped file, which is renamed to `path` once complete.
+    """
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb+") as f:
+            f.truncate(source.size)
+            if source.size:
+                with mmap.mmap(f.fileno(), source.size) as mapped:
+
+                    def download_range(start: int):
+                        end = min(start + chunk_size, source.size)
+                        data = source.read_range(start, end)
+                        if len(data) != end - start:
+                            raise IOError(f"{source.url}: {len(data)} bytes were returned for the range {start}-{end - 1}")
+                        mapped[start:end] = data
+
+                    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="file_download") as executor:
+                        # iterating the results raises the first error
+                        list(executor.map(download_range, range(0, source.size, chunk_size)))
+                    mapped.flush()
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+class DownloadCache:
+    """
+    Local copies of the remote files, keyed by URL and ETag, so the file is not downloaded again by the next commands
+    (e.g. `discover` then `read`) until it changes. Only the last version of a file is kept.
+    """
+
+    def __init__(self, directory: str):
+        self._directory = directory
+
+    def _url_directory(self, url: str) -> str:
+        # the URLs may contain credentials, they are not written to the disk
+        return os.path.join(self._directory, hashlib.sha256(url.encode()).hexdigest()[:32])
+
+    def path(self, url: str, etag: str) -> str:
+        # the extension is kept so the compression of the file is detected by smart_open
+        _, extension = os.path.splitext(url.split("?")[0])
+        return os.path.join(self._url_directory(url), hashlib.sha256(etag.encode()).hexdigest()[:32] + extension)
+
+    def get(self, source: RangedSource) -> str:
+        """
+        :return: the path of the local copy of the file, downloaded if the cache has no copy of its current version
+        """
+        path = self.path(source.url, source.etag)
+        if os.path.exists(path):
+            logger.info(f"Reading {os.path.basename(source.url)} from the download cache")
+            return path
+        url_directory = self._url_directory(source.url)
+        os.makedirs(url_directory, exist_ok=True)
+        download(source, path)
+        for name in os.listdir(url_directory):
+            if os.path.join(url_directory, name) != path and not name.endswith(".tmp"):
+                os.remove(os.path.join(url_directory, name))
+        return path
+
+
+def open_ranged(source: RangedSource, binary: bool) -> IO:
+    """
+    Open the remote file for reading, with concurrent range downloads.
+
+    The binary files are read from a local copy, as most binary formats need random access, which is kept in the download cache if
+    it is enabled and the file has an ETag, or deleted as soon as it is opened otherwise. The text files are streamed, or read from
+    the download cache when a previous command downloaded them.
+    """
+    cache = DownloadCache(DOWNLOAD_CACHE_DIR) if DOWNLOAD_CACHE_DIR and source.etag else None
+    if cache and (binary or os.path.exists(cache.path(source.url, source.etag))):
+        return smart_open.open(cache.get(source), mode="rb" if binary else "r")
+    if binary:
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, os.path.basename(source.url.split("?")[0]) or "file")
+        download(source, path)
+        file = smart_open.open(path, mode="rb")
+        # the file stays readable until it is closed
+        os.remove(path)
+        os.rmdir(directory)
+        return file
+
+    _, extension = os.path.splitext(source.url.split("?")[0])
+    stream = io.BufferedReader(ParallelRangeReader(source), buffer_size=CHUNK_SIZE)
+    if extension in _DECOMPRESSORS:
+        stream = _DECOMPRESSORS[extension](stream)
+    return io.TextIOWrapper(stream)
@@ -0,0 +1,57 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import threading
+from typing import Any, Mapping, MutableMapping, Optional
+
+
+class ETagCache:
+    """
+    Validators (ETag and Last-Modified headers) and bodies of the GitHub responses of the slow-changing streams, keyed by request URL.
+
+    The requests of these streams are sent with If-None-Match/If-Modified-Since: GitHub answers 304 Not Modified, which does not count
+    against the rate limit, when the resource did not change since the cached response and its body is replayed from the cache.
+    The cache is kept in the connector state between syncs, only the entries of the requests sent during the sync are saved,
+    so the entries of the repositories removed from the config are dropped.
+    """
+
+    def __init__(self, entries: Mapping[str, Mapping[str, Any]] = None):
+        self._lock = threading.Lock()
+        self._entries: MutableMapping[str, Mapping[str, Any]] = dict(entries or {})
+        self._used: MutableMapping[str, Mapping[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_state(cls, state: Optional[Mapping[str, Any]]) -> "ETagCache":
+        entries = (state or {}).get("entries")
+        return cls(entries if isinstance(entries, Mapping) else None)
+
+    def to_state(self) -> Mapping[str, Any]:
+        with self._lock:
+            return {"entries": dict(self._used)}
+
+    def get(self, url: str) -> Optional[Mapping[str, Any]]:
+        """
+        :return: the cached entry of the URL: its `etag`, `last_modified`, `link` headers and the JSON `body`
+        """
+        with self._lock:
+            return self._entries.get(url)
+
+    def put(self, url: str, etag: Optional[str], last_modified: Optional[str], link: Optional[str], body: Any):
+        entry = {"etag": etag, "last_modified": last_modified, "link": link, "body": body}
+        with self._lock:
+            self._entries[url] = entry
+            self._used[url] = entry
+            self.misses += 1
+
+    def hit(self, url: str):
+        """Keep the entry of a request answered with 304 Not Modified"""
+        with self._lock:
+            self._used[url] = self._entries[url]
+            self.hits += 1
+
+    def __str__(self):
+        requests = self.hits + self.misses
+        return f"{self.hits} of {requests} conditional requests not modified, {len(self._used)} cached responses"
@@ -96,3 +96,29 @@ def get_query_reviews(owner, name, first, after, number=None):
         is_site_admin="site_admin",
     )
     return str(op)
+
+
+def get_query_refs(repositories, ref_prefix, first, with_protection=False):
+    """
+    Query the refs of several repositories at once, the repository at index `i` of `repositories` (owner, name, after)
+    is aliased `repository{i}` in the response.
+    """
+    op = sgqlc.operation.Operation(_schema_root.query_type)
+    for index, (owner, name, after) in enumerate(repositories):
+        repository = op.repository(owner=owner, name=name, __alias__=f"repository{index}")
+        kwargs = {"ref_prefix": ref_prefix, "first": first}
+        if after:
+            kwargs["after"] = after
+        refs = repository.refs(**kwargs)
+        refs.nodes.__fields__(id=True, name=True)
+        refs.nodes.target.oid()
+        # annotated tags point to a tag object, which points to the commit
+        refs.nodes.target.__as__(_schema_root.Tag).target.oid()
+        if with_protection:
+            rule = refs.nodes.branch_protection_rule()
+            rule.__fields__(requires_status_checks=True, is_admin_enforced=True, required_status_check_contexts=True)
+            rule.required_status_checks.context()
+            rule.required_status_checks.app.database_id()
+        refs.page_info.__fields__(has_next_page=True, end_cursor=True)
+    op.rate_limit.__fields__(cost=True, remaining=True, reset_at=True)
+    return str(op)
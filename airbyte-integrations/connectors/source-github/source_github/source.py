@@ -3,15 +3,17 @@
 #
 
 
+import logging
 import re
-from typing import Any, Dict, List, Mapping, Tuple
+from typing import Any, Dict, Iterator, List, Mapping, MutableMapping, Tuple
 
 from airbyte_cdk import AirbyteLogger
-from airbyte_cdk.models import SyncMode
+from airbyte_cdk.models import AirbyteMessage, AirbyteStateMessage, ConfiguredAirbyteCatalog, SyncMode, Type
 from airbyte_cdk.sources import AbstractSource
 from airbyte_cdk.sources.streams import Stream
 from airbyte_cdk.sources.streams.http.auth import MultipleTokenAuthenticator
 
+from .etag_cache import ETagCache
 from .streams import (
     Assignees,
     Branches,
@@ -56,9 +58,15 @@ DEFAULT_PAGE_SIZE_FOR_LARGE_STREAM = 10
 # To scan all the repos within orgnaization, organization name could be
 # specified by using asteriks i.e. "airbytehq/*"
 ORGANIZATION_PATTERN = re.compile("^.*/\\*$")
+# Key of the connector state under which the ETag cache of the slow-changing streams is kept
+ETAG_CACHE_STATE_KEY = "__etag_cache"
 
 
 class SourceGithub(AbstractSource):
+    def __init__(self):
+        super().__init__()
+        self.etag_cache = ETagCache()
+
     @staticmethod
     def _generate_repositories(config: Mapping[str, Any], authenticator: MultipleTokenAuthenticator) -> Tuple[List[str], List[str]]:
         """
@@ -100,7 +108,9 @@ class SourceGithub(AbstractSource):
         return MultipleTokenAuthenticator(tokens=tokens, auth_method="token")
 
     @staticmethod
-    def _get_branches_data(selected_branches: str, full_refresh_args: Dict[str, Any] = None) -> Tuple[Dict[str, str], Dict[str, List[str]]]:
+    def _get_branches_data(
+        selected_branches: str, full_refresh_args: Dict[str, Any] = None, graphql_batch_size: int = None
+    ) -> Tuple[Dict[str, str], Dict[str, List[str]]]:
         selected_branches = set(filter(None, selected_branches.split(" ")))
 
         # Get the default branch for each repository
@@ -115,7 +125,7 @@ class SourceGithub(AbstractSource):
             )
 
         all_branches = []
-        branches_stream = Branches(**full_refresh_args)
+        branches_stream = Branches(**full_refresh_args, graphql_batch_size=graphql_batch_size)
         for stream_slice in branches_stream.stream_slices(sync_mode=SyncMode.full_refresh):
             for branch in branches_stream.read_records(sync_mode=SyncMode.full_refresh, stream_slice=stream_slice):
                 all_branches.append(f"{branch['repository']}/{branch['name']}")
@@ -170,6 +180,28 @@ class SourceGithub(AbstractSource):
 
             return False, message
 
+    def read(
+        self,
+        logger: logging.Logger,
+        config: Mapping[str, Any],
+        catalog: ConfiguredAirbyteCatalog,
+        state: MutableMapping[str, Any] = None,
+    ) -> Iterator[AirbyteMessage]:
+        """
+        Read the streams with the ETag cache of the previous sync, the cache of this sync is saved by a last state message:
+        the state messages of the streams keep the previous cache, so it is not lost when the sync fails.
+        """
+        state = state or {}
+        self.etag_cache = ETagCache.from_state(state.get(ETAG_CACHE_STATE_KEY))
+        connector_state = dict(state)
+        for message in super().read(logger=logger, config=config, catalog=catalog, state=state):
+            if message.type == Type.STATE:
+                connector_state = dict(message.state.data)
+            yield message
+        logger.info(f"ETag cache: {self.etag_cache}")
+        connector_state[ETAG_CACHE_STATE_KEY] = self.etag_cache.to_state()
+        yield AirbyteMessage(type=Type.STATE, state=AirbyteStateMessage(data=connector_state))
+
     def streams(self, config: Mapping[str, Any]) -> List[Stream]:
         authenticator = self._get_authenticator(config)
         repos, organization_repos = self._generate_repositories(config=config, authenticator=authenticator)
@@ -178,12 +210,19 @@ class SourceGithub(AbstractSource):
         organizations = list({org.split("/")[0] for org in repositories})
         page_size = config.get("page_size_for_large_streams", DEFAULT_PAGE_SIZE_FOR_LARGE_STREAM)
 
-        organization_args = {"authenticator": authenticator, "organizations": organizations}
+        organization_args = {"authenticator": authenticator, "organizations": organizations, "etag_cache": self.etag_cache}
         organization_args_with_start_date = {**organization_args, "start_date": config["start_date"]}
-        repository_args = {"authenticator": authenticator, "repositories": repositories, "page_size_for_large_streams": page_size}
+        repository_args = {
+            "authenticator": authenticator,
+            "repositories": repositories,
+            "page_size_for_large_streams": page_size,
+            "etag_cache": self.etag_cache,
+        }
         repository_args_with_start_date = {**repository_args, "start_date": config["start_date"]}
 
-        default_branches, branches_to_pull = self._get_branches_data(config.get("branch", ""), repository_args)
+        graphql_batch_size = config.get("graphql_batch_size")
+
+        default_branches, branches_to_pull = self._get_branches_data(config.get("branch", ""), repository_args, graphql_batch_size)
         pull_requests_stream = PullRequests(**repository_args_with_start_date)
         projects_stream = Projects(**repository_args_with_start_date)
         project_columns_stream = ProjectColumns(projects_stream, **repository_args_with_start_date)
@@ -192,7 +231,7 @@ class SourceGithub(AbstractSource):
 
         return [
             Assignees(**repository_args),
-            Branches(**repository_args),
+            Branches(**repository_args, graphql_batch_size=graphql_batch_size),
             Collaborators(**repository_args),
             Comments(**repository_args_with_start_date),
             CommitCommentReactions(**repository_args_with_start_date),
@@ -219,7 +258,7 @@ class SourceGithub(AbstractSource):
             ReviewComments(**repository_args_with_start_date),
             Reviews(**repository_args_with_start_date),
             Stargazers(**repository_args_with_start_date),
-            Tags(**repository_args),
+            Tags(**repository_args, graphql_batch_size=graphql_batch_size),
             teams_stream,
             team_members_stream,
             Users(**organization_args),
@@ -2,9 +2,10 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import json
 import time
 from abc import ABC, abstractmethod
-from typing import Any, Iterable, List, Mapping, MutableMapping, Optional, Union
+from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Optional, Tuple, Union
 from urllib import parse
 
 import pendulum
@@ -13,7 +14,8 @@ from airbyte_cdk.models import SyncMode
 from airbyte_cdk.sources.streams.http import HttpStream
 from requests.exceptions import HTTPError
 
-from .graphql import get_query_pull_requests, get_query_reviews
+from .etag_cache import ETagCache
+from .graphql import get_query_pull_requests, get_query_refs, get_query_reviews
 from .utils import getter
 
 DEFAULT_PAGE_SIZE = 100
@@ -29,9 +31,13 @@ class GithubStream(HttpStream, ABC):
 
     stream_base_params = {}
 
-    def __init__(self, repositories: List[str], page_size_for_large_streams: int, **kwargs):
+    # Send conditional requests and replay the cached response when GitHub answers 304 Not Modified, for slow-changing streams
+    use_etag_cache = False
+
+    def __init__(self, repositories: List[str], page_size_for_large_streams: int, etag_cache: ETagCache = None, **kwargs):
         super().__init__(**kwargs)
         self.repositories = repositories
+        self.etag_cache = etag_cache
 
         # GitHub pagination could be from 1 to 100.
         self.page_size = page_size_for_large_streams if self.large_stream else DEFAULT_PAGE_SIZE
@@ -56,6 +62,47 @@ class GithubStream(HttpStream, ABC):
             page = dict(parse.parse_qsl(parsed_link.query)).get("page")
             return {"page": page}
 
+    def _send_request(self, request: requests.PreparedRequest, request_kwargs: Mapping[str, Any]) -> requests.Response:
+        if not (self.use_etag_cache and self.etag_cache is not None and request.method == "GET"):
+            return super()._send_request(request, request_kwargs)
+
+        entry = self.etag_cache.get(request.url)
+        if entry:
+            if entry["etag"]:
+                request.headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                request.headers["If-Modified-Since"] = entry["last_modified"]
+        response = super()._send_request(request, request_kwargs)
+
+        if entry and response.status_code == requests.codes.NOT_MODIFIED:
+            self.etag_cache.hit(request.url)
+            return self._cached_response(request, entry)
+        if response.ok and (response.headers.get("ETag") or response.headers.get("Last-Modified")):
+            self.etag_cache.put(
+                request.url,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                link=response.headers.get("Link"),
+                body=response.json(),
+            )
+        return response
+
+    @staticmethod
+    def _cached_response(request: requests.PreparedRequest, entry: Mapping[str, Any]) -> requests.Response:
+        """
+        Build the response of a request answered with 304 Not Modified from the cached one, so it's parsed and paginated as usual.
+        """
+        response = requests.Response()
+        response.status_code = requests.codes.OK
+        response.url = request.url
+        response.request = request
+        response.encoding = "utf-8"
+        response.headers["Content-Type"] = "application/json; charset=utf-8"
+        if entry["link"]:
+            response.headers["Link"] = entry["link"]
+        response._content = json.dumps(entry["body"]).encode("utf-8")
+        return response
+
     def should_retry(self, response: requests.Response) -> bool:
         # We don't call `super()` here because we have custom error handling and GitHub API sometimes returns strange
         # errors. So in `read_records()` we have custom error handling which don't require to call `super()` here.
@@ -181,6 +228,132 @@ class GithubStream(HttpStream, ABC):
         return record
 
 
+class GraphQLRefsBatchMixin(ABC):
+    """
+    Reads the refs of many repositories with a single GraphQL query when `graphql_batch_size` is set, instead of paging through
+    the REST endpoint of every repository. The records are built from the GraphQL nodes to be identical to the REST ones.
+
+    Every slice is a batch of `graphql_batch_size` repositories, queried with one aliased `repository` field per repository.
+    The repositories with more refs are queried again with their cursor until all their pages are read. GitHub computes the
+    cost of a query from the number of nodes it may return, every query also returns the `rateLimit` of its token, which is kept per
+    token: the queries are sent with the tokens which have enough points remaining, and when none does the stream waits for the
+    rate limit of a token to reset instead of failing.
+    """
+
+    # prefix of the refs read by the stream
+    ref_prefix: str = None
+    # query the branch protection rules of the refs
+    with_protection: bool = False
+
+    def __init__(self, graphql_batch_size: int = None, **kwargs):
+        super().__init__(**kwargs)
+        self.graphql_batch_size = graphql_batch_size
+        self._rate_limits: Dict[Tuple, Mapping[str, Any]] = {}
+
+    def stream_slices(self, **kwargs) -> Iterable[Optional[Mapping[str, Any]]]:
+        if not self.graphql_batch_size:
+            yield from super().stream_slices(**kwargs)
+            return
+        for start in range(0, len(self.repositories), self.graphql_batch_size):
+            yield {"repositories": self.repositories[start : start + self.graphql_batch_size]}
+
+    def read_records(self, stream_slice: Mapping[str, Any] = None, **kwargs) -> Iterable[Mapping[str, Any]]:
+        if "repositories" not in stream_slice:
+            yield from super().read_records(stream_slice=stream_slice, **kwargs)
+            return
+
+        cursors = {repository: None for repository in stream_slice["repositories"]}
+        queries, cost = 0, 0
+        while cursors:
+            repositories = list(cursors)
+            response_json = self._send_graphql_query(repositories, [cursors[repository] for repository in repositories])
+            queries += 1
+            cost += response_json["data"]["rateLimit"]["cost"]
+            for index, repository in enumerate(repositories):
+                data = response_json["data"].get(f"repository{index}")
+                if not data:
+                    del cursors[repository]
+                    continue
+                for node in data["refs"]["nodes"]:
+                    yield self.transform(record=self.parse_ref(repository, node), stream_slice={"repository": repository})
+                page_info = data["refs"]["pageInfo"]
+                if page_info["hasNextPage"]:
+                    cursors[repository] = page_info["endCursor"]
+                else:
+                    del cursors[repository]
+        self.logger.info(
+            f"Read `{self.name}` of {len(stream_slice['repositories'])} repositories with {queries} GraphQL queries costing {cost} points"
+        )
+
+    def _send_graphql_query(self, repositories: List[str], cursors: List[Optional[str]]) -> Mapping[str, Any]:
+        query = get_query_refs(
+            [(*repository.split("/"), cursor) for repository, cursor in zip(repositories, cursors)],
+            ref_prefix=self.ref_prefix,
+            first=self.page_size,
+            with_protection=self.with_protection,
+        )
+        # GitHub counts a point per 100 nodes the query may return, the query costs at least a point
+        auth_header = self._auth_header_for_cost(cost=max(1, round(len(repositories) * self.page_size / 100)))
+        request = self._session.prepare_request(
+            requests.Request(
+                "POST",
+                parse.urljoin(self.url_base, "graphql"),
+                headers=dict(self.request_headers(), **auth_header),
+                json={"query": query},
+            )
+        )
+        response_json = self._send_request(request, {}).json()
+        self._raise_graphql_errors(repositories, response_json.get("errors", []))
+        self._rate_limits[tuple(auth_header.items())] = response_json["data"]["rateLimit"]
+        return response_json
+
+    def _auth_header_for_cost(self, cost: int) -> Mapping[str, Any]:
+        """
+        :return: the auth header of a token with enough points remaining for a query of `cost` points. The tokens rotated by the
+        authenticator are tried in turn, when all of them are exhausted the stream waits for the first one to reset.
+        """
+        exhausted_tokens = []
+        # a token not queried yet is found, or every known token is tried, within one more header than the tokens known
+        for _ in range(len(self._rate_limits) + 1):
+            auth_header = self.authenticator.get_auth_header()
+            rate_limit = self._rate_limits.get(tuple(auth_header.items()))
+            if not rate_limit or rate_limit["remaining"] >= cost:
+                return auth_header
+            exhausted_tokens.append((pendulum.parse(rate_limit["resetAt"]), auth_header))
+        reset_at, auth_header = min(exhausted_tokens, key=lambda token: token[0])
+        wait_time = max((reset_at - pendulum.now()).total_seconds(), 0) + 1
+        self.logger.info(f"GraphQL rate limit of stream `{self.name}` exhausted, waiting {wait_time:.0f} seconds for it to reset")
+        time.sleep(wait_time)
+        return auth_header
+
+    def _raise_graphql_errors(self, repositories: List[str], errors: List[Mapping[str, Any]]):
+        for error in errors:
+            path = error.get("path") or [""]
+            if error.get("type") in ("NOT_FOUND", "FORBIDDEN") and path[0].startswith("repository"):
+                # same as the 404 and 403 responses of the REST endpoint of the repository
+                repository = repositories[int(path[0][len("repository") :])]
+                self.logger.warn(
+                    f"Syncing `{self.name}` stream isn't available for repository `{repository}`. Full error message: {error['message']}"
+                )
+            else:
+                raise Exception(str(errors))
+
+    @staticmethod
+    def _commit_sha(node: Mapping[str, Any]) -> str:
+        target = node["target"]
+        # refs may also point to trees or blobs, the object itself is the commit of the REST record then
+        return target["target"]["oid"] if target.get("__typename") == "Tag" else target["oid"]
+
+    def _commit(self, repository: str, sha: str) -> Mapping[str, Any]:
+        return {"sha": sha, "url": f"{self.url_base}repos/{repository}/commits/{sha}"}
+
+    @abstractmethod
+    def parse_ref(self, repository: str, node: Mapping[str, Any]) -> MutableMapping[str, Any]:
+        """
+        :return: the REST record of the ref
+        """
+
+
 class SemiIncrementalMixin:
     """
     Semi incremental streams are also incremental but with one difference, they:
@@ -288,6 +461,8 @@ class RepositoryStats(GithubStream):
     API docs: https://docs.github.com/en/rest/reference/repos#get-a-repository
     """
 
+    use_etag_cache = True
+
     def path(self, stream_slice: Mapping[str, Any] = None, **kwargs) -> str:
         return f"repos/{stream_slice['repository']}"
 
@@ -300,29 +475,60 @@ class Assignees(GithubStream):
     API docs: https://docs.github.com/en/rest/reference/issues#list-assignees
     """
 
+    use_etag_cache = True
 
-class Branches(GithubStream):
+
+class Branches(GraphQLRefsBatchMixin, GithubStream):
     """
     API docs: https://docs.github.com/en/rest/reference/repos#list-branches
     """
 
+    use_etag_cache = True
+
     primary_key = ["repository", "name"]
+    ref_prefix = "refs/heads/"
+    with_protection = True
 
     def path(self, stream_slice: Mapping[str, Any] = None, **kwargs) -> str:
         return f"repos/{stream_slice['repository']}/branches"
 
+    def parse_ref(self, repository: str, node: Mapping[str, Any]) -> MutableMapping[str, Any]:
+        rule = node["branchProtectionRule"]
+        if rule and rule["requiresStatusChecks"]:
+            required_status_checks = {
+                "enforcement_level": "everyone" if rule["isAdminEnforced"] else "non_admins",
+                "contexts": rule["requiredStatusCheckContexts"],
+                "checks": [
+                    {"context": check["context"], "app_id": check["app"]["databaseId"] if check["app"] else None}
+                    for check in rule["requiredStatusChecks"]
+                ],
+            }
+        else:
+            required_status_checks = {"enforcement_level": "off", "contexts": [], "checks": []}
+        return {
+            "name": node["name"],
+            "commit": self._commit(repository, self._commit_sha(node)),
+            "protected": rule is not None,
+            "protection": {"enabled": rule is not None, "required_status_checks": required_status_checks},
+            "protection_url": f"{self.url_base}repos/{repository}/branches/{node['name']}/protection",
+        }
+
 
 class Collaborators(GithubStream):
     """
     API docs: https://docs.github.com/en/rest/reference/repos#list-repository-collaborators
     """
 
+    use_etag_cache = True
+
 
 class IssueLabels(GithubStream):
     """
     API docs: https://docs.github.com/en/rest/issues/labels#list-labels-for-a-repository
     """
 
+    use_etag_cache = True
+
     def path(self, stream_slice: Mapping[str, Any] = None, **kwargs) -> str:
         return f"repos/{stream_slice['repository']}/labels"
 
@@ -335,9 +541,10 @@ class Organizations(GithubStream):
     # GitHub pagination could be from 1 to 100.
     page_size = 100
 
-    def __init__(self, organizations: List[str], **kwargs):
+    def __init__(self, organizations: List[str], etag_cache: ETagCache = None, **kwargs):
         super(GithubStream, self).__init__(**kwargs)
         self.organizations = organizations
+        self.etag_cache = etag_cache
 
     def stream_slices(self, **kwargs) -> Iterable[Optional[Mapping[str, Any]]]:
         for organization in self.organizations:
@@ -373,16 +580,28 @@ class Repositories(SemiIncrementalMixin, Organizations):
             yield self.transform(record=record, stream_slice=stream_slice)
 
 
-class Tags(GithubStream):
+class Tags(GraphQLRefsBatchMixin, GithubStream):
     """
     API docs: https://docs.github.com/en/rest/reference/repos#list-repository-tags
     """
 
+    use_etag_cache = True
+
     primary_key = ["repository", "name"]
+    ref_prefix = "refs/tags/"
 
     def path(self, stream_slice: Mapping[str, Any] = None, **kwargs) -> str:
         return f"repos/{stream_slice['repository']}/tags"
 
+    def parse_ref(self, repository: str, node: Mapping[str, Any]) -> MutableMapping[str, Any]:
+        return {
+            "name": node["name"],
+            "zipball_url": f"{self.url_base}repos/{repository}/zipball/refs/tags/{node['name']}",
+            "tarball_url": f"{self.url_base}repos/{repository}/tarball/refs/tags/{node['name']}",
+            "commit": self._commit(repository, self._commit_sha(node)),
+            "node_id": node["id"],
+        }
+
 
 class Teams(Organizations):
     """
@@ -390,6 +609,7 @@ class Teams(Organizations):
     """
 
     use_cache = True
+    use_etag_cache = True
 
     def path(self, stream_slice: Mapping[str, Any] = None, **kwargs) -> str:
         return f"orgs/{stream_slice['organization']}/teams"
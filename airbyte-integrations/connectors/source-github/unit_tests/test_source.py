@@ -6,8 +6,9 @@ from unittest.mock import MagicMock
 
 import pytest
 import responses
-from airbyte_cdk.models import AirbyteConnectionStatus, Status
-from source_github.source import SourceGithub
+from airbyte_cdk.models import AirbyteConnectionStatus, ConfiguredAirbyteCatalog, Status, Type
+from responses import matchers
+from source_github.source import ETAG_CACHE_STATE_KEY, SourceGithub
 
 
 def check_source(repo_line: str) -> AirbyteConnectionStatus:
@@ -119,3 +120,56 @@ def test_generate_repositories():
     assert len(organisation_repos) == 2
     assert "docker/compose" in organisation_repos
     assert "docker/docker-py" in organisation_repos
+
+
+@responses.activate
+def test_read_saves_etag_cache_in_state():
+    repository_url = "https://api.github.com/repos/airbytehq/integration-test"
+    branches_url = f"{repository_url}/branches?per_page=100"
+    responses.add(
+        "GET", repository_url, json={"full_name": "airbytehq/integration-test", "default_branch": "master"}, headers={"ETag": '"r"'}
+    )
+    responses.add("GET", f"{repository_url}/branches", status=304, match=[matchers.header_matcher({"If-None-Match": '"b"'})])
+
+    catalog = ConfiguredAirbyteCatalog.parse_obj(
+        {
+            "streams": [
+                {
+                    "stream": {"name": "branches", "json_schema": {}, "supported_sync_modes": ["full_refresh"]},
+                    "sync_mode": "full_refresh",
+                    "destination_sync_mode": "overwrite",
+                }
+            ]
+        }
+    )
+    state = {
+        "commits": {"airbytehq/integration-test": {"master": {"created_at": "2022-01-01T00:00:00Z"}}},
+        ETAG_CACHE_STATE_KEY: {
+            "entries": {
+                branches_url: {"etag": '"b"', "last_modified": None, "link": None, "body": [{"name": "master"}]},
+                f"{repository_url}/tags?per_page=100": {"etag": '"t"', "last_modified": None, "link": None, "body": []},
+            }
+        },
+    }
+    config = {"access_token": "test_token", "repository": "airbytehq/integration-test", "start_date": "2021-01-01T00:00:00Z"}
+
+    messages = list(SourceGithub().read(MagicMock(), config, catalog, state))
+
+    records = [message.record.data for message in messages if message.type == Type.RECORD]
+    assert records == [{"name": "master", "repository": "airbytehq/integration-test"}]
+    assert messages[-1].type == Type.STATE
+    # the entry of the stream which was not read is dropped
+    assert messages[-1].state.data == {
+        "commits": state["commits"],
+        ETAG_CACHE_STATE_KEY: {
+            "entries": {
+                f"{repository_url}?per_page=100": {
+                    "etag": '"r"',
+                    "last_modified": None,
+                    "link": None,
+                    "body": {"full_name": "airbytehq/integration-test", "default_branch": "master"},
+                },
+                branches_url: state[ETAG_CACHE_STATE_KEY]["entries"][branches_url],
+            }
+        },
+    }
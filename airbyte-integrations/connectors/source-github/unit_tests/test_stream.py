@@ -3,16 +3,21 @@
 #
 
 import json
+import re
 from http import HTTPStatus
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import pendulum
 import pytest
 import requests
 import responses
+from airbyte_cdk.models import SyncMode
+from airbyte_cdk.sources.streams.http.auth import MultipleTokenAuthenticator
 from airbyte_cdk.sources.streams.http.exceptions import BaseBackoffException
 from responses import matchers
 from source_github import streams
+from source_github.etag_cache import ETagCache
 from source_github.streams import (
     Branches,
     Collaborators,
@@ -1043,3 +1048,266 @@ def test_stream_workflow_runs_read_incremental(monkeypatch):
     ]
 
     assert len(responses.calls) == 4
+
+
+@responses.activate
+def test_stream_etag_cache_replays_not_modified_responses():
+    etag_cache = ETagCache()
+    stream = Branches(repositories=["organization/repository"], page_size_for_large_streams=100, etag_cache=etag_cache)
+    branches = [{"name": "main"}, {"name": "feature"}]
+    url = "https://api.github.com/repos/organization/repository/branches"
+    next_link = f'<{url}?per_page=100&page=2>; rel="next"'
+
+    responses.add("GET", url, json=branches[:1], headers={"ETag": '"page-1"', "Link": next_link})
+    responses.add(
+        "GET", url, json=branches[1:], headers={"ETag": '"page-2"'}, match=[matchers.query_param_matcher({"per_page": "100", "page": "2"})]
+    )
+    records = read_full_refresh(stream)
+    assert [record["name"] for record in records] == ["main", "feature"]
+    assert etag_cache.hits == 0 and etag_cache.misses == 2
+
+    responses.reset()
+    responses.add("GET", url, status=304, match=[matchers.header_matcher({"If-None-Match": '"page-1"'})])
+    responses.add(
+        "GET",
+        url,
+        status=304,
+        match=[matchers.header_matcher({"If-None-Match": '"page-2"'}), matchers.query_param_matcher({"per_page": "100", "page": "2"})],
+    )
+    assert read_full_refresh(stream) == records
+    assert etag_cache.hits == 2
+    assert list(etag_cache.to_state()["entries"]) == [f"{url}?per_page=100", f"{url}?per_page=100&page=2"]
+
+
+@responses.activate
+def test_stream_etag_cache_updates_modified_responses():
+    url = "https://api.github.com/repos/organization/repository/labels"
+    etag_cache = ETagCache.from_state(
+        {"entries": {f"{url}?per_page=100": {"etag": '"old"', "last_modified": None, "link": None, "body": [{"id": 1, "name": "old"}]}}}
+    )
+    stream = IssueLabels(repositories=["organization/repository"], page_size_for_large_streams=100, etag_cache=etag_cache)
+
+    responses.add(
+        "GET", url, json=[{"id": 1, "name": "new"}], headers={"ETag": '"new"'}, match=[matchers.header_matcher({"If-None-Match": '"old"'})]
+    )
+    assert [record["name"] for record in read_full_refresh(stream)] == ["new"]
+    assert etag_cache.get(f"{url}?per_page=100")["etag"] == '"new"'
+    assert etag_cache.hits == 0
+
+
+@responses.activate
+def test_stream_without_etag_cache_sends_unconditional_requests():
+    url = "https://api.github.com/repos/organization/repository/releases"
+    etag_cache = ETagCache()
+    stream = Releases(
+        repositories=["organization/repository"], page_size_for_large_streams=100, start_date="2021-01-01T00:00:00Z", etag_cache=etag_cache
+    )
+
+    responses.add("GET", url, json=[{"id": 1, "created_at": "2022-01-01T00:00:00Z"}], headers={"ETag": '"releases"'})
+    assert len(read_full_refresh(stream)) == 1
+    assert "If-None-Match" not in responses.calls[0].request.headers
+    assert etag_cache.to_state() == {"entries": {}}
+
+
+def graphql_refs_callback(pages, rate_limit=None):
+    """
+    Answers the GraphQL queries of the refs of several repositories with the next page of `pages` of every repository queried
+    """
+
+    def callback(request):
+        query = json.loads(request.body)["query"]
+        data = {}
+        for alias, owner, name in re.findall(r'(repository\d+): repository\(owner: "(.+?)", name: "(.+?)"\)', query):
+            repository_pages = pages[f"{owner}/{name}"]
+            if repository_pages is None:
+                data[alias] = None
+                continue
+            nodes = repository_pages.pop(0)
+            data[alias] = {"refs": {"nodes": nodes, "pageInfo": {"hasNextPage": bool(repository_pages), "endCursor": "cursor"}}}
+        data["rateLimit"] = rate_limit or {"cost": 1, "remaining": 4999, "resetAt": "2022-01-01T00:00:00Z"}
+        errors = [
+            {"type": "NOT_FOUND", "path": [alias], "message": f"Could not resolve to a Repository with the name '{owner}/{name}'."}
+            for alias, owner, name in re.findall(r'(repository\d+): repository\(owner: "(.+?)", name: "(.+?)"\)', query)
+            if pages[f"{owner}/{name}"] is None
+        ]
+        return (200, {}, json.dumps({"data": data, "errors": errors} if errors else {"data": data}))
+
+    return callback
+
+
+def ref_node(name, sha, annotated=False, rule=None, typename="Commit"):
+    target = {"__typename": "Tag", "oid": f"tag-{sha}", "target": {"oid": sha}} if annotated else {"__typename": typename, "oid": sha}
+    return {"id": f"ref-{name}", "name": name, "target": target, "branchProtectionRule": rule}
+
+
+@responses.activate
+def test_stream_branches_graphql_batch_read():
+    repositories = ["organization/repository1", "organization/repository2"]
+    rule = {
+        "requiresStatusChecks": True,
+        "isAdminEnforced": False,
+        "requiredStatusCheckContexts": ["ci"],
+        "requiredStatusChecks": [{"context": "ci", "app": {"databaseId": 15368}}],
+    }
+    responses.add(
+        "POST",
+        "https://api.github.com/graphql",
+        json={
+            "data": {
+                "repository0": {
+                    "refs": {
+                        "nodes": [ref_node("main", "sha1", rule=rule)],
+                        "pageInfo": {"hasNextPage": True, "endCursor": "cursor"},
+                    }
+                },
+                "repository1": {"refs": {"nodes": [ref_node("dev", "sha2")], "pageInfo": {"hasNextPage": False, "endCursor": "c"}}},
+                "rateLimit": {"cost": 1, "remaining": 4999, "resetAt": "2022-01-01T00:00:00Z"},
+            }
+        },
+    )
+    responses.add(
+        "POST",
+        "https://api.github.com/graphql",
+        json={
+            "data": {
+                "repository0": {"refs": {"nodes": [ref_node("feature/x", "sha3")], "pageInfo": {"hasNextPage": False, "endCursor": "c"}}},
+                "rateLimit": {"cost": 1, "remaining": 4998, "resetAt": "2022-01-01T00:00:00Z"},
+            }
+        },
+    )
+
+    stream = Branches(repositories=repositories, page_size_for_large_streams=100, graphql_batch_size=10)
+    records = read_full_refresh(stream)
+
+    assert records == [
+        {
+            "name": "main",
+            "commit": {"sha": "sha1", "url": "https://api.github.com/repos/organization/repository1/commits/sha1"},
+            "protected": True,
+            "protection": {
+                "enabled": True,
+                "required_status_checks": {
+                    "enforcement_level": "non_admins",
+                    "contexts": ["ci"],
+                    "checks": [{"context": "ci", "app_id": 15368}],
+                },
+            },
+            "protection_url": "https://api.github.com/repos/organization/repository1/branches/main/protection",
+            "repository": "organization/repository1",
+        },
+        {
+            "name": "dev",
+            "commit": {"sha": "sha2", "url": "https://api.github.com/repos/organization/repository2/commits/sha2"},
+            "protected": False,
+            "protection": {"enabled": False, "required_status_checks": {"enforcement_level": "off", "contexts": [], "checks": []}},
+            "protection_url": "https://api.github.com/repos/organization/repository2/branches/dev/protection",
+            "repository": "organization/repository2",
+        },
+        {
+            "name": "feature/x",
+            "commit": {"sha": "sha3", "url": "https://api.github.com/repos/organization/repository1/commits/sha3"},
+            "protected": False,
+            "protection": {"enabled": False, "required_status_checks": {"enforcement_level": "off", "contexts": [], "checks": []}},
+            "protection_url": "https://api.github.com/repos/organization/repository1/branches/feature/x/protection",
+            "repository": "organization/repository1",
+        },
+    ]
+    assert len(responses.calls) == 2
+    first_query, second_query = [json.loads(call.request.body)["query"] for call in responses.calls]
+    assert 'repository1: repository(owner: "organization", name: "repository2")' in first_query
+    assert 'refs(refPrefix: "refs/heads/", first: 100, after: "cursor")' in second_query
+    assert "repository2" not in second_query
+
+
+@responses.activate
+def test_stream_tags_graphql_batch_read_is_identical_to_rest():
+    repositories = ["organization/repository1", "organization/repository2", "organization/repository3"]
+    for repository, tags in (
+        ("organization/repository1", [("v1", "sha1")]),
+        ("organization/repository2", [("v2", "sha2"), ("v3", "sha3")]),
+    ):
+        responses.add(
+            "GET",
+            f"https://api.github.com/repos/{repository}/tags",
+            json=[
+                {
+                    "name": name,
+                    "zipball_url": f"https://api.github.com/repos/{repository}/zipball/refs/tags/{name}",
+                    "tarball_url": f"https://api.github.com/repos/{repository}/tarball/refs/tags/{name}",
+                    "commit": {"sha": sha, "url": f"https://api.github.com/repos/{repository}/commits/{sha}"},
+                    "node_id": f"ref-{name}",
+                }
+                for name, sha in tags
+            ],
+        )
+    responses.add("GET", "https://api.github.com/repos/organization/repository3/tags", status=404, json={"message": "Not Found"})
+    rest_records = read_full_refresh(Tags(repositories=repositories, page_size_for_large_streams=100))
+
+    pages = {
+        "organization/repository1": [[ref_node("v1", "sha1", annotated=True)]],
+        "organization/repository2": [[ref_node("v2", "sha2")], [ref_node("v3", "sha3", annotated=True)]],
+        "organization/repository3": None,
+    }
+    responses.add_callback("POST", "https://api.github.com/graphql", callback=graphql_refs_callback(pages))
+    stream = Tags(repositories=repositories, page_size_for_large_streams=100, graphql_batch_size=2)
+    graphql_records = read_full_refresh(stream)
+
+    assert graphql_records == rest_records
+    # the third repository is in a batch of its own
+    assert list(stream.stream_slices(sync_mode=SyncMode.full_refresh)) == [
+        {"repositories": repositories[:2]},
+        {"repositories": repositories[2:]},
+    ]
+
+
+@responses.activate
+@patch("time.sleep")
+def test_stream_graphql_batch_waits_for_rate_limit_reset(sleep_mock):
+    pages = {"organization/repository": [[ref_node("v1", "sha1")], [ref_node("v2", "sha2")]]}
+    reset_at = pendulum.now().add(seconds=120)
+    rate_limit = {"cost": 1, "remaining": 0, "resetAt": reset_at.isoformat()}
+    responses.add_callback("POST", "https://api.github.com/graphql", callback=graphql_refs_callback(pages, rate_limit))
+
+    stream = Tags(repositories=["organization/repository"], page_size_for_large_streams=100, graphql_batch_size=10)
+    assert [record["name"] for record in read_full_refresh(stream)] == ["v1", "v2"]
+    sleep_mock.assert_called_once()
+    assert 100 < sleep_mock.call_args[0][0] <= 121
+
+
+@responses.activate
+@patch("time.sleep")
+def test_stream_graphql_batch_rate_limit_per_token(sleep_mock):
+    pages = {"organization/repository": [[ref_node(f"v{i}", f"sha{i}")] for i in range(4)]}
+    reset_at = pendulum.now().add(seconds=120).isoformat()
+    rate_limits = {"token token1": {"cost": 1, "remaining": 0, "resetAt": reset_at}}
+    callback = graphql_refs_callback(pages)
+
+    def rate_limited_callback(request):
+        status, headers, body = callback(request)
+        response = json.loads(body)
+        response["data"]["rateLimit"] = rate_limits.get(request.headers["Authorization"], response["data"]["rateLimit"])
+        return status, headers, json.dumps(response)
+
+    responses.add_callback("POST", "https://api.github.com/graphql", callback=rate_limited_callback)
+    authenticator = MultipleTokenAuthenticator(tokens=["token1", "token2"], auth_method="token")
+    stream = Tags(
+        repositories=["organization/repository"], page_size_for_large_streams=100, graphql_batch_size=10, authenticator=authenticator
+    )
+
+    assert [record["name"] for record in read_full_refresh(stream)] == ["v0", "v1", "v2", "v3"]
+    # the exhausted token is skipped until the rate limit of the other one is exhausted too
+    assert [call.request.headers["Authorization"] for call in responses.calls] == ["token token1"] + ["token token2"] * 3
+    sleep_mock.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "node, sha",
+    [
+        (ref_node("v1", "sha1"), "sha1"),
+        (ref_node("v1", "sha1", annotated=True), "sha1"),
+        (ref_node("v1", "sha1", typename="Tree"), "sha1"),
+        (ref_node("v1", "sha1", typename="Blob"), "sha1"),
+    ],
+)
+def test_ref_commit_sha(node, sha):
+    assert Tags._commit_sha(node) == sha
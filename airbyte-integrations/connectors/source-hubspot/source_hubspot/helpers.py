@@ -59,8 +59,13 @@ class IURLPropertyRepresentation(abc.ABC):
     # so it was decided to limit the length of the `properties` parameter to 15000 characters.
     PROPERTIES_PARAM_MAX_LENGTH = 15000
 
-    def __init__(self, properties: List[str]):
+    def __init__(self, properties: List[str], max_properties: int = None):
+        """
+        :param properties: names of the properties
+        :param max_properties: maximum number of properties of a chunk, the chunks are only limited by the URL length by default
+        """
         self.properties = properties
+        self.max_properties = max_properties
 
     def __bool__(self):
         return bool(self.properties)
@@ -80,7 +85,8 @@ class IURLPropertyRepresentation(abc.ABC):
         local_properties = []
         for property_ in self.properties:
             current_property_length = len(urllib.parse.quote(self._term_representation.format(property=property_)))
-            if current_property_length + summary_length >= self.PROPERTIES_PARAM_MAX_LENGTH:
+            chunk_is_full = self.max_properties and len(local_properties) >= self.max_properties
+            if chunk_is_full or current_property_length + summary_length >= self.PROPERTIES_PARAM_MAX_LENGTH:
                 yield type(self)(local_properties)
                 local_properties = []
                 summary_length = 0
@@ -85,7 +85,9 @@ class SourceHubspot(AbstractSource):
         start_date = config.get("start_date")
         credentials = config["credentials"]
         api = self.get_api(config=config)
-        common_params = dict(api=api, start_date=start_date, credentials=credentials)
+        common_params = dict(
+            api=api, start_date=start_date, credentials=credentials, properties_chunk_size=config.get("properties_chunk_size")
+        )
 
         if credentials.get("credentials_title") == "OAuth Credentials":
             common_params["authenticator"] = api.get_authenticator()
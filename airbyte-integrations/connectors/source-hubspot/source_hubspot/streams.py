@@ -6,9 +6,10 @@ import json
 import sys
 import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from functools import cached_property, lru_cache
 from http import HTTPStatus
-from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Optional, Set, Tuple, Union
+from typing import Any, Callable, Dict, Iterable, List, Mapping, MutableMapping, Optional, Set, Tuple, Union
 
 import backoff
 import pendulum as pendulum
@@ -200,6 +201,8 @@ class Stream(HttpStream, ABC):
     primary_key = None
     filter_old_records: bool = True
     denormalize_records: bool = False  # one record from API response can result in multiple records emitted
+    # number of requests sent at the same time to read the chunks of properties of a page
+    max_concurrent_property_chunks = 4
 
     @property
     @abstractmethod
@@ -234,13 +237,16 @@ class Stream(HttpStream, ABC):
     def _property_wrapper(self) -> IURLPropertyRepresentation:
         properties = list(self.properties.keys())
         if "v1" in self.url:
-            return APIv1Property(properties)
-        return APIv3Property(properties)
+            return APIv1Property(properties, max_properties=self._properties_chunk_size)
+        return APIv3Property(properties, max_properties=self._properties_chunk_size)
 
-    def __init__(self, api: API, start_date: str = None, credentials: Mapping[str, Any] = None, **kwargs):
+    def __init__(
+        self, api: API, start_date: str = None, credentials: Mapping[str, Any] = None, properties_chunk_size: int = None, **kwargs
+    ):
         super().__init__(**kwargs)
         self._api: API = api
         self._start_date = pendulum.parse(start_date)
+        self._properties_chunk_size = properties_chunk_size
 
         if credentials["credentials_title"] == "API Key Credentials":
             self._session.params["hapikey"] = credentials.get("api_key")
@@ -310,17 +316,26 @@ class Stream(HttpStream, ABC):
         #  (https://community.hubspot.com/t5/APIs-Integrations/Get-all-contact-properties-without-explicitly-listing-them/m-p/447950)
         #  and the official documentation, this does not exist at the moment.
 
+        #  The chunks of properties of a page are requested at the same time, the partial records are merged by primary key once
+        #  they are received so only the records of the current page are kept in memory.
+
         group_by_pk = self.primary_key and not self.denormalize_records
         post_processor: IRecordPostProcessor = GroupByKey(self.primary_key) if group_by_pk else StoreAsIs()
         response = None
 
-        properties = self._property_wrapper
-        for chunk in properties.split():
-            response = self.handle_request(
+        def read_chunk(chunk: IURLPropertyRepresentation) -> Tuple[List, requests.Response]:
+            chunk_response = self.handle_request(
                 stream_slice=stream_slice, stream_state=stream_state, next_page_token=next_page_token, properties=chunk
             )
-            for record in self._transform(self.parse_response(response, stream_state=stream_state)):
-                post_processor.add_record(record)
+            return list(self._transform(self.parse_response(chunk_response, stream_state=stream_state))), chunk_response
+
+        chunks = list(self._property_wrapper.split())
+        if not chunks:
+            return post_processor.flat, response
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrent_property_chunks, len(chunks))) as executor:
+            for records, response in executor.map(read_chunk, chunks):
+                for record in records:
+                    post_processor.add_record(record)
 
         return post_processor.flat, response
 
@@ -422,59 +437,80 @@ class Stream(HttpStream, ABC):
         :param declared_format format field value from catalog schema
         :return Converted value for record
         """
+        return cls._value_caster(declared_field_types, field_name, declared_format=declared_format)(field_value)
 
-        if "null" in declared_field_types:
-            if field_value is None:
-                return field_value
-            # Sometime hubspot output empty string on field with format set.
-            # Set it to null to avoid errors on destination' normalization stage.
-            if declared_format and field_value == "":
-                return None
+    @classmethod
+    def _value_caster(cls, declared_field_types: List, field_name: str, declared_format: str = None) -> Callable[[Any], Any]:
+        """
+        Resolve how the values of a field are converted according to its declared catalog json schema type / format / attribute name.
+        :param declared_field_types type from catalog schema
+        :param field_name value's attribute name
+        :param declared_format format field value from catalog schema
+        :return function converting a received value of the field
+        """
+        nullable = "null" in declared_field_types
+        cast_datetime = declared_format in ["date", "date-time"]
+        declared_types = tuple(t for t, type_name in CUSTOM_FIELD_TYPE_TO_VALUE.items() if type_name in declared_field_types)
+        target_type_name = next(filter(lambda t: t != "null", declared_field_types), None)
+        target_type = CUSTOM_FIELD_VALUE_TO_TYPE.get(target_type_name)
+        if target_type_name == "number" and field_name.endswith("_id"):
+            # do not cast numeric IDs into float, use integer instead
+            target_type = int
 
-        if declared_format in ["date", "date-time"]:
-            field_value = cls._cast_datetime(field_name, field_value, declared_format=declared_format)
+        def cast(field_value: Any) -> Any:
+            if nullable:
+                if field_value is None:
+                    return field_value
+                # Sometime hubspot output empty string on field with format set.
+                # Set it to null to avoid errors on destination' normalization stage.
+                if declared_format and field_value == "":
+                    return None
 
-        actual_field_type = type(field_value)
-        actual_field_type_name = CUSTOM_FIELD_TYPE_TO_VALUE.get(actual_field_type)
-        if actual_field_type_name in declared_field_types:
-            return field_value
+            if cast_datetime:
+                field_value = cls._cast_datetime(field_name, field_value, declared_format=declared_format)
 
-        target_type_name = next(filter(lambda t: t != "null", declared_field_types))
-        target_type = CUSTOM_FIELD_VALUE_TO_TYPE.get(target_type_name)
+            if type(field_value) in declared_types:
+                return field_value
 
-        if target_type_name == "number":
-            # do not cast numeric IDs into float, use integer instead
-            target_type = int if field_name.endswith("_id") else target_type
-            field_value = field_value.replace(",", "")
+            if target_type_name == "number":
+                field_value = field_value.replace(",", "")
 
-        if target_type_name != "string" and field_value == "":
-            # do not cast empty strings, return None instead to be properly casted.
-            field_value = None
-            return field_value
+            if target_type_name != "string" and field_value == "":
+                # do not cast empty strings, return None instead to be properly casted.
+                return None
 
-        try:
-            casted_value = target_type(field_value)
-        except ValueError:
-            logger.exception(f"Could not cast `{field_value}` to `{target_type}`")
-            return field_value
+            try:
+                return target_type(field_value)
+            except ValueError:
+                logger.exception(f"Could not cast `{field_value}` to `{target_type}`")
+                return field_value
+
+        return cast
 
-        return casted_value
+    @classmethod
+    def _build_cast_plan(cls, properties: Mapping[str, Any]) -> Mapping[str, Callable[[Any], Any]]:
+        """Converter of every property, so the declared types and formats are resolved once instead of once per value"""
+        cast_plan = {}
+        for field_name, field_schema in properties.items():
+            declared_field_types = field_schema.get("type", [])
+            if not isinstance(declared_field_types, Iterable):
+                declared_field_types = [declared_field_types]
+            cast_plan[field_name] = cls._value_caster(declared_field_types, field_name, declared_format=field_schema.get("format"))
+        return cast_plan
+
+    @cached_property
+    def _cast_plan(self) -> Mapping[str, Callable[[Any], Any]]:
+        return self._build_cast_plan(self.properties)
 
     def _cast_record_fields_if_needed(self, record: Mapping, properties: Mapping[str, Any] = None) -> Mapping:
 
         if not self.entity or not record.get("properties"):
             return record
 
-        properties = properties or self.properties
-
-        for field_name, field_value in record["properties"].items():
-            declared_field_types = properties[field_name].get("type", [])
-            if not isinstance(declared_field_types, Iterable):
-                declared_field_types = [declared_field_types]
-            format = properties[field_name].get("format")
-            record["properties"][field_name] = self._cast_value(
-                declared_field_types=declared_field_types, field_name=field_name, field_value=field_value, declared_format=format
-            )
+        cast_plan = self._build_cast_plan(properties) if properties else self._cast_plan
+        record_properties = record["properties"]
+        for field_name, field_value in record_properties.items():
+            record_properties[field_name] = cast_plan[field_name](field_value)
 
         return record
 
@@ -772,6 +808,34 @@ class CRMSearchStream(IncrementalStream, ABC):
         # As per their docs: `These search endpoints are rate limited to four requests per second per authentication token`.
         return self._api.post(url=url, data=data, params=params)
 
+    @retry_connection_handler(max_tries=5, factor=5)
+    @retry_after_handler(max_tries=3)
+    def batch_read(self, record_ids: List[str], properties: List[str]) -> List[Mapping[str, Any]]:
+        """Read the given properties of the records, up to 100 records at once"""
+        data = {"properties": properties, "inputs": [{"id": record_id} for record_id in record_ids]}
+        response, raw_response = self._api.post(url=f"/crm/v3/objects/{self.entity}/batch/read", data=data)
+        return response.get("results", [])
+
+    def _read_properties_chunks(self, records: List[MutableMapping[str, Any]], chunks: List[IURLPropertyRepresentation]) -> List:
+        """
+        Read the other chunks of properties of the searched records at the same time and merge them by ID.
+        The records are read by ID rather than searched again, so every chunk is read for the same page of records.
+        """
+        post_processor = GroupByKey("id")
+        for record in records:
+            post_processor.add_record(record)
+        record_ids = [record["id"] for record in records]
+
+        def read_chunk(chunk: IURLPropertyRepresentation) -> List:
+            return list(self._transform(self.batch_read(record_ids, chunk.properties)))
+
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrent_property_chunks, len(chunks))) as executor:
+            for chunk_records in executor.map(read_chunk, chunks):
+                for record in chunk_records:
+                    post_processor.add_record(record)
+
+        return post_processor.flat
+
     def _process_search(
         self,
         stream_slice: Mapping[str, Any] = None,
@@ -780,6 +844,10 @@ class CRMSearchStream(IncrementalStream, ABC):
     ) -> Tuple[List, requests.Response]:
         stream_records = {}
         properties_list = list(self.properties.keys())
+        # the properties are only split when a chunk size is configured, the search requests have no URL length limit
+        chunks = list(self._property_wrapper.split()) if self._properties_chunk_size and properties_list else []
+        if chunks:
+            properties_list = chunks[0].properties
         payload = (
             {
                 "filters": [{"value": int(self._state.timestamp() * 1000), "propertyName": self.last_modified_field, "operator": "GTE"}],
@@ -797,6 +865,8 @@ class CRMSearchStream(IncrementalStream, ABC):
         for record in self._transform(self.parse_response(raw_response, stream_state=stream_state, stream_slice=stream_slice)):
             stream_records[record["id"]] = record
 
+        if len(chunks) > 1 and stream_records:
+            return self._read_properties_chunks(list(stream_records.values()), chunks[1:]), raw_response
         return list(stream_records.values()), raw_response
 
     def read_records(
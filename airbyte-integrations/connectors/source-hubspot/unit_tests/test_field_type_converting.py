@@ -3,7 +3,7 @@
 #
 
 import pytest
-from source_hubspot.streams import Stream
+from source_hubspot.streams import Companies, Stream
 
 
 @pytest.mark.parametrize(
@@ -102,3 +102,25 @@ def test_cast_type_if_needed(declared_field_types, field_name, field_value, form
 def test_cast_timestamp_to_date(field_value, declared_format, expected_casted_value):
     casted_value = Stream._cast_datetime("hs_recurring_billing_end_date", field_value, declared_format=declared_format)
     assert casted_value == expected_casted_value
+
+
+def test_cast_record_fields_with_cast_plan(common_params, mocker):
+    properties = {
+        "name": {"type": ["null", "string"]},
+        "employees": {"type": ["null", "number"]},
+        "parent_id": {"type": ["null", "number"]},
+        "is_public": {"type": ["null", "boolean"]},
+        "closedate": {"type": ["null", "string"], "format": "date-time"},
+    }
+    mocker.patch.object(Companies, "properties", properties)
+    stream = Companies(**common_params)
+    record = {"id": "1", "properties": {"name": "Acme", "employees": "1,200.5", "parent_id": "42", "is_public": "", "closedate": ""}}
+
+    assert stream._cast_record_fields_if_needed(record)["properties"] == {
+        "name": "Acme",
+        "employees": 1200.5,
+        "parent_id": 42,
+        "is_public": None,
+        "closedate": None,
+    }
+    assert stream._cast_plan.keys() == properties.keys()
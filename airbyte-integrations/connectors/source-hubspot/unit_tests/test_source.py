@@ -309,6 +309,78 @@ class TestSplittingPropertiesFunctionality:
 
         assert len(stream_records) == 6
 
+    def test_stream_with_properties_chunk_size(self, requests_mock, common_params, fake_properties_list):
+        """
+        Check that the chunks of properties of a page are limited to the configured chunk size and merged into complete records
+        """
+        test_stream = Products(**{**common_params, "properties_chunk_size": 300})
+
+        parsed_properties = list(APIv3Property(fake_properties_list, max_properties=300).split())
+        assert len(parsed_properties) == 7
+        self.set_mock_properties(requests_mock, "/properties/v2/product/properties", fake_properties_list)
+
+        ids_list = ["6043593519", "1092593519", "1092593518"]
+        for property_slice in parsed_properties:
+            record_responses = [
+                {
+                    "json": {
+                        "results": [
+                            {**self.BASE_OBJECT_BODY, **{"id": id, "properties": {p: "fake_data" for p in property_slice.properties}}}
+                            for id in ids_list
+                        ],
+                        "paging": {},
+                    },
+                    "status_code": 200,
+                }
+            ]
+            prop_key, prop_val = next(iter(property_slice.as_url_param().items()))
+            requests_mock.register_uri("GET", f"{test_stream.url}?{prop_key}={prop_val}", record_responses)
+
+        stream_records = list(test_stream.read_records(sync_mode=SyncMode.incremental))
+
+        assert [record["id"] for record in stream_records] == ids_list
+        for record in stream_records:
+            assert len(record["properties"]) == NUMBER_OF_PROPERTIES
+
+    def test_search_stream_with_properties_chunk_size(self, requests_mock, common_params, fake_properties_list):
+        """
+        Check that the searched records are completed with the other chunks of properties read by ID
+        """
+        test_stream = Companies(**{**common_params, "properties_chunk_size": 500})
+        test_stream.state = {"updatedAt": "2021-02-24T16:43:11Z"}
+        self.set_mock_properties(requests_mock, "/properties/v2/company/properties", fake_properties_list)
+        ids_list = ["1", "2", "3"]
+
+        def search_callback(request, context):
+            properties = request.json()["properties"]
+            assert properties == fake_properties_list[:500]
+            return {
+                "results": [{**self.BASE_OBJECT_BODY, "id": id, "properties": {p: "fake_data" for p in properties}} for id in ids_list],
+                "paging": {},
+            }
+
+        def batch_read_callback(request, context):
+            body = request.json()
+            assert len(body["properties"]) == 500
+            return {
+                "results": [
+                    {**self.BASE_OBJECT_BODY, "id": input["id"], "properties": {p: "fake_data" for p in body["properties"]}}
+                    for input in body["inputs"]
+                ]
+            }
+
+        test_stream._sync_mode = SyncMode.incremental
+        requests_mock.register_uri("POST", test_stream.url, json=search_callback)
+        test_stream._sync_mode = None
+        requests_mock.register_uri("POST", "/crm/v3/objects/company/batch/read", json=batch_read_callback)
+
+        stream_records, _ = read_incremental(test_stream, {})
+
+        assert [record["id"] for record in stream_records] == ids_list
+        for record in stream_records:
+            assert len(record["properties"]) == NUMBER_OF_PROPERTIES
+        assert len([request for request in requests_mock.request_history if request.path.endswith("/batch/read")]) == 3
+
 
 @pytest.fixture(name="configured_catalog")
 def configured_catalog_fixture():
@@ -31,3 +31,18 @@ def test_split_properties(cls, properties, chunks_expected):
     chunks = index + 1
     assert chunked_properties == set(properties)
     assert chunks == chunks_expected
+
+
+@pytest.mark.parametrize(
+    ("cls", "max_properties", "chunks_expected"),
+    (
+        (APIv1Property, 1000, 11),
+        (APIv3Property, 1000, 8),
+        (APIv3Property, 2000, 5),
+    ),
+)
+def test_split_properties_max_properties(cls, max_properties, chunks_expected):
+    chunks = list(cls(many_properties, max_properties=max_properties).split())
+    assert [p for chunk in chunks for p in chunk.properties] == many_properties
+    assert all(len(chunk.properties) <= max_properties for chunk in chunks)
+    assert len(chunks) == chunks_expected
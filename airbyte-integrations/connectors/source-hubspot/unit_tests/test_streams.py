@@ -221,3 +221,12 @@ def test_contact_lists_transform(requests_mock, common_params):
     assert records[1]["filters"][0][0]["value"] == "True"
     assert records[1]["filters"][0][1]["value"] == "FORM_ABUSE"
     assert records[2]["filters"][0][0]["value"] == "1000"
+
+
+def test_crm_search_stream_without_properties(requests_mock, common_params):
+    stream = Companies(**common_params)
+    requests_mock.register_uri("GET", "/properties/v2/company/properties", [{"json": [], "status_code": 200}])
+
+    stream._sync_mode = SyncMode.full_refresh
+    assert stream._read_stream_records() == ([], None)
+    stream._sync_mode = None
@@ -6,7 +6,7 @@
 from setuptools import find_packages, setup
 
 MAIN_REQUIREMENTS = [
-    "airbyte-cdk",
+    "airbyte-cdk>=0.1.63",
     "pyarrow==4.0.1",
     "smart-open[s3]==5.1.0",
     "wcmatch==8.2",
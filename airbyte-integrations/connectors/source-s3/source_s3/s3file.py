@@ -43,6 +43,22 @@ class S3File(StorageFile):
         aws_secret_access_key = provider.get("aws_secret_access_key")
         return True if (aws_access_key_id is not None and aws_secret_access_key is not None) else False
 
+    def _make_client(self) -> Any:
+        if self.use_aws_account(self._provider):
+            return make_s3_client(self._provider, session=self._boto_session)
+        return make_s3_client(self._provider, config=ClientConfig(signature_version=UNSIGNED))
+
+    def read_tail(self, length: int) -> bytes:
+        """
+        Fetches the end of the object with a single ranged GET request rather than downloading it.
+        """
+        if not self.file_size:
+            # ranged requests on an empty object fail
+            return b""
+        self.logger.debug(f"read the last {length} bytes of {self.file_info}")
+        response = self._make_client().get_object(Bucket=self._provider.get("bucket"), Key=self.url, Range=f"bytes=-{length}")
+        return response["Body"].read()
+
     @contextmanager
     def open(self, binary: bool) -> Iterator[Union[TextIO, BinaryIO]]:
         """
@@ -53,11 +69,7 @@ class S3File(StorageFile):
         """
         mode = "rb" if binary else "r"
         bucket = self._provider.get("bucket")
-        if self.use_aws_account(self._provider):
-            params = {"client": make_s3_client(self._provider, session=self._boto_session)}
-        else:
-            config = ClientConfig(signature_version=UNSIGNED)
-            params = {"client": make_s3_client(self._provider, config=config)}
+        params = {"client": self._make_client()}
         self.logger.debug(f"try to open {self.file_info}")
         result = smart_open.open(f"s3://{bucket}/{self.url}", transport_params=params, mode=mode)
 
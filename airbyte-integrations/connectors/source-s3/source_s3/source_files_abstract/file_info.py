@@ -5,6 +5,7 @@
 from dataclasses import dataclass
 from datetime import datetime
 from functools import total_ordering
+from typing import Optional
 
 
 @total_ordering
@@ -15,6 +16,8 @@ class FileInfo:
     key: str
     size: int
     last_modified: datetime
+    # identifies the version of the file content, if the provider supplies one
+    etag: Optional[str] = None
 
     @property
     def size_in_megabytes(self) -> float:
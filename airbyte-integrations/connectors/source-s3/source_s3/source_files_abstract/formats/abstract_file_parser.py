@@ -3,11 +3,25 @@
 #
 
 from abc import ABC, abstractmethod
-from typing import Any, BinaryIO, Iterator, Mapping, TextIO, Union
+from typing import Any, BinaryIO, Iterable, Iterator, List, Mapping, NamedTuple, Optional, TextIO, Tuple, Union
 
 import pyarrow as pa
 from airbyte_cdk.logger import AirbyteLogger
 from source_s3.source_files_abstract.file_info import FileInfo
+from source_s3.source_files_abstract.storagefile import StorageFile
+
+# Maximum number of records grouped in a batch by the default implementation of stream_record_batches()
+DEFAULT_RECORD_BATCH_SIZE = 10000
+
+
+class RecordBatch(NamedTuple):
+    """
+    Records sharing the same columns.
+    rows yields a tuple of values per record in the order of columns, it may be a lazy iterator which can only be consumed once.
+    """
+
+    columns: List[str]
+    rows: Iterable[Tuple[Any, ...]]
 
 
 class AbstractFileParser(ABC):
@@ -41,6 +55,17 @@ class AbstractFileParser(ABC):
         :return: mapping of {columns:datatypes} where datatypes are JsonSchema types
         """
 
+    def infer_schema(self, storage_file: StorageFile) -> dict:
+        """
+        Infers the schema of a stored file, by default opening it and passing it to get_inferred_schema().
+        Override this for formats which can infer the schema from a part of the file, to avoid downloading all of it.
+
+        :param storage_file: file to infer the schema of
+        :return: mapping of {columns:datatypes} where datatypes are JsonSchema types
+        """
+        with storage_file.open(self.is_binary) as f:
+            return self.get_inferred_schema(f)
+
     @abstractmethod
     def stream_records(self, file: Union[TextIO, BinaryIO], file_info: FileInfo) -> Iterator[Mapping[str, Any]]:
         """
@@ -52,6 +77,28 @@ class AbstractFileParser(ABC):
         :yield: data record as a mapping of {columns:values}
         """
 
+    def stream_record_batches(self, file: Union[TextIO, BinaryIO]) -> Iterator[RecordBatch]:
+        """
+        Streams the data rows of the file as batches of records sharing the same columns, which lets the stream map the columns of a
+        batch to the master schema once rather than for every record.
+        The default implementation groups the consecutive records of stream_records() with the same columns,
+        override this for formats which read columns or rows natively.
+
+        :param file: file-like object (opened via StorageFile)
+        :yield: batches of records
+        """
+        columns: Optional[List[str]] = None
+        rows: List[Tuple[Any, ...]] = []
+        for record in self.stream_records(file):
+            record_columns = list(record.keys())
+            if record_columns != columns or len(rows) >= DEFAULT_RECORD_BATCH_SIZE:
+                if rows:
+                    yield RecordBatch(columns, rows)
+                columns, rows = record_columns, []
+            rows.append(tuple(record.values()))
+        if rows:
+            yield RecordBatch(columns, rows)
+
     @staticmethod
     def json_type_to_pyarrow_type(typ: str, reverse: bool = False, logger: AirbyteLogger = AirbyteLogger()) -> str:
         """
@@ -2,12 +2,13 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
-from typing import Any, BinaryIO, Iterator, Mapping, TextIO, Union
+from operator import itemgetter
+from typing import Any, BinaryIO, Callable, Iterator, Mapping, TextIO, Tuple, Union
 
 import fastavro
 from fastavro import reader
 
-from .abstract_file_parser import AbstractFileParser
+from .abstract_file_parser import AbstractFileParser, RecordBatch
 
 # mapping from apache avro docs: https://avro.apache.org/docs/current/spec.html#schema_complex
 data_type_mapping = {
@@ -86,3 +87,16 @@ class AvroParser(AbstractFileParser):
         avro_reader = reader(file)
         for record in avro_reader:
             yield record
+
+    def stream_record_batches(self, file: Union[TextIO, BinaryIO]) -> Iterator[RecordBatch]:
+        """Every record of an avro file has the fields of its schema, so the whole file is streamed as a single batch
+        :param file: file-like object (opened via StorageFile)
+        :yield: a batch of all records of the file
+        """
+        avro_reader = reader(file)
+        columns = [field["name"] for field in avro_reader.writer_schema["fields"]]
+        # itemgetter only returns a tuple for 2 items or more
+        get_values: Callable[[Mapping[str, Any]], Tuple[Any, ...]] = (
+            itemgetter(*columns) if len(columns) > 1 else lambda record: tuple(record[column] for column in columns)
+        )
+        yield RecordBatch(columns, map(get_values, avro_reader))
@@ -13,7 +13,7 @@ import six  # type: ignore[import]
 from pyarrow import csv as pa_csv
 from source_s3.utils import get_value_or_json_if_empty_string, run_in_external_process
 
-from .abstract_file_parser import AbstractFileParser
+from .abstract_file_parser import AbstractFileParser, RecordBatch
 from .csv_spec import CsvFormat
 
 MAX_CHUNK_SIZE = 50.0 * 1024**2  # in bytes
@@ -151,6 +151,12 @@ class CsvParser(AbstractFileParser):
         https://arrow.apache.org/docs/python/generated/pyarrow.csv.open_csv.html
         PyArrow returns lists of values for each column so we zip() these up into records which we then yield
         """
+        for batch in self.stream_record_batches(file):
+            for record_values in batch.rows:
+                # create our record of {col: value, col: value}
+                yield dict(zip(batch.columns, record_values))
+
+    def stream_record_batches(self, file: Union[TextIO, BinaryIO]) -> Iterator[RecordBatch]:
         streaming_reader = pa_csv.open_csv(
             file,
             pa.csv.ReadOptions(**self._read_options()),
@@ -164,12 +170,9 @@ class CsvParser(AbstractFileParser):
             except StopIteration:
                 still_reading = False
             else:
-                batch_dict = batch.to_pydict()
                 batch_columns = [col_info.name for col_info in batch.schema]
                 # this gives us a list of lists where each nested list holds ordered values for a single column
                 # e.g. [ [1,2,3], ["a", "b", "c"], [True, True, False] ]
-                columnwise_record_values = [batch_dict[column] for column in batch_columns]
+                columnwise_record_values = [column.to_pylist() for column in batch.columns]
                 # we zip this to get row-by-row, e.g. [ [1, "a", True], [2, "b", True], [3, "c", False] ]
-                for record_values in zip(*columnwise_record_values):
-                    # create our record of {col: value, col: value} by dict comprehension, iterating through all cols in batch_columns
-                    yield {batch_columns[i]: record_values[i] for i in range(len(batch_columns))}
+                yield RecordBatch(batch_columns, zip(*columnwise_record_values))
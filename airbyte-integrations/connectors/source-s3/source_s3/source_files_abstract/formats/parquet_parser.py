@@ -2,12 +2,14 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import io
 from typing import Any, BinaryIO, Iterator, List, Mapping, TextIO, Tuple, Union
 
 import pyarrow.parquet as pq
 from pyarrow.parquet import ParquetFile
 
-from .abstract_file_parser import AbstractFileParser
+from ..storagefile import StorageFile
+from .abstract_file_parser import AbstractFileParser, RecordBatch
 from .parquet_spec import ParquetFormat
 
 # All possible parquet data types
@@ -24,6 +26,12 @@ PARQUET_TYPES = {
     "time": ("string", ["INT32", "INT64", "INT96"], lambda v: v.isoformat()),
 }
 
+# A parquet file ends with its metadata, the metadata length (4 bytes) and the magic bytes
+PARQUET_MAGIC = b"PAR1"
+PARQUET_FOOTER_SIZE = 8
+# Number of bytes fetched from the end of a file to infer its schema, enough for the metadata of most files
+PARQUET_TAIL_READ_SIZE = 64 * 1024
+
 
 class ParquetParser(AbstractFileParser):
     """Apache Parquet is a free and open-source column-oriented data storage format of the Apache Hadoop ecosystem.
@@ -90,7 +98,24 @@ class ParquetParser(AbstractFileParser):
 
         A stored schema is a part of metadata and we can extract it without parsing of full file
         """
-        reader = self._init_reader(file)
+        return self._get_schema_from_reader(self._init_reader(file))
+
+    def infer_schema(self, storage_file: StorageFile) -> dict:
+        """
+        The schema is a part of the metadata at the end of the file, so only the end of the file is fetched.
+        A second request is only made if the metadata is larger than PARQUET_TAIL_READ_SIZE.
+        Files which do not end with the Parquet magic bytes (e.g. compressed files) are read entirely.
+        """
+        tail = storage_file.read_tail(PARQUET_TAIL_READ_SIZE)
+        if len(tail) < PARQUET_FOOTER_SIZE or tail[-len(PARQUET_MAGIC) :] != PARQUET_MAGIC:
+            # e.g. a compressed file, which has to be decompressed from its beginning
+            return super().infer_schema(storage_file)
+        metadata_size = int.from_bytes(tail[-PARQUET_FOOTER_SIZE : -len(PARQUET_MAGIC)], "little") + PARQUET_FOOTER_SIZE
+        if metadata_size > len(tail):
+            tail = storage_file.read_tail(metadata_size)
+        return self._get_schema_from_reader(pq.ParquetFile(io.BytesIO(tail)))
+
+    def _get_schema_from_reader(self, reader: ParquetFile) -> dict:
         schema_dict = {
             field.name: self.parse_field_type(field.logical_type.type.lower(), field.physical_type)[0] for field in reader.schema
         }
@@ -104,7 +129,14 @@ class ParquetParser(AbstractFileParser):
         https://arrow.apache.org/docs/python/generated/pyarrow.parquet.ParquetFile.html
         PyArrow reads streaming batches from a Parquet file
         """
+        for batch in self.stream_record_batches(file):
+            for record_values in batch.rows:
+                yield dict(zip(batch.columns, record_values))
 
+    def stream_record_batches(self, file: Union[TextIO, BinaryIO]) -> Iterator[RecordBatch]:
+        """
+        Values are converted to JSON a column at a time, only for the columns whose logical type needs a conversion.
+        """
         reader = self._init_reader(file)
         self.logger.info(f"found {reader.num_row_groups} row groups")
         logical_types = {
@@ -113,6 +145,9 @@ class ParquetParser(AbstractFileParser):
         if not reader.schema:
             # pyarrow can parse empty parquet files but a connector can't generate dynamic schema
             raise OSError("empty Parquet file")
+        converters = {
+            column: PARQUET_TYPES[logical_type][2] for column, logical_type in logical_types.items() if logical_type in PARQUET_TYPES
+        }
 
         args = self._select_options("columns", "batch_size")  # type: ignore[arg-type]
         self.logger.debug(f"Found the {reader.num_row_groups} Parquet groups")
@@ -121,15 +156,17 @@ class ParquetParser(AbstractFileParser):
         for num_row_group in range(reader.num_row_groups):
             args["row_groups"] = [num_row_group]
             for batch in reader.iter_batches(**args):
-                # this gives us a dist of lists where each nested list holds ordered values for a single column
-                # {'number': [1.0, 2.0, 3.0], 'name': ['foo', None, 'bar'], 'flag': [True, False, True], 'delta': [-1.0, 2.5, 0.1]}
-                batch_columns = [col.name for col in batch.schema]
-                batch_dict = batch.to_pydict()
-                columnwise_record_values = [batch_dict[column] for column in batch_columns]
-
+                # this gives us a list of lists where each nested list holds ordered values for a single column
+                # [[1.0, 2.0, 3.0], ['foo', None, 'bar'], [True, False, True], [-1.0, 2.5, 0.1]]
+                batch_columns = batch.schema.names
+                columnwise_record_values = []
+                for column, values in zip(batch_columns, batch.columns):
+                    values = values.to_pylist()
+                    # the values of the columns without a known logical type (e.g. nested columns, whose leaves are named differently
+                    # in the schema of the file) are kept as they are
+                    convert = converters.get(column)
+                    if convert:
+                        values = [None if value is None else convert(value) for value in values]
+                    columnwise_record_values.append(values)
                 # we zip this to get row-by-row
-                for record_values in zip(*columnwise_record_values):
-                    yield {
-                        batch_columns[i]: self.convert_field_data(logical_types[batch_columns[i]], record_values[i])
-                        for i in range(len(batch_columns))
-                    }
+                yield RecordBatch(batch_columns, zip(*columnwise_record_values))
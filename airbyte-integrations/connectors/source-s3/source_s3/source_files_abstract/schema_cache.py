@@ -0,0 +1,127 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+from airbyte_cdk.logger import AirbyteLogger
+
+from .file_info import FileInfo
+
+LOGGER = AirbyteLogger()
+
+# Directory keeping the schema cache between discoveries and syncs, it must be mounted to outlive the container. Disabled when unset.
+SCHEMA_CACHE_DIR = os.environ.get("S3_SCHEMA_CACHE_DIR")
+# Maximum number of files whose schema is cached, the most recently modified files are kept
+MAX_CACHED_FILES = 10_000
+
+
+class SchemaCache:
+    """
+    Keeps the schema inferred from each file so that files are only inferred again when their content changes.
+    An entry is valid as long as the key, etag (or last modified date if the provider has no etag) and size of the file are unchanged.
+
+    The cache is saved in the stream state as {"schemas": {hash: schema, ...}, "files": {key: [version, size, schema hash]}}
+    so that the schema shared by many files is only stored once. Only the max_files most recently modified files are kept, so the
+    state saved at every checkpoint stays bounded however many files match the pattern.
+    """
+
+    def __init__(self, max_files: int = MAX_CACHED_FILES) -> None:
+        self._max_files = max_files
+        self._entries: Dict[str, Tuple[str, int, str]] = {}
+        self._schemas: Dict[str, Dict[str, Any]] = {}
+        self._state: Optional[Mapping[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _version(file_info: FileInfo) -> str:
+        return file_info.etag or file_info.last_modified.isoformat()
+
+    @staticmethod
+    def _hash(schema: Dict[str, Any]) -> str:
+        # the order of the columns is part of the schema
+        return hashlib.sha256(json.dumps(schema).encode()).hexdigest()[:16]
+
+    def get(self, file_info: FileInfo) -> Optional[Dict[str, Any]]:
+        """
+        :return: the cached schema of the file, None if the file is unknown or was modified since it was cached
+        """
+        entry = self._entries.get(file_info.key)
+        if entry is not None and entry[:2] == (self._version(file_info), file_info.size):
+            return self._schemas[entry[2]]
+        return None
+
+    def set(self, file_info: FileInfo, schema: Dict[str, Any]) -> None:
+        schema_hash = self._hash(schema)
+        with self._lock:
+            self._schemas.setdefault(schema_hash, schema)
+            self._entries[file_info.key] = (self._version(file_info), file_info.size, schema_hash)
+            self._state = None
+
+    def retain(self, file_infos: Iterable[FileInfo]) -> None:
+        """
+        Drops the entries of the files which are not in file_infos, e.g. because they were deleted, and of the oldest files beyond
+        max_files. file_infos must be ordered by modification date.
+        """
+        keys = [file_info.key for file_info in file_infos]
+        with self._lock:
+            self._entries = {key: self._entries[key] for key in keys[-self._max_files :] if key in self._entries}
+            self._state = None
+
+    def load(self, state: Optional[Mapping[str, Any]]) -> None:
+        """
+        Adds the entries saved in a stream state by to_state()
+        """
+        if not state:
+            return
+        schemas = state.get("schemas", {})
+        with self._lock:
+            for key, (version, size, schema_hash) in state.get("files", {}).items():
+                if key not in self._entries and schema_hash in schemas:
+                    self._schemas.setdefault(schema_hash, schemas[schema_hash])
+                    self._entries[key] = (version, size, schema_hash)
+            self._state = None
+
+    def to_state(self) -> Mapping[str, Any]:
+        """
+        The state is built once and reused until the cache is modified, as the stream state is updated for every record.
+        """
+        with self._lock:
+            if self._state is None:
+                # the entries beyond max_files added since the last retain are the most recently inferred ones
+                self._entries = dict(list(self._entries.items())[-self._max_files :])
+                self._schemas = {schema_hash: self._schemas[schema_hash] for _, _, schema_hash in self._entries.values()}
+                self._state = {"schemas": dict(self._schemas), "files": {key: list(entry) for key, entry in self._entries.items()}}
+            return self._state
+
+    def load_file(self, path: str) -> None:
+        """
+        Adds the entries saved in a file by save_file(), a missing or unreadable file is ignored.
+        """
+        try:
+            with open(path) as cache_file:
+                self.load(json.load(cache_file))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            LOGGER.warn(f"Could not read the schema cache {path}: {e}")
+
+    def save_file(self, path: str) -> None:
+        """
+        Saves the entries in a file, replaced atomically so that concurrent commands never read a partial cache.
+        """
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(path), delete=False) as cache_file:
+                json.dump(self.to_state(), cache_file)
+            os.replace(cache_file.name, path)
+        except OSError as e:
+            LOGGER.warn(f"Could not save the schema cache {path}: {e}")
@@ -5,7 +5,7 @@
 
 import json
 import re
-from typing import Any, Dict, Union
+from typing import Any, Dict, Optional, Union
 
 from jsonschema import RefResolver
 from pydantic import BaseModel, Field
@@ -76,6 +76,28 @@ class SourceFilesAbstractSpec(BaseModel):
         order=30,
     )
 
+    schema_inference_sample_size: Optional[int] = Field(
+        title="Schema Inference Sample Size (Optional)",
+        default=None,
+        minimum=1,
+        description="Infer the schema from at most this many files, spread over the modification dates of the files and always including "
+        "the most recent one, instead of every file. This speeds up discovery of buckets with many files but columns or datatypes "
+        "which only appear in the other files are not detected. Leave empty to infer the schema from all files.",
+        examples=[100],
+        order=40,
+    )
+
+    max_concurrent_files: int = Field(
+        title="Concurrent File Reads",
+        default=1,
+        minimum=1,
+        maximum=64,
+        description="Maximum number of files read at the same time. Files are synced in batches of files modified at the same time, "
+        "the files of a batch can be read concurrently, which is faster when syncing many small files. Set to 1 to read the files "
+        "one after the other.",
+        order=50,
+    )
+
     @staticmethod
     def change_format_to_oneOf(schema: dict) -> dict:
         props_to_change = ["format"]
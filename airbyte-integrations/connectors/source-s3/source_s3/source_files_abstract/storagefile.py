@@ -58,3 +58,15 @@ class StorageFile(ABC):
         :param binary: whether or not to open file as binary
         :return: file-like object
         """
+
+    def read_tail(self, length: int) -> bytes:
+        """
+        Override this to fetch only the end of the file when the provider supports ranged reads.
+        By default the file is opened and read from the requested position.
+
+        :param length: number of bytes to read from the end of the file
+        :return: the last length bytes of the file, or the whole file if it is shorter
+        """
+        with self.open(binary=True) as f:
+            f.seek(max(self.file_size - length, 0))
+            return f.read()
@@ -3,24 +3,30 @@
 #
 
 
+import hashlib
 import json
+import os
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
 from datetime import datetime, timedelta
-from functools import lru_cache
+from functools import lru_cache, partial
 from traceback import format_exc
-from typing import Any, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Tuple, Union
 
 from airbyte_cdk.logger import AirbyteLogger
 from airbyte_cdk.models.airbyte_protocol import SyncMode
 from airbyte_cdk.sources.streams import Stream
+from airbyte_cdk.sources.utils.concurrency import merge_concurrently
 from wcmatch.glob import GLOBSTAR, SPLIT, globmatch
 
+from . import schema_cache
 from .file_info import FileInfo
-from .formats.abstract_file_parser import AbstractFileParser
+from .formats.abstract_file_parser import AbstractFileParser, RecordBatch
 from .formats.avro_parser import AvroParser
 from .formats.csv_parser import CsvParser
 from .formats.parquet_parser import ParquetParser
+from .schema_cache import SchemaCache
 from .storagefile import StorageFile
 
 JSON_TYPES = ["string", "number", "integer", "object", "array", "boolean", "null"]
@@ -48,14 +54,27 @@ class FileStream(Stream, ABC):
     ab_file_name_col = "_ab_source_file_url"
     airbyte_columns = [ab_additional_col, ab_last_mod_col, ab_file_name_col]
     datetime_format_string = "%Y-%m-%dT%H:%M:%S%z"
+    # number of files whose schema is inferred at the same time
+    schema_inference_concurrency = 8
 
-    def __init__(self, dataset: str, provider: dict, format: dict, path_pattern: str, schema: str = None):
+    def __init__(
+        self,
+        dataset: str,
+        provider: dict,
+        format: dict,
+        path_pattern: str,
+        schema: str = None,
+        schema_inference_sample_size: Optional[int] = None,
+        max_concurrent_files: int = 1,
+    ):
         """
         :param dataset: table name for this stream
         :param provider: provider specific mapping as described in spec.json
         :param format: file format specific mapping as described in spec.json
         :param path_pattern: glob-style pattern for file-matching (https://facelessuser.github.io/wcmatch/glob/)
         :param schema: JSON-syntax user provided schema, defaults to None
+        :param schema_inference_sample_size: if set, the schema is inferred from at most this many files, defaults to None (all files)
+        :param max_concurrent_files: maximum number of files of a stream slice read at the same time, defaults to 1
         """
         self.dataset = dataset
         self._path_pattern = path_pattern
@@ -64,6 +83,9 @@ class FileStream(Stream, ABC):
         self._schema: Dict[str, Any] = {}
         if schema:
             self._schema = self._parse_user_input_schema(schema)
+        self._schema_inference_sample_size = schema_inference_sample_size
+        self._max_concurrent_files = max_concurrent_files
+        self._schema_cache = SchemaCache()
         self.master_schema: Dict[str, Any] = None
         LOGGER.info(f"initialised stream with format: {format}")
 
@@ -183,6 +205,51 @@ class FileStream(Stream, ABC):
         properties[self.ab_last_mod_col]["format"] = "date-time"
         return {"type": "object", "properties": properties}
 
+    def _sample_file_infos(self, file_infos: List[FileInfo]) -> List[FileInfo]:
+        """
+        If a sample size is configured, picks that many files evenly spread over the time-ordered file_infos,
+        always including the most recent file.
+        """
+        sample_size = self._schema_inference_sample_size
+        if not sample_size or len(file_infos) <= sample_size:
+            return file_infos
+        if sample_size == 1:
+            return file_infos[-1:]
+        step = (len(file_infos) - 1) / (sample_size - 1)
+        return [file_infos[round(i * step)] for i in range(sample_size)]
+
+    def _get_file_schemas(self, file_infos: List[FileInfo]) -> Iterator[Tuple[FileInfo, Dict[str, Any]]]:
+        """
+        Yields the schema of each file in order, from the schema cache if the file did not change since it was inferred.
+        The other files are inferred concurrently and added to the cache.
+        """
+        file_reader = self.fileformatparser_class(self._format)
+
+        def infer_schema(file_info: FileInfo) -> Dict[str, Any]:
+            schema = file_reader.infer_schema(self.storagefile_class(file_info, self._provider))
+            self._schema_cache.set(file_info, schema)
+            return schema
+
+        cached_schemas = {file_info.key: self._schema_cache.get(file_info) for file_info in file_infos}
+        files_to_infer = [file_info for file_info in file_infos if cached_schemas[file_info.key] is None]
+        LOGGER.info(f"inferring the schema of {len(files_to_infer)} files, {len(file_infos) - len(files_to_infer)} schemas are cached")
+
+        with ThreadPoolExecutor(max_workers=self.schema_inference_concurrency) as executor:
+            inferred_schemas = executor.map(infer_schema, files_to_infer)
+            for file_info in file_infos:
+                schema = cached_schemas[file_info.key]
+                yield file_info, schema if schema is not None else next(inferred_schemas)
+
+    def _schema_cache_path(self) -> Optional[str]:
+        """
+        :return: the file of S3_SCHEMA_CACHE_DIR keeping the schema cache of the files matched by this stream, None if it is not set
+        """
+        if not schema_cache.SCHEMA_CACHE_DIR:
+            return None
+        # the inferred schemas depend on the files matched and on the format options
+        stream_key = json.dumps([self.dataset, self._provider, self._format, self._path_pattern], sort_keys=True, default=str)
+        return os.path.join(schema_cache.SCHEMA_CACHE_DIR, f"{hashlib.sha256(stream_key.encode()).hexdigest()}.json")
+
     def _get_master_schema(self, min_datetime: datetime = None) -> Dict[str, Any]:
         """
         In order to auto-infer a schema across many files and/or allow for additional properties (columns),
@@ -191,28 +258,27 @@ class FileStream(Stream, ABC):
             to build up this superset schema (master_schema).
         This runs datatype checks to Warn or Error if we find incompatible schemas (e.g. same column is 'date' in one file but 'float' in another).
         This caches the master_schema after first run in order to avoid repeated compute and network calls to infer schema on all files.
+        The schema of each file is also kept in a schema cache saved in the stream state, and in S3_SCHEMA_CACHE_DIR if it is set so
+        that discovery uses it as well, so that unchanged files are not inferred again.
 
         :param min_datetime: if passed, will only use files with last_modified >= this to determine master schema
 
         :raises RuntimeError: if we find datatype mismatches between files or between a file and schema state (provided or from previous inc. batch)
         :return: A dict of the JSON schema representing this stream.
         """
-        # TODO: could implement a (user-beware) 'lazy' mode that skips schema checking to improve performance
         # TODO: could utilise min_datetime to add a start_date parameter in spec for user
         if self.master_schema is None:
             master_schema = deepcopy(self._schema)
 
-            file_reader = self.fileformatparser_class(self._format)
-
-            for file_info in self.get_time_ordered_file_infos():
-                # skip this file if it's earlier than min_datetime
-                if (min_datetime is not None) and (file_info.last_modified < min_datetime):
-                    continue
-
-                storagefile = self.storagefile_class(file_info, self._provider)
-                with storagefile.open(file_reader.is_binary) as f:
-                    this_schema = file_reader.get_inferred_schema(f)
+            cache_path = self._schema_cache_path()
+            if cache_path:
+                self._schema_cache.load_file(cache_path)
+            file_infos = self.get_time_ordered_file_infos()
+            self._schema_cache.retain(file_infos)
+            # skip the files which are earlier than min_datetime
+            file_infos = [file_info for file_info in file_infos if min_datetime is None or file_info.last_modified >= min_datetime]
 
+            for file_info, this_schema in self._get_file_schemas(self._sample_file_infos(file_infos)):
                 if this_schema == master_schema:
                     continue  # exact schema match so go to next file
 
@@ -226,7 +292,7 @@ class FileStream(Stream, ABC):
                         # provided schema state. If not, then the read will error anyway
                         if col in self._schema.keys():
                             LOGGER.warn(
-                                f"Detected mismatched datatype on column '{col}', in file '{storagefile.url}'. "
+                                f"Detected mismatched datatype on column '{col}', in file '{file_info.key}'. "
                                 + f"Should be '{master_schema[col]}', but found '{this_schema[col]}'. "
                                 + f"Airbyte will attempt to coerce this to {master_schema[col]} on read."
                             )
@@ -234,7 +300,7 @@ class FileStream(Stream, ABC):
                         # throw an error on mismatching datatypes
                         else:
                             raise RuntimeError(
-                                f"Detected mismatched datatype on column '{col}', in file '{storagefile.url}'. "
+                                f"Detected mismatched datatype on column '{col}', in file '{file_info.key}'. "
                                 + f"Should be '{master_schema[col]}', but found '{this_schema[col]}'."
                             )
 
@@ -247,6 +313,8 @@ class FileStream(Stream, ABC):
 
             LOGGER.info(f"determined master schema: {master_schema}")
             self.master_schema = master_schema
+            if cache_path:
+                self._schema_cache.save_file(cache_path)
 
         return self.master_schema
 
@@ -306,6 +374,57 @@ class FileStream(Stream, ABC):
             record[key] = value
         return record
 
+    def _records_from_batch(self, batch: RecordBatch, target_columns: List, extra_map: Mapping[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Builds the records of a batch with the same result as _match_target_schema() and _add_extra_fields_from_map(),
+        but the columns of the batch are matched to target_columns once for the whole batch rather than for every record.
+
+        :param batch: records read from a file
+        :param target_columns: list of column names to mutate the records into (obtained via self._get_schema_map().keys() as of now)
+        :param extra_map: map of additional columns and values to add to every record
+        :yield: records with columns lining up to target_columns
+        """
+        if self.ab_additional_col in batch.columns:
+            # the file has its own additional properties column, fall back to the record by record logic which handles it
+            for record_values in batch.rows:
+                record = self._match_target_schema(dict(zip(batch.columns, record_values)), target_columns)
+                yield self._add_extra_fields_from_map(record, extra_map)
+            return
+
+        compare_columns = [c for c in target_columns if c not in [self.ab_last_mod_col, self.ab_file_name_col]]
+        kept_indexes = [i for i, c in enumerate(batch.columns) if c in compare_columns]
+        additional_indexes = [i for i, c in enumerate(batch.columns) if c not in compare_columns]
+        missing_columns = [c for c in compare_columns if c != self.ab_additional_col and c not in batch.columns]
+
+        record_columns = [batch.columns[i] for i in kept_indexes] + missing_columns + [self.ab_additional_col] + list(extra_map.keys())
+        missing_values = (None,) * len(missing_columns)
+        extra_values = tuple(extra_map.values())
+
+        if not additional_indexes and len(kept_indexes) == len(batch.columns):
+            # the usual case, every column of the file is in the schema
+            for record_values in batch.rows:
+                yield dict(zip(record_columns, (*record_values, *missing_values, {}, *extra_values)))
+        else:
+            additional_columns = [batch.columns[i] for i in additional_indexes]
+            for record_values in batch.rows:
+                kept_values = tuple(record_values[i] for i in kept_indexes)
+                additional_properties = dict(zip(additional_columns, (record_values[i] for i in additional_indexes)))
+                yield dict(zip(record_columns, (*kept_values, *missing_values, additional_properties, *extra_values)))
+
+    def _read_from_file(self, file_reader: AbstractFileParser, storage_file: StorageFile) -> Iterable[Mapping[str, Any]]:
+        """
+        Uses provider-relevant StorageFile to open file and then iterates through stream_record_batches() using format-relevant
+        AbstractFileParser. Records are built per batch using _records_from_batch() to achieve desired final schema.
+        """
+        target_columns = list(self._get_schema_map().keys())
+        extra_map = {
+            self.ab_last_mod_col: datetime.strftime(storage_file.last_modified, self.datetime_format_string),
+            self.ab_file_name_col: storage_file.url,
+        }
+        with storage_file.open(file_reader.is_binary) as f:
+            for batch in file_reader.stream_record_batches(f):
+                yield from self._records_from_batch(batch, target_columns, extra_map)
+
     def _read_from_slice(
         self,
         file_reader: AbstractFileParser,
@@ -313,24 +432,19 @@ class FileStream(Stream, ABC):
         stream_state: Mapping[str, Any] = None,
     ) -> Iterable[Mapping[str, Any]]:
         """
-        Uses provider-relevant StorageFile to open file and then iterates through stream_records() using format-relevant AbstractFileParser.
-        Records are mutated on the fly using _match_target_schema() and _add_extra_fields_from_map() to achieve desired final schema.
+        Reads every file of the stream_slice with _read_from_file().
+        If max_concurrent_files > 1, up to that many files of the slice are downloaded and parsed at the same time and their records
+        are interleaved. Files of a slice share the same last_modified so the order doesn't matter to the cursor, and the records of
+        a slice are all emitted before the next slice is read, so the state checkpointed after each slice stays correct.
         Since this is called per stream_slice, this method works for both full_refresh and incremental.
         """
-        for file_item in stream_slice["files"]:
-            storage_file: StorageFile = file_item["storage_file"]
-            with storage_file.open(file_reader.is_binary) as f:
-                # TODO: make this more efficient than mutating every record one-by-one as they stream
-                for record in file_reader.stream_records(f):
-                    schema_matched_record = self._match_target_schema(record, list(self._get_schema_map().keys()))
-                    complete_record = self._add_extra_fields_from_map(
-                        schema_matched_record,
-                        {
-                            self.ab_last_mod_col: datetime.strftime(storage_file.last_modified, self.datetime_format_string),
-                            self.ab_file_name_col: storage_file.url,
-                        },
-                    )
-                    yield complete_record
+        storage_files: List[StorageFile] = [file_item["storage_file"] for file_item in stream_slice["files"]]
+        if self._max_concurrent_files > 1 and len(storage_files) > 1:
+            producers = [partial(self._read_from_file, file_reader, storage_file) for storage_file in storage_files]
+            yield from merge_concurrently(producers, max_workers=self._max_concurrent_files)
+        else:
+            for storage_file in storage_files:
+                yield from self._read_from_file(file_reader, storage_file)
         LOGGER.info("finished reading a stream slice")
 
     def read_records(
@@ -433,6 +547,8 @@ class IncrementalFileStream(FileStream, ABC):
         state_dict[self.cursor_field] = datetime.strftime(max(current_parsed_datetime, latest_record_datetime), self.datetime_format_string)
 
         state_dict["schema"] = self._get_schema_map()
+        if self._schema_cache:
+            state_dict["schema_cache"] = self._schema_cache.to_state()
 
         state_date = self._get_datetime_from_stream_state(state_dict).date()
 
@@ -484,6 +600,8 @@ class IncrementalFileStream(FileStream, ABC):
             # TODO: ideally we could do this on __init__ but I'm not sure that's possible without breaking from cdk style implementation
             if self._schema == {} and stream_state is not None and "schema" in stream_state.keys():
                 self._schema = stream_state["schema"]
+            if stream_state is not None:
+                self._schema_cache.load(stream_state.get("schema_cache"))
 
             # logic here is to bundle all files with exact same last modified timestamp together in each slice
             prev_file_last_mod: datetime = None  # init variable to hold previous iterations last modified
@@ -10,6 +10,7 @@ import tracemalloc
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
 from functools import lru_cache, wraps
+from itertools import zip_longest
 from typing import Any, Callable, List, Mapping
 
 import pytest
@@ -152,3 +153,17 @@ class AbstractTestParser(ABC):
                 assert len(records) == file_info["num_records"]
                 for index, expected_record in file_info["line_checks"].items():
                     assert records[index - 1] == expected_record
+
+    @memory_limit(1024)
+    def test_stream_suite_record_batches(self, file_info: Mapping[str, Any]) -> None:
+        if "test_stream_records" in file_info["fails"]:
+            return
+        file_reader = file_info["AbstractFileParser"]
+        with smart_open(file_info["filepath"], self._get_readmode(file_info)) as f:
+            with smart_open(file_info["filepath"], self._get_readmode(file_info)) as batch_f:
+                batch_records = (
+                    dict(zip(batch.columns, values)) for batch in file_reader.stream_record_batches(batch_f) for values in batch.rows
+                )
+                # the files are compared while streaming to keep the memory usage low on big files
+                for record, batch_record in zip_longest(file_reader.stream_records(f), batch_records):
+                    assert record == batch_record
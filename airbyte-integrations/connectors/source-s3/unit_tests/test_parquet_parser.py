@@ -7,16 +7,21 @@ import copy
 import gzip
 import os
 import shutil
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, List, Mapping
+from typing import Any, BinaryIO, Iterator, List, Mapping
+from unittest.mock import patch
 
 import pandas as pd
 import pyarrow as pa
 import pyarrow.parquet as pq
 import pytest
+from smart_open import open as smart_open
+from source_s3.source_files_abstract.formats import parquet_parser
 from source_s3.source_files_abstract.formats.parquet_parser import PARQUET_TYPES, ParquetParser
+from source_s3.source_files_abstract.storagefile import StorageFile
 
-from .abstract_test_parser import AbstractTestParser
+from .abstract_test_parser import AbstractTestParser, create_by_local_file
 from .conftest import TMP_FOLDER
 
 SAMPLE_DIRECTORY = Path(__file__).resolve().parent.joinpath("sample_files/")
@@ -34,6 +39,19 @@ def compress(archive_name: str, filename: str) -> str:
     return compress_filename
 
 
+class LocalFile(StorageFile):
+    @contextmanager
+    def open(self, binary: bool) -> Iterator[BinaryIO]:
+        with smart_open(self.url, "rb" if binary else "r") as f:
+            yield f
+
+    def read_tail(self, length: int) -> bytes:
+        # reads the raw file like a ranged request would, without decompressing it
+        with open(self.url, "rb") as f:
+            f.seek(max(self.file_size - length, 0))
+            return f.read()
+
+
 class TestParquetParser(AbstractTestParser):
     filetype = "parquet"
     record_types = PARQUET_TYPES
@@ -248,3 +266,24 @@ class TestParquetParser(AbstractTestParser):
     def test_convert_field_data(self):
         with pytest.raises(TypeError):
             ParquetParser.convert_field_data(logical_type="", field_value="")
+
+    def test_stream_records_of_columns_without_logical_type(self, tmp_path):
+        table = pa.table({"id": [1, 2], "tags": pa.array([None, None], type=pa.list_(pa.string()))})
+        pq.write_table(table, tmp_path / "nested.parquet")
+
+        with open(tmp_path / "nested.parquet", "rb") as f:
+            records = list(ParquetParser(format={"filetype": "parquet"}).stream_records(f))
+
+        assert records == [{"id": 1, "tags": None}, {"id": 2, "tags": None}]
+
+    @pytest.mark.parametrize("tail_read_size", [8, 64 * 1024])
+    def test_infer_schema_from_file_tail(self, tail_read_size):
+        with patch.object(parquet_parser, "PARQUET_TAIL_READ_SIZE", tail_read_size):
+            for name, case in self.cached_cases().items():
+                if "test_get_inferred_schema" in case["fails"]:
+                    continue
+                storage_file = LocalFile(create_by_local_file(case["filepath"]), {})
+                with patch.object(LocalFile, "open", wraps=storage_file.open) as open_mock:
+                    assert case["AbstractFileParser"].infer_schema(storage_file) == case["inferred_schema"], name
+                    # compressed files are read entirely, the metadata of the others is read from the end of the file
+                    assert open_mock.called == name.startswith("compression"), name
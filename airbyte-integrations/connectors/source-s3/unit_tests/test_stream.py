@@ -9,7 +9,10 @@ from unittest.mock import MagicMock, patch
 import pytest
 from airbyte_cdk import AirbyteLogger
 from airbyte_cdk.models import SyncMode
+from source_s3.source_files_abstract import schema_cache
 from source_s3.source_files_abstract.file_info import FileInfo
+from source_s3.source_files_abstract.formats.abstract_file_parser import RecordBatch
+from source_s3.source_files_abstract.schema_cache import SchemaCache
 from source_s3.source_files_abstract.storagefile import StorageFile
 from source_s3.source_files_abstract.stream import IncrementalFileStream
 from source_s3.stream import IncrementalFileStreamS3
@@ -423,6 +426,57 @@ class TestIncrementalFileStream:
 
         assert not records
 
+    @pytest.mark.parametrize(
+        ("target_columns", "columns", "rows"),
+        (
+            (["id", "name", "_ab_additional_properties", "_ab_source_file_last_modified"], ["id", "name"], [(1, "a"), (2, None)]),
+            (["id", "name", "_ab_additional_properties"], ["name", "id"], [("a", 1)]),  # different column order
+            (["id", "name", "flag", "_ab_additional_properties"], ["name"], [("a",), ("b",)]),  # missing columns
+            (["id", "_ab_additional_properties"], ["id", "name", "code"], [(1, "a", 7), (2, "b", None)]),  # additional columns
+            (["id", "flag", "_ab_additional_properties"], ["code", "id", "name"], [(7, 1, "a")]),  # missing and additional columns
+            (["id", "_ab_additional_properties"], ["id", "_ab_additional_properties", "name"], [(1, {"a": 1}, "b")]),
+            (["id", "_ab_additional_properties"], ["id"], []),  # empty batch
+        ),
+    )
+    def test_records_from_batch(self, target_columns, columns, rows):
+        stream_instance = IncrementalFileStreamS3(dataset="dummy", provider={}, format={"filetype": "csv"}, path_pattern="**")
+        extra_map = {"_ab_source_file_last_modified": "2022-01-01T13:05:05", "_ab_source_file_url": "file.csv"}
+
+        records = list(stream_instance._records_from_batch(RecordBatch(columns, rows), target_columns, extra_map))
+
+        expected_records = [
+            stream_instance._add_extra_fields_from_map(
+                stream_instance._match_target_schema(dict(zip(columns, values)), target_columns), extra_map
+            )
+            for values in rows
+        ]
+        # compare the items to check the order of the columns too
+        assert [list(record.items()) for record in records] == [list(record.items()) for record in expected_records]
+
+    @pytest.mark.parametrize("max_concurrent_files", [1, 4])
+    @patch.object(
+        IncrementalFileStreamS3, "_get_schema_map", MagicMock(return_value={"id": "integer", "_ab_additional_properties": "object"})
+    )
+    def test_read_from_slice(self, max_concurrent_files):
+        last_modified = datetime(2022, 1, 1, 13, 5, 5)
+        storage_files = [MagicMock(url=f"file_{i}", last_modified=last_modified) for i in range(5)]
+        for storage_file in storage_files:
+            storage_file.open.return_value.__enter__.return_value = storage_file.url
+        file_reader = MagicMock(stream_record_batches=lambda f: [RecordBatch(["id", "file"], [(i, f) for i in range(100)])])
+        stream_instance = IncrementalFileStreamS3(
+            dataset="dummy", provider={}, format={"filetype": "csv"}, path_pattern="**", max_concurrent_files=max_concurrent_files
+        )
+
+        records = list(stream_instance._read_from_slice(file_reader, {"files": [{"storage_file": f} for f in storage_files]}))
+
+        assert len(records) == 500
+        for storage_file in storage_files:
+            file_records = [record for record in records if record["_ab_source_file_url"] == storage_file.url]
+            # records of every file are emitted in order, the records of different files may be interleaved
+            assert [record["id"] for record in file_records] == list(range(100))
+            assert all(record["_ab_additional_properties"] == {"file": storage_file.url} for record in file_records)
+            assert all(record["_ab_source_file_last_modified"] == "2022-01-01T13:05:05" for record in file_records)
+
     @patch(
         "source_s3.source_files_abstract.stream.StorageFile.__abstractmethods__", set()
     )  # patching abstractmethods to empty set so we can instantiate ABC to test
@@ -595,12 +649,19 @@ class TestIncrementalFileStream:
             ),
         ),
     )
-    @patch("source_s3.stream.IncrementalFileStreamS3.storagefile_class", MagicMock())
     def test_master_schema(
         self, capsys, user_schema, min_datetime, ordered_file_infos, file_schemas, expected_schema, log_expected, error_expected
     ):
-        file_format_parser_mock = MagicMock(return_value=MagicMock(get_inferred_schema=MagicMock(side_effect=file_schemas)))
-        with patch.object(IncrementalFileStreamS3, "fileformatparser_class", file_format_parser_mock):
+        # schemas are inferred concurrently, so they are mapped to the files rather than returned in call order
+        inferred_files = [file_info.key for file_info in ordered_file_infos if file_info.last_modified >= min_datetime]
+        schemas_by_file = dict(zip(inferred_files, file_schemas))
+        storage_file_mock = MagicMock(side_effect=lambda file_info, provider: MagicMock(url=file_info.key))
+        file_format_parser_mock = MagicMock(
+            return_value=MagicMock(infer_schema=MagicMock(side_effect=lambda storage_file: schemas_by_file[storage_file.url]))
+        )
+        with patch.object(IncrementalFileStreamS3, "fileformatparser_class", file_format_parser_mock), patch.object(
+            IncrementalFileStreamS3, "storagefile_class", storage_file_mock
+        ):
             with patch.object(IncrementalFileStreamS3, "get_time_ordered_file_infos", MagicMock(return_value=ordered_file_infos)):
                 stream_instance = IncrementalFileStreamS3(
                     dataset="dummy", provider={}, format={"filetype": "csv"}, schema=user_schema, path_pattern="**/prefix*.csv"
@@ -614,6 +675,89 @@ class TestIncrementalFileStream:
                         captured = capsys.readouterr()
                         assert "Detected mismatched datatype" in captured.out
 
+    def test_master_schema_cache(self):
+        file_infos = [
+            FileInfo(key="first", size=128, last_modified=datetime(2022, 1, 1, 13, 5, 5), etag="etag_1"),
+            FileInfo(key="second", size=128, last_modified=datetime(2022, 6, 7, 8, 9, 10), etag="etag_2"),
+        ]
+        infer_schema = MagicMock(side_effect=lambda storage_file: {f"{storage_file.url}_column": "string"})
+        storage_file_mock = MagicMock(side_effect=lambda file_info, provider: MagicMock(url=file_info.key))
+
+        def get_stream():
+            return IncrementalFileStreamS3(dataset="dummy", provider={}, format={"filetype": "csv"}, path_pattern="**/prefix*.csv")
+
+        with patch.object(IncrementalFileStreamS3, "fileformatparser_class", MagicMock(return_value=MagicMock(infer_schema=infer_schema))):
+            with patch.object(IncrementalFileStreamS3, "storagefile_class", storage_file_mock):
+                with patch.object(IncrementalFileStreamS3, "get_time_ordered_file_infos", MagicMock(return_value=file_infos)):
+                    stream_instance = get_stream()
+                    assert stream_instance._get_master_schema() == {"first_column": "string", "second_column": "string"}
+                    state = stream_instance.get_updated_state(
+                        {}, {stream_instance.cursor_field: "2022-06-07T08:09:10+0000", stream_instance.ab_file_name_col: "second"}
+                    )
+                    first_hash, second_hash = SchemaCache._hash({"first_column": "string"}), SchemaCache._hash({"second_column": "string"})
+                    assert state["schema_cache"] == {
+                        "schemas": {first_hash: {"first_column": "string"}, second_hash: {"second_column": "string"}},
+                        "files": {"first": ["etag_1", 128, first_hash], "second": ["etag_2", 128, second_hash]},
+                    }
+
+                    # the second file changed since the previous sync, only its schema is inferred again
+                    file_infos[1] = FileInfo(key="second", size=256, last_modified=datetime(2022, 6, 7, 8, 9, 10), etag="etag_3")
+                    infer_schema.reset_mock()
+                    stream_instance = get_stream()
+                    stream_instance._schema_cache.load(state["schema_cache"])
+                    assert stream_instance._get_master_schema() == {"first_column": "string", "second_column": "string"}
+                    assert [call.args[0].url for call in infer_schema.call_args_list] == ["second"]
+
+    def test_master_schema_cache_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(schema_cache, "SCHEMA_CACHE_DIR", str(tmp_path))
+        file_infos = [FileInfo(key="first", size=128, last_modified=datetime(2022, 1, 1, 13, 5, 5), etag="etag_1")]
+        infer_schema = MagicMock(return_value={"column": "string"})
+        storage_file_mock = MagicMock(side_effect=lambda file_info, provider: MagicMock(url=file_info.key))
+
+        with patch.object(IncrementalFileStreamS3, "fileformatparser_class", MagicMock(return_value=MagicMock(infer_schema=infer_schema))):
+            with patch.object(IncrementalFileStreamS3, "storagefile_class", storage_file_mock):
+                with patch.object(IncrementalFileStreamS3, "get_time_ordered_file_infos", MagicMock(return_value=file_infos)):
+                    for _ in range(2):
+                        # as on discovery, without state
+                        stream_instance = IncrementalFileStreamS3(
+                            dataset="dummy", provider={}, format={"filetype": "csv"}, path_pattern="**/prefix*.csv"
+                        )
+                        assert stream_instance.get_json_schema()["properties"]["column"] == {"type": ["null", "string"]}
+
+        assert infer_schema.call_count == 1
+        assert len(list(tmp_path.iterdir())) == 1
+
+    def test_schema_cache_is_bounded(self):
+        cache = SchemaCache(max_files=2)
+        file_infos = [FileInfo(key=str(i), size=128, last_modified=datetime(2022, 1, i + 1), etag=f"etag_{i}") for i in range(4)]
+        for file_info in file_infos:
+            cache.set(file_info, {"column": "string"} if int(file_info.key) % 2 else {"column": "integer"})
+
+        state = cache.to_state()
+        assert list(state["files"]) == ["2", "3"]
+        assert len(state["schemas"]) == 2
+
+        cache.retain(file_infos[:3])
+        assert list(cache.to_state()["files"]) == ["2"]
+        assert list(cache.to_state()["schemas"].values()) == [{"column": "integer"}]
+
+    @pytest.mark.parametrize(
+        ("sample_size", "expected_keys"),
+        (
+            (None, ["0", "1", "2", "3", "4", "5", "6"]),
+            (10, ["0", "1", "2", "3", "4", "5", "6"]),
+            (3, ["0", "3", "6"]),
+            (2, ["0", "6"]),
+            (1, ["6"]),
+        ),
+    )
+    def test_sample_file_infos(self, sample_size, expected_keys):
+        file_infos = [FileInfo(key=str(i), size=128, last_modified=datetime(2022, 1, i + 1)) for i in range(7)]
+        stream_instance = IncrementalFileStreamS3(
+            dataset="dummy", provider={}, format={"filetype": "csv"}, path_pattern="**", schema_inference_sample_size=sample_size
+        )
+        assert [file_info.key for file_info in stream_instance._sample_file_infos(file_infos)] == expected_keys
+
     @patch.object(
         IncrementalFileStreamS3,
         "_get_master_schema",
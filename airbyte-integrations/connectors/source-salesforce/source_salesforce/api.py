@@ -3,6 +3,8 @@
 #
 
 import concurrent.futures
+import email.utils
+import time
 from typing import Any, List, Mapping, Optional, Tuple
 
 import requests  # type: ignore[import]
@@ -12,7 +14,8 @@ from requests import adapters as request_adapters
 from requests.exceptions import HTTPError, RequestException  # type: ignore[import]
 
 from .exceptions import TypeSalesforceException
-from .rate_limiting import default_backoff_handler
+from .rate_limiting import AdaptiveConcurrency, default_backoff_handler
+from .schema_cache import SCHEMA_CACHE_DIR, SchemaCache
 from .utils import filter_streams_by_criteria
 
 STRING_TYPES = [
@@ -176,6 +179,11 @@ class Salesforce:
     logger = AirbyteLogger()
     version = "v52.0"
     parallel_tasks_size = 100
+    # number of concurrent describe calls at the start of the schemas loading, adapted up to parallel_tasks_size
+    initial_parallel_tasks = 10
+    schema_cache_dir = SCHEMA_CACHE_DIR
+    # margin for the clock difference with Salesforce of the If-Modified-Since dates
+    schema_cache_clock_skew = 300
 
     def __init__(
         self,
@@ -193,6 +201,8 @@ class Salesforce:
         self.client_secret = client_secret
         self.access_token = None
         self.instance_url = ""
+        # identity URL of the user, which contains the ids of the org and of the user
+        self.identity_url: Optional[str] = None
         self.session = requests.Session()
         # Change the connection pool size. Default value is not enough for parallel tasks
         adapter = request_adapters.HTTPAdapter(pool_connections=self.parallel_tasks_size, pool_maxsize=self.parallel_tasks_size)
@@ -276,48 +286,98 @@ class Salesforce:
         auth = resp.json()
         self.access_token = auth["access_token"]
         self.instance_url = auth["instance_url"]
+        self.identity_url = auth.get("id")
 
-    def describe(self, sobject: str = None, sobject_options: Mapping[str, Any] = None) -> Mapping[str, Any]:
-        """Describes all objects or a specific object"""
+    def describe(
+        self, sobject: str = None, sobject_options: Mapping[str, Any] = None, if_modified_since: str = None
+    ) -> Optional[Mapping[str, Any]]:
+        """Describes all objects or a specific object, returns None if the metadata was not modified since `if_modified_since`"""
         headers = self._get_standard_headers()
+        if if_modified_since:
+            headers["If-Modified-Since"] = if_modified_since
 
         endpoint = "sobjects" if not sobject else f"sobjects/{sobject}/describe"
 
         url = f"{self.instance_url}/services/data/{self.version}/{endpoint}"
         resp = self._make_request("GET", url, headers=headers)
+        if resp.status_code == 304:
+            return None
         if resp.status_code == 404 and sobject:
             self.logger.error(f"not found a description for the sobject '{sobject}'. Sobject options: {sobject_options}")
         resp_json: Mapping[str, Any] = resp.json()
         return resp_json
 
-    def generate_schema(self, stream_name: str = None, stream_options: Mapping[str, Any] = None) -> Mapping[str, Any]:
-        response = self.describe(stream_name, stream_options)
+    def get_schema_cache(self) -> Optional[SchemaCache]:
+        if not self.schema_cache_dir:
+            return None
+        return SchemaCache(self.schema_cache_dir, key=f"{self.identity_url or self.instance_url} {self.version}")
+
+    def describe_fields(
+        self, stream_name: str, stream_options: Mapping[str, Any] = None, cache: SchemaCache = None
+    ) -> List[Mapping[str, Any]]:
+        """
+        Describes the fields of a sObject. With a cache, the sObject is described again only if it was modified since it was cached.
+        """
+        if cache is None:
+            return self.describe(stream_name, stream_options)["fields"]
+
+        entry = cache.get(stream_name)
+        described_at = email.utils.formatdate(time.time() - self.schema_cache_clock_skew, usegmt=True)
+        start = time.perf_counter()
+        response = self.describe(stream_name, stream_options, if_modified_since=entry["described_at"] if entry else None)
+        describe_seconds = time.perf_counter() - start
+        if response is None:
+            cache.stats.add_hit(saved_seconds=entry["describe_seconds"] - describe_seconds)
+            return entry["fields"]
+
+        cache.stats.add_miss()
+        try:
+            cache.put(stream_name, response["fields"], described_at=described_at, describe_seconds=describe_seconds)
+        except OSError as e:
+            self.logger.warn(f"Cannot cache the schema of {stream_name}: {e}")
+        return response["fields"]
+
+    def generate_schema(
+        self, stream_name: str = None, stream_options: Mapping[str, Any] = None, cache: SchemaCache = None
+    ) -> Mapping[str, Any]:
+        fields = self.describe_fields(stream_name, stream_options, cache=cache)
         schema = {"$schema": "http://json-schema.org/draft-07/schema#", "type": "object", "additionalProperties": True, "properties": {}}
-        for field in response["fields"]:
+        for field in fields:
             schema["properties"][field["name"]] = self.field_to_property_schema(field)  # type: ignore[index]
         return schema
 
     def generate_schemas(self, stream_objects: Mapping[str, Any]) -> Mapping[str, Any]:
+        cache = self.get_schema_cache()
+        concurrency = AdaptiveConcurrency(initial=self.initial_parallel_tasks, maximum=self.parallel_tasks_size)
+
         def load_schema(name: str, stream_options: Mapping[str, Any]) -> Tuple[str, Optional[Mapping[str, Any]], Optional[str]]:
+            concurrency.acquire()
+            success = False
             try:
-                result = self.generate_schema(stream_name=name, stream_options=stream_options)
+                result = self.generate_schema(stream_name=name, stream_options=stream_options, cache=cache)
+                success = True
             except RequestException as e:
                 return name, None, str(e)
+            finally:
+                concurrency.release(success)
             return name, result, None
 
-        stream_names = list(stream_objects.keys())
-        # try to split all requests by chunks
+        start = time.perf_counter()
         stream_schemas = {}
-        for i in range(0, len(stream_names), self.parallel_tasks_size):
-            chunk_stream_names = stream_names[i : i + self.parallel_tasks_size]
-            with concurrent.futures.ThreadPoolExecutor(max_workers=len(chunk_stream_names)) as executor:
-                for stream_name, schema, err in executor.map(
-                    lambda args: load_schema(*args), [(stream_name, stream_objects[stream_name]) for stream_name in chunk_stream_names]
-                ):
-                    if err:
-                        self.logger.error(f"Loading error of the {stream_name} schema: {err}")
-                        continue
-                    stream_schemas[stream_name] = schema
+        # all the sObjects are queued at once: a worker describes the next one as soon as it is done, instead of waiting for the
+        # slowest call of a chunk. The number of concurrent calls is adapted to the failures.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(self.parallel_tasks_size, len(stream_objects)))) as executor:
+            for stream_name, schema, err in executor.map(lambda args: load_schema(*args), stream_objects.items()):
+                if err:
+                    self.logger.error(f"Loading error of the {stream_name} schema: {err}")
+                    continue
+                stream_schemas[stream_name] = schema
+        self.logger.info(
+            f"Loaded {len(stream_schemas)} schemas in {time.perf_counter() - start:.1f}s"
+            f" with up to {concurrency.peak} concurrent describe calls"
+        )
+        if cache:
+            self.logger.info(f"Schema cache: {cache.stats}")
         return stream_schemas
 
     @staticmethod
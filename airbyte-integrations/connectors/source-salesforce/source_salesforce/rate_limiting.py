@@ -4,6 +4,7 @@
 
 
 import sys
+import threading
 
 import backoff
 from airbyte_cdk.logger import AirbyteLogger
@@ -50,3 +51,38 @@ def default_backoff_handler(max_tries: int, factor: int, **kwargs):
         factor=factor,
         **kwargs,
     )
+
+
+class AdaptiveConcurrency:
+    """
+    Limits the number of concurrent calls to a limit adapted to the failures of the calls.
+
+    The limit doubles every round of successful calls until a call fails (slow start), then it increases by one every round of
+    successful calls and is halved on every failure (additive increase, multiplicative decrease).
+    """
+
+    def __init__(self, initial: int, maximum: int):
+        self.maximum = maximum
+        self.limit = float(min(initial, maximum))
+        # maximum number of concurrent calls
+        self.peak = 0
+        self._in_flight = 0
+        self._slow_start = True
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        with self._condition:
+            while self._in_flight >= int(self.limit):
+                self._condition.wait()
+            self._in_flight += 1
+            self.peak = max(self.peak, self._in_flight)
+
+    def release(self, success: bool):
+        with self._condition:
+            self._in_flight -= 1
+            if success:
+                self.limit = min(self.maximum, self.limit + (1 if self._slow_start else 1 / self.limit))
+            else:
+                self._slow_start = False
+                self.limit = max(1.0, self.limit / 2)
+            self._condition.notify_all()
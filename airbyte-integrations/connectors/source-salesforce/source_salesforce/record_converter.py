@@ -0,0 +1,133 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import math
+from typing import IO, Any, Callable, Dict, Iterator, List, Mapping, Optional, Union
+
+import pandas as pd
+
+# Number of values (rows x columns) converted at once, the number of rows of a chunk is derived from the number of columns
+CHUNK_CELLS = 200_000
+MIN_CHUNK_ROWS = 200
+MAX_CHUNK_ROWS = 2_000
+
+# Boolean literals accepted by the TypeTransformer of the CDK (distutils.util.strtobool)
+BOOLEAN_VALUES = {
+    "y": True,
+    "yes": True,
+    "t": True,
+    "true": True,
+    "on": True,
+    "1": True,
+    "n": False,
+    "no": False,
+    "f": False,
+    "false": False,
+    "off": False,
+    "0": False,
+}
+
+
+def chunk_rows(columns: int) -> int:
+    """
+    :return: number of rows converted at once for records with the given number of columns
+    """
+    return max(MIN_CHUNK_ROWS, min(MAX_CHUNK_ROWS, CHUNK_CELLS // max(columns, 1)))
+
+
+def _is_null(value: Any) -> bool:
+    # pandas reads the empty fields as NaN
+    return not isinstance(value, str) or not value.strip()
+
+
+def _to_string(value: Any) -> Optional[str]:
+    return None if _is_null(value) else value
+
+
+def _to_number(value: Any) -> Union[None, int, float, str]:
+    if _is_null(value):
+        return None
+    literal = value.strip()
+    try:
+        if literal.isdigit() or literal[0] in "+-" and literal[1:].isdigit():
+            return int(literal)
+        number = float(literal)
+    except ValueError:
+        return value
+    # NaN and infinity are not valid JSON numbers
+    return number if math.isfinite(number) else value
+
+
+def _to_integer(value: Any) -> Union[None, int, float, str]:
+    number = _to_number(value)
+    return int(number) if isinstance(number, float) and number.is_integer() else number
+
+
+def _to_boolean(value: Any) -> Union[None, bool, str]:
+    if _is_null(value):
+        return None
+    return BOOLEAN_VALUES.get(value.strip().lower(), value)
+
+
+def _inferred(value: Any) -> Any:
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+
+_CONVERTERS: Mapping[str, Callable[[Any], Any]] = {"integer": _to_integer, "number": _to_number, "boolean": _to_boolean}
+
+
+class BulkRecordConverter:
+    """
+    Converts the CSV results of BULK jobs to records of the stream schema, a whole chunk of rows at a time.
+
+    The BULK API returns all the values as strings. pandas parses the CSV data into columns without inferring their types, then
+    every column of a chunk is converted at once by the converter of its property type, which is resolved once per stream:
+    - empty values and values made of whitespaces, which are the BULK API's null values, are None
+    - integer and number values are parsed: integer literals to int and the other values to float
+    - boolean values are parsed as the CDK TypeTransformer does
+    - strings are kept as they are, including the date and date-time values which are returned in ISO 8601 format
+    Values which can't be converted are kept as strings, so the records are ready to be emitted without the TypeTransformer.
+    The types of the columns which are not in the schema are inferred by pandas.
+    """
+
+    def __init__(self, schema: Mapping[str, Any]):
+        self._properties: Mapping[str, Any] = schema.get("properties", {})
+        self._converters: Dict[str, Callable[[Any], Any]] = {
+            name: _CONVERTERS.get(self._target_type(property_schema), _to_string) for name, property_schema in self._properties.items()
+        }
+
+    @property
+    def chunk_size(self) -> int:
+        return chunk_rows(len(self._properties))
+
+    def read_csv(self, data: IO[str], chunk_size: int = None) -> Iterator[Mapping[str, Any]]:
+        """
+        Parses the CSV data of a job result, by chunks of `chunk_size` lines, tuned to the number of properties by default.
+        :raises pd.errors.EmptyDataError: if the data has no header
+        """
+        chunks = pd.read_csv(
+            data,
+            chunksize=chunk_size or self.chunk_size,
+            iterator=True,
+            dialect="unix",
+            dtype={name: object for name in self._properties},
+            # only empty fields are null, strings like "NA" or "null" are values
+            keep_default_na=False,
+            na_values=[""],
+        )
+        for chunk in chunks:
+            yield from self.convert(chunk)
+
+    def convert(self, chunk: pd.DataFrame) -> List[Mapping[str, Any]]:
+        columns = list(chunk.columns)
+        values = [list(map(self._converters.get(column, _inferred), chunk[column].tolist())) for column in columns]
+        return [dict(zip(columns, row)) for row in zip(*values)]
+
+    @staticmethod
+    def _target_type(property_schema: Mapping[str, Any]) -> Optional[str]:
+        types = property_schema.get("type", [])
+        if isinstance(types, str):
+            types = [types]
+        types = [t for t in types if t != "null"]
+        return types[0] if len(types) == 1 else None
@@ -0,0 +1,96 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Any, List, Mapping, Optional
+
+# Directory of the schema cache, it must be mounted in the container to be kept between runs. The cache is disabled when it is not set.
+SCHEMA_CACHE_DIR = os.environ.get("SALESFORCE_SCHEMA_CACHE_DIR", "")
+# Changes when the format of the cached entries changes, so entries written by previous versions are ignored
+SCHEMA_CACHE_FORMAT = 1
+
+
+class SchemaCacheStats:
+    """
+    Thread-safe counters of the lookups of a SchemaCache.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+    def add_hit(self, saved_seconds: float):
+        with self._lock:
+            self.hits += 1
+            self.saved_seconds += max(0.0, saved_seconds)
+
+    def add_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __str__(self):
+        return (
+            f"{self.hits} cached and {self.misses} described sObjects ({self.hit_rate:.0%} hit rate),"
+            f" about {self.saved_seconds:.1f}s of describe calls saved"
+        )
+
+
+class SchemaCache:
+    """
+    On-disk cache of the sObject fields returned by the describe calls of an org.
+
+    Every entry keeps the time the sObject was described, which is sent as If-Modified-Since when the sObject is described again:
+    Salesforce answers 304 Not Modified without the description if its metadata did not change since then. The entries of an org are
+    stored in their own directory, keyed by the identity of the user (field permissions depend on it) and the API version.
+    """
+
+    def __init__(self, directory: str, key: str):
+        digest = hashlib.sha256(f"{SCHEMA_CACHE_FORMAT}:{key}".encode()).hexdigest()[:32]
+        self._directory = os.path.join(directory, digest)
+        self.stats = SchemaCacheStats()
+
+    def _path(self, sobject: str) -> str:
+        return os.path.join(self._directory, f"{sobject}.json")
+
+    def get(self, sobject: str) -> Optional[Mapping[str, Any]]:
+        """
+        :return: the cached entry of the sObject: its `fields`, the `described_at` HTTP date and `describe_seconds` the describe call took
+        """
+        try:
+            with open(self._path(sobject), "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or not {"fields", "described_at", "describe_seconds"} <= entry.keys():
+            return None
+        return entry
+
+    def put(self, sobject: str, fields: List[Mapping[str, Any]], described_at: str, describe_seconds: float):
+        # only the attributes used to build the schemas are kept, the descriptions of the fields are large
+        entry = {
+            "fields": [{"name": field["name"], "type": field["type"]} for field in fields],
+            "described_at": described_at,
+            "describe_seconds": describe_seconds,
+        }
+        os.makedirs(self._directory, exist_ok=True)
+        # written to a temporary file first so concurrent syncs never read a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(sobject))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
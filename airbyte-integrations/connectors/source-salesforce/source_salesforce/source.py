@@ -100,31 +100,50 @@ class SourceSalesforce(AbstractSource):
         stream_instances = {s.name: s for s in self.streams(config, catalog=catalog, state=state)}
         logger.info(f"Starting syncing {self.name}")
         self._stream_to_instance_map = stream_instances
-        for configured_stream in catalog.streams:
-            stream_instance = stream_instances.get(configured_stream.stream.name)
-            if not stream_instance:
-                raise KeyError(
-                    f"The requested stream {configured_stream.stream.name} was not found in the source. Available streams: {stream_instances.keys()}"
-                )
-
-            try:
-                yield from self._read_stream(
-                    logger=logger,
-                    stream_instance=stream_instance,
-                    configured_stream=configured_stream,
-                    connector_state=connector_state,
-                    internal_config=internal_config,
-                )
-            except exceptions.HTTPError as error:
-                error_data = error.response.json()[0]
-                error_code = error_data.get("errorCode")
-                if error.response.status_code == codes.FORBIDDEN and error_code == "REQUEST_LIMIT_EXCEEDED":
-                    logger.warn(f"API Call limit is exceeded. Error message: '{error_data.get('message')}'")
-                    break  # if got 403 rate limit response, finish the sync with success.
-                raise error
-
-            except Exception as e:
-                logger.exception(f"Encountered an exception while reading stream {self.name}")
-                raise e
+        concurrent_bulk_jobs = config.get("concurrent_bulk_jobs", 1)
+        try:
+            for index, configured_stream in enumerate(catalog.streams):
+                stream_instance = stream_instances.get(configured_stream.stream.name)
+                if not stream_instance:
+                    raise KeyError(
+                        f"The requested stream {configured_stream.stream.name} was not found in the source. Available streams: {stream_instances.keys()}"
+                    )
+                # the jobs of the next streams are processed by Salesforce while the current stream is read
+                next_streams = catalog.streams[index + 1 : index + concurrent_bulk_jobs]
+                self._prepare_bulk_jobs(logger, [stream_instances.get(s.stream.name) for s in next_streams], connector_state)
+
+                try:
+                    yield from self._read_stream(
+                        logger=logger,
+                        stream_instance=stream_instance,
+                        configured_stream=configured_stream,
+                        connector_state=connector_state,
+                        internal_config=internal_config,
+                    )
+                except exceptions.HTTPError as error:
+                    error_data = error.response.json()[0]
+                    error_code = error_data.get("errorCode")
+                    if error.response.status_code == codes.FORBIDDEN and error_code == "REQUEST_LIMIT_EXCEEDED":
+                        logger.warn(f"API Call limit is exceeded. Error message: '{error_data.get('message')}'")
+                        break  # if got 403 rate limit response, finish the sync with success.
+                    raise error
+
+                except Exception as e:
+                    logger.exception(f"Encountered an exception while reading stream {self.name}")
+                    raise e
+        finally:
+            for stream_instance in stream_instances.values():
+                if isinstance(stream_instance, BulkSalesforceStream):
+                    stream_instance.discard_prepared_jobs()
 
         logger.info(f"Finished syncing {self.name}")
+
+    @staticmethod
+    def _prepare_bulk_jobs(logger: AirbyteLogger, streams: List[Optional[Stream]], connector_state: Mapping[str, Any]):
+        for stream in streams:
+            if isinstance(stream, BulkSalesforceStream) and not stream.has_prepared_jobs:
+                try:
+                    stream.prepare_job(stream_state=connector_state.get(stream.name, {}))
+                except exceptions.RequestException as e:
+                    # the job is created again when the stream is read, which reports the error if it persists
+                    logger.warn(f"Cannot create the BULK job of the stream {stream.name} ahead of its read: {e}")
@@ -2,14 +2,21 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import codecs
 import csv
 import ctypes
+import io
+import itertools
 import math
 import os
+import tempfile
+import threading
 import time
 from abc import ABC
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import closing
-from typing import Any, Iterable, List, Mapping, MutableMapping, Optional, Tuple, Type, Union
+from typing import IO, Any, Callable, Deque, Dict, Iterable, Iterator, List, Mapping, MutableMapping, Optional, Tuple, Type, Union
 
 import pandas as pd
 import pendulum
@@ -18,13 +25,13 @@ from airbyte_cdk.models import ConfiguredAirbyteCatalog, SyncMode
 from airbyte_cdk.sources.streams import Stream
 from airbyte_cdk.sources.streams.http import HttpStream
 from airbyte_cdk.sources.utils.transform import TransformConfig, TypeTransformer
-from numpy import nan
 from pendulum import DateTime  # type: ignore[attr-defined]
 from requests import codes, exceptions
 
 from .api import UNSUPPORTED_FILTERING_STREAMS, Salesforce
 from .exceptions import SalesforceException, TmpFileIOError
 from .rate_limiting import default_backoff_handler
+from .record_converter import BulkRecordConverter
 
 # https://stackoverflow.com/a/54517228
 CSV_FIELD_SIZE_LIMIT = int(ctypes.c_ulong(-1).value // 2)
@@ -32,6 +39,96 @@ csv.field_size_limit(CSV_FIELD_SIZE_LIMIT)
 
 DEFAULT_ENCODING = "utf-8"
 
+# Size of the chunks read from the responses of the BULK API results
+RESULT_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Result pages downloaded ahead of the parsing are kept in memory up to this size, then written to a temporary file
+RESULT_PAGE_MEMORY_SIZE = 8 * 1024 * 1024
+
+
+class TextChunksIO(io.TextIOBase):
+    """
+    Read-only text file-like object over an iterator of strings, so a response can be parsed while it is downloaded.
+    """
+
+    def __init__(self, chunks: Iterator[str]):
+        self._chunks = chunks
+        self._buffer = ""
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: Optional[int] = -1) -> str:
+        while size is None or size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+        if size is None or size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+class ResultPagesDownloader:
+    """
+    Downloads the pages of BULK job results following the first page, in up to max_workers threads.
+
+    Every page of results gives the locator of the next page in its headers, which are received before its content. So the download of
+    a page starts as soon as the headers of the previous one are received and the pages are downloaded in parallel. At most max_workers
+    pages are downloaded or waiting to be parsed at the same time.
+    """
+
+    def __init__(self, download_page: Callable[[str, Callable[[Optional[str]], None]], IO[str]], max_workers: int):
+        """
+        :param download_page: downloads the page of a locator, calls its second argument with the next locator once it is known
+        :param max_workers: maximum number of pages downloaded ahead of the parsing
+        """
+        self._download_page = download_page
+        self._max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="salesforce_results")
+        self._lock = threading.Lock()
+        self._pages: Deque[Future] = deque()
+        self._next_locator: Optional[str] = None
+        self._closed = False
+
+    def start(self, locator: Optional[str]):
+        self._set_next_locator(locator)
+
+    def _set_next_locator(self, locator: Optional[str]):
+        with self._lock:
+            self._next_locator = locator
+            self._schedule()
+
+    def _schedule(self):
+        # the lock is held, a single page is scheduled at a time since the next locator is only known once its headers are received
+        if self._next_locator and len(self._pages) < self._max_workers and not self._closed:
+            locator, self._next_locator = self._next_locator, None
+            self._pages.append(self._executor.submit(self._download_page, locator, self._set_next_locator))
+
+    def pages(self) -> Iterator[IO[str]]:
+        """
+        :return: the downloaded pages in order, rewound. The caller must close them.
+        """
+        while True:
+            with self._lock:
+                if not self._pages:
+                    return
+                future = self._pages[0]
+            page = future.result()
+            with self._lock:
+                self._pages.popleft()
+                self._schedule()
+            yield page
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        for future in self._pages:
+            if future.done() and not future.cancelled() and not future.exception():
+                future.result().close()
+        self._pages.clear()
+
 
 class SalesforceStream(HttpStream, ABC):
     page_size = 2000
@@ -153,16 +250,25 @@ class BulkSalesforceStream(SalesforceStream):
     DEFAULT_WAIT_TIMEOUT_SECONDS = 600
     MAX_CHECK_INTERVAL_SECONDS = 2.0
     MAX_RETRY_NUMBER = 3
+    # maximum number of records of a page of job results, the pages are downloaded in parallel
+    RESULT_PAGE_SIZE = 10000
+    MAX_RESULT_DOWNLOAD_WORKERS = 4
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # jobs created ahead of the read by prepare_job, by query
+        self._prepared_jobs: Dict[str, Optional[str]] = {}
 
     def path(self, next_page_token: Mapping[str, Any] = None, **kwargs: Any) -> str:
         return f"/services/data/{self.sf_api.version}/jobs/query"
 
-    transformer = TypeTransformer(TransformConfig.CustomSchemaNormalization | TransformConfig.DefaultSchemaNormalization)
+    # the records are converted to the stream schema by BulkRecordConverter
+    transformer = TypeTransformer(TransformConfig.NoTransform)
 
     @default_backoff_handler(max_tries=5, factor=15)
-    def _send_http_request(self, method: str, url: str, json: dict = None, stream: bool = False):
+    def _send_http_request(self, method: str, url: str, json: dict = None, stream: bool = False, params: Mapping[str, Any] = None):
         headers = self.authenticator.get_auth_header()
-        response = self._session.request(method, url=url, headers=headers, json=json, stream=stream)
+        response = self._session.request(method, url=url, headers=headers, json=json, stream=stream, params=params)
         if response.status_code not in [200, 204]:
             self.logger.error(f"error body: {response.text}, sobject options: {self.sobject_options}")
         response.raise_for_status()
@@ -256,7 +362,10 @@ class BulkSalesforceStream(SalesforceStream):
     def execute_job(self, query: str, url: str) -> Tuple[Optional[str], Optional[str]]:
         job_status = "Failed"
         for i in range(0, self.MAX_RETRY_NUMBER):
-            job_id = self.create_stream_job(query=query, url=url)
+            if query in self._prepared_jobs:
+                job_id = self._prepared_jobs.pop(query)
+            else:
+                job_id = self.create_stream_job(query=query, url=url)
             if not job_id:
                 return None, None
             job_full_url = f"{url}/{job_id}"
@@ -301,28 +410,140 @@ class BulkSalesforceStream(SalesforceStream):
         else:
             raise TmpFileIOError(f"The IO/Error occured while verifying binary data. Stream: {self.name}, file {tmp_file} doesn't exist.")
 
-    def read_with_chunks(self, path: str = None, chunk_size: int = 100) -> Iterable[Tuple[int, Mapping[str, Any]]]:
+    def read_with_chunks(self, path: str = None, chunk_size: int = None) -> Iterable[Tuple[int, Mapping[str, Any]]]:
         """
         Reads the downloaded binary data, using lines chunks, set by `chunk_size`.
         @ path: string - the path to the downloaded temporarily binary data.
-        @ chunk_size: int - the number of lines to read at a time, default: 100 lines / time.
+        @ chunk_size: int - the number of lines to read at a time, default: tuned to the number of properties of the stream.
         """
         try:
             with open(path, "r", encoding=self.encoding) as data:
-                chunks = pd.read_csv(data, chunksize=chunk_size, iterator=True, dialect="unix")
-                for chunk in chunks:
-                    chunk = chunk.replace({nan: None}).to_dict(orient="records")
-                    for row in chunk:
-                        yield row
-        except pd.errors.EmptyDataError as e:
-            self.logger.info(f"Empty data received. {e}")
-            yield from []
+                yield from self.read_csv_chunks(data, chunk_size=chunk_size)
         except IOError as ioe:
             raise TmpFileIOError(f"The IO/Error occured while reading tmp data. Called: {path}. Stream: {self.name}", ioe)
         finally:
             # remove binary tmp file, after data is read
             os.remove(path)
 
+    def read_csv_chunks(self, data: IO[str], chunk_size: int = None) -> Iterable[Mapping[str, Any]]:
+        """
+        Parses the CSV data of a job result into records of the stream schema, using lines chunks, set by `chunk_size`.
+        The chunk size is tuned to the number of properties of the stream by default.
+        """
+        try:
+            # the schema was loaded to build the query of the job
+            yield from BulkRecordConverter(self.schema or {}).read_csv(data, chunk_size=chunk_size)
+        except pd.errors.EmptyDataError as e:
+            self.logger.info(f"Empty data received. {e}")
+            yield from []
+
+    def decode_chunks(self, chunks: Iterable[bytes]) -> Iterator[str]:
+        """
+        Decodes the chunks of a response like `decode`, characters split between two chunks are decoded once the second one is received.
+        The encoding is settled for each response, so that the pages of results downloaded in parallel do not share it.
+        """
+        encoding = DEFAULT_ENCODING
+        decoder = codecs.getincrementaldecoder(encoding)()
+        # the None chunk flushes the decoder
+        for chunk in itertools.chain(chunks, [None]):
+            pending, _ = decoder.getstate()
+            try:
+                text = decoder.decode(chunk or b"", final=chunk is None)
+            except UnicodeDecodeError as e:
+                if encoding != DEFAULT_ENCODING:
+                    raise
+                encoding = "ISO-8859-1"
+                self.logger.info(f"Could not decode chunk. Falling back to {encoding} encoding. Error: {e}")
+                decoder = codecs.getincrementaldecoder(encoding)()
+                text = decoder.decode(pending + (chunk or b""), final=chunk is None)
+            if text:
+                yield self.filter_null_bytes(text)
+
+    @staticmethod
+    def get_next_locator(response: requests.Response) -> Optional[str]:
+        """
+        docs: https://developer.salesforce.com/docs/atlas.en-us.api_asynch.meta/api_asynch/query_get_job_results.htm
+        """
+        locator = response.headers.get("Sforce-Locator")
+        return None if not locator or locator == "null" else locator
+
+    def get_result_page(self, url: str, locator: str = None) -> requests.Response:
+        params = {"maxRecords": self.RESULT_PAGE_SIZE}
+        if locator:
+            params["locator"] = locator
+        return self._send_http_request("GET", f"{url}/results", params=params, stream=True)
+
+    def download_result_page(self, url: str, locator: str, set_next_locator: Callable[[Optional[str]], None]) -> IO[str]:
+        """
+        Downloads a page of results into a temporary file. The next locator is given to `set_next_locator` before the content is read.
+        """
+        try:
+            response = self.get_result_page(url, locator)
+        except BaseException:
+            set_next_locator(None)
+            raise
+        with closing(response):
+            set_next_locator(self.get_next_locator(response))
+            page = tempfile.SpooledTemporaryFile(max_size=RESULT_PAGE_MEMORY_SIZE, mode="w+", encoding="utf-8", newline="")
+            try:
+                for text in self.decode_chunks(response.iter_content(chunk_size=RESULT_DOWNLOAD_CHUNK_SIZE)):
+                    page.write(text)
+            except BaseException:
+                page.close()
+                raise
+        page.seek(0)
+        return page
+
+    def read_job_results(self, url: str) -> Iterable[Mapping[str, Any]]:
+        """
+        Reads the records of a completed job. The first page of results is parsed while it is downloaded and the next pages are
+        downloaded in parallel meanwhile.
+        @ url: string - the url of the `executed_job`
+        """
+        downloader = ResultPagesDownloader(
+            lambda locator, set_next_locator: self.download_result_page(url, locator, set_next_locator),
+            max_workers=self.MAX_RESULT_DOWNLOAD_WORKERS,
+        )
+        try:
+            with closing(self.get_result_page(url)) as response:
+                downloader.start(self.get_next_locator(response))
+                data = TextChunksIO(self.decode_chunks(response.iter_content(chunk_size=RESULT_DOWNLOAD_CHUNK_SIZE)))
+                yield from self.read_csv_chunks(data)
+            for page in downloader.pages():
+                with page:
+                    yield from self.read_csv_chunks(page)
+        finally:
+            downloader.close()
+
+    def prepare_job(self, stream_state: Mapping[str, Any] = None):
+        """
+        Creates the job of the first page of records so that Salesforce processes it before the stream is read.
+        """
+        query = self.request_params(stream_state=stream_state or {})["q"]
+        if query not in self._prepared_jobs:
+            self._prepared_jobs[query] = self.create_stream_job(query=query, url=f"{self.url_base}{self.path()}")
+
+    @property
+    def has_prepared_jobs(self) -> bool:
+        return bool(self._prepared_jobs)
+
+    def discard_prepared_jobs(self):
+        """
+        Deletes the prepared jobs which were not read.
+        """
+        while self._prepared_jobs:
+            _, job_id = self._prepared_jobs.popitem()
+            if not job_id:
+                continue
+            job_full_url = f"{self.url_base}{self.path()}/{job_id}"
+            try:
+                job_status = self._send_http_request("GET", url=job_full_url).json()["state"]
+                if job_status in ["UploadComplete", "InProgress"]:
+                    self.abort_job(url=job_full_url)
+                self.delete_job(url=job_full_url)
+            except exceptions.RequestException as e:
+                self.logger.warning(f"Cannot delete the job {job_id} of the stream {self.name}: {e}")
+
     def abort_job(self, url: str):
         data = {"state": "Aborted"}
         self._send_http_request("PATCH", url=url, json=data)
@@ -374,15 +595,19 @@ class BulkSalesforceStream(SalesforceStream):
                     # Thus we can try to switch to GET sync request because its response returns obvious error message
                     standard_instance = self.get_standard_instance()
                     self.logger.warning("switch to STANDARD(non-BULK) sync. Because the SalesForce BULK job has returned a failed status")
-                    yield from standard_instance.read_records(
+                    schema = self.get_json_schema()
+                    for record in standard_instance.read_records(
                         sync_mode=sync_mode, cursor_field=cursor_field, stream_slice=stream_slice, stream_state=stream_state
-                    )
+                    ):
+                        # the records of the standard instance are not normalized by the transformer of this stream
+                        standard_instance.transformer.transform(record, schema)
+                        yield record
                     return
                 raise SalesforceException(f"Job for {self.name} stream using BULK API was failed.")
 
             count = 0
             record: Mapping[str, Any] = {}
-            for record in self.read_with_chunks(self.download_data(url=job_full_url)):
+            for record in self.read_job_results(url=job_full_url):
                 count += 1
                 yield record
             self.delete_job(url=job_full_url)
@@ -416,18 +641,6 @@ class BulkSalesforceStream(SalesforceStream):
         return new_cls(**stream_kwargs)
 
 
-@BulkSalesforceStream.transformer.registerCustomTransform
-def transform_empty_string_to_none(instance: Any, schema: Any):
-    """
-    BULK API returns a `csv` file, where all values are initially as string type.
-    This custom transformer replaces empty lines with `None` value.
-    """
-    if isinstance(instance, str) and not instance.strip():
-        instance = None
-
-    return instance
-
-
 class IncrementalSalesforceStream(SalesforceStream, ABC):
     state_checkpoint_interval = 500
 
@@ -218,6 +218,82 @@ def test_download_data_filter_null_bytes(stream_config, stream_api):
         assert res == [{"Id": "0014W000027f6UwQAI", "IsDeleted": False}]
 
 
+def test_read_job_results_locator_pages(stream_config, stream_api):
+    job_full_url: str = "https://fase-account.salesforce.com/services/data/v52.0/jobs/query/7504W00000bkgnpQAA"
+    stream: BulkIncrementalSalesforceStream = generate_stream("Account", stream_config, stream_api)
+    pages = [[1, 2], [3, 4], [5], [6, 7, 8]]
+    locators = [None, "MTAw", "MjAw", "MzAw"]
+
+    with requests_mock.Mocker() as m:
+        # the most recently registered matchers are tried first, so the first page matches the requests without a locator only
+        for page, (locator, next_locator) in enumerate(zip(locators, locators[1:] + ["null"])):
+            query = f"?locator={locator}" if locator else ""
+            text = "\n".join(["ID,Name"] + [f"{i},name {i}" for i in pages[page]])
+            m.register_uri("GET", f"{job_full_url}/results{query}", text=text, headers={"Sforce-Locator": next_locator})
+        res = [record["ID"] for record in stream.read_job_results(url=job_full_url)]
+        assert res == [1, 2, 3, 4, 5, 6, 7, 8]
+        assert [r.qs.get("locator") for r in m.request_history] == [None, ["mtaw"], ["mjaw"], ["mzaw"]]
+        assert all(r.qs["maxrecords"] == [str(stream.RESULT_PAGE_SIZE)] for r in m.request_history)
+
+
+def test_read_job_results_decode_chunks(mocker, stream_config, stream_api):
+    job_full_url: str = "https://fase-account.salesforce.com/services/data/v52.0/jobs/query/7504W00000bkgnpQAA"
+    stream: BulkIncrementalSalesforceStream = generate_stream("Account", stream_config, stream_api)
+    # multibyte characters are split between chunks
+    mocker.patch("source_salesforce.streams.RESULT_DOWNLOAD_CHUNK_SIZE", 1)
+
+    with requests_mock.Mocker() as m:
+        content = '"Id","Name"\n\x00"0014W000027f6UwQAI","Café ☕"\n\x00\x00'.encode("utf-8")
+        m.register_uri("GET", f"{job_full_url}/results", content=content)
+        res = list(stream.read_job_results(url=job_full_url))
+        assert res == [{"Id": "0014W000027f6UwQAI", "Name": "Café ☕"}]
+        assert stream.encoding == "utf-8"
+
+
+def test_read_job_results_decode_pages_separately(stream_config, stream_api):
+    job_full_url: str = "https://fase-account.salesforce.com/services/data/v52.0/jobs/query/7504W00000bkgnpQAA"
+    stream: BulkIncrementalSalesforceStream = generate_stream("Account", stream_config, stream_api)
+
+    with requests_mock.Mocker() as m:
+        # the most recently registered matchers are tried first, so the first page matches the requests without a locator only
+        m.register_uri(
+            "GET", f"{job_full_url}/results", content='"Id","Name"\n"1","Café"\n'.encode("ISO-8859-1"), headers={"Sforce-Locator": "MTAw"}
+        )
+        m.register_uri(
+            "GET",
+            f"{job_full_url}/results?locator=MTAw",
+            content='"Id","Name"\n"2","Café ☕"\n'.encode("utf-8"),
+            headers={"Sforce-Locator": "null"},
+        )
+        res = list(stream.read_job_results(url=job_full_url))
+        assert res == [{"Id": 1, "Name": "Café"}, {"Id": 2, "Name": "Café ☕"}]
+        assert stream.encoding == "utf-8"
+
+
+def test_prepared_job(stream_config, stream_api):
+    stream: BulkIncrementalSalesforceStream = generate_stream("Account", stream_config, stream_api)
+    with requests_mock.Mocker() as m:
+        job_id = _prepare_mock(m, stream)
+        m.register_uri("GET", stream.path() + f"/{job_id}", json={"state": "JobComplete"})
+        stream.prepare_job(stream_state={})
+        assert stream.has_prepared_jobs
+        assert _get_result_id(stream) == 1
+        assert not stream.has_prepared_jobs
+        post_request_count = len([r for r in m.request_history if r.method == "POST"])
+        assert post_request_count == 1
+
+
+def test_discard_prepared_jobs(stream_config, stream_api):
+    stream: BulkIncrementalSalesforceStream = generate_stream("Account", stream_config, stream_api)
+    with requests_mock.Mocker() as m:
+        job_id = _prepare_mock(m, stream)
+        m.register_uri("GET", stream.path() + f"/{job_id}", json={"state": "InProgress"})
+        stream.prepare_job(stream_state={})
+        stream.discard_prepared_jobs()
+        assert not stream.has_prepared_jobs
+        assert [r.method for r in m.request_history] == ["POST", "GET", "PATCH", "DELETE"]
+
+
 def test_check_connection_rate_limit(stream_config):
     source = SourceSalesforce()
     logger = AirbyteLogger()
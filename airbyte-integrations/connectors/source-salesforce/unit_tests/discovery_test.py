@@ -2,11 +2,15 @@
 # Copyright (c) 2022 Airbyte, Inc., all rights reserved.
 #
 
+import re
+import threading
 from unittest.mock import Mock
 
 import pytest
+import requests_mock
 from source_salesforce.api import DATE_TYPES, LOOSE_TYPES, NUMBER_TYPES, STRING_TYPES, Salesforce
 from source_salesforce.exceptions import TypeSalesforceException
+from source_salesforce.rate_limiting import AdaptiveConcurrency
 
 
 @pytest.fixture(autouse=True)
@@ -100,3 +104,105 @@ def test_convert_sf_types(sf_types, json_type, with_raise):
                 Salesforce.field_to_property_schema({"type": sf_type})
         else:
             assert json_type in Salesforce.field_to_property_schema({"type": sf_type})["type"]
+
+
+def _schema_cache_api(stream_config, tmp_path, identity_url="https://login.salesforce.com/id/00D000000000001/005000000000001"):
+    sf_object = Salesforce(**stream_config)
+    sf_object.schema_cache_dir = str(tmp_path)
+    sf_object.access_token = "fake-token"
+    sf_object.instance_url = "https://fase-account.salesforce.com"
+    sf_object.identity_url = identity_url
+    return sf_object
+
+
+def test_schema_cache(stream_config, tmp_path):
+    describe_matcher = re.compile("/sobjects/(Account|Lead)/describe$")
+    fields = {"fields": [{"name": "Id", "type": "id", "label": "Account ID"}, {"name": "NumberOfEmployees", "type": "int"}]}
+
+    with requests_mock.Mocker() as m:
+        m.register_uri("GET", describe_matcher, json=fields)
+        first_schemas = _schema_cache_api(stream_config, tmp_path).generate_schemas({"Account": {}, "Lead": {}})
+        assert [r.headers.get("If-Modified-Since") for r in m.request_history] == [None, None]
+
+    with requests_mock.Mocker() as m:
+        # Account was not modified since it was cached, Lead was
+        m.register_uri("GET", describe_matcher, json={"fields": [{"name": "Id", "type": "id"}]})
+        m.register_uri("GET", re.compile("/sobjects/Account/describe$"), status_code=304)
+        sf_object = _schema_cache_api(stream_config, tmp_path)
+        cache = sf_object.get_schema_cache()
+        schemas = sf_object.describe_fields("Account", cache=cache), sf_object.describe_fields("Lead", cache=cache)
+        assert all(r.headers.get("If-Modified-Since") for r in m.request_history)
+        assert schemas == ([{"name": "Id", "type": "id"}, {"name": "NumberOfEmployees", "type": "int"}], [{"name": "Id", "type": "id"}])
+        assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    with requests_mock.Mocker() as m:
+        m.register_uri("GET", describe_matcher, status_code=304)
+        assert _schema_cache_api(stream_config, tmp_path).generate_schemas({"Account": {}})["Account"] == first_schemas["Account"]
+        # the entries of another user are not shared
+        m.register_uri("GET", describe_matcher, json=fields)
+        sf_object = _schema_cache_api(
+            stream_config, tmp_path, identity_url="https://login.salesforce.com/id/00D000000000001/005000000000002"
+        )
+        sf_object.generate_schemas({"Account": {}})
+        assert "If-Modified-Since" not in m.request_history[-1].headers
+
+
+def test_schema_cache_disabled(stream_config, tmp_path):
+    sf_object = _schema_cache_api(stream_config, tmp_path)
+    sf_object.schema_cache_dir = ""
+    assert sf_object.get_schema_cache() is None
+    with requests_mock.Mocker() as m:
+        m.register_uri("GET", re.compile("/describe$"), json={"fields": [{"name": "Id", "type": "id"}]})
+        sf_object.generate_schemas({"Account": {}})
+        sf_object.generate_schemas({"Account": {}})
+        assert [r.headers.get("If-Modified-Since") for r in m.request_history] == [None, None]
+    assert not list(tmp_path.iterdir())
+
+
+def test_generate_schemas_skips_failed_describe(stream_config, tmp_path):
+    sf_object = _schema_cache_api(stream_config, tmp_path)
+    with requests_mock.Mocker() as m:
+        m.register_uri("GET", re.compile("/describe$"), json={"fields": [{"name": "Id", "type": "id"}]})
+        m.register_uri("GET", re.compile("/Broken/describe$"), status_code=400, json=[{"errorCode": "INVALID_TYPE"}])
+        schemas = sf_object.generate_schemas({**{f"Object{i}": {} for i in range(30)}, "Broken": {}})
+    assert len(schemas) == 30 and "Broken" not in schemas
+
+
+def test_adaptive_concurrency():
+    concurrency = AdaptiveConcurrency(initial=2, maximum=10)
+    # slow start: one more concurrent call per success
+    for _ in range(4):
+        concurrency.acquire()
+        concurrency.release(success=True)
+    assert concurrency.limit == 6
+    concurrency.acquire()
+    concurrency.release(success=False)
+    assert concurrency.limit == 3
+    # additive increase: one more concurrent call per round of successful calls
+    for _ in range(3):
+        concurrency.acquire()
+        concurrency.release(success=True)
+    assert 3.9 < concurrency.limit < 4.1
+    for _ in range(100):
+        concurrency.acquire()
+        concurrency.release(success=True)
+    assert concurrency.limit == 10
+
+
+def test_adaptive_concurrency_limits_concurrent_calls():
+    concurrency = AdaptiveConcurrency(initial=3, maximum=3)
+    for _ in range(3):
+        concurrency.acquire()
+    acquired = threading.Event()
+
+    def acquire():
+        concurrency.acquire()
+        acquired.set()
+
+    thread = threading.Thread(target=acquire)
+    thread.start()
+    assert not acquired.wait(0.1)
+    concurrency.release(success=True)
+    assert acquired.wait(5)
+    thread.join()
+    assert concurrency.peak == 3
@@ -0,0 +1,85 @@
+#
+# Copyright (c) 2022 Airbyte, Inc., all rights reserved.
+#
+
+import io
+
+import pytest
+from source_salesforce.record_converter import MAX_CHUNK_ROWS, MIN_CHUNK_ROWS, BulkRecordConverter, chunk_rows
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "Id": {"type": ["string", "null"]},
+        "Name": {"type": ["string", "null"]},
+        "NumberOfEmployees": {"type": ["integer", "null"]},
+        "AnnualRevenue": {"type": ["number", "null"]},
+        "IsDeleted": {"type": ["boolean", "null"]},
+        "CreatedDate": {"type": ["string", "null"], "format": "date-time"},
+        "Anything": {"type": ["string", "number", "null"]},
+    },
+}
+
+
+@pytest.mark.parametrize(
+    "name,value,expected",
+    (
+        ("Id", "0014W000027f6UwQAI", "0014W000027f6UwQAI"),
+        ("Id", "00123", "00123"),
+        ("Name", "NA", "NA"),
+        ("Name", "null", "null"),
+        ("Name", " padded ", " padded "),
+        ("Name", "", None),
+        ("Name", "   ", None),
+        ("NumberOfEmployees", "42", 42),
+        ("NumberOfEmployees", "-7", -7),
+        ("NumberOfEmployees", "1.0", 1),
+        ("NumberOfEmployees", "1.5", 1.5),
+        ("NumberOfEmployees", "not a number", "not a number"),
+        ("NumberOfEmployees", "", None),
+        ("AnnualRevenue", "12", 12),
+        ("AnnualRevenue", "12.50", 12.5),
+        ("AnnualRevenue", "1e3", 1000.0),
+        ("AnnualRevenue", "123456789012345678", 123456789012345678),
+        ("AnnualRevenue", "123456789012345678901234567890", 123456789012345678901234567890),
+        ("AnnualRevenue", "NaN", "NaN"),
+        ("IsDeleted", "true", True),
+        ("IsDeleted", "False", False),
+        ("IsDeleted", "1", True),
+        ("IsDeleted", "maybe", "maybe"),
+        ("IsDeleted", " ", None),
+        ("CreatedDate", "2021-11-16T10:05:00.000Z", "2021-11-16T10:05:00.000Z"),
+        ("Anything", "12", "12"),
+    ),
+)
+def test_convert_value(name, value, expected):
+    # the other rows make sure the column types of a chunk don't depend on the values of the other rows
+    data = io.StringIO(f'"Id","{name}"\n"1","{value}"\n"2",""\n"3","x"\n' if name != "Id" else f'"Id"\n"{value}"\n')
+    records = list(BulkRecordConverter(SCHEMA).read_csv(data))
+    assert records[0][name] == expected
+    assert type(records[0][name]) is type(expected)
+
+
+def test_convert_chunks():
+    rows = [f'"{i}","name {i}","{i}","{i}.5","{str(i % 2 == 0).lower()}"' for i in range(250)]
+    data = io.StringIO("\n".join(['"Id","Name","NumberOfEmployees","AnnualRevenue","IsDeleted"'] + rows))
+    records = list(BulkRecordConverter(SCHEMA).read_csv(data, chunk_size=100))
+    assert records == [
+        {"Id": str(i), "Name": f"name {i}", "NumberOfEmployees": i, "AnnualRevenue": i + 0.5, "IsDeleted": i % 2 == 0} for i in range(250)
+    ]
+
+
+def test_columns_not_in_schema_are_inferred():
+    data = io.StringIO('"Id","IsDeleted","Count"\n"0014W000027f6UwQAI","false","3"\n"0014W000027f6UwQAJ","true",""\n')
+    assert list(BulkRecordConverter({"properties": {}}).read_csv(data)) == [
+        {"Id": "0014W000027f6UwQAI", "IsDeleted": False, "Count": 3.0},
+        {"Id": "0014W000027f6UwQAJ", "IsDeleted": True, "Count": None},
+    ]
+
+
+@pytest.mark.parametrize(
+    "columns,expected",
+    ((0, MAX_CHUNK_ROWS), (1, MAX_CHUNK_ROWS), (200, 1000), (400, 500), (5000, MIN_CHUNK_ROWS)),
+)
+def test_chunk_rows(columns, expected):
+    assert chunk_rows(columns) == expected